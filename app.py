@@ -14,6 +14,7 @@ from zoneinfo import ZoneInfo
 
 from src.postgres_client import get_postgres_client
 from src.duckdb_client import get_duckdb_client
+from src.models import ANNOUNCEMENT_LIGHT_FIELDS
 
 # Data backend toggle: set USE_POSTGRES=1 to use Postgres instead of DuckDB
 USE_DUCKDB = os.getenv("USE_POSTGRES", "0") != "1"
@@ -209,7 +210,7 @@ def set_param(key: str, value):
 def load_announcements():
     """Load announcements from PostgreSQL. Persists to disk across restarts."""
     client = get_postgres_client()
-    return client.load_announcements()
+    return client.load_announcements(fields=ANNOUNCEMENT_LIGHT_FIELDS)
 
 @_cached
 def load_filter_options():
@@ -231,6 +232,7 @@ def load_sampled_announcements(sample_pct: int, sample_seed: int):
         source="backfill",
         sample_pct=sample_pct,
         sample_seed=sample_seed,
+        fields=ANNOUNCEMENT_LIGHT_FIELDS,
     )
 
 
@@ -296,9 +298,23 @@ def load_sampled_filtered_announcements(
         rvol_max=rvol_max,
         exclude_financing_types=list(exclude_financing_types) if exclude_financing_types else None,
         exclude_biotech=exclude_biotech,
+        fields=ANNOUNCEMENT_LIGHT_FIELDS,
     )
 
 
+@st.cache_data(max_entries=32)
+def load_announcement_sources(announcement_keys: tuple) -> dict:
+    """Fetch source_message/source_html for the announcements actually displayed.
+
+    Bulk loads above skip these heavy columns; this keeps them out of the cached payload.
+    """
+    if USE_DUCKDB:
+        client = get_duckdb_client()
+    else:
+        client = get_postgres_client()
+    return client.load_announcement_sources(list(announcement_keys))
+
+
 @_cached
 def load_ohlcv_for_announcements(announcement_keys: tuple, _window_minutes: int):
     """Load OHLCV bars for a set of announcements.
@@ -1222,7 +1238,6 @@ if hide_no_entry:
 rows = []
 for r in display_results:
     a = r.announcement
-    msg = a.source_message or ""
     headline = a.headline or ""
     rows.append({
         "Time": to_est(a.timestamp),
@@ -1235,7 +1250,7 @@ for r in display_results:
         "Float (M)": a.float_shares / 1e6 if a.float_shares else None,
         "MC (M)": a.market_cap / 1e6 if a.market_cap else None,
         "Headline": headline[:60] + "..." if len(headline) > 60 else headline,
-        "Message": msg[:80] + "..." if len(msg) > 80 else msg,
+        "Message": "",  # Filled for the displayed page below (source text is loaded lazily)
         "Entry": r.entry_price,
         "Exit": r.exit_price,
         "Return %": r.return_pct,
@@ -1317,6 +1332,23 @@ for df_idx, row in df.iterrows():
             df_to_result_idx[df_idx] = r_idx
             break
 
+# Fill the Message column for the displayed rows only (one query for the page)
+if not df.empty and df_to_result_idx:
+    page_keys = tuple(
+        (display_results[r_idx].announcement.ticker, display_results[r_idx].announcement.timestamp)
+        for r_idx in df_to_result_idx.values()
+    )
+    page_sources = load_announcement_sources(page_keys)
+    messages = []
+    for df_idx in range(len(df)):
+        r_idx = df_to_result_idx.get(df_idx)
+        msg = ""
+        if r_idx is not None:
+            a = display_results[r_idx].announcement
+            msg = (page_sources.get((a.ticker, a.timestamp)) or {}).get("source_message") or ""
+        messages.append(msg[:80] + "..." if len(msg) > 80 else msg)
+    df["Message"] = messages
+
 # Render the dataframe with row selection
 if df.empty:
     st.warning("No trade results to display")
@@ -1392,8 +1424,12 @@ else:
 
         if ann.headline:
             st.markdown(f"**Headline:** {ann.headline}")
-        if ann.source_message:
-            st.markdown(f"**Full Message:** {ann.source_message}")
+        source_message = ann.source_message
+        if source_message is None:
+            sources = load_announcement_sources(((ann.ticker, ann.timestamp),))
+            source_message = (sources.get((ann.ticker, ann.timestamp)) or {}).get("source_message")
+        if source_message:
+            st.markdown(f"**Full Message:** {source_message}")
 
         # Get the bars for this announcement
         key = (ann.ticker, ann.timestamp)
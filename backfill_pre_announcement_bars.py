@@ -11,9 +11,11 @@ Run this once after deploying the pre-fetch enhancement to fill in historical da
 import sys
 import os
 from datetime import datetime, timedelta, date
-from time import sleep
-from src.postgres_client import PostgresClient
-from src.models import get_market_session
+from src.postgres_client import OHLCV_LINK_MAX_BEFORE, PostgresClient
+from src.data_providers import FetchWindow, get_async_fetcher, plan_fetches
+
+# Announcements submitted to the concurrent fetcher at a time
+FETCH_BATCH_SIZE = 50
 
 
 def get_announcements_with_ohlcv(client):
@@ -67,39 +69,53 @@ def needs_backfill(client, ann, pre_window_minutes=5):
     return time_diff > 2
 
 
-def backfill_pre_announcement_bars(client, ann, pre_window_minutes=5, dry_run=False):
-    """Fetch and store the missing pre-announcement bars for a single announcement."""
-    from src.massive_client import MassiveClient
+def backfill_pre_announcement_bars(client, anns, pre_window_minutes=5, dry_run=False):
+    """Fetch and store the missing pre-announcement bars for a batch of announcements.
 
-    # Calculate the time range to fetch (only the pre-announcement window)
-    pre_start = ann.timestamp - timedelta(minutes=pre_window_minutes)
-    pre_end = ann.timestamp
+    Returns one result per announcement: number of bars added, 0 if there was no
+    pre-announcement data, or None on error (always None with dry_run).
+    """
+    # Only the pre-announcement window, fetched directly from the provider (bypasses cache).
+    # Nearby announcements of the same ticker share one request.
+    windows = [
+        FetchWindow(i, ann.ticker, ann.timestamp - timedelta(minutes=pre_window_minutes), ann.timestamp)
+        for i, ann in enumerate(anns)
+    ]
+    plan = plan_fetches(windows)
 
     if dry_run:
-        print(f"  [DRY RUN] Would fetch {ann.ticker} from {pre_start} to {pre_end}")
-        return None
-
-    try:
-        # Fetch bars directly using MassiveClient (bypasses cache to get fresh data)
-        massive_client = MassiveClient()
-        bars = massive_client.fetch_ohlcv(ann.ticker, pre_start, pre_end)
-
+        for coalesced in plan:
+            req = coalesced.request
+            print(f"  [DRY RUN] Would fetch {req.ticker} from {req.start} to {req.end} "
+                  f"({len(coalesced.windows)} announcements)")
+        return [None] * len(anns)
+
+    bars_by_index = {}
+    for coalesced, bars in zip(plan, get_async_fetcher().fetch_batch([p.request for p in plan])):
+        bars_by_index.update(coalesced.split(bars))
+
+    results = []
+    for i, ann in enumerate(anns):
+        bars = bars_by_index[i]
+        if bars is None:
+            results.append(None)
+            continue
         if not bars:
-            return 0
-
-        # Store bars in database with announcement association
-        client.save_ohlcv_bars(
-            ann.ticker,
-            bars,
-            announcement_ticker=ann.ticker,
-            announcement_timestamp=ann.timestamp
-        )
-
-        return len(bars)
-
-    except Exception as e:
-        print(f"  ERROR: {e}")
-        return None
+            results.append(0)
+            continue
+        try:
+            # Store bars in database with announcement association
+            client.save_ohlcv_bars(
+                ann.ticker,
+                bars,
+                announcement_ticker=ann.ticker,
+                announcement_timestamp=ann.timestamp
+            )
+            results.append(len(bars))
+        except Exception as e:
+            print(f"  ERROR: {e}")
+            results.append(None)
+    return results
 
 
 def main():
@@ -116,6 +132,13 @@ def main():
         elif arg.startswith("--pre-window="):
             pre_window = int(arg.split("=")[1])
 
+    # Bars further back than OHLCV_LINK_MAX_BEFORE would be saved but never found by
+    # announcement-key lookups (they carry that bound as a timestamp range)
+    max_pre_window = int(OHLCV_LINK_MAX_BEFORE.total_seconds() // 60)
+    if pre_window > max_pre_window:
+        print(f"Error: --pre-window can be at most {max_pre_window} minutes (OHLCV_LINK_MAX_BEFORE)")
+        sys.exit(1)
+
     print("=" * 70)
     print("Pre-Announcement OHLCV Backfill Script")
     print("=" * 70)
@@ -173,31 +196,30 @@ def main():
     error_count = 0
     total_bars = 0
 
-    for i, ann in enumerate(to_backfill):
-        progress = f"[{i+1}/{len(to_backfill)}]"
-        session = get_market_session(ann.timestamp)
-        timestamp_str = ann.timestamp.strftime("%Y-%m-%d %H:%M")
-
-        print(f"{progress} {ann.ticker} @ {timestamp_str} ({session})")
+    # Requests are paced by the shared fetcher's token bucket (provider rate limits)
+    for batch_start in range(0, len(to_backfill), FETCH_BATCH_SIZE):
+        batch = to_backfill[batch_start:batch_start + FETCH_BATCH_SIZE]
+        results = backfill_pre_announcement_bars(client, batch, pre_window, dry_run)
 
-        result = backfill_pre_announcement_bars(client, ann, pre_window, dry_run)
+        for i, (ann, result) in enumerate(zip(batch, results), start=batch_start):
+            progress = f"[{i+1}/{len(to_backfill)}]"
+            session = ann.market_session
+            timestamp_str = ann.timestamp.strftime("%Y-%m-%d %H:%M")
 
-        if result is None:
-            error_count += 1
-            status = "ERROR"
-        elif result == 0:
-            no_data_count += 1
-            status = "no pre-announcement data"
-        else:
-            success_count += 1
-            total_bars += result
-            status = f"added {result} bars"
+            print(f"{progress} {ann.ticker} @ {timestamp_str} ({session})")
 
-        print(f"  -> {status}")
+            if result is None:
+                error_count += 1
+                status = "ERROR"
+            elif result == 0:
+                no_data_count += 1
+                status = "no pre-announcement data"
+            else:
+                success_count += 1
+                total_bars += result
+                status = f"added {result} bars"
 
-        # Rate limiting (respect provider limits)
-        if not dry_run and (i + 1) % 5 == 0:
-            sleep(1)  # 5 requests per second max
+            print(f"  -> {status}")
 
     print()
     print("=" * 70)
@@ -223,7 +245,7 @@ if __name__ == "__main__":
         print("\nOptions:")
         print("  --dry-run              Show what would be done without modifying data")
         print("  --limit=N              Only process first N announcements")
-        print("  --pre-window=N         Fetch N minutes before (default: 5)")
+        print("  --pre-window=N         Fetch N minutes before (default: 5, max: 30)")
         print("  --skip-check           Skip timestamp check, backfill all announcements")
         print("  -h, --help             Show this help message")
         print("\nExamples:")
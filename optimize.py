@@ -14,7 +14,7 @@ from datetime import datetime
 
 from src.postgres_client import PostgresClient
 from src.backtest import run_backtest, BacktestConfig
-from src.models import Announcement, OHLCVBar
+from src.models import ANNOUNCEMENT_LIGHT_FIELDS, Announcement, OHLCVBar
 
 
 def calc_total_volume(bars: List[OHLCVBar]) -> int:
@@ -54,7 +54,7 @@ def load_data(window_minutes: int = 120):
     from datetime import timedelta
 
     client = PostgresClient()
-    announcements = client.load_announcements()
+    announcements = client.load_announcements(fields=ANNOUNCEMENT_LIGHT_FIELDS)
 
     # Load OHLCV bars for each announcement
     bars_dict = {}
@@ -5,13 +5,12 @@ import pandas as pd
 import time
 from datetime import datetime
 
-from src.database import init_db, SessionLocal, TradeDB
+from src.database import init_db
 from src.strategy import StrategyConfig
-from src.strategy_store import get_strategy_store, Strategy
+from src.strategy_store import get_strategy_store, Strategy, StrategySummary
 from src.active_trade_store import get_active_trade_store
 from src.pending_entry_store import get_pending_entry_store
 from src.trading import get_trading_client
-from datetime import date
 from src.live_trading_service import (
     get_live_trading_status,
     is_live_trading_active,
@@ -159,20 +158,6 @@ with st.sidebar:
 store = get_strategy_store()
 
 
-def get_completed_today_count(strategy_id: str) -> int:
-    """Get count of trades completed today for a strategy from the database."""
-    session = SessionLocal()
-    try:
-        today_start = datetime.combine(date.today(), datetime.min.time())
-        count = session.query(TradeDB).filter(
-            TradeDB.strategy_id == strategy_id,
-            TradeDB.exit_time >= today_start,
-        ).count()
-        return count
-    finally:
-        session.close()
-
-
 # ─────────────────────────────────────────────────────────────────────────────
 # Strategy List
 # ─────────────────────────────────────────────────────────────────────────────
@@ -195,16 +180,17 @@ else:
     # Build dataframe - always read counts from database for persistence
     rows = []
     try:
+        # One grouped query for all strategies' counts
+        summaries = store.get_dashboard_summary()
         for s in strategies:
-            # Always read from database for accurate counts
-            db_pending = pending_store.get_entries_for_strategy(s.id)
-            db_active = active_store.get_trades_for_strategy(s.id)
-            db_completed = get_completed_today_count(s.id)
+            summary = summaries.get(s.id) or StrategySummary(strategy_id=s.id)
 
             # Use strings for all columns to avoid Arrow mixed-type errors
-            pending = str(len(db_pending)) if s.enabled else "-"
-            active = str(len(db_active)) if s.enabled else "-"
-            completed = str(db_completed) if s.enabled else "-"
+            pending = str(summary.pending) if s.enabled else "-"
+            active = str(summary.active) if s.enabled else "-"
+            completed = str(summary.completed_today) if s.enabled else "-"
+            pnl_today = summary.realized_pnl_today + summary.unrealized_pnl
+            pnl = f"${pnl_today:+,.2f}" if s.enabled else "-"
 
             # Format position sizing display
             if s.config.stake_mode == "volume_pct":
@@ -221,6 +207,7 @@ else:
                 "Pending": pending,
                 "Active": active,
                 "Completed": completed,
+                "P&L Today": pnl,
                 "Sizing": sizing_str,
                 "TP/SL": f"{s.config.take_profit_pct:.0f}% / {s.config.stop_loss_pct:.0f}%",
             })
@@ -636,7 +623,8 @@ else:
                 # Read from database for persistence across restarts
                 db_pending = pending_store.get_entries_for_strategy(strategy_id)
                 db_active = active_store.get_trades_for_strategy(strategy_id)
-                db_completed = get_completed_today_count(strategy_id)
+                summary = store.get_dashboard_summary().get(strategy_id)
+                db_completed = summary.completed_today if summary else 0
 
                 col1, col2, col3 = st.columns(3)
                 with col1:
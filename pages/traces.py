@@ -7,7 +7,7 @@ from zoneinfo import ZoneInfo
 
 from src.trace_store import get_trace_store
 from src.strategy_store import get_strategy_store
-from src.database import init_db, SessionLocal, TraceDB, TraceEventDB
+from src.database import init_db
 
 # Initialize database tables
 init_db()
@@ -61,129 +61,12 @@ def format_pnl(pnl: float, return_pct: float) -> str:
     return f"${pnl:,.2f} ({sign}{return_pct:.2f}%)"
 
 
-def get_traces_with_events(
-    limit: int = 100,
-    status: str = None,
-    ticker: str = None,
-    strategy_id: str = None,
-    start: datetime = None,
-) -> list:
-    """Get traces with optional filters."""
-    db = SessionLocal()
-    try:
-        query = db.query(TraceDB)
-
-        if status and status != "All":
-            query = query.filter(TraceDB.status == status)
-        if ticker:
-            query = query.filter(TraceDB.ticker == ticker.upper())
-        if strategy_id:
-            # Join with events to filter by strategy
-            query = query.join(TraceEventDB).filter(
-                TraceEventDB.strategy_id == strategy_id
-            ).distinct()
-        if start:
-            query = query.filter(TraceDB.alert_timestamp >= start)
-
-        traces = query.order_by(TraceDB.created_at.desc()).limit(limit).all()
-
-        # For each trace, get the strategy name from the first event that has one
-        for trace in traces:
-            # Query for the strategy name from trace events
-            event_query = db.query(TraceEventDB.strategy_name).filter(
-                TraceEventDB.trace_id == trace.trace_id,
-                TraceEventDB.strategy_name.isnot(None)
-            ).order_by(TraceEventDB.event_timestamp.asc()).limit(1)
-
-            event = event_query.first()
-            if event and event.strategy_name:
-                trace.strategy_name = event.strategy_name
-            else:
-                trace.strategy_name = "-"
-
-            # Detach from session
-            db.expunge(trace)
-
-        return traces
-    finally:
-        db.close()
-
-
-def get_trace_events(trace_id: str) -> list:
-    """Get all events for a trace."""
-    db = SessionLocal()
-    try:
-        events = db.query(TraceEventDB).filter(
-            TraceEventDB.trace_id == trace_id
-        ).order_by(TraceEventDB.event_timestamp.asc()).all()
-
-        for e in events:
-            db.expunge(e)
-
-        return events
-    finally:
-        db.close()
-
-
-def get_funnel_stats(start: datetime = None) -> dict:
-    """Get funnel statistics for traces."""
-    db = SessionLocal()
-    try:
-        query = db.query(TraceDB)
-        if start:
-            query = query.filter(TraceDB.alert_timestamp >= start)
-
-        traces = query.all()
-
-        stats = {
-            "total_received": len(traces),
-            "filtered": sum(1 for t in traces if t.status == "filtered"),
-            "pending_entry": sum(1 for t in traces if t.status == "pending_entry"),
-            "entry_timeout": sum(1 for t in traces if t.status == "entry_timeout"),
-            "active_trade": sum(1 for t in traces if t.status == "active_trade"),
-            "completed": sum(1 for t in traces if t.status == "completed"),
-            "winners": sum(1 for t in traces if t.status == "completed" and t.pnl and t.pnl > 0),
-            "losers": sum(1 for t in traces if t.status == "completed" and t.pnl and t.pnl <= 0),
-            "total_pnl": sum(t.pnl or 0 for t in traces if t.status == "completed"),
-        }
-
-        return stats
-    finally:
-        db.close()
-
-
 def get_filter_rejection_summary(strategy_id: str = None, start: datetime = None) -> pd.DataFrame:
     """Get summary of filter rejections by reason."""
-    db = SessionLocal()
-    try:
-        query = db.query(TraceEventDB).filter(
-            TraceEventDB.event_type == "filter_rejected"
-        )
-
-        if strategy_id:
-            query = query.filter(TraceEventDB.strategy_id == strategy_id)
-        if start:
-            query = query.filter(TraceEventDB.event_timestamp >= start)
-
-        events = query.all()
-
-        # Group by reason
-        reason_counts = {}
-        for e in events:
-            reason = e.reason or "Unknown"
-            reason_counts[reason] = reason_counts.get(reason, 0) + 1
-
-        if not reason_counts:
-            return pd.DataFrame()
-
-        df = pd.DataFrame([
-            {"Rejection Reason": reason, "Count": count}
-            for reason, count in sorted(reason_counts.items(), key=lambda x: -x[1])
-        ])
-
-        return df
-    finally:
-        db.close()
+    rows = get_trace_store().get_filter_rejection_summary(strategy_id=strategy_id, start=start)
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame([{"Rejection Reason": reason, "Count": count} for reason, count in rows])
 
 
 # Page config
@@ -272,7 +155,8 @@ st.sidebar.markdown("[View Orders ->](orders)")
 
 # Funnel stats
 st.header("Alert Funnel")
-stats = get_funnel_stats(start_date)
+trace_store = get_trace_store()
+stats = trace_store.get_funnel_stats(start_date)
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
@@ -311,7 +195,7 @@ if status_filter in ["All", "filtered"]:
 # Traces list
 st.header("Traces")
 
-traces = get_traces_with_events(
+traces = trace_store.get_trace_summaries(
     limit=200,
     status=status_filter if status_filter != "All" else None,
     ticker=ticker_filter,
@@ -365,7 +249,7 @@ else:
 
     if selected_trace_id:
         selected_trace = next(t for t in traces if t.trace_id == selected_trace_id)
-        events = get_trace_events(selected_trace_id)
+        events = trace_store.get_events_for_trace(selected_trace_id)
 
         col1, col2 = st.columns(2)
 
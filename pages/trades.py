@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 from src.trade_store import get_trade_store
 from src.strategy_store import get_strategy_store
 from src.live_bar_store import get_live_bar_store
-from src.database import init_db, SessionLocal, OrderDB, OrderEventDB
+from src.database import init_db
 from src.order_store import get_order_store
 
 
@@ -35,94 +35,39 @@ def to_est_display(dt: datetime) -> str:
     return est_dt.strftime("%Y-%m-%d %H:%M:%S")
 
 
-def get_order_events_for_trade(db_trade_id: int, ticker: str, entry_time: datetime, exit_time: datetime, strategy_id: str = None, trade_id: str = None) -> pd.DataFrame:
-    """Get all orders and their events for a completed trade, displayed in EST.
+def order_events_frame(orders_with_events: list) -> pd.DataFrame:
+    """Build the chronological order events table for one trade, displayed in EST."""
+    events_data = []
+    for order, events in orders_with_events:
+        for event in events:
+            # For SUBMITTED events, show the order details
+            # For FILL events, show the fill details
+            if event.event_type.lower() == "submitted":
+                shares_display = order.requested_shares
+                price_display = f"${order.limit_price:.2f}" if order.limit_price else "-"
+            elif event.event_type.lower() in ("fill", "partial_fill"):
+                shares_display = event.filled_shares if event.filled_shares else "-"
+                price_display = f"${event.fill_price:.2f}" if event.fill_price else "-"
+            else:
+                shares_display = event.filled_shares if event.filled_shares else order.requested_shares
+                price_display = f"${event.fill_price:.2f}" if event.fill_price else (f"${order.limit_price:.2f}" if order.limit_price else "-")
 
-    Uses trade_id (UUID) for direct lookup if available, falls back to time-based matching for legacy trades.
-    """
-    db = SessionLocal()
-    try:
-        orders = []
-
-        # Primary method: Query by trade_id (UUID) if available
-        if trade_id:
-            orders = db.query(OrderDB).filter(
-                OrderDB.trade_id == trade_id
-            ).order_by(OrderDB.created_at.asc()).all()
-
-        # Fallback for legacy trades: time-based matching
-        if not orders:
-            # Find BUY order (created within 2 minutes before entry fill time)
-            buy_query = db.query(OrderDB).filter(
-                OrderDB.ticker == ticker,
-                OrderDB.side == "buy",
-                OrderDB.created_at >= entry_time - timedelta(seconds=120),
-                OrderDB.created_at <= entry_time + timedelta(seconds=5),
-            )
-            if strategy_id:
-                buy_query = buy_query.filter(OrderDB.strategy_id == strategy_id)
-            buy_order = buy_query.first()
-            if buy_order:
-                orders.append(buy_order)
-
-            # Find SELL order (created within 2 minutes before exit fill time)
-            sell_query = db.query(OrderDB).filter(
-                OrderDB.ticker == ticker,
-                OrderDB.side == "sell",
-                OrderDB.created_at >= exit_time - timedelta(seconds=120),
-                OrderDB.created_at <= exit_time + timedelta(seconds=5),
-            )
-            if strategy_id:
-                sell_query = sell_query.filter(OrderDB.strategy_id == strategy_id)
-            sell_order = sell_query.first()
-            if sell_order:
-                orders.append(sell_order)
-
-            # Sort by created_at
-            orders.sort(key=lambda o: o.created_at)
-
-        if not orders:
-            return pd.DataFrame()
-
-        # Get all events for these orders
-        events_data = []
-        for order in orders:
-            # Get events for this order
-            events = db.query(OrderEventDB).filter(
-                OrderEventDB.order_id == order.id
-            ).order_by(OrderEventDB.event_timestamp.asc()).all()
-
-            for event in events:
-                # For SUBMITTED events, show the order details
-                # For FILL events, show the fill details
-                if event.event_type.lower() == "submitted":
-                    shares_display = order.requested_shares
-                    price_display = f"${order.limit_price:.2f}" if order.limit_price else "-"
-                elif event.event_type.lower() in ("fill", "partial_fill"):
-                    shares_display = event.filled_shares if event.filled_shares else "-"
-                    price_display = f"${event.fill_price:.2f}" if event.fill_price else "-"
-                else:
-                    shares_display = event.filled_shares if event.filled_shares else order.requested_shares
-                    price_display = f"${event.fill_price:.2f}" if event.fill_price else (f"${order.limit_price:.2f}" if order.limit_price else "-")
-
-                events_data.append({
-                    "Time (EST)": to_est_display(event.event_timestamp),
-                    "Event": event.event_type.upper(),
-                    "Side": order.side.upper(),
-                    "Type": order.order_type,
-                    "Shares": shares_display,
-                    "Limit Price": f"${order.limit_price:.2f}" if order.limit_price else "-",
-                    "Fill Price": price_display if event.event_type.lower() in ("fill", "partial_fill") else "-",
-                    "Filled": f"{event.cumulative_filled}/{order.requested_shares}" if event.cumulative_filled is not None else "-",
-                    "Status": order.status,
-                })
-
-        if not events_data:
-            return pd.DataFrame()
-
-        return pd.DataFrame(events_data)
-    finally:
-        db.close()
+            events_data.append({
+                "Time (EST)": to_est_display(event.event_timestamp),
+                "Event": event.event_type.upper(),
+                "Side": order.side.upper(),
+                "Type": order.order_type,
+                "Shares": shares_display,
+                "Limit Price": f"${order.limit_price:.2f}" if order.limit_price else "-",
+                "Fill Price": price_display if event.event_type.lower() in ("fill", "partial_fill") else "-",
+                "Filled": f"{event.cumulative_filled}/{order.requested_shares}" if event.cumulative_filled is not None else "-",
+                "Status": order.status,
+            })
+
+    if not events_data:
+        return pd.DataFrame()
+
+    return pd.DataFrame(events_data)
 
 
 
@@ -195,6 +140,9 @@ elif date_range == "Last 30 days":
     start_date = datetime.now() - timedelta(days=30)
 else:
     start_date = None
+# Minute resolution keeps the cache key (and the pagination cursor stack) stable across reruns
+if start_date is not None:
+    start_date = start_date.replace(second=0, microsecond=0)
 
 # Ticker filter
 ticker_default = params.get("ticker", "")
@@ -216,53 +164,70 @@ st.sidebar.markdown("[<- Back to Backtest](../)")
 st.sidebar.markdown("[Manage Strategies ->](strategies)")
 st.sidebar.markdown("[View Orders ->](orders)")
 
+TRADES_PAGE_SIZE = 100
+
+
 # Load trades with caching to avoid re-fetching on every widget interaction
-@st.cache_data
-def fetch_trades(paper_filter, ticker_filter, start_date, strategy_name_filter):
-    """Fetch and filter trades. Cache invalidates automatically when filters change."""
-    trades = client.get_trades(
+@st.cache_data(ttl=30)
+def fetch_trades(paper_filter, ticker_filter, start_date, strategy_name_filter, cursor=None):
+    """Fetch one page of trades (keyset pagination, filtered in SQL)."""
+    return client.get_trades(
         paper=paper_filter,
         ticker=ticker_filter,
         start=start_date,
-        limit=500,
+        strategy_name=strategy_name_filter,
+        limit=TRADES_PAGE_SIZE,
+        before=cursor,
     )
-    # Filter by strategy name (client-side since DB query doesn't support it yet)
-    if strategy_name_filter:
-        trades = [t for t in trades if t.strategy_name == strategy_name_filter]
-    return trades
 
-trades = fetch_trades(paper_filter, ticker_filter, start_date, strategy_name_filter)
+
+@st.cache_data(ttl=30)
+def fetch_order_events(trade_ids: tuple, _trades: list) -> dict:
+    """Order event tables for a page of trades, keyed by trade DB id.
+
+    Loaded for the whole page at once (a fixed number of queries), so switching the
+    selected trade doesn't hit the database.
+    """
+    orders = get_order_store().get_orders_with_events_for_trades(_trades)
+    return {trade_key: order_events_frame(rows) for trade_key, rows in orders.items()}
+
+
+@st.cache_data(ttl=30)
+def fetch_trade_stats(paper_filter, ticker_filter, start_date, strategy_name_filter):
+    """Aggregate stats over all trades matching the filters (computed in SQL)."""
+    return client.get_trade_stats(
+        paper=paper_filter,
+        ticker=ticker_filter,
+        start=start_date,
+        strategy_name=strategy_name_filter,
+    )
+
+
+@st.cache_data(ttl=30)
+def fetch_daily_pnl(paper_filter, ticker_filter, start_date, strategy_name_filter):
+    """Per-day stats over all trades matching the filters (computed in SQL)."""
+    return client.get_trade_stats(
+        paper=paper_filter,
+        ticker=ticker_filter,
+        start=start_date,
+        strategy_name=strategy_name_filter,
+        group_by="day",
+    )
+
+
+filter_key = (paper_filter, ticker_filter, start_date, strategy_name_filter)
+# Stack of cursors for pages visited so far; reset whenever the filters change
+if st.session_state.get("trades_filter_key") != filter_key:
+    st.session_state["trades_filter_key"] = filter_key
+    st.session_state["trades_cursors"] = [None]
+cursors = st.session_state["trades_cursors"]
+
+trades = fetch_trades(paper_filter, ticker_filter, start_date, strategy_name_filter, cursors[-1])
 
 # Stats section
 st.header("Performance Summary")
 
-# Compute stats from filtered trades (not a separate DB call that ignores filters)
-if trades:
-    wins = sum(1 for t in trades if t.pnl > 0)
-    losses = sum(1 for t in trades if t.pnl <= 0)
-    total_pnl = sum(t.pnl for t in trades)
-    returns = [t.return_pct for t in trades]
-    stats = {
-        "total_trades": len(trades),
-        "wins": wins,
-        "losses": losses,
-        "win_rate": wins / len(trades) * 100,
-        "total_pnl": total_pnl,
-        "avg_return_pct": sum(returns) / len(returns),
-        "best_trade_pct": max(returns),
-        "worst_trade_pct": min(returns),
-    }
-else:
-    stats = {
-        "total_trades": 0,
-        "wins": 0,
-        "losses": 0,
-        "win_rate": 0,
-        "total_pnl": 0,
-        "avg_return_pct": 0,
-        "best_trade_pct": 0,
-        "worst_trade_pct": 0,
-    }
+stats = fetch_trade_stats(paper_filter, ticker_filter, start_date, strategy_name_filter)
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -363,6 +328,22 @@ else:
         hide_index=True,
     )
 
+    # Pagination
+    next_cursor = client.next_page_cursor(trades, TRADES_PAGE_SIZE)
+    page_number = len(cursors)
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("← Newer", disabled=page_number == 1):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        first = (page_number - 1) * TRADES_PAGE_SIZE + 1
+        st.caption(f"Trades {first}-{first + len(trades) - 1} of {stats['total_trades']}")
+    with next_col:
+        if st.button("Older →", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
     # Expandable trade details
     st.subheader("Trade Details")
 
@@ -377,14 +358,8 @@ else:
 
         # Order Events Table (only for trades with order tracking)
         st.subheader("Order Events (Chronological)")
-        order_events_df = get_order_events_for_trade(
-            db_trade_id=selected_trade.id,
-            ticker=selected_trade.ticker,
-            entry_time=selected_trade.entry_time,
-            exit_time=selected_trade.exit_time,
-            strategy_id=selected_trade.strategy_id,
-            trade_id=selected_trade.trade_id,  # UUID for direct order lookup
-        )
+        order_events = fetch_order_events(tuple(t.id for t in trades), trades)
+        order_events_df = order_events.get(selected_trade.id, pd.DataFrame())
 
         if not order_events_df.empty:
             st.dataframe(
@@ -625,23 +600,14 @@ else:
 
                 st.plotly_chart(fig, use_container_width=True)
 
-# Chart of P&L over time
-if trades:
+# Chart of P&L over time (all matching trades, not just the current page)
+daily_pnl = fetch_daily_pnl(paper_filter, ticker_filter, start_date, strategy_name_filter)
+if daily_pnl:
     st.divider()
     st.header("P&L Over Time")
 
-    # Build cumulative P&L
-    pnl_data = []
-    cumulative = 0
-    for t in reversed(trades):  # Oldest first
-        cumulative += t.pnl
-        pnl_data.append({
-            "date": t.exit_time,
-            "pnl": t.pnl,
-            "cumulative": cumulative,
-        })
-
-    pnl_df = pd.DataFrame(pnl_data)
-    pnl_df.set_index("date", inplace=True)
+    pnl_df = pd.DataFrame(daily_pnl, columns=["day", "total_pnl"])
+    pnl_df["cumulative"] = pnl_df["total_pnl"].cumsum()  # days come oldest first
+    pnl_df.set_index("day", inplace=True)
 
     st.line_chart(pnl_df["cumulative"])
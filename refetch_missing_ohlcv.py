@@ -4,16 +4,21 @@
 This script fetches OHLCV bars starting from 5 minutes BEFORE each announcement
 up to 120 minutes after (configurable). This allows for pre-announcement
 price action analysis.
+
+--refetch queues the missing announcements as backfill jobs (src/backfill_jobs.py)
+and runs them; see scripts/run_backfill_jobs.py for finer control.
 """
 
 import sys
 import json
 import os
 from datetime import date, timedelta
+from src.backfill_jobs import BackfillRunner, get_backfill_job_store
 from src.postgres_client import PostgresClient
-from src.models import get_market_session
+from src.massive_client import get_effective_start_time
+from src.models import ANNOUNCEMENT_LIGHT_FIELDS
 
-# File to track tickers that have no data available
+# Tickers found without data before the backfill job table existed (read-only)
 NO_DATA_FILE = "data/no_ohlcv_data.json"
 
 
@@ -26,13 +31,6 @@ def load_no_data_set():
     return set()
 
 
-def save_no_data_set(no_data_set):
-    """Save set of (ticker, timestamp) that have no data available."""
-    os.makedirs(os.path.dirname(NO_DATA_FILE), exist_ok=True)
-    with open(NO_DATA_FILE, "w") as f:
-        json.dump(list(no_data_set), f, indent=2)
-
-
 def get_missing_announcements(client, announcements, no_data_set):
     """Find announcements missing OHLCV data."""
     missing = []
@@ -42,22 +40,8 @@ def get_missing_announcements(client, announcements, no_data_set):
         if key in no_data_set:
             continue
 
-        session = get_market_session(ann.timestamp)
-
-        # Calculate effective start time
-        if session == "closed":
-            effective_start = ann.timestamp.replace(hour=9, minute=30, second=0, microsecond=0)
-            if ann.timestamp.hour >= 20:
-                effective_start += timedelta(days=1)
-            while effective_start.weekday() >= 5:
-                effective_start += timedelta(days=1)
-        elif session == "postmarket":
-            effective_start = ann.timestamp.replace(hour=9, minute=30, second=0, microsecond=0)
-            effective_start += timedelta(days=1)
-            while effective_start.weekday() >= 5:
-                effective_start += timedelta(days=1)
-        else:
-            effective_start = ann.timestamp
+        # Effective start is stored at save time; compute it for rows saved before that
+        effective_start = ann.effective_start or get_effective_start_time(ann.timestamp)
 
         # Skip if trading window is today or future
         if effective_start.date() >= date.today():
@@ -75,75 +59,47 @@ def get_missing_announcements(client, announcements, no_data_set):
 
 def main():
     client = PostgresClient()
-    announcements = client.load_announcements()
+    announcements = client.load_announcements(fields=ANNOUNCEMENT_LIGHT_FIELDS)
+    store = get_backfill_job_store()
+    # Legacy no-data file plus announcements the job runner found without data
     no_data_set = load_no_data_set()
+    no_data_set |= {(ticker, ts.isoformat()) for ticker, ts in store.keys_in_state("no_data")}
 
     print(f"Loaded {len(announcements)} announcements")
     print(f"Already marked as no-data: {len(no_data_set)}")
 
-    loop_count = 0
-    max_loops = 10  # Safety limit
-
-    while loop_count < max_loops:
-        loop_count += 1
-        missing = get_missing_announcements(client, announcements, no_data_set)
-
-        print(f"\n{'='*60}")
-        print(f"Loop {loop_count}: Found {len(missing)} announcements missing OHLCV data")
-
-        if not missing:
-            print("All announcements have OHLCV data or are marked as unavailable!")
-            break
-
-        # Show first 10
-        for ann in missing[:10]:
-            print(f"  {ann.timestamp} {ann.ticker}")
-        if len(missing) > 10:
-            print(f"  ... and {len(missing) - 10} more")
-
-        if len(sys.argv) > 1 and sys.argv[1] == "--refetch":
-            print(f"\nRefetching OHLCV data...")
-            success_count = 0
-            no_data_count = 0
-
-            for i, ann in enumerate(missing):
-                print(f"[{i+1}/{len(missing)}] Fetching {ann.ticker} @ {ann.timestamp}...")
-                bars = client.fetch_after_announcement(
-                    ann.ticker,
-                    ann.timestamp,
-                    window_minutes=120,
-                    use_cache=False  # Force refetch
-                )
-                if bars is None:
-                    # Rate limit or network failure - will retry next loop
-                    print(f"  -> Failed (will retry)")
-                elif bars:
-                    print(f"  -> Got {len(bars)} bars")
-                    success_count += 1
-                else:
-                    # Empty list = API confirmed no data exists
-                    print(f"  -> No data available (marking as unavailable)")
-                    key = (ann.ticker, ann.timestamp.isoformat())
-                    no_data_set.add(key)
-                    no_data_count += 1
-                    # Save periodically
-                    if no_data_count % 10 == 0:
-                        save_no_data_set(no_data_set)
-
-            # Save after each loop
-            save_no_data_set(no_data_set)
-            print(f"\nLoop {loop_count} complete: {success_count} fetched, {no_data_count} marked unavailable")
-
-            # If we got no successful fetches this loop, we're done
-            if success_count == 0:
-                print("No new data fetched this loop, stopping.")
-                break
-        else:
-            print("\nRun with --refetch to fetch missing data")
-            break
+    missing = get_missing_announcements(client, announcements, no_data_set)
+    print(f"\n{'='*60}")
+    print(f"Found {len(missing)} announcements missing OHLCV data")
+
+    # Show first 10
+    for ann in missing[:10]:
+        print(f"  {ann.timestamp} {ann.ticker}")
+    if len(missing) > 10:
+        print(f"  ... and {len(missing) - 10} more")
+
+    if not missing:
+        print("All announcements have OHLCV data or are marked as unavailable!")
+        return
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--refetch":
+        # Jobs persist in backfill_jobs: interrupting and re-running resumes the backfill
+        queued = store.enqueue([(ann.ticker, ann.timestamp) for ann in missing], requeue=True)
+        print(f"\nQueued {queued} backfill jobs, refetching OHLCV data...")
+        try:
+            finished = BackfillRunner(store).run()
+        except KeyboardInterrupt:
+            print("\nInterrupted; run again to resume.")
+            return
+        print(f"\nFinished: {finished}")
+        print("Job states: " + " ".join(f"{state}={count}" for state, count in store.progress().items()))
+    else:
+        print("\nRun with --refetch to fetch missing data")
+        return
 
     print(f"\nFinal stats:")
     print(f"  Total announcements: {len(announcements)}")
+    no_data_set |= {(ticker, ts.isoformat()) for ticker, ts in store.keys_in_state("no_data")}
     print(f"  Marked as no-data: {len(no_data_set)}")
     remaining = get_missing_announcements(client, announcements, no_data_set)
     print(f"  Still missing: {len(remaining)}")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Backfill market_session, et_date and effective_start for existing announcements.
+
+Usage:
+    python scripts/backfill_market_session.py [--all]
+
+By default only rows with a NULL market_session/effective_start are updated; --all
+recomputes every row (e.g. after changing session boundaries).
+"""
+
+import argparse
+import sys
+sys.path.insert(0, '.')
+
+from sqlalchemy import text
+from src.database import engine, init_db
+from src.massive_client import get_effective_start_times
+from src.models import classify_market_sessions
+
+BATCH_SIZE = 5000
+
+
+def backfill_market_session(recompute_all: bool = False):
+    """Compute the derived session columns in bulk and write them back in batches."""
+    init_db()
+
+    where = "" if recompute_all else "WHERE market_session IS NULL OR effective_start IS NULL"
+
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT id, timestamp FROM announcements {where}")).fetchall()
+        if not rows:
+            print("Nothing to backfill")
+            return
+
+        ids = [r[0] for r in rows]
+        timestamps = [r[1] for r in rows]
+        sessions, et_dates = classify_market_sessions(timestamps)
+        effective_starts = get_effective_start_times(timestamps).astype("datetime64[us]").tolist()
+
+        updated = 0
+        for start in range(0, len(ids), BATCH_SIZE):
+            params = [
+                {
+                    "id": ids[i],
+                    "session": str(sessions[i]),
+                    "et_date": et_dates[i],
+                    "effective_start": effective_starts[i],
+                }
+                for i in range(start, min(start + BATCH_SIZE, len(ids)))
+            ]
+            conn.execute(
+                text(
+                    "UPDATE announcements SET market_session = :session, et_date = :et_date, "
+                    "effective_start = :effective_start WHERE id = :id"
+                ),
+                params,
+            )
+            conn.commit()
+            updated += len(params)
+            print(f"  {updated:,}/{len(ids):,}")
+
+        print(f"\nDone! Updated {updated:,} announcements")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill precomputed announcement session fields")
+    parser.add_argument("--all", action="store_true", help="Recompute every row, not just missing ones")
+    args = parser.parse_args()
+    backfill_market_session(recompute_all=args.all)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark signal-to-submit latency with and without the order journal.
+
+Replays the entry sequence from StrategyEngine._execute_entry against the configured
+database: create_order -> (broker submit) -> update_broker_order_id -> record_event.
+"signal->submit" is the time spent before the broker call could go out; "total" includes
+the post-submit bookkeeping. The broker call itself is not made.
+
+Usage:
+    python scripts/benchmark_order_journal.py [--orders 200]
+
+Rows are written with ticker BENCH and deleted afterwards.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+sys.path.insert(0, '.')
+
+from src.database import OrderDB, OrderEventDB, SessionLocal, init_db
+from src.order_store import OrderStore
+
+BENCH_TICKER = "BENCH"
+
+
+def run(store: OrderStore, n: int) -> tuple:
+    to_submit, totals = [], []
+    for _ in range(n):
+        start = time.perf_counter()
+        order_id = store.create_order(
+            ticker=BENCH_TICKER,
+            side="buy",
+            order_type="limit",
+            requested_shares=100,
+            limit_price=1.0,
+            trade_id=str(uuid.uuid4()),
+        )
+        submitted = time.perf_counter()
+
+        broker_id = f"bench-{uuid.uuid4()}"
+        store.update_broker_order_id(order_id, broker_id)
+        store.record_event(
+            event_type="submitted",
+            event_timestamp=datetime.utcnow(),
+            order_id=order_id,
+            broker_order_id=broker_id,
+        )
+        done = time.perf_counter()
+
+        to_submit.append((submitted - start) * 1000)
+        totals.append((done - start) * 1000)
+    store.flush()
+    return to_submit, totals
+
+
+def summarize(label: str, samples: list) -> str:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return (
+        f"{label:<16} mean={statistics.mean(samples):7.3f}ms  "
+        f"p50={statistics.median(samples):7.3f}ms  p95={p95:7.3f}ms"
+    )
+
+
+def cleanup():
+    session = SessionLocal()
+    try:
+        ids = [r[0] for r in session.query(OrderDB.id).filter(OrderDB.ticker == BENCH_TICKER)]
+        if ids:
+            session.query(OrderEventDB).filter(OrderEventDB.order_id.in_(ids)).delete(synchronize_session=False)
+            session.query(OrderDB).filter(OrderDB.id.in_(ids)).delete(synchronize_session=False)
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order journal latency")
+    parser.add_argument("--orders", type=int, default=200, help="Orders per mode")
+    args = parser.parse_args()
+
+    init_db()
+    try:
+        results = {}
+        for mode, journal in (("direct", False), ("journal", True)):
+            store = OrderStore(journal=journal)
+            run(store, 5)  # warm up connections / id pool
+            results[mode] = run(store, args.orders)
+            store.close()
+
+        print(f"\n{args.orders} orders per mode\n")
+        for mode, (to_submit, totals) in results.items():
+            print(f"[{mode}]")
+            print("  " + summarize("signal->submit", to_submit))
+            print("  " + summarize("total", totals))
+
+        direct = statistics.median(results["direct"][0])
+        journal = statistics.median(results["journal"][0])
+        if journal > 0:
+            print(f"\nsignal->submit median speedup: {direct / journal:.1f}x")
+    finally:
+        cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,70 +1,57 @@
 #!/usr/bin/env python3
-"""Bulk refetch all PAVS announcements from Polygon."""
+"""Bulk refetch all PAVS announcements from Polygon.
+
+Queues replace-jobs in the backfill job table and runs them, so an interrupted run
+resumes where it stopped (see src/backfill_jobs.py).
+"""
 
 import sys
 sys.path.insert(0, '.')
 
-from datetime import datetime
+from src.backfill_jobs import BackfillRunner, get_backfill_job_store
+from src.database import AnnouncementDB
 from src.postgres_client import get_postgres_client
-from refetch_with_polygon import refetch_announcement_data
+
 
 def main():
     pg_client = get_postgres_client()
+    store = get_backfill_job_store()
 
     # Get all PAVS announcements from backfill source
     print("Finding all PAVS announcements...")
     db = pg_client._get_db()
     try:
-        from src.database import AnnouncementDB
-
-        announcements = db.query(AnnouncementDB).filter(
+        keys = db.query(AnnouncementDB.ticker, AnnouncementDB.timestamp).filter(
             AnnouncementDB.ticker == 'PAVS',
             AnnouncementDB.source == 'backfill'
         ).order_by(AnnouncementDB.timestamp).all()
+    finally:
+        db.close()
 
-        print(f"Found {len(announcements)} PAVS announcements")
-        print("=" * 80)
-
-        success_count = 0
-        skip_count = 0
-        fail_count = 0
-
-        for i, ann in enumerate(announcements, 1):
-            print(f"\n[{i}/{len(announcements)}] Processing {ann.ticker} at {ann.timestamp}")
-
-            # Skip if already has fetched status (optional - remove if you want to force refetch)
-            # if ann.ohlcv_status == 'fetched':
-            #     print("   ⏭️  Skipping - already fetched")
-            #     skip_count += 1
-            #     continue
-
-            try:
-                success = refetch_announcement_data(
-                    ticker=ann.ticker,
-                    timestamp_str=ann.timestamp.isoformat(),
-                    window_minutes=120
-                )
-
-                if success:
-                    success_count += 1
-                else:
-                    fail_count += 1
-
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
-                fail_count += 1
+    print(f"Found {len(keys)} PAVS announcements")
+    print("=" * 80)
 
-            print("-" * 80)
+    # Jobs that already finished are kept unless this is a fresh run; pass --requeue to redo them
+    requeue = "--requeue" in sys.argv[1:]
+    queued = store.enqueue([tuple(k) for k in keys], backend="polygon", replace=True, requeue=requeue)
+    print(f"Queued {queued} jobs")
 
-        print("\n" + "=" * 80)
-        print(f"SUMMARY:")
-        print(f"  Total:   {len(announcements)}")
-        print(f"  Success: {success_count}")
-        print(f"  Skipped: {skip_count}")
-        print(f"  Failed:  {fail_count}")
+    try:
+        finished = BackfillRunner(store).run()
+    except KeyboardInterrupt:
+        print("\nInterrupted; run again to resume.")
+        sys.exit(130)
+
+    states = store.get_states([tuple(k) for k in keys])
+    print("\n" + "=" * 80)
+    print(f"SUMMARY:")
+    print(f"  Total:   {len(keys)}")
+    print(f"  Success: {sum(1 for s in states.values() if s == 'done')}")
+    print(f"  No data: {sum(1 for s in states.values() if s == 'no_data')}")
+    print(f"  Failed:  {sum(1 for s in states.values() if s == 'failed')}")
+    print(f"  Pending: {sum(1 for s in states.values() if s in ('pending', 'running'))}")
+    print(f"  This run: {finished}")
 
-    finally:
-        db.close()
 
 if __name__ == "__main__":
     main()
@@ -3,11 +3,13 @@
 Export Postgres data to Parquet files for fast DuckDB queries.
 
 Usage:
-    python scripts/export_to_parquet.py [--force]
+    python scripts/export_to_parquet.py [--force] [--legacy-layout]
 
 This exports:
     - announcements → data/parquet/announcements.parquet
-    - ohlcv_bars → data/parquet/ohlcv_1min/ (partitioned by month)
+    - ohlcv_bars → data/parquet/ohlcv_partitioned/month=YYYY-MM/bucket=NN.parquet
+      (partitioned by announcement month and ticker hash bucket, sorted for row-group pruning)
+    - ohlcv_bars → data/parquet/ohlcv_1min/ (legacy, one file per month; --legacy-layout)
 """
 
 import argparse
@@ -26,6 +28,14 @@ from sqlalchemy import create_engine, text
 
 from dotenv import load_dotenv
 
+from src.models import classify_market_sessions
+from src.duckdb_client import (
+    OHLCV_PARTITION_BUCKETS,
+    OHLCV_PARTITION_DIRNAME,
+    OHLCV_PARTITION_ROW_GROUP_SIZE,
+    ohlcv_partition_bucket,
+)
+
 load_dotenv()
 
 PARQUET_DIR = Path(__file__).parent.parent / "data" / "parquet"
@@ -51,6 +61,18 @@ def export_announcements(engine, force: bool = False):
     df = pd.read_sql("SELECT * FROM announcements", engine)
     print(f"  Loaded {len(df):,} rows")
 
+    # Fill precomputed session/ET date for rows saved before those columns existed
+    if not df.empty:
+        sessions, et_dates = classify_market_sessions(df["timestamp"])
+        if "market_session" in df.columns:
+            df["market_session"] = df["market_session"].fillna(pd.Series(sessions, index=df.index))
+        else:
+            df["market_session"] = sessions
+        if "et_date" in df.columns:
+            df["et_date"] = df["et_date"].fillna(pd.Series(et_dates, index=df.index))
+        else:
+            df["et_date"] = et_dates
+
     # Ensure output directory exists
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -60,16 +82,13 @@ def export_announcements(engine, force: bool = False):
     print(f"  Wrote {output_path} ({size_mb:.1f} MB)")
 
 
-def export_ohlcv(engine, force: bool = False):
-    """Export OHLCV bars with full announcement linkage.
+def load_linked_ohlcv(engine) -> pd.DataFrame:
+    """Load OHLCV bars with full announcement linkage.
 
     For each announcement, links ALL bars in its time window (not just those
     originally linked). This enables fast direct lookups without fallback queries.
     Uses vectorized pandas operations for speed.
     """
-    output_dir = PARQUET_DIR / "ohlcv_1min"
-    output_dir.mkdir(parents=True, exist_ok=True)
-
     print("  Loading announcements for linkage...")
     ann_df = pd.read_sql(
         "SELECT ticker, timestamp FROM announcements WHERE source = 'backfill'",
@@ -110,12 +129,20 @@ def export_ohlcv(engine, force: bool = False):
     )
     linked_df = merged[time_mask].copy()
     print(f"    After time filter: {len(linked_df):,} linked records")
+    return linked_df
+
+
+def export_ohlcv(linked_df: pd.DataFrame, force: bool = False):
+    """Export linked OHLCV bars in the legacy layout (one file per bar month)."""
+    output_dir = PARQUET_DIR / "ohlcv_1min"
+    output_dir.mkdir(parents=True, exist_ok=True)
 
     if linked_df.empty:
         print("  No linked bars to export")
         return
 
     # Partition by month based on bar timestamp
+    linked_df = linked_df.copy()
     linked_df['month'] = linked_df['timestamp'].dt.to_period('M')
 
     total_rows = 0
@@ -138,9 +165,67 @@ def export_ohlcv(engine, force: bool = False):
     print(f"  Total: {total_rows:,} rows exported")
 
 
+def export_ohlcv_partitioned(linked_df: pd.DataFrame, force: bool = False):
+    """Export linked OHLCV bars partitioned by announcement month and ticker bucket.
+
+    Partition keys come from the announcement (not the bar) so DuckDBClient can map a
+    set of announcement keys straight to the files it needs. Each file is sorted by
+    (announcement_ticker, announcement_timestamp, timestamp) and written with small
+    row groups and min/max statistics, so key lookups only read matching row groups.
+    """
+    output_dir = PARQUET_DIR / OHLCV_PARTITION_DIRNAME
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if linked_df.empty:
+        print("  No linked bars to export")
+        return
+
+    linked_df = linked_df.copy()
+    linked_df['month'] = linked_df['announcement_timestamp'].dt.strftime('%Y-%m')
+    bucket_by_ticker = {
+        t: ohlcv_partition_bucket(t) for t in linked_df['announcement_ticker'].unique()
+    }
+    linked_df['bucket'] = linked_df['announcement_ticker'].map(bucket_by_ticker)
+
+    total_rows = 0
+    total_files = 0
+    for (month_str, bucket), part_df in linked_df.groupby(['month', 'bucket']):
+        month_dir = output_dir / f"month={month_str}"
+        output_path = month_dir / f"bucket={int(bucket):02d}.parquet"
+
+        if output_path.exists() and not force:
+            continue
+
+        month_dir.mkdir(parents=True, exist_ok=True)
+        export_df = (
+            part_df.drop(columns=['month', 'bucket'])
+            .sort_values(['announcement_ticker', 'announcement_timestamp', 'timestamp'])
+        )
+        table = pa.Table.from_pandas(export_df, preserve_index=False)
+        pq.write_table(
+            table,
+            output_path,
+            compression="snappy",
+            row_group_size=OHLCV_PARTITION_ROW_GROUP_SIZE,
+            write_statistics=True,
+        )
+        total_rows += len(export_df)
+        total_files += 1
+
+    print(
+        f"  Total: {total_rows:,} rows in {total_files:,} files "
+        f"({OHLCV_PARTITION_BUCKETS} buckets per month)"
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="Export Postgres data to Parquet")
     parser.add_argument("--force", action="store_true", help="Overwrite existing files")
+    parser.add_argument(
+        "--legacy-layout",
+        action="store_true",
+        help="Also write the legacy ohlcv_1min/<month>.parquet files",
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -152,8 +237,12 @@ def main():
     print("\n[1/2] Announcements")
     export_announcements(engine, force=args.force)
 
-    print("\n[2/2] OHLCV Bars (by month)")
-    export_ohlcv(engine, force=args.force)
+    print("\n[2/2] OHLCV Bars (by month and ticker bucket)")
+    linked_df = load_linked_ohlcv(engine)
+    export_ohlcv_partitioned(linked_df, force=args.force)
+    if args.legacy_layout:
+        print("  Legacy layout (by month)")
+        export_ohlcv(linked_df, force=args.force)
 
     print("\n" + "=" * 60)
     print("Export complete!")
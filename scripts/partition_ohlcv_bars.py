@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Manage monthly range partitions of ohlcv_bars.
+
+Usage:
+    python scripts/partition_ohlcv_bars.py migrate              # heap -> partitioned (one-time)
+    python scripts/partition_ohlcv_bars.py ensure [--months 3]  # create upcoming partitions
+    python scripts/partition_ohlcv_bars.py detach --before 2025-01 [--drop]
+
+migrate copies the existing table month by month into a partitioned table (BRIN on
+timestamp, local B-trees on (ticker, timestamp) and the announcement key) and swaps
+names; the old heap is kept as ohlcv_bars_legacy until you drop it.
+Detached partitions remain as standalone tables (ohlcv_bars_yYYYYmMM) for archiving.
+"""
+
+import argparse
+import sys
+from datetime import date, datetime
+sys.path.insert(0, '.')
+
+from src.database import (
+    add_months,
+    detach_ohlcv_partitions,
+    engine,
+    ensure_ohlcv_partitions,
+    init_db,
+    is_ohlcv_partitioned,
+    migrate_ohlcv_bars_to_partitions,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage ohlcv_bars partitions")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("migrate", help="Convert ohlcv_bars to monthly partitions")
+
+    ensure_p = sub.add_parser("ensure", help="Create partitions for upcoming months")
+    ensure_p.add_argument("--months", type=int, default=3, help="Months ahead to create")
+
+    detach_p = sub.add_parser("detach", help="Detach partitions older than a month")
+    detach_p.add_argument("--before", required=True, help="YYYY-MM; partitions ending on/before this month start")
+    detach_p.add_argument("--drop", action="store_true", help="Drop detached partitions")
+
+    args = parser.parse_args()
+    init_db()
+
+    if args.command == "migrate":
+        print("Migrating ohlcv_bars to monthly partitions (this copies every row)...")
+        if migrate_ohlcv_bars_to_partitions():
+            print("Done. Old table kept as ohlcv_bars_legacy - drop it once verified.")
+        else:
+            print("ohlcv_bars is already partitioned")
+
+    elif args.command == "ensure":
+        with engine.connect() as conn:
+            if not is_ohlcv_partitioned(conn):
+                print("ohlcv_bars is not partitioned - run 'migrate' first")
+                return
+            today = date.today()
+            created = ensure_ohlcv_partitions(conn, today, add_months(today, args.months))
+        print(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+
+    elif args.command == "detach":
+        before = datetime.strptime(args.before, "%Y-%m").date()
+        affected = detach_ohlcv_partitions(before, drop=args.drop)
+        action = "Dropped" if args.drop else "Detached"
+        print(f"{action} {len(affected)} partitions: {', '.join(affected) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,26 @@
 #!/usr/bin/env python3
 """Refetch OHLCV data for specific announcements using Polygon.
 
+Queues a backfill job (backend=polygon, replace) at top priority and runs only that
+job, so the refetch goes through the same path as any other backfill: the shared token
+bucket, replacement of the announcement's stored bars, and its ohlcv_status update. If
+the fetch fails, the job stays queued and `scripts/run_backfill_jobs.py run` retries it.
+
 Usage:
     python scripts/refetch_with_polygon.py PAVS "2025-12-12 16:31:23.148"
-    python scripts/refetch_with_polygon.py TICKER "YYYY-MM-DD HH:MM:SS.mmm"
+    python scripts/refetch_with_polygon.py TICKER "YYYY-MM-DD HH:MM:SS.mmm" [WINDOW_MINUTES]
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 sys.path.insert(0, '.')
 
-from src.massive_client import MassiveClient
+from src.backfill_jobs import BackfillRunner, get_backfill_job_store
+from src.database import init_db
 from src.postgres_client import get_postgres_client
-from src.data_providers import PolygonProvider
+
+REFETCH_PRIORITY = 1000
+
 
 def refetch_announcement_data(ticker: str, timestamp_str: str, window_minutes: int = 120):
     """
@@ -23,100 +31,27 @@ def refetch_announcement_data(ticker: str, timestamp_str: str, window_minutes: i
         timestamp_str: Announcement timestamp in ISO format
         window_minutes: Minutes of data to fetch after announcement
     """
-    # Parse timestamp
     timestamp = datetime.fromisoformat(timestamp_str)
+    key = (ticker, timestamp)
     print(f"Refetching OHLCV data for {ticker} at {timestamp} using Polygon...")
     print("=" * 80)
 
-    # Initialize clients
-    pg_client = get_postgres_client()
-    polygon_provider = PolygonProvider()
-    massive_client = MassiveClient(provider=polygon_provider)
+    init_db()
+    store = get_backfill_job_store()
+    store.enqueue([key], priority=REFETCH_PRIORITY, backend="polygon", replace=True, requeue=True)
 
-    # Fetch data from Polygon
-    print(f"\n1. Fetching data from Polygon...")
     print(f"   Window: 5 min before → {window_minutes} min after announcement")
+    BackfillRunner(store, workers=1, batch_size=1, window_minutes=window_minutes).run(keys=[key])
 
-    bars = massive_client.fetch_after_announcement(
-        ticker=ticker,
-        announcement_time=timestamp,
-        window_minutes=window_minutes,
-        pre_window_minutes=5,
-    )
-
-    if not bars:
-        print("   ❌ No data returned from Polygon!")
-        return False
-
-    print(f"   ✓ Fetched {len(bars)} bars from Polygon")
-    print(f"   Time range: {bars[0].timestamp} → {bars[-1].timestamp}")
-
-    # Show sample of data
-    print(f"\n2. Sample of Polygon data:")
-    print(f"   {'Time':<20} {'Open':<12} {'Close':<12} {'Volume':<12}")
-    print("   " + "-" * 56)
-    for bar in bars[:5]:
-        print(f"   {bar.timestamp.strftime('%Y-%m-%d %H:%M'):<20} "
-              f"${bar.open:>10.4f} ${bar.close:>10.4f} {bar.volume:>10,}")
-    if len(bars) > 5:
-        print(f"   ... ({len(bars) - 5} more bars)")
-
-    # Delete existing data
-    print(f"\n3. Deleting existing OHLCV data for this announcement...")
-    db = pg_client._get_db()
-    try:
-        from src.database import OHLCVBarDB
-
-        deleted = db.query(OHLCVBarDB).filter(
-            OHLCVBarDB.announcement_ticker == ticker,
-            OHLCVBarDB.announcement_timestamp == timestamp
-        ).delete()
-
-        db.commit()
-        print(f"   ✓ Deleted {deleted} existing bars")
-    except Exception as e:
-        db.rollback()
-        print(f"   ❌ Error deleting: {e}")
-        return False
-    finally:
-        db.close()
-
-    # Save new data
-    print(f"\n4. Saving Polygon data to database...")
-    try:
-        saved = pg_client.save_ohlcv_bars(
-            ticker=ticker,
-            bars=bars,
-            announcement_ticker=ticker,
-            announcement_timestamp=timestamp
-        )
-        print(f"   ✓ Saved {saved} bars")
-    except Exception as e:
-        print(f"   ❌ Error saving: {e}")
+    state = store.get_states([key]).get(key)
+    if state != "done":
+        print(f"   ❌ No data saved from Polygon (job state: {state})")
         return False
 
-    # Update announcement status
-    print(f"\n5. Updating announcement status...")
-    try:
-        db = pg_client._get_db()
-        from src.database import AnnouncementDB
-
-        ann = db.query(AnnouncementDB).filter(
-            AnnouncementDB.ticker == ticker,
-            AnnouncementDB.timestamp == timestamp
-        ).first()
-
-        if ann:
-            ann.ohlcv_status = 'fetched'
-            db.commit()
-            print(f"   ✓ Updated announcement status to 'fetched'")
-        else:
-            print(f"   ⚠️  Announcement not found in database")
-    except Exception as e:
-        db.rollback()
-        print(f"   ❌ Error updating status: {e}")
-    finally:
-        db.close()
+    bars = get_postgres_client().get_ohlcv_bars_bulk([key]).get(key, [])
+    print(f"   ✓ Saved {len(bars)} bars from Polygon")
+    if bars:
+        print(f"   Time range: {bars[0].timestamp} → {bars[-1].timestamp}")
 
     print("\n" + "=" * 80)
     print("✓ SUCCESS: OHLCV data refetched from Polygon")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Queue and run resumable OHLCV backfill jobs.
+
+Usage:
+    python scripts/run_backfill_jobs.py enqueue --missing
+    python scripts/run_backfill_jobs.py enqueue --ticker PAVS --backend polygon --replace --requeue
+    python scripts/run_backfill_jobs.py run [--workers 2] [--batch-size 50] [--wait-for-retries]
+    python scripts/run_backfill_jobs.py status
+
+`run` can be interrupted at any time; running it again picks up where it stopped.
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date, datetime
+sys.path.insert(0, '.')
+
+from sqlalchemy import and_, or_
+from src.backfill_jobs import BackfillRunner, get_backfill_job_store
+from src.database import AnnouncementDB, SessionLocal, init_db
+
+
+def select_announcements(missing: bool, ticker: str = None, source: str = None, since: datetime = None):
+    """(ticker, timestamp) of announcements matching the filters whose window has passed."""
+    db = SessionLocal()
+    try:
+        query = db.query(AnnouncementDB.ticker, AnnouncementDB.timestamp)
+        if missing:
+            query = query.filter(AnnouncementDB.ohlcv_status.in_(("pending", "error")))
+        if ticker:
+            query = query.filter(AnnouncementDB.ticker == ticker.upper())
+        if source:
+            query = query.filter(AnnouncementDB.source == source)
+        if since:
+            query = query.filter(AnnouncementDB.timestamp >= since)
+        # Trading window must be over (same rule as PostgresClient.fetch_after_announcements)
+        today = datetime.combine(date.today(), datetime.min.time())
+        query = query.filter(or_(
+            AnnouncementDB.effective_start < today,
+            and_(AnnouncementDB.effective_start.is_(None), AnnouncementDB.timestamp < today),
+        ))
+        return [(t, ts) for t, ts in query.all()]
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable OHLCV backfill jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = sub.add_parser("enqueue", help="Queue announcements for backfill")
+    enqueue.add_argument("--missing", action="store_true", help="Announcements with ohlcv_status pending/error")
+    enqueue.add_argument("--ticker", help="Only this ticker")
+    enqueue.add_argument("--source", help="Only this announcement source (e.g. backfill)")
+    enqueue.add_argument("--since", type=datetime.fromisoformat, help="Only announcements at/after (UTC)")
+    enqueue.add_argument("--backend", help="Fetch from this provider instead of DATA_BACKEND")
+    enqueue.add_argument("--replace", action="store_true", help="Replace the announcement's stored bars")
+    enqueue.add_argument("--priority", type=int, default=0, help="Higher runs first")
+    enqueue.add_argument("--requeue", action="store_true", help="Reset jobs that already finished")
+
+    run = sub.add_parser("run", help="Process queued jobs")
+    run.add_argument("--workers", type=int, default=None)
+    run.add_argument("--batch-size", type=int, default=None)
+    run.add_argument("--max-jobs", type=int, default=None)
+    run.add_argument("--wait-for-retries", action="store_true", help="Stay up until deferred retries are done")
+
+    sub.add_parser("status", help="Show job counts per state")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    init_db()
+    store = get_backfill_job_store()
+
+    if args.command == "enqueue":
+        if not (args.missing or args.ticker or args.source or args.since):
+            parser.error("enqueue needs at least one of --missing, --ticker, --source, --since")
+        keys = select_announcements(args.missing, args.ticker, args.source, args.since)
+        added = store.enqueue(keys, priority=args.priority, backend=args.backend,
+                              replace=args.replace, requeue=args.requeue)
+        print(f"Matched {len(keys):,} announcements, queued {added:,} jobs")
+
+    elif args.command == "run":
+        runner_kwargs = {}
+        if args.workers:
+            runner_kwargs["workers"] = args.workers
+        if args.batch_size:
+            runner_kwargs["batch_size"] = args.batch_size
+        runner = BackfillRunner(store, **runner_kwargs)
+        try:
+            finished = runner.run(max_jobs=args.max_jobs, wait_for_retries=args.wait_for_retries)
+        except KeyboardInterrupt:
+            print("\nInterrupted; run again to resume.")
+            sys.exit(130)
+        print(f"Finished: {finished}")
+
+    print(" ".join(f"{state}={count:,}" for state, count in store.progress().items()))
+
+
+if __name__ == "__main__":
+    main()
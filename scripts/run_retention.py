@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Roll up old live bars and archive old traces (see src/retention.py).
+
+Usage:
+    python scripts/run_retention.py                 # defaults from env (7d bars, 30d traces)
+    python scripts/run_retention.py --dry-run
+    python scripts/run_retention.py --live-bar-days 3 --trace-days 14
+
+Safe to interrupt and re-run. Intended to run nightly, e.g. from cron:
+    15 4 * * * cd /path/to/repo && python scripts/run_retention.py
+"""
+
+import argparse
+import logging
+import sys
+sys.path.insert(0, '.')
+
+from src.database import init_db
+from src.retention import LIVE_BAR_RETENTION_DAYS, TRACE_RETENTION_DAYS, run_retention
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live bar rollup and trace archiving")
+    parser.add_argument("--live-bar-days", type=int, default=LIVE_BAR_RETENTION_DAYS,
+                        help="Keep 1-second live bars this many days")
+    parser.add_argument("--trace-days", type=int, default=TRACE_RETENTION_DAYS,
+                        help="Keep traces in Postgres this many days")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be done")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    init_db()
+
+    result = run_retention(args.live_bar_days, args.trace_days, dry_run=args.dry_run)
+    verb = "Would process" if args.dry_run else "Processed"
+    print(f"{verb}: {result['live_bars_rolled']:,} live bars, {result['traces_archived']:,} traces")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Run the local stand-in for Polygon, Alpaca and InsightSentry (src/market_data_standin.py).
+
+Usage:
+    python scripts/run_standin_server.py [--port 8765] [--latency-ms 150 --jitter-ms 100]
+    python scripts/run_standin_server.py --error-rate 0.02 --polygon-rate-limit 5 --alpaca-rate-limit 200
+
+Then run the benchmark / soak test with the printed environment, e.g.
+    MASSIVE_BASE_URL=http://127.0.0.1:8765 OHLCV_RESPONSE_CACHE=0 python scripts/run_backfill_jobs.py run
+"""
+
+import argparse
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp import web
+
+from src.duckdb_client import PARQUET_DIR, DuckDBClient
+from src.market_data_standin import PROVIDERS, FaultProfile, HistoryBars, StandinServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in market data server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--parquet-dir", type=Path, default=PARQUET_DIR, help="History exported by export_to_parquet.py")
+    parser.add_argument("--no-synthetic", action="store_true", help="Return no bars where there is no history")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request / frame")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra latency, 0..N ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 5xx")
+    parser.add_argument("--rate-window", type=float, default=60.0, help="Rate limit window (seconds)")
+    for name in PROVIDERS:
+        parser.add_argument(f"--{name}-rate-limit", type=int, default=0,
+                            help=f"{name} requests per window before 429 (0 = unlimited)")
+    parser.add_argument("--tick-interval", type=float, default=1.0,
+                        help="WebSocket frame interval; each tick replays one minute of history")
+    parser.add_argument("--max-symbols", type=int, default=10, help="WebSocket subscription limit")
+    parser.add_argument("--replay-date", type=date.fromisoformat, help="Session replayed on the WebSocket")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    duckdb_client = DuckDBClient(args.parquet_dir) if args.parquet_dir.exists() else None
+    if duckdb_client is None:
+        print(f"No Parquet history at {args.parquet_dir}; serving synthetic bars only")
+    profiles = {
+        name: FaultProfile(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rate_limit=getattr(args, f"{name}_rate_limit"),
+            rate_window_s=args.rate_window,
+        )
+        for name in PROVIDERS
+    }
+    server = StandinServer(
+        history=HistoryBars(duckdb_client, synthetic=not args.no_synthetic),
+        profiles=profiles,
+        tick_interval_s=args.tick_interval,
+        max_symbols=args.max_symbols,
+        replay_date=args.replay_date,
+    )
+
+    base_url = f"http://{args.host}:{args.port}"
+    print("Point the clients at the stand-in with (API keys can be any non-empty value):")
+    print(f"  export MASSIVE_BASE_URL={base_url}")
+    print(f"  export ALPACA_DATA_URL={base_url}")
+    print(f"  export INSIGHT_SENTRY_API_URL={base_url}")
+    print(f"  export INSIGHT_SENTRY_WS_URL=ws://{args.host}:{args.port}/live")
+    print("  export OHLCV_RESPONSE_CACHE=0   # so repeat runs reach the stand-in instead of the disk cache")
+    print(f"Counters: {base_url}/standin/stats")
+
+    web.run_app(server.make_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,56 @@
 """Store for persisting active trades to database."""
 
+import atexit
 import logging
+import os
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
-from .base_store import BaseStore
+from sqlalchemy import bindparam, func, update
+
+from .base_store import BaseStore, mark_trade_data_changed
 from .database import ActiveTradeDB
 
 logger = logging.getLogger(__name__)
 
+# Write-behind for update_price(): price ticks are coalesced in memory and flushed in one
+# batched UPDATE every ACTIVE_TRADE_FLUSH_INTERVAL seconds. Set ACTIVE_TRADE_WRITE_BEHIND=0
+# to write every tick synchronously.
+ACTIVE_TRADE_WRITE_BEHIND = os.getenv("ACTIVE_TRADE_WRITE_BEHIND", "1") == "1"
+ACTIVE_TRADE_FLUSH_INTERVAL = float(os.getenv("ACTIVE_TRADE_FLUSH_INTERVAL", "1.5"))
+
+
+@dataclass
+class _PendingPrice:
+    """Latest unflushed price state for one trade."""
+    last_price: float
+    highest_since_entry: float
+    last_quote_time: datetime
+
 
 class ActiveTradeStore(BaseStore):
-    """CRUD operations for active trades."""
+    """CRUD operations for active trades.
+
+    update_price() is write-behind by default: the latest price and high-water mark per
+    trade are kept in memory and written by a background thread. Reads, deletes and
+    flush() drain the buffer first, and the DB high-water mark only ever increases
+    (GREATEST), so recovery never sees a lower highest_since_entry than was observed.
+    """
+
+    def __init__(
+        self,
+        write_behind: bool = ACTIVE_TRADE_WRITE_BEHIND,
+        flush_interval: float = ACTIVE_TRADE_FLUSH_INTERVAL,
+    ):
+        self._write_behind = write_behind
+        self._flush_interval = flush_interval
+        self._pending: Dict[str, _PendingPrice] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
 
     def save_trade(
         self,
@@ -69,6 +108,7 @@ class ActiveTradeStore(BaseStore):
                     )
                     session.add(trade)
 
+            mark_trade_data_changed()
             logger.info(f"[{ticker}] Saved active trade to database (trade_id={trade_id[:8]})")
             return True
 
@@ -83,7 +123,23 @@ class ActiveTradeStore(BaseStore):
         highest_since_entry: float,
         last_quote_time: datetime,
     ) -> bool:
-        """Update price tracking for an active trade."""
+        """Update price tracking for an active trade.
+
+        With write-behind enabled this only records the values in memory (no DB work on
+        the quote path); they are persisted by the next flush.
+        """
+        if self._write_behind:
+            with self._pending_lock:
+                pending = self._pending.get(trade_id)
+                if pending is None:
+                    self._pending[trade_id] = _PendingPrice(last_price, highest_since_entry, last_quote_time)
+                else:
+                    pending.last_price = last_price
+                    pending.highest_since_entry = max(pending.highest_since_entry, highest_since_entry)
+                    pending.last_quote_time = last_quote_time
+            self._ensure_flusher()
+            return True
+
         try:
             with self._db_session() as session:
                 trade = session.query(ActiveTradeDB).filter(
@@ -102,8 +158,92 @@ class ActiveTradeStore(BaseStore):
             logger.error(f"Failed to update trade price: {e}")
             return False
 
+    def flush(self, trade_ids: Optional[Iterable[str]] = None) -> int:
+        """Write buffered price updates in one batched UPDATE.
+
+        Args:
+            trade_ids: Only flush these trades (e.g. right before an exit); None = all.
+
+        Returns:
+            Number of trades written. On failure the updates are put back in the buffer.
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                if trade_ids is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {
+                        tid: self._pending.pop(tid) for tid in list(trade_ids) if tid in self._pending
+                    }
+            if not batch:
+                return 0
+
+            params = [
+                {
+                    "b_trade_id": tid,
+                    "b_last_price": p.last_price,
+                    "b_highest": p.highest_since_entry,
+                    "b_quote_time": p.last_quote_time,
+                    "b_updated_at": datetime.utcnow(),
+                }
+                for tid, p in batch.items()
+            ]
+            stmt = (
+                update(ActiveTradeDB)
+                .where(ActiveTradeDB.trade_id == bindparam("b_trade_id"))
+                .values(
+                    last_price=bindparam("b_last_price"),
+                    highest_since_entry=func.greatest(
+                        ActiveTradeDB.highest_since_entry, bindparam("b_highest")
+                    ),
+                    last_quote_time=bindparam("b_quote_time"),
+                    updated_at=bindparam("b_updated_at"),
+                )
+            )
+            try:
+                with self._db_session() as session:
+                    session.connection().execute(stmt, params)
+                return len(params)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} trade price updates: {e}")
+                # Put back anything not superseded by newer ticks (keep the higher high-water mark)
+                with self._pending_lock:
+                    for tid, p in batch.items():
+                        newer = self._pending.get(tid)
+                        if newer is None:
+                            self._pending[tid] = p
+                        else:
+                            newer.highest_since_entry = max(newer.highest_since_entry, p.highest_since_entry)
+                return 0
+
+    def close(self) -> None:
+        """Stop the background flusher and write any buffered updates."""
+        self._stop_event.set()
+        flusher = self._flusher
+        if flusher and flusher.is_alive() and flusher is not threading.current_thread():
+            flusher.join(timeout=self._flush_interval * 2)
+        self.flush()
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        self._stop_event.clear()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, daemon=True, name="ActiveTradeFlusher"
+        )
+        self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop_event.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Active trade flusher error: {e}")
+
     def delete_trade(self, trade_id: str) -> bool:
         """Delete an active trade by trade_id (when position is closed)."""
+        with self._pending_lock:
+            self._pending.pop(trade_id, None)
         try:
             with self._db_session() as session:
                 trade = session.query(ActiveTradeDB).filter(
@@ -114,8 +254,10 @@ class ActiveTradeStore(BaseStore):
                     ticker = trade.ticker
                     session.delete(trade)
                     logger.info(f"[{ticker}] Deleted active trade from database (trade_id={trade_id[:8]})")
-                    return True
-                return False
+                else:
+                    return False
+            mark_trade_data_changed()
+            return True
 
         except Exception as e:
             logger.error(f"Failed to delete active trade: {e}")
@@ -123,6 +265,7 @@ class ActiveTradeStore(BaseStore):
 
     def get_trade(self, trade_id: str) -> Optional[ActiveTradeDB]:
         """Get a specific active trade by trade_id."""
+        self.flush([trade_id])
         with self._db_session() as session:
             trade = session.query(ActiveTradeDB).filter(
                 ActiveTradeDB.trade_id == trade_id,
@@ -133,6 +276,7 @@ class ActiveTradeStore(BaseStore):
 
     def get_trades_for_strategy(self, strategy_id: str) -> List[ActiveTradeDB]:
         """Get all active trades for a strategy."""
+        self.flush()
         with self._db_session() as session:
             trades = session.query(ActiveTradeDB).filter(
                 ActiveTradeDB.strategy_id == strategy_id
@@ -144,6 +288,7 @@ class ActiveTradeStore(BaseStore):
 
     def get_all_trades(self) -> List[ActiveTradeDB]:
         """Get all active trades."""
+        self.flush()
         with self._db_session() as session:
             trades = session.query(ActiveTradeDB).all()
             for t in trades:
@@ -152,11 +297,14 @@ class ActiveTradeStore(BaseStore):
 
     def clear_strategy_trades(self, strategy_id: str) -> int:
         """Delete all active trades for a strategy."""
+        self.flush()
         try:
             with self._db_session() as session:
                 count = session.query(ActiveTradeDB).filter(
                     ActiveTradeDB.strategy_id == strategy_id
                 ).delete()
+            if count:
+                mark_trade_data_changed()
             logger.info(f"Cleared {count} active trades for strategy {strategy_id}")
             return count
         except Exception as e:
@@ -173,4 +321,6 @@ def get_active_trade_store() -> ActiveTradeStore:
     global _active_trade_store
     if _active_trade_store is None:
         _active_trade_store = ActiveTradeStore()
+        # Last-chance flush of buffered prices on interpreter exit
+        atexit.register(_active_trade_store.close)
     return _active_trade_store
@@ -0,0 +1,137 @@
+"""Ordered, non-blocking database writes for the live trading loop.
+
+StrategyEngine runs its quote and fill handlers synchronously on the TradingEngine
+asyncio loop. Writes submitted here become tasks on that loop using the stores' async
+(asyncpg) methods, so a slow query delays only its own write, not quote processing.
+
+Writes sharing a key (the trade_id) run strictly in submission order; writes for
+different keys run concurrently, capped at the async pool size. When no loop is
+running in the calling thread (tests, scripts, Streamlit) the sync method is called
+directly, so callers don't need to care where they run.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from . import database
+
+logger = logging.getLogger(__name__)
+
+# LIVE_DB_ASYNC=0 keeps every write synchronous on the caller's thread.
+LIVE_DB_ASYNC = os.getenv("LIVE_DB_ASYNC", "1") == "1"
+
+
+class AsyncDBWriter:
+    """Schedules store writes as ordered tasks on the running event loop."""
+
+    def __init__(self, max_concurrency: Optional[int] = None, enabled: bool = LIVE_DB_ASYNC):
+        self._enabled = enabled
+        self._max_concurrency = max_concurrency or (
+            database.ASYNC_DB_POOL_SIZE + database.ASYNC_DB_MAX_OVERFLOW
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tails: Dict[str, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        # Set once the async engine turns out to be unusable (e.g. asyncpg missing)
+        self._async_unavailable = False
+
+    def submit(
+        self,
+        key: str,
+        async_fn: Callable[[], Awaitable[Any]],
+        sync_fn: Callable[[], Any],
+    ) -> None:
+        """Run a write without blocking the event loop.
+
+        Args:
+            key: Ordering key; writes with the same key are applied in submission order.
+            async_fn: Zero-arg callable returning the store's async write coroutine.
+            sync_fn: Zero-arg callable doing the same write synchronously.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or not self._enabled:
+            sync_fn()
+            return
+
+        if self._loop is not loop:
+            # New loop (engine restarted): asyncio primitives can't be shared across loops
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            self._tails.clear()
+            self._tasks.clear()
+
+        previous = self._tails.get(key)
+        task = loop.create_task(self._run(key, previous, async_fn, sync_fn))
+        self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t, k=key: self._on_done(k, t))
+
+    def pending(self) -> int:
+        """Number of writes not yet finished."""
+        return len(self._tasks)
+
+    async def drain(self, timeout: float = 10.0) -> None:
+        """Wait for in-flight writes (call before the loop shuts down)."""
+        if not self._tasks:
+            return
+        done, not_done = await asyncio.wait(list(self._tasks), timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} async DB writes still pending at shutdown")
+
+    async def _run(
+        self,
+        key: str,
+        previous: Optional[asyncio.Task],
+        async_fn: Callable[[], Awaitable[Any]],
+        sync_fn: Callable[[], Any],
+    ) -> None:
+        if previous is not None and not previous.done():
+            # Keep per-key order; the previous write's outcome doesn't matter here
+            await asyncio.wait([previous])
+
+        async with self._semaphore:
+            if self._async_available():
+                try:
+                    await async_fn()
+                except Exception as e:
+                    logger.error(f"Async DB write failed for {key}: {e}")
+                return
+
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, sync_fn)
+            except Exception as e:
+                logger.error(f"DB write failed for {key}: {e}")
+
+    def _async_available(self) -> bool:
+        if self._async_unavailable:
+            return False
+        try:
+            database.get_async_sessionmaker()
+            return True
+        except ImportError as e:
+            logger.warning(f"Async DB engine unavailable ({e}); running writes in the thread pool")
+            self._async_unavailable = True
+            return False
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+
+# Global instance
+_async_db_writer: Optional[AsyncDBWriter] = None
+
+
+def get_async_db_writer() -> AsyncDBWriter:
+    """Get the global async DB writer."""
+    global _async_db_writer
+    if _async_db_writer is None:
+        _async_db_writer = AsyncDBWriter()
+    return _async_db_writer
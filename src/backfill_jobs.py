@@ -0,0 +1,392 @@
+"""Resumable OHLCV backfill jobs.
+
+Each announcement to backfill is a row in backfill_jobs with a state, attempt count,
+next retry time and priority. BackfillRunner workers claim batches with FOR UPDATE
+SKIP LOCKED (most important, then most recent announcements first) and fetch them via
+PostgresClient.fetch_after_announcements, so every worker shares the provider's async
+fetcher and token bucket. With several workers a new batch is always queued while
+another is being saved, which keeps the provider quota saturated.
+
+All progress lives in the table: a backfill can be stopped at any point (Ctrl-C, a
+crash, a deploy) and resumed by running again. Jobs left 'running' by a dead worker
+are released after BACKFILL_STALE_AFTER. Jobs whose trading window isn't over yet go
+back to pending until the session's data is available, without using an attempt.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .base_store import BaseStore
+from .database import BackfillJobDB
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_WORKERS = int(os.getenv("BACKFILL_WORKERS", "2"))
+BACKFILL_BATCH_SIZE = int(os.getenv("BACKFILL_BATCH_SIZE", "50"))
+BACKFILL_MAX_ATTEMPTS = int(os.getenv("BACKFILL_MAX_ATTEMPTS", "5"))
+BACKFILL_RETRY_BASE = timedelta(seconds=float(os.getenv("BACKFILL_RETRY_BASE_S", "60")))
+BACKFILL_RETRY_CAP = timedelta(hours=1)
+BACKFILL_STALE_AFTER = timedelta(minutes=15)
+
+JOB_STATES = ("pending", "running", "done", "no_data", "failed")
+
+
+@dataclass
+class BackfillJob:
+    """A claimed job."""
+    id: int
+    ticker: str
+    announcement_timestamp: datetime
+    backend: Optional[str]
+    replace: bool
+    attempts: int
+    max_attempts: int
+
+
+class BackfillJobStore(BaseStore):
+    """CRUD for the backfill_jobs table."""
+
+    def enqueue(
+        self,
+        keys: Sequence[Tuple[str, datetime]],
+        priority: int = 0,
+        backend: Optional[str] = None,
+        replace: bool = False,
+        requeue: bool = False,
+        max_attempts: int = BACKFILL_MAX_ATTEMPTS,
+    ) -> int:
+        """Add jobs for (ticker, announcement_timestamp) keys. Returns rows added or reset.
+
+        Existing jobs are left alone unless requeue is set, which resets finished ones
+        (running jobs are never touched).
+        """
+        now = datetime.utcnow()
+        values = [
+            {
+                "ticker": ticker,
+                "announcement_timestamp": ts,
+                "backend": backend,
+                "replace": replace,
+                "priority": priority,
+                "state": "pending",
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for ticker, ts in dict.fromkeys(tuple(k) for k in keys)
+        ]
+        count = 0
+        with self._db_session() as session:
+            for start_idx in range(0, len(values), 1000):
+                stmt = pg_insert(BackfillJobDB).values(values[start_idx:start_idx + 1000])
+                if requeue:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["ticker", "announcement_timestamp"],
+                        set_={
+                            "backend": stmt.excluded.backend,
+                            "replace": stmt.excluded.replace,
+                            "priority": stmt.excluded.priority,
+                            "max_attempts": stmt.excluded.max_attempts,
+                            "state": "pending",
+                            "attempts": 0,
+                            "next_attempt_at": None,
+                            "last_error": None,
+                            "updated_at": now,
+                        },
+                        where=BackfillJobDB.state != "running",
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=["ticker", "announcement_timestamp"])
+                count += max(session.execute(stmt).rowcount or 0, 0)
+        return count
+
+    def claim(
+        self,
+        worker_id: str,
+        limit: int,
+        keys: Optional[Sequence[Tuple[str, datetime]]] = None,
+    ) -> List[BackfillJob]:
+        """Mark up to `limit` due pending jobs as running by this worker and return them.
+
+        With `keys`, only jobs for those (ticker, announcement_timestamp) keys are claimed.
+        """
+        now = datetime.utcnow()
+        due = select(BackfillJobDB.id).where(
+            BackfillJobDB.state == "pending",
+            or_(BackfillJobDB.next_attempt_at.is_(None), BackfillJobDB.next_attempt_at <= now),
+        )
+        if keys is not None:
+            due = due.where(
+                tuple_(BackfillJobDB.ticker, BackfillJobDB.announcement_timestamp).in_([tuple(k) for k in keys])
+            )
+        due = (
+            due
+            .order_by(BackfillJobDB.priority.desc(), BackfillJobDB.announcement_timestamp.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BackfillJobDB)
+            .where(BackfillJobDB.id.in_(due))
+            .values(
+                state="running",
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=BackfillJobDB.attempts + 1,
+                updated_at=now,
+            )
+            .returning(
+                BackfillJobDB.id, BackfillJobDB.ticker, BackfillJobDB.announcement_timestamp,
+                BackfillJobDB.backend, BackfillJobDB.replace, BackfillJobDB.attempts,
+                BackfillJobDB.max_attempts,
+            )
+        )
+        with self._db_session() as session:
+            rows = session.execute(stmt).all()
+        jobs = [BackfillJob(*row) for row in rows]
+        jobs.sort(key=lambda j: j.announcement_timestamp, reverse=True)
+        return jobs
+
+    def finish(self, job: BackfillJob, bars: Optional[int], error: Optional[str] = None) -> str:
+        """Record a job's outcome: bar count, 0 for no data, or None for a failed fetch.
+
+        Failed jobs go back to pending with exponential backoff until max_attempts.
+        Returns the new state.
+        """
+        now = datetime.utcnow()
+        values = {"locked_by": None, "locked_at": None, "updated_at": now}
+        if bars is None:
+            if job.attempts >= job.max_attempts:
+                values["state"] = "failed"
+            else:
+                backoff = min(BACKFILL_RETRY_CAP, BACKFILL_RETRY_BASE * (2 ** (job.attempts - 1)))
+                values.update(state="pending", next_attempt_at=now + backoff)
+            values["last_error"] = error or "fetch failed"
+        else:
+            values.update(state="done" if bars else "no_data", bars=bars, last_error=None)
+
+        with self._db_session() as session:
+            session.execute(
+                update(BackfillJobDB)
+                .where(BackfillJobDB.id == job.id, BackfillJobDB.state == "running")
+                .values(**values)
+            )
+        return values["state"]
+
+    def defer(self, job: BackfillJob, until: datetime) -> str:
+        """Return a job that couldn't be fetched yet to pending, due at `until` (at the
+        earliest BACKFILL_RETRY_BASE from now). The claim doesn't count as an attempt.
+        """
+        now = datetime.utcnow()
+        with self._db_session() as session:
+            session.execute(
+                update(BackfillJobDB)
+                .where(BackfillJobDB.id == job.id, BackfillJobDB.state == "running")
+                .values(
+                    state="pending",
+                    attempts=BackfillJobDB.attempts - 1,
+                    next_attempt_at=max(until, now + BACKFILL_RETRY_BASE),
+                    locked_by=None,
+                    locked_at=None,
+                    updated_at=now,
+                )
+            )
+        return "pending"
+
+    def release_stale(self, older_than: timedelta = BACKFILL_STALE_AFTER) -> int:
+        """Return running jobs whose worker went away to pending. Returns jobs released."""
+        cutoff = datetime.utcnow() - older_than
+        with self._db_session() as session:
+            result = session.execute(
+                update(BackfillJobDB)
+                .where(BackfillJobDB.state == "running", BackfillJobDB.locked_at < cutoff)
+                .values(state="pending", locked_by=None, locked_at=None, updated_at=datetime.utcnow())
+            )
+            return max(result.rowcount or 0, 0)
+
+    def progress(self) -> Dict[str, int]:
+        """Job counts per state (every state present, zero if none)."""
+        counts = dict.fromkeys(JOB_STATES, 0)
+        with self._db_session() as session:
+            for state, count in session.query(BackfillJobDB.state, func.count()).group_by(BackfillJobDB.state):
+                counts[state] = count
+        return counts
+
+    def next_attempt_at(self) -> Optional[datetime]:
+        """When the earliest deferred pending job becomes due (None if nothing pending)."""
+        with self._db_session() as session:
+            return session.query(func.min(func.coalesce(BackfillJobDB.next_attempt_at, datetime.min))).filter(
+                BackfillJobDB.state == "pending"
+            ).scalar()
+
+    def keys_in_state(self, state: str) -> set:
+        """(ticker, announcement_timestamp) of every job in a state."""
+        with self._db_session() as session:
+            rows = session.query(BackfillJobDB.ticker, BackfillJobDB.announcement_timestamp).filter(
+                BackfillJobDB.state == state
+            ).all()
+            return {(ticker, ts) for ticker, ts in rows}
+
+    def get_states(self, keys: Sequence[Tuple[str, datetime]]) -> Dict[Tuple[str, datetime], str]:
+        """Current state per (ticker, announcement_timestamp) for the given keys."""
+        if not keys:
+            return {}
+        with self._db_session() as session:
+            rows = session.query(
+                BackfillJobDB.ticker, BackfillJobDB.announcement_timestamp, BackfillJobDB.state
+            ).filter(
+                tuple_(BackfillJobDB.ticker, BackfillJobDB.announcement_timestamp).in_(list(keys))
+            ).all()
+            return {(ticker, ts): state for ticker, ts, state in rows}
+
+
+class BackfillRunner:
+    """Pool of workers draining the job table through the shared async fetcher."""
+
+    def __init__(
+        self,
+        store: Optional[BackfillJobStore] = None,
+        workers: int = BACKFILL_WORKERS,
+        batch_size: int = BACKFILL_BATCH_SIZE,
+        window_minutes: int = 120,
+        pre_window_minutes: int = 5,
+    ):
+        self.store = store or get_backfill_job_store()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.window_minutes = window_minutes
+        self.pre_window_minutes = pre_window_minutes
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._finished: Dict[str, int] = {}
+
+    def stop(self) -> None:
+        """Ask workers to stop after their current batch."""
+        self._stop.set()
+
+    def run(self, max_jobs: Optional[int] = None, progress_interval: float = 10.0,
+            wait_for_retries: bool = False,
+            keys: Optional[Sequence[Tuple[str, datetime]]] = None) -> Dict[str, int]:
+        """Process due jobs until none are left (or max_jobs / stop()).
+
+        Args:
+            max_jobs: Stop after roughly this many jobs (whole batches)
+            progress_interval: Seconds between progress log lines
+            wait_for_retries: Keep running until deferred retries are due and done
+            keys: Only process the jobs for these (ticker, announcement_timestamp) keys
+
+        Returns:
+            Jobs finished by this run per resulting state
+        """
+        released = self.store.release_stale()
+        if released:
+            logger.info(f"Released {released} stale running jobs")
+
+        self._stop.clear()
+        self._finished = {}
+        worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        began = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="BackfillWorker") as pool:
+            futures = [
+                pool.submit(self._work, f"{worker_prefix}:{i}", max_jobs, wait_for_retries, keys)
+                for i in range(self.workers)
+            ]
+            try:
+                while not all(f.done() for f in futures):
+                    wait([f for f in futures if not f.done()], timeout=progress_interval,
+                         return_when=FIRST_COMPLETED)
+                    logger.info(self.format_progress(time.monotonic() - began))
+            except KeyboardInterrupt:
+                logger.info("Stopping after the current batches (progress is saved)...")
+                self.stop()
+                raise
+            finally:
+                for f in futures:
+                    if f.done() and f.exception() is not None:
+                        logger.error(f"Backfill worker failed: {f.exception()}")
+
+        logger.info(self.format_progress(time.monotonic() - began))
+        return dict(self._finished)
+
+    def format_progress(self, elapsed: float) -> str:
+        """One-line readout: table state counts plus this run's throughput."""
+        counts = self.store.progress()
+        with self._lock:
+            finished = sum(self._finished.values())
+        rate = finished / elapsed * 60 if elapsed > 0 else 0.0
+        remaining = counts["pending"] + counts["running"]
+        eta = f", ETA {remaining / rate:.0f} min" if rate > 0 and remaining else ""
+        states = " ".join(f"{state}={counts[state]}" for state in JOB_STATES)
+        return f"Backfill: {states} | this run {finished} jobs, {rate:.1f}/min{eta}"
+
+    def _work(self, worker_id: str, max_jobs: Optional[int], wait_for_retries: bool,
+              keys: Optional[Sequence[Tuple[str, datetime]]] = None) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if max_jobs is not None and sum(self._finished.values()) >= max_jobs:
+                    return
+            jobs = self.store.claim(worker_id, self.batch_size, keys)
+            if not jobs:
+                if not wait_for_retries:
+                    return
+                due = self.store.next_attempt_at()
+                if due is None:
+                    return
+                self._stop.wait(min(30.0, max(1.0, (due - datetime.utcnow()).total_seconds())))
+                continue
+            self._process(jobs)
+
+    def _process(self, jobs: List[BackfillJob]) -> None:
+        from .postgres_client import NOT_AVAILABLE_YET, PostgresClient, get_postgres_client
+
+        groups: Dict[Tuple[Optional[str], bool], List[BackfillJob]] = {}
+        for job in jobs:
+            groups.setdefault((job.backend, job.replace), []).append(job)
+
+        for (backend, replace), group in groups.items():
+            try:
+                results = get_postgres_client(backend).fetch_after_announcements(
+                    [(job.ticker, job.announcement_timestamp) for job in group],
+                    window_minutes=self.window_minutes,
+                    pre_window_minutes=self.pre_window_minutes,
+                    use_cache=not replace,
+                    replace=replace,
+                )
+                error = None
+            except Exception as e:
+                logger.error(f"Backfill batch failed: {e}", exc_info=True)
+                results, error = [None] * len(group), str(e)
+
+            for job, bars in zip(group, results):
+                if bars is NOT_AVAILABLE_YET:
+                    until = PostgresClient.announcement_available_at(job.announcement_timestamp)
+                    state = self.store.defer(job, until)
+                else:
+                    state = self.store.finish(job, None if bars is None else len(bars), error)
+                with self._lock:
+                    self._finished[state] = self._finished.get(state, 0) + 1
+
+
+# Global instance
+_backfill_job_store: Optional[BackfillJobStore] = None
+
+
+def get_backfill_job_store() -> BackfillJobStore:
+    """Get the global backfill job store instance."""
+    global _backfill_job_store
+    if _backfill_job_store is None:
+        _backfill_job_store = BackfillJobStore()
+    return _backfill_job_store
@@ -1,12 +1,29 @@
 """Base class for database stores with common session management."""
 
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Generator
 
 from sqlalchemy.orm import Session
 
+from . import database
 from .database import SessionLocal
 
+# Bumped by writes that change per-strategy trade counts (pending entries, active
+# trades, completed trades) so read-side caches in this process can drop stale results
+# before their TTL runs out.
+_trade_data_version = 0
+
+
+def mark_trade_data_changed() -> None:
+    """Invalidate caches derived from trade tables (see StrategyStore.get_dashboard_summary)."""
+    global _trade_data_version
+    _trade_data_version += 1
+
+
+def trade_data_version() -> int:
+    """Current trade data version (changes after every mark_trade_data_changed)."""
+    return _trade_data_version
+
 
 class BaseStore:
     """Base class providing common database session management.
@@ -18,6 +35,9 @@ class BaseStore:
             session.add(...)
 
     The session will be committed on normal exit and rolled back on exception.
+
+    Stores used on the live trading loop also expose async variants of their write
+    methods (a* prefix) built on _async_db_session, which uses the asyncpg engine.
     """
 
     @contextmanager
@@ -38,3 +58,16 @@ class BaseStore:
             raise
         finally:
             session.close()
+
+    @asynccontextmanager
+    async def _async_db_session(self) -> AsyncGenerator:
+        """Async counterpart of _db_session (AsyncSession on the asyncpg engine)."""
+        session = database.get_async_sessionmaker()()
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,233 @@
+"""Daily bar cache for premarket features.
+
+Premarket features used to cost up to nine minute-bar requests per announcement: a
+walk back day by day for the previous close, plus separate premarket and open fetches.
+DailyBarStore keeps one row per (ticker, NYSE session) filled by a single daily-bars
+request per ticker over a date range, so previous close and regular open become
+lookups. Premarket volume still needs minute bars; it is fetched once per ticker and
+session and cached in the same row.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .base_store import BaseStore
+from .database import DailyBarDB
+from .market_calendar import get_trading_calendar
+from .massive_client import _combine_et_to_utc
+from .models import MARKET_OPEN, PREMARKET_START, OHLCVBar, get_et_date
+
+logger = logging.getLogger(__name__)
+
+# Calendar days fetched before the first requested session so its previous close is
+# cached too (covers long weekends and holiday clusters).
+DAILY_BAR_LOOKBACK_DAYS = 10
+
+
+@dataclass
+class DailyBar:
+    """One cached session; prices are None when the provider had no bar."""
+    ticker: str
+    session_date: date
+    open: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    close: Optional[float] = None
+    volume: Optional[int] = None
+    premarket_volume: Optional[int] = None
+    premarket_dollar_volume: Optional[float] = None
+
+
+def _sum_dollar_volume(bars: List[OHLCVBar]) -> float:
+    total = 0.0
+    for b in bars:
+        px = b.vwap if b.vwap is not None else b.close
+        total += float(b.volume) * float(px)
+    return total
+
+
+class DailyBarStore(BaseStore):
+    """Daily bar cache backed by the daily_bars table."""
+
+    def get_bars(self, ticker: str, start_date: date, end_date: date) -> Dict[date, DailyBar]:
+        """Cached sessions for ticker in [start_date, end_date], keyed by session date."""
+        with self._db_session() as session:
+            rows = session.query(DailyBarDB).filter(
+                DailyBarDB.ticker == ticker,
+                DailyBarDB.session_date >= start_date,
+                DailyBarDB.session_date <= end_date,
+            ).all()
+            return {row.session_date: self._to_bar(row) for row in rows}
+
+    def get_prev_bar(self, ticker: str, session_date: date) -> Optional[DailyBar]:
+        """Most recent cached session with a close before session_date."""
+        with self._db_session() as session:
+            row = session.query(DailyBarDB).filter(
+                DailyBarDB.ticker == ticker,
+                DailyBarDB.session_date < session_date,
+                DailyBarDB.close.isnot(None),
+            ).order_by(DailyBarDB.session_date.desc()).first()
+            return self._to_bar(row) if row else None
+
+    def save_bars(self, bars: List[DailyBar]) -> int:
+        """Upsert session prices, keeping any cached premarket columns."""
+        if not bars:
+            return 0
+        values = [
+            {
+                "ticker": b.ticker,
+                "session_date": b.session_date,
+                "open": b.open,
+                "high": b.high,
+                "low": b.low,
+                "close": b.close,
+                "volume": b.volume,
+                "fetched_at": datetime.utcnow(),
+            }
+            for b in bars
+        ]
+        with self._db_session() as session:
+            for start_idx in range(0, len(values), 1000):
+                stmt = pg_insert(DailyBarDB).values(values[start_idx:start_idx + 1000])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["ticker", "session_date"],
+                    set_={
+                        "open": stmt.excluded.open,
+                        "high": stmt.excluded.high,
+                        "low": stmt.excluded.low,
+                        "close": stmt.excluded.close,
+                        "volume": stmt.excluded.volume,
+                        "fetched_at": stmt.excluded.fetched_at,
+                    },
+                )
+                session.execute(stmt)
+        return len(values)
+
+    def save_premarket(self, ticker: str, session_date: date, volume: int, dollar_volume: float) -> None:
+        """Store premarket totals for a session (creating the row if needed)."""
+        stmt = pg_insert(DailyBarDB).values(
+            ticker=ticker,
+            session_date=session_date,
+            premarket_volume=volume,
+            premarket_dollar_volume=dollar_volume,
+            fetched_at=datetime.utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ticker", "session_date"],
+            set_={
+                "premarket_volume": stmt.excluded.premarket_volume,
+                "premarket_dollar_volume": stmt.excluded.premarket_dollar_volume,
+                "fetched_at": func.coalesce(DailyBarDB.fetched_at, stmt.excluded.fetched_at),
+            },
+        )
+        with self._db_session() as session:
+            session.execute(stmt)
+
+    def ensure_daily_bars(self, client, ticker: str, start_date: date, end_date: date) -> bool:
+        """Fill the cache for every NYSE session in [start_date - lookback, end_date].
+
+        Makes at most one daily-bars request (spanning the missing sessions) and none
+        when everything is cached. The current session is always refreshed since its
+        bar isn't final. Returns False if the request failed.
+
+        Args:
+            client: A MassiveClient or an OHLCVDataProvider (fetch_ohlcv with a
+                timespan argument). Not a PostgresClient: its fetch_ohlcv has no
+                timespan and caches into the minute-bar table.
+        """
+        today = get_et_date(datetime.utcnow())
+        end_date = min(end_date, today)
+        sessions = get_trading_calendar().sessions_between(
+            start_date - timedelta(days=DAILY_BAR_LOOKBACK_DAYS), end_date,
+        )
+        if not sessions:
+            return True
+
+        cached = self.get_bars(ticker, sessions[0], sessions[-1])
+        missing = [d for d in sessions if d not in cached or d >= today]
+        if not missing:
+            return True
+
+        bars = client.fetch_ohlcv(
+            ticker,
+            _combine_et_to_utc(missing[0], time(0, 0)),
+            _combine_et_to_utc(missing[-1], time(23, 59)),
+            timespan="day",
+        )
+        if bars is None:
+            logger.warning(f"Daily bar fetch failed for {ticker} {missing[0]}..{missing[-1]}")
+            return False
+
+        by_date = {get_et_date(b.timestamp): b for b in bars}
+        rows = []
+        for d in missing:
+            bar = by_date.get(d)
+            if bar is None:
+                rows.append(DailyBar(ticker=ticker, session_date=d))
+                continue
+            rows.append(DailyBar(
+                ticker=ticker,
+                session_date=d,
+                open=float(bar.open),
+                high=float(bar.high),
+                low=float(bar.low),
+                close=float(bar.close),
+                volume=int(bar.volume),
+            ))
+        self.save_bars(rows)
+        logger.debug(f"Cached {len(by_date)} daily bars for {ticker} ({len(missing)} sessions requested)")
+        return True
+
+    def ensure_premarket(self, client, ticker: str, session_date: date) -> Optional[DailyBar]:
+        """Cached session with premarket totals, fetching 04:00-09:30 ET minute bars once.
+
+        Totals are only cached once the premarket is over. Returns None if the fetch failed.
+        """
+        bar = self.get_bars(ticker, session_date, session_date).get(session_date)
+        if bar is not None and bar.premarket_volume is not None:
+            return bar
+
+        pre_start = _combine_et_to_utc(session_date, PREMARKET_START)
+        pre_end = _combine_et_to_utc(session_date, MARKET_OPEN)
+        minute_bars = client.fetch_ohlcv(ticker, pre_start, pre_end, timespan="minute")
+        if minute_bars is None:
+            return None
+        minute_bars = [b for b in minute_bars if pre_start <= b.timestamp < pre_end]
+
+        bar = bar or DailyBar(ticker=ticker, session_date=session_date)
+        bar.premarket_volume = int(sum(b.volume for b in minute_bars))
+        bar.premarket_dollar_volume = float(_sum_dollar_volume(minute_bars))
+        if datetime.utcnow() >= pre_end:
+            self.save_premarket(ticker, session_date, bar.premarket_volume, bar.premarket_dollar_volume)
+        return bar
+
+    @staticmethod
+    def _to_bar(row: DailyBarDB) -> DailyBar:
+        return DailyBar(
+            ticker=row.ticker,
+            session_date=row.session_date,
+            open=row.open,
+            high=row.high,
+            low=row.low,
+            close=row.close,
+            volume=row.volume,
+            premarket_volume=row.premarket_volume,
+            premarket_dollar_volume=row.premarket_dollar_volume,
+        )
+
+
+# Global instance
+_daily_bar_store: Optional[DailyBarStore] = None
+
+
+def get_daily_bar_store() -> DailyBarStore:
+    """Get the global daily bar store instance."""
+    global _daily_bar_store
+    if _daily_bar_store is None:
+        _daily_bar_store = DailyBarStore()
+    return _daily_bar_store
@@ -4,12 +4,28 @@ from .base import OHLCVDataProvider
 from .polygon import PolygonProvider
 from .alpaca import AlpacaProvider
 from .ib import IBProvider
+from .async_fetcher import AsyncOHLCVFetcher, FetchRequest, TokenBucket, get_async_fetcher
+from .columnar import OHLCVColumns
+from .fetch_planner import CoalescedFetch, FetchWindow, plan_fetches
+from .hedged import HedgedProvider
+from .response_cache import ResponseCache, get_response_cache
 
 __all__ = [
     "OHLCVDataProvider",
     "PolygonProvider",
     "AlpacaProvider",
     "IBProvider",
+    "HedgedProvider",
+    "AsyncOHLCVFetcher",
+    "FetchRequest",
+    "TokenBucket",
+    "get_async_fetcher",
+    "OHLCVColumns",
+    "CoalescedFetch",
+    "FetchWindow",
+    "plan_fetches",
+    "ResponseCache",
+    "get_response_cache",
     "get_provider",
 ]
 
@@ -19,7 +35,8 @@ def get_provider(backend: Optional[str] = None) -> OHLCVDataProvider:
     Factory to get the configured data provider.
 
     Args:
-        backend: Provider name ('polygon', 'alpaca', 'ib').
+        backend: Provider name ('polygon', 'alpaca', 'ib'), or a comma-separated list
+                 ('polygon,alpaca') for a HedgedProvider with the first as primary.
                  If not specified, uses DATA_BACKEND env var, defaulting to 'alpaca'.
 
     Returns:
@@ -31,6 +48,9 @@ def get_provider(backend: Optional[str] = None) -> OHLCVDataProvider:
     backend = backend or os.getenv("DATA_BACKEND", "alpaca")
     backend = backend.lower()
 
+    if "," in backend:
+        return HedgedProvider([get_provider(b.strip()) for b in backend.split(",") if b.strip()])
+
     if backend == "polygon" or backend == "massive":
         return PolygonProvider()
     elif backend == "alpaca":
@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 from ..models import OHLCVBar
 from .base import OHLCVDataProvider
+from .columnar import OHLCVColumns, json_loads
+from .response_cache import cached_fetch
 
 logger = logging.getLogger(__name__)
 
@@ -23,14 +25,18 @@ class AlpacaProvider(OHLCVDataProvider):
         rate_limit_delay: float = 0.3,
         max_retries: int = 5,
         timeout_s: float = 30.0,
+        base_url: Optional[str] = None,
     ):
         self.api_key = api_key or os.getenv("ALPACA_API_KEY")
+        # Override to point at a stand-in server (scripts/run_standin_server.py)
+        self.base_url = (base_url or os.getenv("ALPACA_DATA_URL") or self.BASE_URL).rstrip("/")
         self.secret_key = secret_key or os.getenv("ALPACA_SECRET_KEY")
         self._rate_limit_delay = float(os.getenv("ALPACA_RATE_LIMIT_DELAY", rate_limit_delay))
         self.max_retries = int(os.getenv("ALPACA_MAX_RETRIES", max_retries))
         self.timeout_s = float(os.getenv("ALPACA_TIMEOUT_S", timeout_s))
         self.backoff_base_s = float(os.getenv("ALPACA_BACKOFF_BASE_S", "1.0"))
         self.backoff_cap_s = float(os.getenv("ALPACA_BACKOFF_CAP_S", "60.0"))
+        self._max_in_flight = int(os.getenv("ALPACA_MAX_IN_FLIGHT", "4"))
 
         self._session = requests.Session()
         self._next_allowed_time = 0.0
@@ -48,6 +54,10 @@ class AlpacaProvider(OHLCVDataProvider):
     def rate_limit_delay(self) -> float:
         return self._rate_limit_delay
 
+    @property
+    def max_in_flight(self) -> int:
+        return self._max_in_flight
+
     def supports_extended_hours(self) -> bool:
         return True
 
@@ -68,13 +78,7 @@ class AlpacaProvider(OHLCVDataProvider):
             "APCA-API-SECRET-KEY": self.secret_key,
         }
 
-    def fetch_ohlcv(
-        self,
-        ticker: str,
-        start: datetime,
-        end: datetime,
-        timespan: str = "minute",
-    ) -> Optional[List[OHLCVBar]]:
+    def _build_params(self, start: datetime, end: datetime, timespan: str) -> Dict[str, Any]:
         if not self.api_key or not self.secret_key:
             raise ValueError("Alpaca API credentials not set. Set ALPACA_API_KEY and ALPACA_SECRET_KEY in .env")
 
@@ -101,10 +105,7 @@ class AlpacaProvider(OHLCVDataProvider):
         start_str = start_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
         end_str = end_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
-
-        url = f"{self.BASE_URL}/v2/stocks/{ticker}/bars"
-        params = {
+        return {
             "start": start_str,
             "end": end_str,
             "timeframe": timeframe,
@@ -113,6 +114,67 @@ class AlpacaProvider(OHLCVDataProvider):
             "sort": "asc",
         }
 
+    @staticmethod
+    def _parse_bars(bars_data: List[Dict[str, Any]]) -> List[OHLCVBar]:
+        return OHLCVColumns.from_alpaca(bars_data).to_bars()
+
+    @cached_fetch
+    async def afetch_ohlcv(
+        self,
+        fetcher,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        params = self._build_params(start, end, timespan)
+        url = f"{self.base_url}/v2/stocks/{ticker}/bars"
+
+        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
+
+        all_bars = []
+        while True:
+            result = await fetcher.get_json(
+                url,
+                params=params,
+                headers=self._get_headers(),
+                label=ticker,
+                max_retries=self.max_retries,
+                timeout_s=self.timeout_s,
+                backoff_base_s=self.backoff_base_s,
+                backoff_cap_s=self.backoff_cap_s,
+            )
+            if result is None:
+                return None  # None = retry later
+            status, data = result
+            if status != 200:
+                logger.error(f"Error fetching {ticker}: HTTP {status}")
+                return None  # None = retry later
+
+            all_bars.extend(self._parse_bars(data.get("bars") or []))
+
+            # Check for pagination
+            next_page_token = data.get("next_page_token")
+            if not next_page_token:
+                if not all_bars:
+                    logger.debug(f"No data for {ticker}")
+                return all_bars
+            params = {**params, "page_token": next_page_token}
+
+    @cached_fetch
+    def fetch_ohlcv(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        params = self._build_params(start, end, timespan)
+
+        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
+
+        url = f"{self.base_url}/v2/stocks/{ticker}/bars"
+
         all_bars = []
         next_page_token = None
 
@@ -151,7 +213,7 @@ class AlpacaProvider(OHLCVDataProvider):
                         logger.debug(f"Response: {response.text[:200]}")
                     return None  # None = retry later
 
-                data = response.json()
+                data = json_loads(response.content)
                 bars_data = data.get("bars", [])
 
                 if not bars_data:
@@ -159,27 +221,7 @@ class AlpacaProvider(OHLCVDataProvider):
                         logger.debug(f"No data for {ticker}")
                     return all_bars
 
-                for bar in bars_data:
-                    # Parse ISO timestamp (Alpaca returns UTC)
-                    ts_str = bar["t"]
-                    if ts_str.endswith("Z"):
-                        ts = datetime.fromisoformat(ts_str.replace("Z", "+00:00"))
-                    else:
-                        ts = datetime.fromisoformat(ts_str)
-
-                    # Store as naive UTC (strip timezone info but keep UTC time)
-                    if ts.tzinfo is not None:
-                        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
-
-                    all_bars.append(OHLCVBar(
-                        timestamp=ts,
-                        open=bar["o"],
-                        high=bar["h"],
-                        low=bar["l"],
-                        close=bar["c"],
-                        volume=bar["v"],
-                        vwap=bar.get("vw"),
-                    ))
+                all_bars.extend(self._parse_bars(bars_data))
 
                 # Check for pagination
                 next_page_token = data.get("next_page_token")
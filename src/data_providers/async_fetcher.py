@@ -0,0 +1,317 @@
+"""Concurrent OHLCV fetching paced by a shared token bucket.
+
+The providers' fetch_ohlcv methods are synchronous and space calls with a fixed delay,
+so a backfill runs one request at a time. AsyncOHLCVFetcher runs provider requests on
+an asyncio loop in a background thread (aiohttp for the HTTP providers), all paced by
+one TokenBucket: at most `rps` requests per second and `max_in_flight` outstanding.
+A 429 pauses the bucket for Retry-After and halves its rate; the rate recovers
+gradually as requests succeed.
+
+Any thread can submit work: fetch_batch() blocks until a batch is done, submit()
+returns a concurrent.futures.Future. get_async_fetcher() shares one fetcher (and so
+one bucket) per provider type in the process.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import aiohttp
+
+from ..models import OHLCVBar
+from .base import OHLCVDataProvider
+from .columnar import json_loads
+
+logger = logging.getLogger(__name__)
+
+# Override the provider defaults (1 / rate_limit_delay, provider.max_in_flight)
+OHLCV_FETCH_RPS = float(os.getenv("OHLCV_FETCH_RPS", "0"))
+OHLCV_FETCH_MAX_IN_FLIGHT = int(os.getenv("OHLCV_FETCH_MAX_IN_FLIGHT", "0"))
+
+
+@dataclass(frozen=True)
+class FetchRequest:
+    """One provider call: bars for ticker in [start, end]."""
+    ticker: str
+    start: datetime
+    end: datetime
+    timespan: str = "minute"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(value)
+            return max(0.0, (dt - datetime.now(tz=dt.tzinfo)).total_seconds())
+        except Exception:
+            return None
+
+
+class TokenBucket:
+    """Request pacing for one upstream API (use from a single event loop).
+
+    Tokens refill at the current rate up to one second's worth (at least one), and a
+    request also needs one of `max_in_flight` slots. Waiters are served in order.
+    """
+
+    def __init__(self, rate: float, max_in_flight: int = 1, min_rate: Optional[float] = None):
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self._current_rate = rate
+        self._min_rate = min_rate or rate / 8
+        self._capacity = max(1.0, rate)
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def current_rate(self) -> float:
+        return self._current_rate
+
+    @property
+    def paused(self) -> bool:
+        """True while paused by a 429 (not during the rate's recovery afterwards)."""
+        return time.monotonic() < self._paused_until
+
+    async def acquire(self) -> None:
+        """Wait for a token and an in-flight slot. Pair with release()."""
+        if self._slots is None:
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    wait = self._paused_until - now
+                    if wait <= 0 and self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = max(wait, (1 - self._tokens) / self._current_rate)
+                    await asyncio.sleep(wait)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, throttled: bool = False, retry_after: Optional[float] = None) -> None:
+        """Free the in-flight slot and feed the response outcome back into the rate."""
+        self._slots.release()
+        if throttled:
+            self._refill(time.monotonic())
+            self._current_rate = max(self._min_rate, self._current_rate / 2)
+            pause = retry_after if retry_after is not None else 1 / self._current_rate
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0.0
+            logger.warning(f"Rate limited: pausing {pause:.1f}s, rate now {self._current_rate:.2f} req/s")
+        elif self._current_rate < self.rate:
+            self._current_rate = min(self.rate, self._current_rate + self.rate * 0.05)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._current_rate)
+        self._updated = now
+
+
+class AsyncOHLCVFetcher:
+    """Runs provider fetches concurrently on a background event loop."""
+
+    def __init__(
+        self,
+        provider: OHLCVDataProvider,
+        rps: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        self.provider = provider
+        delay = provider.rate_limit_delay
+        rps = rps or OHLCV_FETCH_RPS or (1.0 / delay if delay > 0 else 10.0)
+        max_in_flight = max_in_flight or OHLCV_FETCH_MAX_IN_FLIGHT or provider.max_in_flight
+        self.bucket = TokenBucket(rps, max_in_flight)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sync_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._start_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API (any thread)
+    # ------------------------------------------------------------------
+
+    def submit(self, request: FetchRequest) -> concurrent.futures.Future:
+        """Schedule one fetch. The future resolves to bars, [] (no data) or None (failed)."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._fetch(request), loop)
+
+    def fetch_batch(self, requests: Sequence[FetchRequest]) -> List[Optional[List[OHLCVBar]]]:
+        """Fetch a batch concurrently; results are in request order."""
+        futures = [self.submit(r) for r in requests]
+        return [f.result() for f in futures]
+
+    def close(self) -> None:
+        """Close the HTTP session and stop the loop thread."""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(timeout=5)
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._sync_executor is not None:
+            self._sync_executor.shutdown(wait=False)
+            self._sync_executor = None
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # Helpers for provider afetch_ohlcv implementations (loop thread)
+    # ------------------------------------------------------------------
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        label: str = "",
+        max_retries: int = 5,
+        timeout_s: float = 30.0,
+        backoff_base_s: float = 1.0,
+        backoff_cap_s: float = 60.0,
+    ) -> Optional[Tuple[int, Any]]:
+        """GET through the bucket, retrying 429s and network errors.
+
+        Returns:
+            (status, parsed JSON) for 200, (status, None) for other statuses,
+            or None if retries were exhausted.
+        """
+        session = self._get_session()
+        for attempt in range(max_retries):
+            backoff = min(backoff_cap_s, backoff_base_s * (2 ** attempt))
+            backoff += random.uniform(0.0, min(1.0, backoff * 0.25))
+
+            await self.bucket.acquire()
+            throttled, retry_after = False, None
+            try:
+                async with session.get(
+                    url, params=params, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout_s),
+                ) as response:
+                    if response.status == 429:
+                        throttled = True
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    elif response.status == 200:
+                        return response.status, await response.json(content_type=None, loads=json_loads)
+                    else:
+                        body = await response.text()
+                        logger.debug(f"{label}: HTTP {response.status}: {body[:200]}")
+                        return response.status, None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == max_retries - 1:
+                    logger.error(f"Error fetching {label}: {e}")
+                    return None
+                logger.warning(f"Request error for {label}: {e} (retrying in {backoff:.1f}s)")
+                await asyncio.sleep(backoff)
+                continue
+            finally:
+                self.bucket.release(throttled=throttled, retry_after=retry_after)
+
+            if attempt < max_retries - 1:
+                logger.warning(f"Rate limited for {label} (attempt {attempt + 1}/{max_retries})")
+                if retry_after is None:
+                    await asyncio.sleep(backoff)
+
+        logger.error(f"Rate limit exceeded for {label} after {max_retries} retries")
+        return None
+
+    async def run_sync(self, fn: Callable, *args) -> Any:
+        """Run a blocking call on the fetcher's worker thread, paced by the bucket.
+
+        Used for providers without an async client (IB); the single worker keeps their
+        client confined to one thread.
+        """
+        if self._sync_executor is None:
+            self._sync_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="OHLCVFetchSync",
+            )
+        await self.bucket.acquire()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._sync_executor, fn, *args)
+        finally:
+            self.bucket.release()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _fetch(self, request: FetchRequest) -> Optional[List[OHLCVBar]]:
+        try:
+            return await self.provider.afetch_ohlcv(
+                self, request.ticker, request.start, request.end, request.timespan,
+            )
+        except Exception as e:
+            logger.error(f"Error fetching {request.ticker}: {e}", exc_info=True)
+            return None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None or not self._loop.is_running():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(loop, started), daemon=True, name="OHLCVFetcher",
+                )
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+        loop.close()
+
+
+# One fetcher per provider type, so every caller in the process shares its bucket
+_fetchers: Dict[str, AsyncOHLCVFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_async_fetcher(
+    provider: Optional[OHLCVDataProvider] = None,
+    backend: Optional[str] = None,
+) -> AsyncOHLCVFetcher:
+    """Get the shared fetcher for a provider (or for the configured backend)."""
+    if provider is None:
+        from . import get_provider
+        provider = get_provider(backend)
+    with _fetchers_lock:
+        fetcher = _fetchers.get(provider.name)
+        if fetcher is None:
+            fetcher = AsyncOHLCVFetcher(provider)
+            _fetchers[provider.name] = fetcher
+            atexit.register(fetcher.close)
+        return fetcher
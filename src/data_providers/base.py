@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from ..models import OHLCVBar
 
+if TYPE_CHECKING:
+    from .async_fetcher import AsyncOHLCVFetcher
+
 
 class OHLCVDataProvider(ABC):
     """Abstract base class for OHLCV data providers."""
@@ -31,6 +34,22 @@ class OHLCVDataProvider(ABC):
         """
         pass
 
+    async def afetch_ohlcv(
+        self,
+        fetcher: "AsyncOHLCVFetcher",
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        """
+        Async fetch_ohlcv used by AsyncOHLCVFetcher (same return contract).
+
+        Providers with an HTTP API override this to issue requests through
+        fetcher.get_json. The default runs fetch_ohlcv on the fetcher's worker thread.
+        """
+        return await fetcher.run_sync(self.fetch_ohlcv, ticker, start, end, timespan)
+
     @abstractmethod
     def supports_extended_hours(self) -> bool:
         """Whether this provider has premarket/postmarket data."""
@@ -42,6 +61,16 @@ class OHLCVDataProvider(ABC):
         """Minimum seconds between requests."""
         pass
 
+    @property
+    def max_in_flight(self) -> int:
+        """Maximum concurrent requests when fetching through AsyncOHLCVFetcher."""
+        return 1
+
+    @property
+    def adjustment(self) -> str:
+        """Price adjustment applied to returned bars (part of the response cache key)."""
+        return "split"
+
     @property
     def name(self) -> str:
         """Human-readable name of the provider."""
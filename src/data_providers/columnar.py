@@ -0,0 +1,165 @@
+"""Columnar decoding of provider OHLCV responses.
+
+Polygon and Alpaca return bars as JSON objects keyed t/o/h/l/c/v/vw, up to 50,000 per
+response. Instead of parsing a datetime and building an OHLCVBar per result while
+walking the dicts, OHLCVColumns pulls each key into one numpy array and converts all
+timestamps in a single vectorized cast (epoch ms or RFC3339 -> datetime64). Bars are
+only materialized at the end, from plain Python lists (ndarray.tolist), which is the
+cheap part.
+
+json_loads / json_dumps use orjson when it is installed (several times faster on
+large bodies) and the standard library otherwise.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from ..models import OHLCVBar
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
+
+json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def json_dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+_PRICE_KEYS = ("o", "h", "l", "c")
+
+
+def _column(rows: Sequence[Mapping[str, Any]], key: str, dtype) -> np.ndarray:
+    # Missing keys become None, which float64 stores as NaN
+    return np.fromiter((row.get(key) for row in rows), dtype=dtype, count=len(rows))
+
+
+def _volume(values) -> np.ndarray:
+    # Polygon reports fractional volume for some tickers; stored as whole shares
+    return np.rint(np.asarray(values, dtype=np.float64)).astype(np.int64)
+
+
+def _parse_rfc3339(values: Sequence[str]) -> np.ndarray:
+    """RFC3339 timestamps -> naive UTC datetime64[ns]."""
+    if all(v.endswith("Z") for v in values):
+        return np.array([v[:-1] for v in values], dtype="datetime64[ns]")
+    # Explicit offsets are rare; normalize them one by one
+    parsed = []
+    for v in values:
+        ts = datetime.fromisoformat(v.replace("Z", "+00:00"))
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+        parsed.append(ts)
+    return np.array(parsed, dtype="datetime64[ns]")
+
+
+@dataclass
+class OHLCVColumns:
+    """Bars as parallel numpy arrays. Timestamps are naive UTC, missing vwap is NaN."""
+    timestamp: np.ndarray  # datetime64[ns]
+    open: np.ndarray       # float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray     # int64
+    vwap: np.ndarray       # float64
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def empty(cls) -> "OHLCVColumns":
+        prices = [np.empty(0, dtype=np.float64) for _ in range(4)]
+        return cls(np.empty(0, dtype="datetime64[ns]"), *prices,
+                   np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+    @classmethod
+    def from_epoch_ms(cls, columns: Mapping[str, Sequence]) -> "OHLCVColumns":
+        """From column lists keyed t/o/h/l/c/v/vw with t in epoch milliseconds."""
+        vwap = columns.get("vw")
+        return cls(
+            np.asarray(columns["t"], dtype=np.int64).astype("datetime64[ms]").astype("datetime64[ns]"),
+            *(np.asarray(columns[k], dtype=np.float64) for k in _PRICE_KEYS),
+            _volume(columns["v"]),
+            np.asarray(vwap if vwap is not None else [None] * len(columns["t"]), dtype=np.float64),
+        )
+
+    @classmethod
+    def from_polygon(cls, results: Sequence[Mapping[str, Any]]) -> "OHLCVColumns":
+        """From Polygon aggregate results (t in epoch milliseconds)."""
+        if not results:
+            return cls.empty()
+        return cls(
+            _column(results, "t", np.int64).astype("datetime64[ms]").astype("datetime64[ns]"),
+            *(_column(results, k, np.float64) for k in _PRICE_KEYS),
+            _volume(_column(results, "v", np.float64)),
+            _column(results, "vw", np.float64),
+        )
+
+    @classmethod
+    def from_alpaca(cls, bars: Sequence[Mapping[str, Any]]) -> "OHLCVColumns":
+        """From Alpaca bars (t as RFC3339 strings)."""
+        if not bars:
+            return cls.empty()
+        return cls(
+            _parse_rfc3339([bar["t"] for bar in bars]),
+            *(_column(bars, k, np.float64) for k in _PRICE_KEYS),
+            _volume(_column(bars, "v", np.float64)),
+            _column(bars, "vw", np.float64),
+        )
+
+    @classmethod
+    def from_frame(cls, df) -> "OHLCVColumns":
+        """From a DataFrame with timestamp/open/high/low/close/volume/vwap columns."""
+        if df.empty:
+            return cls.empty()
+        return cls(
+            df["timestamp"].to_numpy(dtype="datetime64[ns]"),
+            *(df[k].to_numpy(dtype=np.float64) for k in ("open", "high", "low", "close")),
+            _volume(df["volume"].to_numpy(dtype=np.float64, na_value=0.0)),
+            df["vwap"].to_numpy(dtype=np.float64, na_value=np.nan),
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["OHLCVColumns"]) -> "OHLCVColumns":
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(p, name) for p in parts]) for name in cls.__dataclass_fields__))
+
+    def select(self, index) -> "OHLCVColumns":
+        """Rows picked by a boolean mask, index array or slice."""
+        return OHLCVColumns(*(getattr(self, name)[index] for name in self.__dataclass_fields__))
+
+    def epoch_ms(self) -> np.ndarray:
+        return self.timestamp.astype("datetime64[ms]").astype(np.int64)
+
+    def to_bars(self) -> List[OHLCVBar]:
+        timestamps = self.timestamp.astype("datetime64[us]").tolist()
+        vwaps = np.where(np.isnan(self.vwap), None, self.vwap).tolist()
+        return [
+            OHLCVBar(timestamp=ts, open=o, high=h, low=l, close=c, volume=v, vwap=vw)
+            for ts, o, h, l, c, v, vw in zip(
+                timestamps, self.open.tolist(), self.high.tolist(), self.low.tolist(),
+                self.close.tolist(), self.volume.tolist(), vwaps,
+            )
+        ]
+
+    def to_dict(self) -> Dict[str, list]:
+        """Column lists keyed t/o/h/l/c/v/vw (t in epoch ms, missing vwap as None)."""
+        return {
+            "t": self.epoch_ms().tolist(),
+            "o": self.open.tolist(),
+            "h": self.high.tolist(),
+            "l": self.low.tolist(),
+            "c": self.close.tolist(),
+            "v": self.volume.tolist(),
+            "vw": np.where(np.isnan(self.vwap), None, self.vwap).tolist(),
+        }
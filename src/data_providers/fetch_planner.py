@@ -0,0 +1,80 @@
+"""Coalesce per-announcement OHLCV windows into fewer provider requests.
+
+Every announcement needs its own [-5, +120] minute window, so a ticker alerted several
+times in a session would otherwise be fetched once per alert, mostly re-downloading the
+same bars. plan_fetches() groups windows per (ticker, trading day), merges windows that
+overlap (or sit within max_gap of each other) into one request, and each
+CoalescedFetch splits the fetched bars back per window.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, List, Optional, Sequence
+
+from ..models import OHLCVBar, get_et_date
+from .async_fetcher import FetchRequest
+
+logger = logging.getLogger(__name__)
+
+# Windows closer than this are fetched as one span; the extra bars in the gap cost far
+# less than another rate-limited request.
+COALESCE_MAX_GAP = timedelta(minutes=30)
+
+
+@dataclass(frozen=True)
+class FetchWindow:
+    """Bars wanted for one caller-side item (e.g. an announcement)."""
+    key: Hashable
+    ticker: str
+    start: datetime
+    end: datetime
+
+
+@dataclass
+class CoalescedFetch:
+    """One provider request covering one or more windows."""
+    request: FetchRequest
+    windows: List[FetchWindow] = field(default_factory=list)
+
+    def split(self, bars: Optional[List[OHLCVBar]]) -> Dict[Hashable, Optional[List[OHLCVBar]]]:
+        """Bars per window key. A failed fetch (None) fails every window it covered."""
+        if bars is None:
+            return {w.key: None for w in self.windows}
+        return {
+            w.key: [bar for bar in bars if w.start <= bar.timestamp <= w.end]
+            for w in self.windows
+        }
+
+
+def plan_fetches(
+    windows: Sequence[FetchWindow],
+    max_gap: timedelta = COALESCE_MAX_GAP,
+    timespan: str = "minute",
+) -> List[CoalescedFetch]:
+    """Merge windows into as few requests as possible.
+
+    Windows are grouped by ticker and by the ET trading day their window ends on (a
+    postmarket window that runs into the next session belongs to that session), then
+    merged while each starts no later than max_gap after the span so far ends.
+    """
+    groups: Dict[tuple, List[FetchWindow]] = {}
+    for w in windows:
+        groups.setdefault((w.ticker, get_et_date(w.end)), []).append(w)
+
+    plan: List[CoalescedFetch] = []
+    for (ticker, _), group in groups.items():
+        group.sort(key=lambda w: w.start)
+        current: Optional[CoalescedFetch] = None
+        for w in group:
+            if current is not None and w.start <= current.request.end + max_gap:
+                current.windows.append(w)
+                if w.end > current.request.end:
+                    current.request = FetchRequest(ticker, current.request.start, w.end, timespan)
+                continue
+            current = CoalescedFetch(FetchRequest(ticker, w.start, w.end, timespan), [w])
+            plan.append(current)
+
+    if len(plan) < len(windows):
+        logger.info(f"Coalesced {len(windows)} fetch windows into {len(plan)} requests")
+    return plan
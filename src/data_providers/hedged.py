@@ -0,0 +1,241 @@
+"""Composite provider with hedged requests and failover.
+
+With a single backend a throttled or failing Polygon meant returning None and retrying
+the window much later. HedgedProvider sends each request to the best-ranked provider
+and, if no answer arrives within that provider's recent latency percentile
+(OHLCV_HEDGE_PERCENTILE), sends the same request to the next one. The first valid
+response wins (bars or a confirmed []); the others are cancelled. A failed response
+(None after the provider's own retries, e.g. a 5xx) fails over to the next provider
+immediately. A provider whose fetcher is paused by a 429 is hedged at once, also when
+the 429 arrives while waiting on it; once the pause ends the latency-based delay applies
+again while the bucket's rate recovers. A request cancelled after losing still counts
+its elapsed time as a latency sample (a lower bound), so the percentile doesn't drift
+down to the fast responses only.
+
+Ranking keeps the configured order, but moves providers to the back while their
+recent error rate is above OHLCV_HEDGE_MAX_ERROR_RATE. Providers whose data is not
+published yet for the window (min_delay_minutes) are skipped. Each provider is called
+through its own shared AsyncOHLCVFetcher, so token buckets and response caches work
+exactly as when the provider is used alone.
+
+Configure with a comma-separated backend list, primary first:
+DATA_BACKEND=polygon,alpaca. Bars from different feeds can differ slightly (e.g.
+Alpaca's IEX volume), so the winner's name is logged at debug level.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Sequence
+
+from ..models import OHLCVBar
+from .async_fetcher import FetchRequest, get_async_fetcher
+from .base import OHLCVDataProvider
+
+logger = logging.getLogger(__name__)
+
+OHLCV_HEDGE_PERCENTILE = float(os.getenv("OHLCV_HEDGE_PERCENTILE", "0.9"))
+OHLCV_HEDGE_DEFAULT_DELAY_S = float(os.getenv("OHLCV_HEDGE_DEFAULT_DELAY_S", "3.0"))
+OHLCV_HEDGE_MIN_DELAY_S = float(os.getenv("OHLCV_HEDGE_MIN_DELAY_S", "0.25"))
+OHLCV_HEDGE_MAX_DELAY_S = float(os.getenv("OHLCV_HEDGE_MAX_DELAY_S", "30.0"))
+OHLCV_HEDGE_MAX_ERROR_RATE = float(os.getenv("OHLCV_HEDGE_MAX_ERROR_RATE", "0.5"))
+HEDGE_MIN_SAMPLES = 20
+# How often a hedge wait re-checks the waited-on provider's bucket for a 429 pause
+HEDGE_PAUSE_POLL_S = 0.05
+
+
+class ProviderStats:
+    """Rolling latency and error samples for one provider (thread-safe)."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._errors: Deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def record(self, latency_s: float, ok: bool) -> None:
+        with self._lock:
+            self._errors.append(not ok)
+            if ok:
+                self._latencies.append(latency_s)
+
+    def record_cancelled(self, elapsed_s: float) -> None:
+        """A request cancelled after elapsed_s: its latency was at least that long."""
+        with self._lock:
+            self._latencies.append(elapsed_s)
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        """q-quantile of latencies (cancelled requests as lower bounds), or None before
+        HEDGE_MIN_SAMPLES."""
+        with self._lock:
+            if len(self._latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(self._errors) / len(self._errors) if self._errors else 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        p50 = self.latency_percentile(0.5)
+        p90 = self.latency_percentile(0.9)
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "wins": self.wins,
+            "error_rate": round(self.error_rate, 3),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p90_s": round(p90, 3) if p90 is not None else None,
+        }
+
+
+class HedgedProvider(OHLCVDataProvider):
+    """Routes each fetch across several providers (primary first), hedging slow ones."""
+
+    def __init__(self, providers: Sequence[OHLCVDataProvider], percentile: float = OHLCV_HEDGE_PERCENTILE):
+        if len(providers) < 2:
+            raise ValueError("HedgedProvider needs at least two providers")
+        self.providers = list(providers)
+        self.percentile = percentile
+        self._stats = {p.name: ProviderStats() for p in self.providers}
+
+    @property
+    def name(self) -> str:
+        return f"Hedged({','.join(p.name for p in self.providers)})"
+
+    def supports_extended_hours(self) -> bool:
+        return self.providers[0].supports_extended_hours()
+
+    @property
+    def rate_limit_delay(self) -> float:
+        # Pacing happens in each provider's own fetcher
+        return 0.0
+
+    @property
+    def max_in_flight(self) -> int:
+        return sum(p.max_in_flight for p in self.providers)
+
+    @property
+    def min_delay_minutes(self) -> int:
+        return min(p.min_delay_minutes for p in self.providers)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-provider counters, error rate and latency percentiles."""
+        return {name: s.snapshot() for name, s in self._stats.items()}
+
+    def fetch_ohlcv(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        return get_async_fetcher(self).submit(FetchRequest(ticker, start, end, timespan)).result()
+
+    async def afetch_ohlcv(
+        self,
+        fetcher,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        request = FetchRequest(ticker, start, end, timespan)
+        candidates = self._route(end)
+        pending: Dict[asyncio.Future, OHLCVDataProvider] = {}
+        launched_at: Dict[asyncio.Future, float] = {}
+
+        def launch(provider: OHLCVDataProvider) -> None:
+            self._stats[provider.name].requests += 1
+            future = asyncio.wrap_future(get_async_fetcher(provider).submit(request))
+            pending[future] = provider
+            launched_at[future] = time.monotonic()
+
+        launch(candidates[0])
+        next_idx = 1
+        try:
+            while pending:
+                if next_idx < len(candidates):
+                    waited_on = candidates[next_idx - 1]
+                    done = await self._wait_or_hedge(pending, waited_on)
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    logger.debug(
+                        f"{ticker}: no answer from {waited_on.name} in time, "
+                        f"hedging to {candidates[next_idx].name}"
+                    )
+                    self._stats[candidates[next_idx].name].hedges += 1
+                    launch(candidates[next_idx])
+                    next_idx += 1
+                    continue
+
+                for future in done:
+                    provider = pending.pop(future)
+                    try:
+                        bars = future.result()
+                    except Exception as e:
+                        logger.warning(f"{ticker}: {provider.name} raised {e}")
+                        bars = None
+                    stats = self._stats[provider.name]
+                    stats.record(time.monotonic() - launched_at[future], bars is not None)
+                    if bars is not None:
+                        stats.wins += 1
+                        logger.debug(f"{ticker}: served by {provider.name}")
+                        return bars
+
+                # Everything in flight failed: fail over without waiting
+                if not pending and next_idx < len(candidates):
+                    logger.info(f"{ticker}: {provider.name} failed, failing over to {candidates[next_idx].name}")
+                    launch(candidates[next_idx])
+                    next_idx += 1
+            return None  # None = retry later (every provider failed)
+        finally:
+            now = time.monotonic()
+            for future, provider in pending.items():
+                future.cancel()
+                self._stats[provider.name].record_cancelled(now - launched_at[future])
+
+    async def _wait_or_hedge(self, pending, provider: OHLCVDataProvider) -> set:
+        """Wait for any pending future until provider's hedge delay passes or its bucket
+        is paused by a 429. Returns the finished futures (empty = hedge now)."""
+        deadline = time.monotonic() + self._hedge_delay(provider)
+        bucket = get_async_fetcher(provider).bucket
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or bucket.paused:
+                return set()
+            done, _ = await asyncio.wait(
+                pending, timeout=min(HEDGE_PAUSE_POLL_S, remaining), return_when=asyncio.FIRST_COMPLETED,
+            )
+            if done:
+                return done
+
+    def _route(self, end: datetime) -> List[OHLCVDataProvider]:
+        """Providers to try, best first."""
+        now = datetime.utcnow()
+        published = [
+            p for p in self.providers if end <= now - timedelta(minutes=p.min_delay_minutes)
+        ] or self.providers
+        return sorted(
+            published,
+            key=lambda p: (self._stats[p.name].error_rate > OHLCV_HEDGE_MAX_ERROR_RATE, self.providers.index(p)),
+        )
+
+    def _hedge_delay(self, provider: OHLCVDataProvider) -> float:
+        """How long to wait on provider before hedging."""
+        if get_async_fetcher(provider).bucket.paused:
+            return 0.0
+        delay = self._stats[provider.name].latency_percentile(self.percentile)
+        if delay is None:
+            return OHLCV_HEDGE_DEFAULT_DELAY_S
+        return min(OHLCV_HEDGE_MAX_DELAY_S, max(OHLCV_HEDGE_MIN_DELAY_S, delay))
@@ -1,13 +1,153 @@
+"""Interactive Brokers historical bars via ib_insync.
+
+All requests run as reqHistoricalDataAsync on the shared AsyncOHLCVFetcher's event
+loop, which owns one IB connection for the life of the process (a whole backfill),
+so several requests are in flight at once. IBPacer keeps them inside IB's historical
+data pacing rules: at most IB_PACING_MAX_REQUESTS per IB_PACING_WINDOW_S, no
+identical request within 15 seconds, and at most 5 requests per contract within
+2 seconds. A pacing violation (error 162) pauses all requests for
+IB_PACING_PENALTY_S. Qualified contracts are cached per ticker.
+"""
+
+import asyncio
 import logging
 import os
 import time
-from datetime import datetime, timedelta
-from typing import List, Optional
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Hashable, List, Optional
+
 from ..models import OHLCVBar
+from .async_fetcher import FetchRequest, get_async_fetcher
 from .base import OHLCVDataProvider
+from .response_cache import cached_fetch
 
 logger = logging.getLogger(__name__)
 
+BAR_SIZES = {
+    "minute": "1 min",
+    "hour": "1 hour",
+    "day": "1 day",
+}
+
+# IB error codes that mean "no data" rather than a failed request
+_NO_DATA_ERRORS = {162, 200}
+
+
+class IBPacer:
+    """IB historical data pacing (use from a single event loop).
+
+    Waiters are served in order; each acquire() waits until every rule allows one more
+    request and then records it. Pair with release().
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 60,
+        window_s: float = 600.0,
+        identical_gap_s: float = 15.0,
+        per_contract: int = 5,
+        per_contract_window_s: float = 2.0,
+        max_in_flight: int = 6,
+    ):
+        self.max_requests = max_requests
+        self.window_s = window_s
+        self.identical_gap_s = identical_gap_s
+        self.per_contract = per_contract
+        self.per_contract_window_s = per_contract_window_s
+        self.max_in_flight = max_in_flight
+
+        self._sent: Deque[float] = deque()
+        self._by_contract: Dict[Hashable, Deque[float]] = {}
+        self._last_identical: Dict[Hashable, float] = {}
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def acquire(self, contract_key: Hashable, request_key: Hashable) -> None:
+        if self._slots is None:
+            self._lock = asyncio.Lock()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    wait = self._wait_time(now, contract_key, request_key)
+                    if wait <= 0:
+                        self._sent.append(now)
+                        self._by_contract.setdefault(contract_key, deque()).append(now)
+                        self._last_identical[request_key] = now
+                        return
+                    await asyncio.sleep(wait)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self) -> None:
+        self._slots.release()
+
+    def penalize(self, seconds: float) -> None:
+        """Pause all requests (after a pacing violation)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _wait_time(self, now: float, contract_key: Hashable, request_key: Hashable) -> float:
+        waits = [self._paused_until - now]
+
+        while self._sent and now - self._sent[0] >= self.window_s:
+            self._sent.popleft()
+        if len(self._sent) >= self.max_requests:
+            waits.append(self._sent[0] + self.window_s - now)
+
+        recent = self._by_contract.get(contract_key)
+        if recent is not None:
+            while recent and now - recent[0] >= self.per_contract_window_s:
+                recent.popleft()
+            if len(recent) >= self.per_contract:
+                waits.append(recent[0] + self.per_contract_window_s - now)
+
+        last = self._last_identical.get(request_key)
+        if last is not None:
+            waits.append(last + self.identical_gap_s - now)
+        # Forget identical-request stamps that can no longer matter
+        if len(self._last_identical) > 10_000:
+            self._last_identical = {
+                k: t for k, t in self._last_identical.items() if now - t < self.identical_gap_s
+            }
+        return max(waits)
+
+
+def _duration_str(start: datetime, end: datetime) -> str:
+    duration_days = (end - start).days + 1
+    if duration_days <= 1:
+        return f"{int((end - start).total_seconds())} S"
+    return f"{duration_days} D"
+
+
+def _to_ohlcv(bars, start: datetime, end: datetime) -> List[OHLCVBar]:
+    result = []
+    for bar in bars:
+        # Filter to requested time range
+        bar_time = bar.date
+        if isinstance(bar_time, str):
+            bar_time = datetime.strptime(bar_time, "%Y%m%d  %H:%M:%S")
+        # Strip timezone info for comparison with naive datetimes
+        if hasattr(bar_time, 'tzinfo') and bar_time.tzinfo is not None:
+            bar_time = bar_time.replace(tzinfo=None)
+
+        if start <= bar_time <= end:
+            result.append(OHLCVBar(
+                timestamp=bar_time,
+                open=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                volume=int(bar.volume),
+                vwap=getattr(bar, "average", None),
+            ))
+    return result
+
 
 class IBProvider(OHLCVDataProvider):
     """OHLCV data provider using Interactive Brokers via ib_insync."""
@@ -25,131 +165,149 @@ class IBProvider(OHLCVDataProvider):
         self.client_id = int(client_id or os.getenv("IB_CLIENT_ID", "1"))
         self._rate_limit_delay = float(os.getenv("IB_RATE_LIMIT_DELAY", rate_limit_delay))
         self.timeout_s = float(os.getenv("IB_TIMEOUT_S", timeout_s))
+        self.pacing_penalty_s = float(os.getenv("IB_PACING_PENALTY_S", "60"))
+        self.pacer = IBPacer(
+            max_requests=int(os.getenv("IB_PACING_MAX_REQUESTS", "60")),
+            window_s=float(os.getenv("IB_PACING_WINDOW_S", "600")),
+            max_in_flight=int(os.getenv("IB_MAX_IN_FLIGHT", "6")),
+        )
 
         self._ib = None
-        self._next_allowed_time = 0.0
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._contracts: Dict[str, object] = {}  # ticker -> qualified Contract (None = unknown)
 
     @property
     def rate_limit_delay(self) -> float:
         return self._rate_limit_delay
 
+    @property
+    def max_in_flight(self) -> int:
+        return self.pacer.max_in_flight
+
     def supports_extended_hours(self) -> bool:
         return True
 
-    def _sleep_for_rate_limit(self):
-        now = time.time()
-        if now < self._next_allowed_time:
-            time.sleep(self._next_allowed_time - now)
+    async def _aconnect(self):
+        """Connect to IB Gateway on the current loop if not already connected."""
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._ib is None:
+                try:
+                    from ib_insync import IB
+                except ImportError:
+                    raise ImportError("ib_insync is required for IB provider. Install with: pip install ib_insync")
+                self._ib = IB()
+                # Historical requests raise RequestError instead of returning empty bars
+                self._ib.RaiseRequestErrors = True
 
-    def _bump_next_allowed_time(self, extra_delay_s: float = 0.0):
-        now = time.time()
-        base = now + self._rate_limit_delay
-        extra = now + max(0.0, float(extra_delay_s))
-        self._next_allowed_time = max(self._next_allowed_time, base, extra)
-
-    def _connect(self):
-        """Connect to IB Gateway if not already connected."""
-        try:
-            from ib_insync import IB
-        except ImportError:
-            raise ImportError("ib_insync is required for IB provider. Install with: pip install ib_insync")
-
-        if self._ib is None:
-            self._ib = IB()
-
-        if not self._ib.isConnected():
-            logger.info(f"Connecting to {self.host}:{self.port} (client_id={self.client_id})...")
-            self._ib.connect(self.host, self.port, clientId=self.client_id, timeout=self.timeout_s)
-            logger.info("Connected")
+            if not self._ib.isConnected():
+                logger.info(f"Connecting to {self.host}:{self.port} (client_id={self.client_id})...")
+                await self._ib.connectAsync(self.host, self.port, clientId=self.client_id, timeout=self.timeout_s)
+                logger.info("Connected")
 
     def _disconnect(self):
         """Disconnect from IB Gateway."""
         if self._ib and self._ib.isConnected():
             self._ib.disconnect()
 
+    async def _qualified_contract(self, ticker: str):
+        """Qualified stock contract for ticker (cached), or None if IB doesn't know it.
+
+        Only IB's "no security definition" (error 200) is cached as unknown. An empty
+        result (ambiguous contract, failed lookup) raises, so the fetch is retried later.
+        """
+        if ticker in self._contracts:
+            return self._contracts[ticker]
+
+        from ib_insync import Stock
+        try:
+            qualified = await self._ib.qualifyContractsAsync(Stock(ticker, "SMART", "USD"))
+        except Exception as e:
+            if getattr(e, "code", None) != 200:  # 200 = no security definition
+                raise
+            self._contracts[ticker] = None
+            return None
+        if not qualified:
+            raise LookupError(f"IB could not qualify {ticker} (ambiguous or lookup failed)")
+        self._contracts[ticker] = qualified[0]
+        return qualified[0]
+
     def fetch_ohlcv(
         self,
         ticker: str,
         start: datetime,
         end: datetime,
         timespan: str = "minute",
-    ) -> List[OHLCVBar]:
-        try:
-            from ib_insync import Stock
-        except ImportError:
-            raise ImportError("ib_insync is required for IB provider. Install with: pip install ib_insync")
-
-        # Map timespan to IB bar size
-        bar_size_map = {
-            "minute": "1 min",
-            "hour": "1 hour",
-            "day": "1 day",
-        }
-        bar_size = bar_size_map.get(timespan, "1 min")
+    ) -> Optional[List[OHLCVBar]]:
+        # Runs on the shared fetcher's loop, which owns the IB connection
+        return get_async_fetcher(self).submit(FetchRequest(ticker, start, end, timespan)).result()
 
+    @cached_fetch
+    async def afetch_ohlcv(
+        self,
+        fetcher,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        bar_size = BAR_SIZES.get(timespan, "1 min")
         logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
 
         try:
-            self._sleep_for_rate_limit()
-            self._connect()
-
-            # Create contract
-            contract = Stock(ticker, "SMART", "USD")
-            self._ib.qualifyContracts(contract)
-
-            # Calculate duration string
-            duration_days = (end - start).days + 1
-            if duration_days <= 1:
-                duration_str = f"{int((end - start).total_seconds())} S"
-            elif duration_days <= 30:
-                duration_str = f"{duration_days} D"
-            else:
-                duration_str = f"{duration_days} D"
-
-            # Request historical data
+            await asyncio.wait_for(self._aconnect(), self.timeout_s)
+            contract = await asyncio.wait_for(self._qualified_contract(ticker), self.timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out preparing IB request for {ticker} after {self.timeout_s:.0f}s")
+            return None  # None = retry later
+        except Exception as e:
+            logger.error(f"Error preparing IB request for {ticker}: {e}")
+            return None  # None = retry later
+        if contract is None:
+            logger.debug(f"No IB contract for {ticker}")
+            return []
+
+        end_str = end.strftime("%Y%m%d %H:%M:%S")
+        duration_str = _duration_str(start, end)
+        await self.pacer.acquire(contract.conId, (contract.conId, end_str, duration_str, bar_size))
+        try:
             # Use RTH=False to include extended hours
-            bars = self._ib.reqHistoricalData(
-                contract,
-                endDateTime=end.strftime("%Y%m%d %H:%M:%S"),
-                durationStr=duration_str,
-                barSizeSetting=bar_size,
-                whatToShow="TRADES",
-                useRTH=False,  # Include extended hours
-                formatDate=1,
+            bars = await asyncio.wait_for(
+                self._ib.reqHistoricalDataAsync(
+                    contract,
+                    endDateTime=end_str,
+                    durationStr=duration_str,
+                    barSizeSetting=bar_size,
+                    whatToShow="TRADES",
+                    useRTH=False,
+                    formatDate=1,
+                    timeout=0,  # timed out here so a timeout is not mistaken for "no data"
+                ),
+                self.timeout_s,
             )
-
-            self._bump_next_allowed_time()
-
-            if not bars:
-                logger.debug(f"No data for {ticker}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out fetching {ticker} after {self.timeout_s:.0f}s")
+            return None  # None = retry later
+        except Exception as e:
+            code = getattr(e, "code", None)
+            message = str(getattr(e, "message", e))
+            if code == 162 and "pacing violation" in message.lower():
+                logger.warning(f"IB pacing violation on {ticker}; pausing requests {self.pacing_penalty_s:.0f}s")
+                self.pacer.penalize(self.pacing_penalty_s)
+                return None  # None = retry later
+            if code in _NO_DATA_ERRORS:
+                logger.debug(f"No data for {ticker}: {message}")
                 return []
+            logger.error(f"Error fetching {ticker}: {e}")
+            return None  # None = retry later
+        finally:
+            self.pacer.release()
 
-            result = []
-            for bar in bars:
-                # Filter to requested time range
-                bar_time = bar.date
-                if isinstance(bar_time, str):
-                    bar_time = datetime.strptime(bar_time, "%Y%m%d  %H:%M:%S")
-                # Strip timezone info for comparison with naive datetimes
-                if hasattr(bar_time, 'tzinfo') and bar_time.tzinfo is not None:
-                    bar_time = bar_time.replace(tzinfo=None)
-
-                if start <= bar_time <= end:
-                    result.append(OHLCVBar(
-                        timestamp=bar_time,
-                        open=bar.open,
-                        high=bar.high,
-                        low=bar.low,
-                        close=bar.close,
-                        volume=int(bar.volume),
-                        vwap=getattr(bar, "average", None),
-                    ))
-
-            return result
-
-        except Exception as e:
-            logger.error(f"Error fetching {ticker}: {e}", exc_info=True)
+        if not bars:
+            logger.debug(f"No data for {ticker}")
             return []
+        return _to_ohlcv(bars, start, end)
 
     def __del__(self):
         """Cleanup on deletion."""
@@ -4,10 +4,12 @@ import time
 import random
 import requests
 from datetime import datetime
-from email.utils import parsedate_to_datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from ..models import OHLCVBar
+from .async_fetcher import parse_retry_after
 from .base import OHLCVDataProvider
+from .columnar import OHLCVColumns, json_loads
+from .response_cache import cached_fetch
 
 logger = logging.getLogger(__name__)
 
@@ -23,13 +25,17 @@ class PolygonProvider(OHLCVDataProvider):
         rate_limit_delay: float = 12.0,
         max_retries: int = 8,
         timeout_s: float = 30.0,
+        base_url: Optional[str] = None,
     ):
         self.api_key = api_key or os.getenv("MASSIVE_API_KEY") or os.getenv("POLYGON_API_KEY")
+        # Override to point at a stand-in server (scripts/run_standin_server.py)
+        self.base_url = (base_url or os.getenv("MASSIVE_BASE_URL") or self.BASE_URL).rstrip("/")
         self._rate_limit_delay = float(os.getenv("MASSIVE_RATE_LIMIT_DELAY", rate_limit_delay))
         self.max_retries = int(os.getenv("MASSIVE_MAX_RETRIES", max_retries))
         self.timeout_s = float(os.getenv("MASSIVE_TIMEOUT_S", timeout_s))
         self.backoff_base_s = float(os.getenv("MASSIVE_BACKOFF_BASE_S", "2.0"))
         self.backoff_cap_s = float(os.getenv("MASSIVE_BACKOFF_CAP_S", "120.0"))
+        self._max_in_flight = int(os.getenv("MASSIVE_MAX_IN_FLIGHT", "1"))
 
         self._session = requests.Session()
         self._next_allowed_time = 0.0
@@ -47,6 +53,10 @@ class PolygonProvider(OHLCVDataProvider):
     def rate_limit_delay(self) -> float:
         return self._rate_limit_delay
 
+    @property
+    def max_in_flight(self) -> int:
+        return self._max_in_flight
+
     def supports_extended_hours(self) -> bool:
         return True
 
@@ -67,18 +77,7 @@ class PolygonProvider(OHLCVDataProvider):
         self._next_allowed_time = max(self._next_allowed_time, base, extra)
 
     def _parse_retry_after_seconds(self, response: requests.Response) -> Optional[float]:
-        ra = response.headers.get("Retry-After")
-        if not ra:
-            return None
-        ra = ra.strip()
-        try:
-            return float(ra)
-        except ValueError:
-            try:
-                dt = parsedate_to_datetime(ra)
-                return max(0.0, (dt - datetime.now(tz=dt.tzinfo)).total_seconds())
-            except Exception:
-                return None
+        return parse_retry_after(response.headers.get("Retry-After"))
 
     def _redact_params(self, params: Dict[str, Any]) -> Dict[str, Any]:
         redacted = dict(params)
@@ -86,28 +85,69 @@ class PolygonProvider(OHLCVDataProvider):
             redacted["apiKey"] = "REDACTED"
         return redacted
 
-    def fetch_ohlcv(
-        self,
-        ticker: str,
-        start: datetime,
-        end: datetime,
-        timespan: str = "minute",
-    ) -> Optional[List[OHLCVBar]]:
+    def _build_request(self, ticker: str, start: datetime, end: datetime, timespan: str) -> Tuple[str, Dict[str, Any]]:
         if not self.api_key:
             raise ValueError("Polygon API key not set. Set POLYGON_API_KEY or MASSIVE_API_KEY in .env")
 
         start_ms = int(start.timestamp() * 1000)
         end_ms = int(end.timestamp() * 1000)
 
-        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
-
-        url = f"{self.BASE_URL}/v2/aggs/ticker/{ticker}/range/1/{timespan}/{start_ms}/{end_ms}"
+        url = f"{self.base_url}/v2/aggs/ticker/{ticker}/range/1/{timespan}/{start_ms}/{end_ms}"
         params = {
             "adjusted": "true",
             "sort": "asc",
             "limit": 50000,
             "apiKey": self.api_key,
         }
+        return url, params
+
+    def _parse_bars(self, ticker: str, data: Dict[str, Any]) -> List[OHLCVBar]:
+        if data.get("status") != "OK" or "results" not in data:
+            logger.debug(f"No data for {ticker}: status={data.get('status')}, results_count={data.get('resultsCount', 0)}")
+            return []
+
+        return OHLCVColumns.from_polygon(data["results"]).to_bars()
+
+    @cached_fetch
+    async def afetch_ohlcv(
+        self,
+        fetcher,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        url, params = self._build_request(ticker, start, end, timespan)
+        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
+
+        result = await fetcher.get_json(
+            url,
+            params=params,
+            label=ticker,
+            max_retries=self.max_retries,
+            timeout_s=self.timeout_s,
+            backoff_base_s=self.backoff_base_s,
+            backoff_cap_s=self.backoff_cap_s,
+        )
+        if result is None:
+            return None  # None = retry later
+        status, data = result
+        if status != 200:
+            logger.error(f"Error fetching {ticker}: HTTP {status}")
+            return None  # None = retry later
+        return self._parse_bars(ticker, data)
+
+    @cached_fetch
+    def fetch_ohlcv(
+        self,
+        ticker: str,
+        start: datetime,
+        end: datetime,
+        timespan: str = "minute",
+    ) -> Optional[List[OHLCVBar]]:
+        url, params = self._build_request(ticker, start, end, timespan)
+
+        logger.info(f"Fetching {ticker} from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}")
 
         safe_params = self._redact_params(params)
 
@@ -135,25 +175,7 @@ class PolygonProvider(OHLCVDataProvider):
                     logger.error(f"Error fetching {ticker}: {response.status_code} {response.reason}")
                     return None  # None = retry later
 
-                data = response.json()
-
-                if data.get("status") != "OK" or "results" not in data:
-                    logger.debug(f"No data for {ticker}: status={data.get('status')}, results_count={data.get('resultsCount', 0)}")
-                    return []
-
-                bars = []
-                for result in data["results"]:
-                    bars.append(OHLCVBar(
-                        timestamp=datetime.fromtimestamp(result["t"] / 1000),
-                        open=result["o"],
-                        high=result["h"],
-                        low=result["l"],
-                        close=result["c"],
-                        volume=result["v"],
-                        vwap=result.get("vw"),
-                    ))
-
-                return bars
+                return self._parse_bars(ticker, json_loads(response.content))
 
             except requests.RequestException as e:
                 if attempt < self.max_retries - 1:
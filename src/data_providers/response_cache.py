@@ -0,0 +1,216 @@
+"""On-disk cache of provider OHLCV responses.
+
+Re-running a backfill or a bad-data investigation used to hit Polygon/Alpaca again for
+bars that can no longer change. Provider fetch methods decorated with @cached_fetch
+look responses up by a content hash of (provider, ticker, timespan, start, end,
+adjustment) first. Each entry is one gzip'd JSON file holding the bars as columns.
+
+Entries for sessions that had closed when they were fetched never expire. Anything
+that could still change (today's bars, or fetched before the provider's delay had
+passed) expires after OHLCV_RESPONSE_CACHE_TTL seconds. Failed fetches (None) are
+never cached.
+
+OHLCV_RESPONSE_CACHE_OFFLINE=1 serves from the cache only: a miss is a failed fetch
+instead of an API call, so tests and investigations can run against recorded responses.
+"""
+
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..models import OHLCVBar, get_et_date
+from .columnar import OHLCVColumns, json_loads
+
+logger = logging.getLogger(__name__)
+
+OHLCV_RESPONSE_CACHE = os.getenv("OHLCV_RESPONSE_CACHE", "1") == "1"
+OHLCV_RESPONSE_CACHE_DIR = Path(
+    os.getenv("OHLCV_RESPONSE_CACHE_DIR", str(Path(__file__).parent.parent.parent / "data" / "ohlcv_cache"))
+)
+OHLCV_RESPONSE_CACHE_TTL = float(os.getenv("OHLCV_RESPONSE_CACHE_TTL", "60"))
+OHLCV_RESPONSE_CACHE_OFFLINE = os.getenv("OHLCV_RESPONSE_CACHE_OFFLINE", "0") == "1"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _naive_utc(dt: datetime) -> datetime:
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _encode_bars(bars: List[OHLCVBar]) -> Dict[str, list]:
+    return {
+        "t": [(bar.timestamp - _EPOCH) // timedelta(milliseconds=1) for bar in bars],
+        "o": [bar.open for bar in bars],
+        "h": [bar.high for bar in bars],
+        "l": [bar.low for bar in bars],
+        "c": [bar.close for bar in bars],
+        "v": [bar.volume for bar in bars],
+        "vw": [bar.vwap for bar in bars],
+    }
+
+
+def _decode_bars(columns: Dict[str, list]) -> List[OHLCVBar]:
+    return OHLCVColumns.from_epoch_ms(columns).to_bars()
+
+
+class ResponseCache:
+    """Content-addressed response files under one directory, with hit/miss counters."""
+
+    def __init__(
+        self,
+        directory: Path = OHLCV_RESPONSE_CACHE_DIR,
+        enabled: bool = OHLCV_RESPONSE_CACHE,
+        ttl: float = OHLCV_RESPONSE_CACHE_TTL,
+        offline: bool = OHLCV_RESPONSE_CACHE_OFFLINE,
+    ):
+        self.directory = Path(directory)
+        self.enabled = enabled or offline
+        self.ttl = ttl
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0}
+
+    @staticmethod
+    def key(provider, ticker: str, start: datetime, end: datetime, timespan: str) -> str:
+        parts = [
+            provider.name,
+            ticker.upper(),
+            timespan,
+            _naive_utc(start).isoformat(),
+            _naive_utc(end).isoformat(),
+            provider.adjustment,
+        ]
+        # Responses from a stand-in server (base URL override) never mix with real ones
+        base_url = getattr(provider, "base_url", None)
+        if base_url and base_url != getattr(provider, "BASE_URL", base_url):
+            parts.append(base_url)
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def get(self, provider, ticker: str, start: datetime, end: datetime, timespan: str) -> Optional[List[OHLCVBar]]:
+        """Cached bars ([] is a cached "no data"), or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(provider, self.key(provider, ticker, start, end, timespan))
+        try:
+            with gzip.open(path, "rb") as f:
+                payload = json_loads(f.read())
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable response cache entry {path.name}: {e}")
+            self._count("misses")
+            return None
+
+        expires_at = payload.get("expires_at")
+        if expires_at is not None and time.time() >= expires_at:
+            self._count("expired")
+            self._count("misses")
+            return None
+        self._count("hits")
+        return _decode_bars(payload["columns"])
+
+    def put(self, provider, ticker: str, start: datetime, end: datetime, timespan: str,
+            bars: Optional[List[OHLCVBar]]) -> None:
+        """Store a successful response (None is never cached)."""
+        if not self.enabled or bars is None:
+            return
+
+        # Final once the ET session containing `end` had closed (plus the provider's
+        # publication delay) when the data was fetched
+        available_as_of = datetime.utcnow() - timedelta(minutes=provider.min_delay_minutes)
+        immutable = get_et_date(available_as_of) > get_et_date(_naive_utc(end))
+        payload = {
+            "provider": provider.name,
+            "ticker": ticker,
+            "timespan": timespan,
+            "start": _naive_utc(start).isoformat(),
+            "end": _naive_utc(end).isoformat(),
+            "adjustment": provider.adjustment,
+            "fetched_at": datetime.utcnow().isoformat(),
+            "expires_at": None if immutable else time.time() + self.ttl,
+            "columns": _encode_bars(bars),
+        }
+
+        path = self._path(provider, self.key(provider, ticker, start, end, timespan))
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with gzip.open(tmp_path, "wt") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._count("stores")
+        except OSError as e:
+            logger.warning(f"Failed to write response cache entry for {ticker}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since start (hits, misses, expired, stores)."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _path(self, provider, key: str) -> Path:
+        return self.directory / provider.name / key[:2] / f"{key}.json.gz"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+
+def _offline_miss(ticker: str) -> None:
+    logger.warning(f"No recorded response for {ticker} (offline response cache)")
+    return None
+
+
+def cached_fetch(fn):
+    """Serve a provider's fetch_ohlcv / afetch_ohlcv from the response cache."""
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(self, fetcher, ticker, start, end, timespan="minute"):
+            cache = get_response_cache()
+            bars = cache.get(self, ticker, start, end, timespan)
+            if bars is not None or cache.offline:
+                return bars if bars is not None else _offline_miss(ticker)
+            bars = await fn(self, fetcher, ticker, start, end, timespan)
+            cache.put(self, ticker, start, end, timespan, bars)
+            return bars
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(self, ticker, start, end, timespan="minute"):
+        cache = get_response_cache()
+        bars = cache.get(self, ticker, start, end, timespan)
+        if bars is not None or cache.offline:
+            return bars if bars is not None else _offline_miss(ticker)
+        bars = fn(self, ticker, start, end, timespan)
+        cache.put(self, ticker, start, end, timespan, bars)
+        return bars
+    return wrapper
+
+
+# Global instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global provider response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Replace the global cache (tests, or a one-off directory for an investigation)."""
+    global _response_cache
+    _response_cache = cache
@@ -1,10 +1,10 @@
 """PostgreSQL database models and connection."""
 
 import os
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
-from sqlalchemy import create_engine, Column, Integer, Float, String, Boolean, DateTime, Text, Index, UniqueConstraint, ForeignKey
+from sqlalchemy import create_engine, event, text, Column, BigInteger, Integer, Float, String, Boolean, Date, DateTime, Text, Index, UniqueConstraint, ForeignKey
 from sqlalchemy.orm import declarative_base, sessionmaker
 from dotenv import load_dotenv
 
@@ -32,6 +32,18 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine for the live trading loop (asyncpg). Created lazily so processes that
+# never touch it (dashboard, scripts) don't need asyncpg. The pool is deliberately
+# small and the statement timeout short: a slow query should fail fast rather than
+# hold connections the quote loop is waiting on.
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "4"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "2"))
+ASYNC_DB_POOL_TIMEOUT = float(os.getenv("ASYNC_DB_POOL_TIMEOUT", "5"))
+ASYNC_DB_STATEMENT_TIMEOUT_MS = int(os.getenv("ASYNC_DB_STATEMENT_TIMEOUT_MS", "5000"))
+
+_async_engine = None
+_async_sessionmaker = None
+
 
 class AnnouncementDB(Base):
     """Announcement record in PostgreSQL."""
@@ -96,17 +108,29 @@ class AnnouncementDB(Base):
     # Blacklist flag (for excluding problematic announcements like reverse splits)
     is_blacklisted = Column(Boolean, default=False)
 
+    # Derived from timestamp at save time (see PostgresClient._announcement_to_dict)
+    market_session = Column(String(20))  # premarket | market | postmarket | closed
+    et_date = Column(Date)  # Calendar date in Eastern Time
+    effective_start = Column(DateTime)  # Naive UTC start of the OHLCV window
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
 
     __table_args__ = (
         UniqueConstraint('ticker', 'timestamp', name='uq_ticker_timestamp'),
         Index('ix_announcements_ticker_timestamp', 'ticker', 'timestamp'),
+        Index('ix_announcements_source_session', 'source', 'market_session'),
+        Index('ix_announcements_et_date', 'et_date'),
     )
 
 
 class OHLCVBarDB(Base):
-    """OHLCV bar record in PostgreSQL."""
+    """OHLCV bar record in PostgreSQL.
+
+    create_all() builds a plain heap table. migrate_ohlcv_bars_to_partitions() converts it
+    to monthly range partitions on timestamp (BRIN on timestamp, local B-trees on
+    (ticker, timestamp)); the ORM mapping works unchanged against either layout.
+    """
     __tablename__ = "ohlcv_bars"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -131,6 +155,62 @@ class OHLCVBarDB(Base):
     )
 
 
+class DailyBarDB(Base):
+    """Regular-session daily bar per ticker and NYSE session, cached for premarket features.
+
+    A row with NULL prices records a session the provider had no bar for, so it isn't
+    requested again. The premarket columns are filled separately from minute bars.
+    """
+    __tablename__ = "daily_bars"
+
+    ticker = Column(String(10), primary_key=True)
+    session_date = Column(Date, primary_key=True)
+    open = Column(Float)
+    high = Column(Float)
+    low = Column(Float)
+    close = Column(Float)
+    volume = Column(BigInteger)
+
+    premarket_volume = Column(BigInteger)  # sum volume 04:00-09:30 ET
+    premarket_dollar_volume = Column(Float)  # sum(volume * vwap/close) 04:00-09:30 ET
+
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BackfillJobDB(Base):
+    """OHLCV backfill job for one announcement (see src/backfill_jobs.py).
+
+    state: pending -> running -> done | no_data | failed; failed attempts go back to
+    pending with a later next_attempt_at until max_attempts is reached.
+    """
+    __tablename__ = "backfill_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticker = Column(String(10), nullable=False)
+    announcement_timestamp = Column(DateTime, nullable=False)
+
+    backend = Column(String(20))  # provider override, NULL = DATA_BACKEND
+    replace = Column(Boolean, nullable=False, default=False)  # drop the announcement's stored bars first
+    priority = Column(Integer, nullable=False, default=0)  # higher first, then most recent announcement
+
+    state = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(DateTime)
+    last_error = Column(Text)
+    bars = Column(Integer)
+
+    locked_by = Column(String(64))
+    locked_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('ticker', 'announcement_timestamp', name='uq_backfill_job_announcement'),
+        Index('ix_backfill_jobs_claim', 'state', 'priority', 'announcement_timestamp'),
+    )
+
+
 class TradeDB(Base):
     """Completed trade record for live/paper trading."""
     __tablename__ = "trades"
@@ -167,6 +247,9 @@ class TradeDB(Base):
     __table_args__ = (
         Index('ix_trades_entry_time', 'entry_time'),
         Index('ix_trades_paper', 'paper'),
+        # Keyset pagination (entry_time DESC, id DESC) with the common filters
+        Index('ix_trades_paper_entry_id', 'paper', 'entry_time', 'id'),
+        Index('ix_trades_strategy_name_entry_id', 'strategy_name', 'entry_time', 'id'),
     )
 
 
@@ -229,6 +312,27 @@ class LiveBarDB(Base):
     )
 
 
+class LiveBarMinuteDB(Base):
+    """1-minute rollup of live_bars, kept after the 1-second bars age out (see src/retention.py)."""
+    __tablename__ = "live_bars_1m"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    ticker = Column(String(10), nullable=False)
+    timestamp = Column(DateTime, nullable=False)  # Minute start (UTC)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(Integer, nullable=False)
+
+    strategy_id = Column(String(36), nullable=True, index=True)
+
+    __table_args__ = (
+        UniqueConstraint('ticker', 'timestamp', name='uq_live_bar_1m_ticker_timestamp'),
+    )
+
+
 class ActiveTradeDB(Base):
     """Active trade position - persisted for recovery across restarts."""
     __tablename__ = "active_trades"
@@ -479,14 +583,147 @@ class TraceEventDB(Base):
     event_timestamp = Column(DateTime, nullable=False)  # When event occurred
     created_at = Column(DateTime, default=datetime.utcnow)  # When recorded
 
+    # Client-generated UUID, so a write replayed from the TraceStore spill file is a no-op
+    event_key = Column(String(36), nullable=True)
+
     __table_args__ = (
+        Index('uq_trace_events_event_key', 'event_key', unique=True),
         Index('ix_trace_events_trace', 'trace_id'),
         Index('ix_trace_events_type', 'event_type'),
         Index('ix_trace_events_timestamp', 'event_timestamp'),
         Index('ix_trace_events_strategy', 'strategy_id'),
+        # First-strategy lookup per trace (TraceStore.get_trace_summaries)
+        Index('ix_trace_events_trace_ts', 'trace_id', 'event_timestamp'),
     )
 
 
+class TraceFunnelDailyDB(Base):
+    """Trace counts per ET day and status, maintained by a trigger on traces."""
+    __tablename__ = "trace_funnel_daily"
+
+    day = Column(Date, primary_key=True)  # ET date of alert_timestamp
+    status = Column(String(30), primary_key=True)
+    traces = Column(Integer, nullable=False, default=0)
+
+    # Completed traces only
+    winners = Column(Integer, nullable=False, default=0)
+    losers = Column(Integer, nullable=False, default=0)
+    pnl = Column(Float, nullable=False, default=0.0)
+
+
+class TraceRejectionDailyDB(Base):
+    """Filter rejection counts per ET day, strategy and reason, maintained by a trigger on trace_events."""
+    __tablename__ = "trace_rejection_daily"
+
+    day = Column(Date, primary_key=True)  # ET date of event_timestamp
+    strategy_id = Column(String(36), primary_key=True)  # '' when the event has none
+    reason = Column(Text, primary_key=True)  # 'Unknown' when the event has none
+    rejections = Column(Integer, nullable=False, default=0)
+
+
+# Counters are kept in the same transaction as the row change, so they can't drift from
+# whatever writes traces (TraceStore batches, scripts, manual fixes). Deletes are not
+# counted: retention archiving removes old traces but their counts stay in the funnel.
+_TRACE_COUNTER_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION trace_funnel_count() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.status IS NOT DISTINCT FROM OLD.status
+           AND NEW.pnl IS NOT DISTINCT FROM OLD.pnl
+           AND NEW.alert_timestamp IS NOT DISTINCT FROM OLD.alert_timestamp THEN
+            RETURN NULL;
+        END IF;
+        UPDATE trace_funnel_daily SET
+            traces = traces - 1,
+            winners = winners - COALESCE(OLD.status = 'completed' AND OLD.pnl > 0, false)::int,
+            losers = losers - COALESCE(OLD.status = 'completed' AND OLD.pnl < 0, false)::int,
+            pnl = pnl - CASE WHEN OLD.status = 'completed' THEN COALESCE(OLD.pnl, 0) ELSE 0 END
+        WHERE day = timezone('America/New_York', timezone('UTC', OLD.alert_timestamp))::date
+          AND status = OLD.status;
+    END IF;
+    INSERT INTO trace_funnel_daily AS f (day, status, traces, winners, losers, pnl)
+    VALUES (
+        timezone('America/New_York', timezone('UTC', NEW.alert_timestamp))::date,
+        NEW.status,
+        1,
+        COALESCE(NEW.status = 'completed' AND NEW.pnl > 0, false)::int,
+        COALESCE(NEW.status = 'completed' AND NEW.pnl < 0, false)::int,
+        CASE WHEN NEW.status = 'completed' THEN COALESCE(NEW.pnl, 0) ELSE 0 END
+    )
+    ON CONFLICT (day, status) DO UPDATE SET
+        traces = f.traces + EXCLUDED.traces,
+        winners = f.winners + EXCLUDED.winners,
+        losers = f.losers + EXCLUDED.losers,
+        pnl = f.pnl + EXCLUDED.pnl;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION trace_rejection_count() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO trace_rejection_daily AS r (day, strategy_id, reason, rejections)
+    VALUES (
+        timezone('America/New_York', timezone('UTC', NEW.event_timestamp))::date,
+        COALESCE(NEW.strategy_id, ''),
+        COALESCE(NEW.reason, 'Unknown'),
+        1
+    )
+    ON CONFLICT (day, strategy_id, reason) DO UPDATE SET rejections = r.rejections + 1;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# Triggers are created once; creating them backfills the counters from existing rows in
+# the same transaction (CREATE TRIGGER blocks writes to the table until commit).
+_TRACE_COUNTER_TRIGGERS_SQL = """
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_traces_funnel_count') THEN
+        CREATE TRIGGER trg_traces_funnel_count
+            AFTER INSERT OR UPDATE OF status, pnl, alert_timestamp ON traces
+            FOR EACH ROW EXECUTE FUNCTION trace_funnel_count();
+        DELETE FROM trace_funnel_daily;
+        INSERT INTO trace_funnel_daily (day, status, traces, winners, losers, pnl)
+        SELECT
+            timezone('America/New_York', timezone('UTC', alert_timestamp))::date AS day,
+            status,
+            count(*),
+            count(*) FILTER (WHERE status = 'completed' AND pnl > 0),
+            count(*) FILTER (WHERE status = 'completed' AND pnl < 0),
+            COALESCE(sum(pnl) FILTER (WHERE status = 'completed'), 0)
+        FROM traces
+        GROUP BY 1, 2;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'trg_trace_events_rejection_count') THEN
+        CREATE TRIGGER trg_trace_events_rejection_count
+            AFTER INSERT ON trace_events
+            FOR EACH ROW WHEN (NEW.event_type = 'filter_rejected')
+            EXECUTE FUNCTION trace_rejection_count();
+        DELETE FROM trace_rejection_daily;
+        INSERT INTO trace_rejection_daily (day, strategy_id, reason, rejections)
+        SELECT
+            timezone('America/New_York', timezone('UTC', event_timestamp))::date AS day,
+            COALESCE(strategy_id, ''),
+            COALESCE(reason, 'Unknown'),
+            count(*)
+        FROM trace_events
+        WHERE event_type = 'filter_rejected'
+        GROUP BY 1, 2, 3;
+    END IF;
+END
+$$;
+"""
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_trace_counter_triggers(target, connection, **kw):
+    """Install the trace counter triggers whenever the schema is created (init_db, tests)."""
+    connection.execute(text(_TRACE_COUNTER_FUNCTIONS_SQL))
+    connection.execute(text(_TRACE_COUNTER_TRIGGERS_SQL))
+
+
 def init_db():
     """Create all tables and run migrations."""
     Base.metadata.create_all(bind=engine)
@@ -533,6 +770,26 @@ def init_db():
                 conn.execute(text("ALTER TABLE announcements ADD COLUMN ohlcv_status VARCHAR(20) DEFAULT 'pending'"))
                 conn.commit()
 
+    # Migration: Add precomputed session/date columns to announcements if missing
+    # (populate existing rows with scripts/backfill_market_session.py)
+    if 'announcements' in inspector.get_table_names():
+        columns = [c['name'] for c in inspector.get_columns('announcements')]
+        with engine.connect() as conn:
+            if 'market_session' not in columns:
+                conn.execute(text("ALTER TABLE announcements ADD COLUMN market_session VARCHAR(20)"))
+            if 'et_date' not in columns:
+                conn.execute(text("ALTER TABLE announcements ADD COLUMN et_date DATE"))
+            if 'effective_start' not in columns:
+                conn.execute(text("ALTER TABLE announcements ADD COLUMN effective_start TIMESTAMP"))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_announcements_source_session "
+                "ON announcements (source, market_session)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_announcements_et_date ON announcements (et_date)"
+            ))
+            conn.commit()
+
     # Migration: Add trade_id column to active_trades if missing
     if 'active_trades' in inspector.get_table_names():
         columns = [c['name'] for c in inspector.get_columns('active_trades')]
@@ -578,17 +835,50 @@ def init_db():
     # Performance: indexes for dashboard bulk loads (safe to run multiple times)
     if 'ohlcv_bars' in inspector.get_table_names():
         with engine.connect() as conn:
-            # Helps get_ohlcv_bars_bulk() (filter by announcement key, ordered by bar timestamp)
+            partitioned = is_ohlcv_partitioned(conn)
+            if partitioned:
+                # Keep a couple of future months ready so inserts never land in the default partition
+                today = datetime.utcnow().date()
+                ensure_ohlcv_partitions(conn, today, add_months(today, OHLCV_PARTITION_MONTHS_AHEAD))
+            else:
+                # Helps get_ohlcv_bars_bulk() (filter by announcement key, ordered by bar timestamp)
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_ohlcv_announcement_ts "
+                    "ON ohlcv_bars (announcement_ticker, announcement_timestamp, timestamp)"
+                ))
+                # Covering index for index-only scans (saves heap fetches during large dashboard loads)
+                # Note: this increases index size; worth it for fast bulk reads.
+                # (the partitioned layout has its own, ix_ohlcv_part_announcement_ts_cover)
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_ohlcv_announcement_ts_cover "
+                    "ON ohlcv_bars (announcement_ticker, announcement_timestamp, timestamp) "
+                    "INCLUDE (\"open\", high, low, \"close\", volume, vwap)"
+                ))
+            conn.commit()
+
+    if 'trades' in inspector.get_table_names():
+        with engine.connect() as conn:
+            # Keyset pagination on the trades page (see TradeStore.get_trades)
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_trades_paper_entry_id ON trades (paper, entry_time, id)"
+            ))
+            conn.execute(text(
+                "CREATE INDEX IF NOT EXISTS ix_trades_strategy_name_entry_id "
+                "ON trades (strategy_name, entry_time, id)"
+            ))
+            conn.commit()
+
+    if 'trace_events' in inspector.get_table_names():
+        columns = [c['name'] for c in inspector.get_columns('trace_events')]
+        with engine.connect() as conn:
+            # Migration: idempotency key for replayed trace events (see TraceStore)
+            if 'event_key' not in columns:
+                conn.execute(text("ALTER TABLE trace_events ADD COLUMN event_key VARCHAR(36)"))
             conn.execute(text(
-                "CREATE INDEX IF NOT EXISTS ix_ohlcv_announcement_ts "
-                "ON ohlcv_bars (announcement_ticker, announcement_timestamp, timestamp)"
+                "CREATE UNIQUE INDEX IF NOT EXISTS uq_trace_events_event_key ON trace_events (event_key)"
             ))
-            # Covering index for index-only scans (saves heap fetches during large dashboard loads)
-            # Note: this increases index size; worth it for fast bulk reads.
             conn.execute(text(
-                "CREATE INDEX IF NOT EXISTS ix_ohlcv_announcement_ts_cover "
-                "ON ohlcv_bars (announcement_ticker, announcement_timestamp, timestamp) "
-                "INCLUDE (\"open\", high, low, \"close\", volume, vwap)"
+                "CREATE INDEX IF NOT EXISTS ix_trace_events_trace_ts ON trace_events (trace_id, event_timestamp)"
             ))
             conn.commit()
 
@@ -602,6 +892,252 @@ def init_db():
             conn.commit()
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# OHLCV bar partitioning
+# ─────────────────────────────────────────────────────────────────────────────
+
+OHLCV_PARTITION_MONTHS_AHEAD = 2
+
+
+def month_start(d) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d, months: int) -> date:
+    month_index = d.year * 12 + (d.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def ohlcv_partition_name(month: date) -> str:
+    """Partition table name for a month, e.g. ohlcv_bars_y2025m01."""
+    return f"ohlcv_bars_y{month.year:04d}m{month.month:02d}"
+
+
+def is_ohlcv_partitioned(conn) -> bool:
+    """True if ohlcv_bars is a declaratively partitioned table."""
+    from sqlalchemy import text
+    return bool(conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p "
+        "JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'ohlcv_bars' AND pg_table_is_visible(c.oid)"
+    )).first())
+
+
+def ensure_ohlcv_partitions(conn, start, end, table: str = "ohlcv_bars") -> List[str]:
+    """Create monthly partitions of `table` covering [start, end] if they don't exist.
+
+    Indexes declared on the parent (BRIN on timestamp, B-trees on (ticker, timestamp) and
+    the announcement key) are created on each new partition automatically. Rows for a
+    new month that already landed in the DEFAULT partition are moved into it (Postgres
+    refuses to create the partition otherwise): the DEFAULT partition is detached, the
+    rows re-inserted through the parent, and the DEFAULT partition reattached, all in
+    one transaction.
+    Returns the names of partitions that were created.
+    """
+    from sqlalchemy import text
+
+    default = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT'"
+    ), {"table": table}).scalar()
+
+    created = []
+    month = month_start(start)
+    last = month_start(end)
+    while month <= last:
+        name = ohlcv_partition_name(month)
+        exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is None:
+            nxt = add_months(month, 1)
+            bounds = {"lo": month, "hi": nxt}
+            stranded = default is not None and conn.execute(text(
+                f"SELECT 1 FROM {default} WHERE timestamp >= :lo AND timestamp < :hi LIMIT 1"
+            ), bounds).first()
+            if stranded:
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{nxt.isoformat()}')"
+            ))
+            if stranded:
+                conn.execute(text(
+                    f"WITH moved AS (DELETE FROM {default} WHERE timestamp >= :lo AND timestamp < :hi "
+                    f"RETURNING *) INSERT INTO {table} SELECT * FROM moved"
+                ), bounds)
+                conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+            conn.commit()
+            created.append(name)
+        month = add_months(month, 1)
+    conn.commit()
+    return created
+
+
+def migrate_ohlcv_bars_to_partitions(batch_months: int = 1) -> bool:
+    """Convert ohlcv_bars from a single heap into monthly range partitions.
+
+    Builds ohlcv_bars_partitioned alongside the existing table, copies the data one
+    month at a time, then swaps names in a single transaction. The old table is kept as
+    ohlcv_bars_legacy until it's dropped manually. Returns False if already partitioned.
+    """
+    from sqlalchemy import text
+
+    with engine.connect() as conn:
+        if is_ohlcv_partitioned(conn):
+            return False
+
+        bounds = conn.execute(text("SELECT MIN(timestamp), MAX(timestamp) FROM ohlcv_bars")).first()
+        max_id = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM ohlcv_bars")).scalar()
+
+        # Partitioned tables need the partition key in every unique constraint, so the
+        # primary key becomes (id, timestamp); id stays unique via its sequence.
+        conn.execute(text("""
+            CREATE TABLE ohlcv_bars_partitioned (
+                id BIGSERIAL NOT NULL,
+                ticker VARCHAR(10) NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                "open" DOUBLE PRECISION NOT NULL,
+                high DOUBLE PRECISION NOT NULL,
+                low DOUBLE PRECISION NOT NULL,
+                "close" DOUBLE PRECISION NOT NULL,
+                volume INTEGER NOT NULL,
+                vwap DOUBLE PRECISION,
+                announcement_ticker VARCHAR(10),
+                announcement_timestamp TIMESTAMP,
+                PRIMARY KEY (id, timestamp),
+                CONSTRAINT uq_ohlcv_part_ticker_timestamp UNIQUE (ticker, timestamp)
+            ) PARTITION BY RANGE (timestamp)
+        """))
+        conn.execute(text(
+            "CREATE INDEX ix_ohlcv_part_timestamp_brin ON ohlcv_bars_partitioned "
+            "USING brin (timestamp)"
+        ))
+        conn.execute(text(
+            "CREATE INDEX ix_ohlcv_part_announcement_ts_cover ON ohlcv_bars_partitioned "
+            "(announcement_ticker, announcement_timestamp, timestamp) "
+            "INCLUDE (\"open\", high, low, \"close\", volume, vwap)"
+        ))
+        conn.execute(text("CREATE TABLE ohlcv_bars_default PARTITION OF ohlcv_bars_partitioned DEFAULT"))
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('ohlcv_bars_partitioned', 'id'), :v, true)"
+        ), {"v": max(int(max_id or 0), 1)})
+        conn.commit()
+
+        if bounds and bounds[0] is not None:
+            first, last = bounds
+            ensure_ohlcv_partitions(
+                conn, first, add_months(last, OHLCV_PARTITION_MONTHS_AHEAD),
+                table="ohlcv_bars_partitioned",
+            )
+            month = month_start(first)
+            while month <= month_start(last):
+                nxt = add_months(month, batch_months)
+                conn.execute(text(
+                    "INSERT INTO ohlcv_bars_partitioned "
+                    "SELECT id, ticker, timestamp, \"open\", high, low, \"close\", volume, vwap, "
+                    "announcement_ticker, announcement_timestamp "
+                    "FROM ohlcv_bars WHERE timestamp >= :lo AND timestamp < :hi"
+                ), {"lo": month, "hi": nxt})
+                conn.commit()
+                month = nxt
+
+        # Swap: block writers briefly, copy any rows that arrived during the backfill, rename
+        conn.execute(text("LOCK TABLE ohlcv_bars IN EXCLUSIVE MODE"))
+        conn.execute(text(
+            "INSERT INTO ohlcv_bars_partitioned "
+            "SELECT id, ticker, timestamp, \"open\", high, low, \"close\", volume, vwap, "
+            "announcement_ticker, announcement_timestamp "
+            "FROM ohlcv_bars WHERE id > :max_id "
+            "ON CONFLICT (ticker, timestamp) DO NOTHING"
+        ), {"max_id": int(max_id or 0)})
+        # The sequence was set from the starting max_id; move it past the caught-up rows
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('ohlcv_bars_partitioned', 'id'), "
+            "(SELECT COALESCE(MAX(id), 1) FROM ohlcv_bars_partitioned), true)"
+        ))
+        conn.execute(text("ALTER TABLE ohlcv_bars RENAME TO ohlcv_bars_legacy"))
+        conn.execute(text("ALTER TABLE ohlcv_bars_partitioned RENAME TO ohlcv_bars"))
+        conn.commit()
+    return True
+
+
+def detach_ohlcv_partitions(before, drop: bool = False) -> List[str]:
+    """Detach (and optionally drop) monthly ohlcv_bars partitions that end before `before`.
+
+    Detached partitions stay as standalone tables so they can be archived (e.g. exported
+    to Parquet) before being dropped. Returns the affected partition names.
+    """
+    from sqlalchemy import text
+
+    cutoff = month_start(before)
+    affected = []
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'ohlcv_bars' AND c.relname LIKE 'ohlcv_bars_y%'"
+        )).fetchall()
+        for (name,) in sorted(rows):
+            month = date(int(name[12:16]), int(name[17:19]), 1)
+            if add_months(month, 1) > cutoff:
+                continue
+            conn.execute(text(f"ALTER TABLE ohlcv_bars DETACH PARTITION {name}"))
+            if drop:
+                conn.execute(text(f"DROP TABLE {name}"))
+            affected.append(name)
+        conn.commit()
+    return affected
+
+
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """DATABASE_URL rewritten for the asyncpg driver."""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgresql", "postgres", "postgresql+psycopg2"):
+        scheme = "postgresql+asyncpg"
+    return f"{scheme}{sep}{rest}"
+
+
+def get_async_engine():
+    """Get the shared async engine (created on first use; requires asyncpg)."""
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        _async_engine = create_async_engine(
+            get_async_database_url(),
+            pool_pre_ping=True,
+            pool_size=ASYNC_DB_POOL_SIZE,
+            max_overflow=ASYNC_DB_MAX_OVERFLOW,
+            pool_timeout=ASYNC_DB_POOL_TIMEOUT,
+            connect_args={
+                "timeout": 10,
+                "server_settings": {"statement_timeout": str(ASYNC_DB_STATEMENT_TIMEOUT_MS)},
+            },
+        )
+    return _async_engine
+
+
+def get_async_sessionmaker():
+    """Get the async session factory bound to the shared async engine."""
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_sessionmaker = async_sessionmaker(get_async_engine(), expire_on_commit=False)
+    return _async_sessionmaker
+
+
+async def dispose_async_engine() -> None:
+    """Close pooled async connections (call from the loop that used them)."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_sessionmaker = None
+
+
 def get_db():
     """Get database session."""
     db = SessionLocal()
@@ -7,14 +7,16 @@ using DuckDB for 10-100x faster analytical queries.
 
 import logging
 import os
-from datetime import datetime
+import zlib
+from collections import defaultdict
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import duckdb
 import pandas as pd
 
-from .models import Announcement, OHLCVBar
+from .models import Announcement, OHLCVBar, resolve_announcement_fields
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +57,54 @@ class LazyBarList:
 
 PARQUET_DIR = Path(__file__).parent.parent / "data" / "parquet"
 
+# Partitioned OHLCV layout: <parquet_dir>/ohlcv_partitioned/month=YYYY-MM/bucket=NN.parquet
+# Month and bucket are derived from the announcement key, so a key set maps to a
+# small set of files. Rows inside each file are sorted by (announcement_ticker,
+# announcement_timestamp, timestamp) and written in small row groups, so DuckDB can
+# skip row groups using their min/max statistics.
+OHLCV_PARTITION_DIRNAME = "ohlcv_partitioned"
+OHLCV_PARTITION_BUCKETS = 16
+OHLCV_PARTITION_ROW_GROUP_SIZE = 16_384
+
+
+def ohlcv_partition_bucket(ticker: str, buckets: int = OHLCV_PARTITION_BUCKETS) -> int:
+    """Stable hash bucket for a ticker (crc32, identical across processes)."""
+    return zlib.crc32(ticker.encode("utf-8")) % buckets
+
+
+def _naive_utc(ts) -> datetime:
+    """Announcement key timestamp as a naive UTC datetime (ISO strings accepted)."""
+    if not isinstance(ts, datetime):
+        ts = datetime.fromisoformat(str(ts))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def ohlcv_partition_relpath(ticker: str, announcement_timestamp: datetime) -> str:
+    """Relative path of the partition file holding bars for an announcement key."""
+    month = announcement_timestamp.strftime("%Y-%m")
+    bucket = ohlcv_partition_bucket(ticker)
+    return f"month={month}/bucket={bucket:02d}.parquet"
+
+
+# Market session from a naive-UTC timestamp column, evaluated in DuckDB.
+# Mirrors src.models.get_market_session (boundaries in Eastern Time).
+_ET_TIME_SQL = "CAST(timezone('America/New_York', timezone('UTC', timestamp)) AS TIME)"
+MARKET_SESSION_SQL = f"""
+    CASE
+        WHEN {_ET_TIME_SQL} >= TIME '04:00:00' AND {_ET_TIME_SQL} < TIME '09:30:00' THEN 'premarket'
+        WHEN {_ET_TIME_SQL} >= TIME '09:30:00' AND {_ET_TIME_SQL} < TIME '16:00:00' THEN 'market'
+        WHEN {_ET_TIME_SQL} >= TIME '16:00:00' AND {_ET_TIME_SQL} < TIME '20:00:00' THEN 'postmarket'
+        ELSE 'closed'
+    END
+"""
+
+
+def _sql_str(value: str) -> str:
+    """Quote a string literal for inline DuckDB SQL."""
+    return "'" + str(value).replace("'", "''") + "'"
+
 
 class DuckDBClient:
     """Fast read-only client using DuckDB to query Parquet files."""
@@ -63,6 +113,7 @@ class DuckDBClient:
         self.parquet_dir = parquet_dir or PARQUET_DIR
         self._conn = None
         self._ohlcv_loaded = False
+        self._announcement_columns: Optional[List[str]] = None
 
     def _get_conn(self) -> duckdb.DuckDBPyConnection:
         """Get or create DuckDB connection."""
@@ -113,32 +164,62 @@ class DuckDBClient:
     def _announcements_path(self) -> Path:
         return self.parquet_dir / "announcements.parquet"
 
+    def _announcement_parquet_columns(self) -> List[str]:
+        """Column names in announcements.parquet (read once from the file schema)."""
+        if self._announcement_columns is None:
+            path = self._announcements_path()
+            rows = self._get_conn().execute(
+                f"DESCRIBE SELECT * FROM read_parquet('{path}')"
+            ).fetchall()
+            self._announcement_columns = [r[0] for r in rows]
+        return self._announcement_columns
+
+    def _announcement_select_list(self, fields: Optional[Sequence[str]] = None) -> str:
+        """SELECT list for a field projection, limited to columns present in the Parquet file.
+
+        Parquet is columnar, so unselected columns (e.g. source_html) are never read.
+        """
+        available = set(self._announcement_parquet_columns())
+        return ", ".join(
+            name for name in resolve_announcement_fields(fields) if name in available
+        )
+
     def _ohlcv_glob(self) -> str:
         return str(self.parquet_dir / "ohlcv_1min" / "*.parquet")
 
-    def load_announcements(self, source: Optional[str] = "backfill") -> List[Announcement]:
-        """Load announcements from Parquet."""
+    def _ohlcv_partition_dir(self) -> Path:
+        return self.parquet_dir / OHLCV_PARTITION_DIRNAME
+
+    def _has_partitioned_ohlcv(self) -> bool:
+        part_dir = self._ohlcv_partition_dir()
+        return part_dir.exists() and any(part_dir.glob("month=*/bucket=*.parquet"))
+
+    def load_announcements(
+        self,
+        source: Optional[str] = "backfill",
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Announcement]:
+        """Load announcements from Parquet (optionally only the given fields)."""
         path = self._announcements_path()
         if not path.exists():
             logger.warning(f"Parquet file not found: {path}")
             return []
 
-        conn = self._get_conn()
+        select_list = self._announcement_select_list(fields)
 
         if source:
             query = f"""
-                SELECT * FROM read_parquet('{path}')
+                SELECT {select_list} FROM read_parquet('{path}')
                 WHERE source = '{source}'
                 ORDER BY timestamp DESC
             """
         else:
             query = f"""
-                SELECT * FROM read_parquet('{path}')
+                SELECT {select_list} FROM read_parquet('{path}')
                 ORDER BY timestamp DESC
             """
 
-        df = conn.execute(query).df()
-        return self._df_to_announcements(df)
+        return self._query_announcements(query)
 
     def get_announcement_filter_options(self, source: str = "backfill") -> dict:
         """Get distinct values for filter widgets."""
@@ -198,8 +279,9 @@ class DuckDBClient:
         rvol_max: float = 0.0,
         exclude_financing_types: Optional[List[str]] = None,
         exclude_biotech: bool = False,
+        fields: Optional[Sequence[str]] = None,
     ) -> tuple:
-        """Load filtered announcements using DuckDB SQL."""
+        """Load filtered announcements using DuckDB SQL (only the requested fields)."""
         path = self._announcements_path()
         if not path.exists():
             return (0, [])
@@ -209,6 +291,16 @@ class DuckDBClient:
         # Build WHERE clause
         conditions = [f"source = '{source}'"]
 
+        # Session: precomputed market_session column when exported, otherwise derived
+        # from the UTC timestamp in SQL (ET conversion via timezone())
+        if sessions:
+            sessions_str = ", ".join(f"'{s}'" for s in sessions)
+            if "market_session" in self._announcement_parquet_columns():
+                session_expr = f"COALESCE(market_session, {MARKET_SESSION_SQL})"
+            else:
+                session_expr = f"({MARKET_SESSION_SQL})"
+            conditions.append(f"{session_expr} IN ({sessions_str})")
+
         if countries:
             countries_str = ", ".join(f"'{c}'" for c in countries)
             conditions.append(f"country IN ({countries_str})")
@@ -259,6 +351,12 @@ class DuckDBClient:
         if mc_max_m < 10000:
             conditions.append(f"(market_cap IS NULL OR market_cap <= {mc_max_m * 1_000_000})")
 
+        # Prior move (scanner_gain_pct)
+        if prior_move_min > 0:
+            conditions.append(f"(scanner_gain_pct IS NOT NULL AND scanner_gain_pct >= {prior_move_min})")
+        if prior_move_max > 0:
+            conditions.append(f"(scanner_gain_pct IS NULL OR scanner_gain_pct <= {prior_move_max})")
+
         # NHOD filter
         if nhod_filter == "Yes":
             conditions.append("is_nhod = true")
@@ -300,12 +398,14 @@ class DuckDBClient:
         result = conn.execute(count_query).fetchone()
         total_count = result[0] if result else 0
 
+        select_list = self._announcement_select_list(fields)
+
         # Build main query with sampling
         if sample_pct < 100 and sample_ids is None:
             # Use deterministic sampling based on hash of id and seed
             # This ensures repeatable results with the same seed
             query = f"""
-                SELECT * FROM read_parquet('{path}')
+                SELECT {select_list} FROM read_parquet('{path}')
                 WHERE {where_clause}
                   AND hash(id + {sample_seed}) % 100 < {sample_pct}
                 ORDER BY timestamp DESC
@@ -313,36 +413,121 @@ class DuckDBClient:
         elif sample_ids:
             ids_str = ", ".join(str(i) for i in sample_ids)
             query = f"""
-                SELECT * FROM read_parquet('{path}')
+                SELECT {select_list} FROM read_parquet('{path}')
                 WHERE {where_clause} AND id IN ({ids_str})
                 ORDER BY timestamp DESC
             """
         else:
             query = f"""
-                SELECT * FROM read_parquet('{path}')
+                SELECT {select_list} FROM read_parquet('{path}')
                 WHERE {where_clause}
                 ORDER BY timestamp DESC
             """
 
-        df = conn.execute(query).df()
+        announcements = self._query_announcements(query)
+        return (total_count, announcements)
 
-        # Filter by session (requires timestamp parsing)
-        if sessions:
-            from .models import get_market_session
+    def load_announcement_sources(self, keys: List[tuple]) -> Dict[tuple, dict]:
+        """Fetch source_message/source_html for specific announcements.
 
-            def matches_session(ts):
-                return get_market_session(ts) in sessions
+        Args:
+            keys: List of (ticker, timestamp) tuples
 
-            df = df[df["timestamp"].apply(matches_session)]
+        Returns:
+            Dict mapping (ticker, timestamp) to {"source_message": ..., "source_html": ...}
+        """
+        path = self._announcements_path()
+        if not keys or not path.exists():
+            return {}
 
-        announcements = self._df_to_announcements(df)
-        return (total_count, announcements)
+        conn = self._get_conn()
+        keys_df = pd.DataFrame(list(keys), columns=['ann_ticker', 'ann_timestamp'])
+        conn.register('source_keys_temp', keys_df)
+        try:
+            rows = conn.execute(f"""
+                SELECT a.ticker, a.timestamp, a.source_message, a.source_html
+                FROM read_parquet('{path}') a
+                INNER JOIN source_keys_temp k
+                    ON a.ticker = k.ann_ticker AND a.timestamp = k.ann_timestamp
+            """).fetchall()
+        finally:
+            try:
+                conn.unregister('source_keys_temp')
+            except Exception:
+                pass
+
+        return {
+            (ticker, ts): {"source_message": source_message, "source_html": source_html}
+            for ticker, ts, source_message, source_html in rows
+        }
+
+    def _archive_glob(self, dirname: str) -> Optional[str]:
+        """Glob over an archive written by src/retention.py, or None if it doesn't exist."""
+        archive_dir = self.parquet_dir / dirname
+        if not archive_dir.exists() or not any(archive_dir.glob("month=*/*.parquet")):
+            return None
+        return str(archive_dir / "month=*" / "*.parquet")
+
+    def get_archived_traces(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        ticker: Optional[str] = None,
+        limit: int = 1000,
+    ) -> pd.DataFrame:
+        """Query traces archived out of Postgres by the retention job (newest first)."""
+        glob = self._archive_glob("traces")
+        if glob is None:
+            return pd.DataFrame()
+
+        conditions = ["1=1"]
+        params: list = []
+        if start:
+            conditions.append("created_at >= ?")
+            params.append(start)
+        if end:
+            conditions.append("created_at < ?")
+            params.append(end)
+        if ticker:
+            conditions.append("ticker = ?")
+            params.append(ticker)
+        if start or end:
+            # Prune month partitions before touching any row groups
+            if start:
+                conditions.append("month >= ?")
+                params.append(start.strftime("%Y-%m"))
+            if end:
+                conditions.append("month <= ?")
+                params.append(end.strftime("%Y-%m"))
+
+        return self._get_conn().execute(f"""
+            SELECT * EXCLUDE (month)
+            FROM read_parquet('{glob}', hive_partitioning = true, hive_types = {{'month': VARCHAR}})
+            WHERE {' AND '.join(conditions)}
+            ORDER BY created_at DESC
+            LIMIT {int(limit)}
+        """, params).df()
+
+    def get_archived_trace_events(self, trace_id: str) -> pd.DataFrame:
+        """Events of an archived trace, in timestamp order."""
+        glob = self._archive_glob("trace_events")
+        if glob is None:
+            return pd.DataFrame()
+        return self._get_conn().execute(f"""
+            SELECT * EXCLUDE (month, trace_created_at)
+            FROM read_parquet('{glob}', hive_partitioning = true, hive_types = {{'month': VARCHAR}})
+            WHERE trace_id = ?
+            ORDER BY event_timestamp
+        """, [trace_id]).df()
 
     def get_ohlcv_bars_bulk(self, announcement_keys: List[tuple]) -> dict:
         """
         Get OHLCV bars for multiple announcements.
 
-        Uses a pre-loaded in-memory table with index for fast lookups.
+        When the partitioned layout exists (see scripts/export_to_parquet.py), only the
+        partition files covering the requested keys are scanned and the key bounds are
+        pushed into each scan so DuckDB prunes row groups by min/max statistics.
+        Otherwise falls back to the legacy monthly files loaded into an in-memory table.
         Returns LazyBarList wrappers that convert to OHLCVBar objects on demand.
 
         Args:
@@ -354,49 +539,49 @@ class DuckDBClient:
         if not announcement_keys:
             return {}
 
-        # Ensure OHLCV data is loaded into memory table
-        self._ensure_ohlcv_table()
-
         conn = self._get_conn()
 
         import time
         start = time.time()
 
-        # Convert keys to DataFrame and register as temp table
-        keys_data = [
-            (ticker, ts if isinstance(ts, datetime) else datetime.fromisoformat(str(ts)))
-            for ticker, ts in announcement_keys
-        ]
+        # Normalize keys to naive datetimes and register as temp table
+        keys_data = [(ticker, _naive_utc(ts)) for ticker, ts in announcement_keys]
         keys_df = pd.DataFrame(keys_data, columns=['ann_ticker', 'ann_timestamp'])
         conn.register('keys_temp', keys_df)
 
-        query = """
-            SELECT
-                o.announcement_ticker,
-                o.announcement_timestamp,
-                o.timestamp,
-                o.open,
-                o.high,
-                o.low,
-                o.close,
-                o.volume,
-                o.vwap
-            FROM ohlcv o
-            INNER JOIN keys_temp k
-                ON o.announcement_ticker = k.ann_ticker
-                AND o.announcement_timestamp = k.ann_timestamp
-            ORDER BY
-                o.announcement_ticker,
-                o.announcement_timestamp,
-                o.timestamp
-        """
+        if self._has_partitioned_ohlcv():
+            source_sql = self._partitioned_ohlcv_source(keys_data)
+        else:
+            # Ensure OHLCV data is loaded into memory table
+            self._ensure_ohlcv_table()
+            source_sql = "ohlcv"
 
-        # Pre-create result map with empty lists
-        from collections import defaultdict
         raw_result = defaultdict(list)
 
         try:
-            rows = conn.execute(query).fetchall()
+            rows = []
+            if source_sql is not None:
+                query = f"""
+                    SELECT
+                        o.announcement_ticker,
+                        o.announcement_timestamp,
+                        o.timestamp,
+                        o.open,
+                        o.high,
+                        o.low,
+                        o.close,
+                        o.volume,
+                        o.vwap
+                    FROM {source_sql} o
+                    INNER JOIN keys_temp k
+                        ON o.announcement_ticker = k.ann_ticker
+                        AND o.announcement_timestamp = k.ann_timestamp
+                    ORDER BY
+                        o.announcement_ticker,
+                        o.announcement_timestamp,
+                        o.timestamp
+                """
+                rows = conn.execute(query).fetchall()
 
             # Group raw tuples by announcement key (fast - no object creation)
             for row in rows:
@@ -419,52 +604,204 @@ class DuckDBClient:
                 pass
 
         # Wrap each list in LazyBarList for on-demand conversion
-        result = {key: LazyBarList(raw_result.get(key, [])) for key in announcement_keys}
+        # Keyed by the caller's keys (bars were matched on the normalized ones)
+        result = {
+            key: LazyBarList(raw_result.get(normalized, []))
+            for key, normalized in zip(announcement_keys, keys_data)
+        }
         return result
 
-    def _df_to_announcements(self, df: pd.DataFrame) -> List[Announcement]:
-        """Convert DataFrame to list of Announcement dataclass."""
-        announcements = []
-        for _, row in df.iterrows():
-            ann = Announcement(
-                ticker=row.get("ticker", ""),
-                timestamp=row.get("timestamp"),
-                price_threshold=row.get("price_threshold", 0.0),
-                headline=row.get("headline") or "",
-                country=row.get("country") or "US",
-                float_shares=row.get("float_shares"),
-                io_percent=row.get("io_percent"),
-                market_cap=row.get("market_cap"),
-                reg_sho=bool(row.get("reg_sho")),
-                high_ctb=bool(row.get("high_ctb")),
-                short_interest=row.get("short_interest"),
-                channel=row.get("channel"),
-                author=row.get("author"),
-                direction=row.get("direction"),
-                headline_is_financing=row.get("headline_is_financing"),
-                headline_financing_type=row.get("headline_financing_type"),
-                headline_financing_tags=row.get("headline_financing_tags"),
-                prev_close=row.get("prev_close"),
-                regular_open=row.get("regular_open"),
-                premarket_gap_pct=row.get("premarket_gap_pct"),
-                premarket_volume=row.get("premarket_volume"),
-                premarket_dollar_volume=row.get("premarket_dollar_volume"),
-                scanner_gain_pct=row.get("scanner_gain_pct"),
-                is_nhod=bool(row.get("is_nhod")),
-                is_nsh=bool(row.get("is_nsh")),
-                rvol=row.get("rvol"),
-                mention_count=row.get("mention_count"),
-                has_news=bool(row.get("has_news", True)),
-                green_bars=row.get("green_bars"),
-                bar_minutes=row.get("bar_minutes"),
-                scanner_test=bool(row.get("scanner_test")),
-                scanner_after_lull=bool(row.get("scanner_after_lull")),
-                source_message=row.get("source_message"),
-                source_html=row.get("source_html"),
-                ohlcv_status=row.get("ohlcv_status"),
+    def get_ohlcv_range(self, ticker: str, start: datetime, end: datetime) -> pd.DataFrame:
+        """Bars for one ticker with start <= timestamp < end, one row per timestamp.
+
+        Bars are stored per announcement, so a bar linked to overlapping announcements
+        appears once. With the partitioned layout only the ticker's hash bucket is scanned.
+        Returns an empty frame when there is no history.
+        """
+        columns = ["timestamp", "open", "high", "low", "close", "volume", "vwap"]
+        if self._has_partitioned_ohlcv():
+            glob = self._ohlcv_partition_dir() / f"month=*/bucket={ohlcv_partition_bucket(ticker):02d}.parquet"
+            source_sql = f"read_parquet({_sql_str(str(glob))})"
+        else:
+            self._ensure_ohlcv_table()
+            source_sql = "ohlcv"
+
+        query = f"""
+            SELECT timestamp, any_value(open), any_value(high), any_value(low),
+                   any_value(close), any_value(volume), any_value(vwap)
+            FROM {source_sql}
+            WHERE announcement_ticker = ? AND timestamp >= ? AND timestamp < ?
+            GROUP BY timestamp
+            ORDER BY timestamp
+        """
+        try:
+            rows = self._get_conn().execute(query, [ticker, start, end]).fetchall()
+        except Exception as e:
+            logger.debug(f"No OHLCV history for {ticker}: {e}")
+            rows = []
+        return pd.DataFrame(rows, columns=columns)
+
+    def _partitioned_ohlcv_source(self, keys_data: List[Tuple[str, datetime]]) -> Optional[str]:
+        """Build a FROM-clause subquery scanning only the partitions for the given keys.
+
+        Each partition file gets its own scan with constant ticker / timestamp bounds,
+        which DuckDB pushes into the Parquet reader to skip non-matching row groups.
+        Returns None when none of the keys has a partition file on disk.
+        """
+        part_dir = self._ohlcv_partition_dir()
+
+        keys_by_file: Dict[str, List[Tuple[str, datetime]]] = defaultdict(list)
+        for ticker, ts in keys_data:
+            keys_by_file[ohlcv_partition_relpath(ticker, ts)].append((ticker, ts))
+
+        scans = []
+        for relpath, file_keys in sorted(keys_by_file.items()):
+            path = part_dir / relpath
+            if not path.exists():
+                continue
+            tickers = ", ".join(_sql_str(t) for t in sorted({t for t, _ in file_keys}))
+            min_ts = min(ts for _, ts in file_keys)
+            max_ts = max(ts for _, ts in file_keys)
+            scans.append(f"""
+                SELECT announcement_ticker, announcement_timestamp, timestamp,
+                       open, high, low, close, volume, vwap
+                FROM read_parquet({_sql_str(path)})
+                WHERE announcement_ticker IN ({tickers})
+                  AND announcement_timestamp BETWEEN TIMESTAMP {_sql_str(min_ts.isoformat(sep=' '))}
+                                                 AND TIMESTAMP {_sql_str(max_ts.isoformat(sep=' '))}
+            """)
+
+        logger.debug(
+            "Partitioned OHLCV scan: %d of %d partition files for %d keys",
+            len(scans), len(keys_by_file), len(keys_data),
+        )
+        if not scans:
+            return None
+        return "(" + " UNION ALL ".join(scans) + ")"
+
+    def _query_announcements(self, query: str) -> List[Announcement]:
+        """Run an announcements query and build dataclasses column-wise.
+
+        fetchall() lets DuckDB produce native Python values (None for NULL) in C++,
+        and the column positions are resolved once instead of per row.
+        """
+        cursor = self._get_conn().execute(query)
+        columns = [d[0] for d in cursor.description]
+        rows = cursor.fetchall()
+        return self._rows_to_announcements(columns, rows)
+
+    @staticmethod
+    def _rows_to_announcements(columns: List[str], rows: List[tuple]) -> List[Announcement]:
+        """Convert row tuples (with column names) to a list of Announcement dataclass."""
+        if not rows:
+            return []
+
+        index = {name: i for i, name in enumerate(columns)}
+
+        def col(name: str, default=None) -> list:
+            i = index.get(name)
+            if i is None:
+                return [default] * len(rows)
+            return [r[i] for r in rows]
+
+        def text(name: str, default: str) -> list:
+            return [v or default for v in col(name)]
+
+        def flag(name: str, default: bool = False) -> list:
+            return [default if v is None else bool(v) for v in col(name)]
+
+        return [
+            Announcement(
+                ticker=ticker,
+                timestamp=timestamp,
+                price_threshold=price_threshold,
+                headline=headline,
+                country=country,
+                float_shares=float_shares,
+                io_percent=io_percent,
+                market_cap=market_cap,
+                reg_sho=reg_sho,
+                high_ctb=high_ctb,
+                short_interest=short_interest,
+                channel=channel,
+                author=author,
+                direction=direction,
+                headline_is_financing=headline_is_financing,
+                headline_financing_type=headline_financing_type,
+                headline_financing_tags=headline_financing_tags,
+                prev_close=prev_close,
+                regular_open=regular_open,
+                premarket_gap_pct=premarket_gap_pct,
+                premarket_volume=premarket_volume,
+                premarket_dollar_volume=premarket_dollar_volume,
+                scanner_gain_pct=scanner_gain_pct,
+                is_nhod=is_nhod,
+                is_nsh=is_nsh,
+                rvol=rvol,
+                mention_count=mention_count,
+                has_news=has_news,
+                green_bars=green_bars,
+                bar_minutes=bar_minutes,
+                scanner_test=scanner_test,
+                scanner_after_lull=scanner_after_lull,
+                source_message=source_message,
+                source_html=source_html,
+                ohlcv_status=ohlcv_status,
+                market_session=market_session,
+                et_date=et_date,
+                effective_start=effective_start,
+            )
+            for (
+                ticker, timestamp, price_threshold, headline, country,
+                float_shares, io_percent, market_cap, reg_sho, high_ctb,
+                short_interest, channel, author, direction,
+                headline_is_financing, headline_financing_type, headline_financing_tags,
+                prev_close, regular_open, premarket_gap_pct, premarket_volume,
+                premarket_dollar_volume, scanner_gain_pct, is_nhod, is_nsh, rvol,
+                mention_count, has_news, green_bars, bar_minutes, scanner_test,
+                scanner_after_lull, source_message, source_html, ohlcv_status,
+                market_session, et_date, effective_start,
+            ) in zip(
+                col("ticker", ""),
+                col("timestamp"),
+                col("price_threshold", 0.0),
+                text("headline", ""),
+                text("country", "US"),
+                col("float_shares"),
+                col("io_percent"),
+                col("market_cap"),
+                flag("reg_sho"),
+                flag("high_ctb"),
+                col("short_interest"),
+                col("channel"),
+                col("author"),
+                col("direction"),
+                col("headline_is_financing"),
+                col("headline_financing_type"),
+                col("headline_financing_tags"),
+                col("prev_close"),
+                col("regular_open"),
+                col("premarket_gap_pct"),
+                col("premarket_volume"),
+                col("premarket_dollar_volume"),
+                col("scanner_gain_pct"),
+                flag("is_nhod"),
+                flag("is_nsh"),
+                col("rvol"),
+                col("mention_count"),
+                flag("has_news", True),
+                col("green_bars"),
+                col("bar_minutes"),
+                flag("scanner_test"),
+                flag("scanner_after_lull"),
+                col("source_message"),
+                col("source_html"),
+                col("ohlcv_status"),
+                col("market_session"),
+                col("et_date"),
+                col("effective_start"),
             )
-            announcements.append(ann)
-        return announcements
+        ]
 
 
 # Global instance
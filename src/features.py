@@ -1,10 +1,12 @@
 import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta, time
-from typing import Dict, List, Optional, Tuple
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 from .massive_client import MassiveClient
-from .models import MARKET_OPEN, OHLCVBar
+
+if TYPE_CHECKING:
+    from .daily_bar_store import DailyBarStore
 
 
 @dataclass
@@ -65,70 +67,72 @@ def classify_headline(headline: str) -> HeadlineFlags:
     return HeadlineFlags(is_financing=False, financing_type=None, tags=tags)
 
 
-def _sum_dollar_volume(bars: List[OHLCVBar]) -> float:
-    total = 0.0
-    for b in bars:
-        px = b.vwap if b.vwap is not None else b.close
-        total += float(b.volume) * float(px)
-    return total
-
-
-def _find_prev_close(
+def _features_from_cache(
     client: MassiveClient,
+    store: "DailyBarStore",
     ticker: str,
-    session_date: datetime.date,
-    *,
-    lookback_days: int = 7,
-) -> Optional[float]:
-    """
-    Best-effort: find the most recent regular-session close before `session_date`.
-    Fetches 15:30-16:01 for prior days and takes the last close.
-    """
-    for i in range(1, lookback_days + 1):
-        d = session_date - timedelta(days=i)
-        start = datetime.combine(d, time(15, 30))
-        end = datetime.combine(d, time(16, 1))
-        bars = client.fetch_ohlcv(ticker, start, end)
-        if bars:
-            return float(bars[-1].close)
-    return None
+    session_date: date,
+) -> Dict[str, Optional[float]]:
+    bar = store.ensure_premarket(client, ticker, session_date)
+    prev = store.get_prev_bar(ticker, session_date)
+
+    pre_vol = bar.premarket_volume if bar and bar.premarket_volume else None
+    pre_dv = bar.premarket_dollar_volume if pre_vol else None
+    regular_open = bar.open if bar else None
+    prev_close = prev.close if prev else None
+
+    gap_pct = None
+    if regular_open is not None and prev_close is not None and prev_close > 0:
+        gap_pct = (regular_open - prev_close) / prev_close * 100.0
+
+    return {
+        "prev_close": prev_close,
+        "regular_open": regular_open,
+        "premarket_gap_pct": gap_pct,
+        "premarket_volume": pre_vol,
+        "premarket_dollar_volume": pre_dv,
+    }
 
 
 def compute_premarket_features(
     client: MassiveClient,
     ticker: str,
-    effective_session_date: datetime.date,
+    effective_session_date: date,
+    store: Optional["DailyBarStore"] = None,
 ) -> Dict[str, Optional[float]]:
     """
     Compute premarket context features for the given trading date:
-    - premarket volume + dollar volume (04:00-09:30)
-    - regular open (09:30 bar open)
+    - premarket volume + dollar volume (04:00-09:30 ET)
+    - regular open (session open)
     - previous close (prior session close)
     - gap % = (open - prev_close) / prev_close * 100
+
+    Prices come from the daily bar cache (see DailyBarStore); use
+    compute_premarket_features_bulk for many announcements.
     """
-    pre_start = datetime.combine(effective_session_date, time(4, 0))
-    pre_end = datetime.combine(effective_session_date, time(9, 30))
-    open_start = datetime.combine(effective_session_date, MARKET_OPEN)
-    open_end = open_start + timedelta(minutes=1)
+    from .daily_bar_store import get_daily_bar_store
 
-    pre_bars = client.fetch_ohlcv(ticker, pre_start, pre_end)
-    open_bars = client.fetch_ohlcv(ticker, open_start, open_end)
+    store = store or get_daily_bar_store()
+    store.ensure_daily_bars(client, ticker, effective_session_date, effective_session_date)
+    return _features_from_cache(client, store, ticker, effective_session_date)
 
-    pre_vol = int(sum(b.volume for b in pre_bars)) if pre_bars else None
-    pre_dv = float(_sum_dollar_volume(pre_bars)) if pre_bars else None
 
-    regular_open = float(open_bars[0].open) if open_bars else None
-    prev_close = _find_prev_close(client, ticker, effective_session_date)
+def compute_premarket_features_bulk(
+    client: MassiveClient,
+    items: Sequence[Tuple[str, date]],
+    store: Optional["DailyBarStore"] = None,
+) -> List[Dict[str, Optional[float]]]:
+    """compute_premarket_features for many (ticker, session date) pairs, in order.
 
-    gap_pct = None
-    if regular_open is not None and prev_close is not None and prev_close > 0:
-        gap_pct = (regular_open - prev_close) / prev_close * 100.0
+    Daily bars are fetched with one range request per ticker, covering all of its dates.
+    """
+    from .daily_bar_store import get_daily_bar_store
 
-    return {
-        "prev_close": prev_close,
-        "regular_open": regular_open,
-        "premarket_gap_pct": gap_pct,
-        "premarket_volume": pre_vol,
-        "premarket_dollar_volume": pre_dv,
-    }
+    store = store or get_daily_bar_store()
+    dates_by_ticker: Dict[str, List[date]] = {}
+    for ticker, session_date in items:
+        dates_by_ticker.setdefault(ticker, []).append(session_date)
+    for ticker, dates in dates_by_ticker.items():
+        store.ensure_daily_bars(client, ticker, min(dates), max(dates))
 
+    return [_features_from_cache(client, store, ticker, d) for ticker, d in items]
@@ -1,14 +1,28 @@
 """Store for persisting live 1-second bars to database."""
 
+import atexit
 import logging
+import os
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import List, Optional
+from typing import Deque, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from .base_store import BaseStore
-from .database import LiveBarDB
+from .database import LiveBarDB, LiveBarMinuteDB
 
 logger = logging.getLogger(__name__)
 
+# Background bar writer tuning. The queue is bounded: when Postgres falls behind the
+# oldest bars are dropped (they are visualization-only) instead of blocking the quote loop.
+LIVE_BAR_QUEUE_SIZE = int(os.getenv("LIVE_BAR_QUEUE_SIZE", "20000"))
+LIVE_BAR_BATCH_SIZE = int(os.getenv("LIVE_BAR_BATCH_SIZE", "1000"))
+LIVE_BAR_FLUSH_INTERVAL = float(os.getenv("LIVE_BAR_FLUSH_INTERVAL", "1.0"))
+
 
 class LiveBarStore(BaseStore):
     """CRUD operations for live bars."""
@@ -75,25 +89,38 @@ class LiveBarStore(BaseStore):
         if not bars:
             return 0
 
+        # One row per (ticker, timestamp) - ON CONFLICT can't touch the same row twice
+        rows = {}
+        for bar_data in bars:
+            rows[(bar_data["ticker"], bar_data["timestamp"])] = {
+                "ticker": bar_data["ticker"],
+                "timestamp": bar_data["timestamp"],
+                "open": bar_data["open"],
+                "high": bar_data["high"],
+                "low": bar_data["low"],
+                "close": bar_data["close"],
+                "volume": bar_data["volume"],
+                "strategy_id": bar_data.get("strategy_id"),
+            }
+        values = list(rows.values())
+
         try:
             with self._db_session() as session:
-                count = 0
-                for bar_data in bars:
-                    # Use merge for upsert behavior
-                    bar = LiveBarDB(
-                        ticker=bar_data["ticker"],
-                        timestamp=bar_data["timestamp"],
-                        open=bar_data["open"],
-                        high=bar_data["high"],
-                        low=bar_data["low"],
-                        close=bar_data["close"],
-                        volume=bar_data["volume"],
-                        strategy_id=bar_data.get("strategy_id"),
+                for start_idx in range(0, len(values), 1000):
+                    stmt = pg_insert(LiveBarDB).values(values[start_idx:start_idx + 1000])
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["ticker", "timestamp"],
+                        set_={
+                            "open": stmt.excluded.open,
+                            "high": stmt.excluded.high,
+                            "low": stmt.excluded.low,
+                            "close": stmt.excluded.close,
+                            "volume": stmt.excluded.volume,
+                            "strategy_id": func.coalesce(stmt.excluded.strategy_id, LiveBarDB.strategy_id),
+                        },
                     )
-                    session.merge(bar)
-                    count += 1
-
-                return count
+                    session.execute(stmt)
+            return len(values)
 
         except Exception as e:
             logger.error(f"Failed to save bar batch: {e}", exc_info=True)
@@ -116,7 +143,8 @@ class LiveBarStore(BaseStore):
             strategy_id: Optional filter by strategy
 
         Returns:
-            List of LiveBarDB records ordered by timestamp
+            List of LiveBarDB records ordered by timestamp. If the range has no 1-second
+            bars left, the 1-minute rollups (LiveBarMinuteDB) are returned instead.
         """
         with self._db_session() as session:
             query = session.query(LiveBarDB).filter(
@@ -130,6 +158,17 @@ class LiveBarStore(BaseStore):
 
             bars = query.order_by(LiveBarDB.timestamp).all()
 
+            if not bars:
+                # Older ranges only survive as 1-minute rollups (see src/retention.py)
+                query = session.query(LiveBarMinuteDB).filter(
+                    LiveBarMinuteDB.ticker == ticker,
+                    LiveBarMinuteDB.timestamp >= start_time,
+                    LiveBarMinuteDB.timestamp <= end_time,
+                )
+                if strategy_id:
+                    query = query.filter(LiveBarMinuteDB.strategy_id == strategy_id)
+                bars = query.order_by(LiveBarMinuteDB.timestamp).all()
+
             # Detach from session
             for bar in bars:
                 session.expunge(bar)
@@ -156,8 +195,168 @@ class LiveBarStore(BaseStore):
             return 0
 
 
-# Global instance
+class LiveBarWriter:
+    """Asynchronous sink for live bars.
+
+    enqueue() is O(1) and never touches the database; a daemon thread drains the queue
+    and upserts batches through LiveBarStore.save_bars_batch(). The queue is bounded and
+    drops the oldest bars when full. stats() exposes queue depth, lag and drop counters.
+    """
+
+    def __init__(
+        self,
+        store: LiveBarStore,
+        max_queue: int = LIVE_BAR_QUEUE_SIZE,
+        batch_size: int = LIVE_BAR_BATCH_SIZE,
+        flush_interval: float = LIVE_BAR_FLUSH_INTERVAL,
+    ):
+        self._store = store
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # (enqueued_at monotonic, bar dict)
+        self._queue: Deque[Tuple[float, dict]] = deque(maxlen=max_queue)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+        self._last_batch_ms = 0.0
+        self._last_lag_seconds = 0.0
+        self._last_drop_log = 0.0
+
+    def enqueue(
+        self,
+        ticker: str,
+        timestamp: datetime,
+        open_price: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: int,
+        strategy_id: Optional[str] = None,
+    ) -> None:
+        """Queue a bar for writing (drop-oldest when the queue is full)."""
+        bar = {
+            "ticker": ticker,
+            "timestamp": timestamp,
+            "open": open_price,
+            "high": high,
+            "low": low,
+            "close": close,
+            "volume": volume,
+            "strategy_id": strategy_id,
+        }
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self._dropped += 1
+            self._queue.append((time.monotonic(), bar))
+            self._enqueued += 1
+            depth = len(self._queue)
+
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+        if depth >= self._batch_size:
+            self._wake.set()
+
+    def start(self) -> None:
+        """Start the writer thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="LiveBarWriter")
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the writer thread and write whatever is still queued."""
+        self._stop_event.set()
+        self._wake.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        self.flush()
+
+    def flush(self) -> int:
+        """Drain the queue synchronously. Returns number of bars written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if not self._queue:
+                        break
+                    count = min(self._batch_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(count)]
+
+                started = time.monotonic()
+                saved = self._store.save_bars_batch([bar for _, bar in batch])
+                finished = time.monotonic()
+
+                self._batches += 1
+                self._last_batch_ms = (finished - started) * 1000
+                self._last_lag_seconds = finished - batch[0][0]
+                if saved:
+                    self._written += len(batch)
+                    written += len(batch)
+                else:
+                    # Visualization data: count the loss and move on rather than retry-looping
+                    self._failed += len(batch)
+                    break
+
+        self._maybe_log_backlog()
+        return written
+
+    def stats(self) -> dict:
+        """Writer metrics for status reporting."""
+        with self._lock:
+            depth = len(self._queue)
+            oldest_age = time.monotonic() - self._queue[0][0] if self._queue else 0.0
+        return {
+            "queue_depth": depth,
+            "queue_capacity": self._queue.maxlen,
+            "oldest_queued_seconds": round(oldest_age, 3),
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "dropped": self._dropped,
+            "failed": self._failed,
+            "batches": self._batches,
+            "last_batch_ms": round(self._last_batch_ms, 1),
+            "last_lag_seconds": round(self._last_lag_seconds, 3),
+        }
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Live bar writer error: {e}", exc_info=True)
+
+    def _maybe_log_backlog(self) -> None:
+        """Warn (at most every 30s) when bars are being dropped."""
+        if not self._dropped:
+            return
+        now = time.monotonic()
+        if now - self._last_drop_log < 30:
+            return
+        self._last_drop_log = now
+        stats = self.stats()
+        logger.warning(
+            f"Live bar writer falling behind: dropped={stats['dropped']} "
+            f"depth={stats['queue_depth']}/{stats['queue_capacity']} "
+            f"last_batch={stats['last_batch_ms']}ms lag={stats['last_lag_seconds']}s"
+        )
+
+
+# Global instances
 _live_bar_store: Optional[LiveBarStore] = None
+_live_bar_writer: Optional[LiveBarWriter] = None
 
 
 def get_live_bar_store() -> LiveBarStore:
@@ -166,3 +365,12 @@ def get_live_bar_store() -> LiveBarStore:
     if _live_bar_store is None:
         _live_bar_store = LiveBarStore()
     return _live_bar_store
+
+
+def get_live_bar_writer() -> LiveBarWriter:
+    """Get the global background live bar writer."""
+    global _live_bar_writer
+    if _live_bar_writer is None:
+        _live_bar_writer = LiveBarWriter(get_live_bar_store())
+        atexit.register(_live_bar_writer.stop)
+    return _live_bar_writer
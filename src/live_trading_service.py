@@ -18,7 +18,7 @@ from .quote_provider import InsightSentryQuoteProvider
 from .parser import parse_message_line
 from .alert_service import set_alert_callback
 from .strategy_store import get_strategy_store, Strategy
-from .live_bar_store import get_live_bar_store
+from .live_bar_store import get_live_bar_writer
 from .trace_store import get_trace_store
 
 logger = logging.getLogger(__name__)
@@ -220,8 +220,8 @@ class TradingEngine:
         # Orphaned tickers (positions in DB but strategy disabled)
         self._orphaned_tickers: set = set()
 
-        # Live bar storage for TradingView visualization
-        self._live_bar_store = get_live_bar_store()
+        # Live bar storage for TradingView visualization (written off the event loop)
+        self._live_bar_writer = get_live_bar_writer()
 
         # Callbacks for external status updates
         self.on_status_change: Optional[Callable[[dict], None]] = None
@@ -386,6 +386,10 @@ class TradingEngine:
         self.trader = get_trading_client(paper=self.paper)
         logger.info(f"Trading client: {self.trader.name} (paper={self.paper})")
 
+        # Journal order transitions off the entry/exit path (flushed on broker submit)
+        from .order_store import ORDER_JOURNAL, get_order_store
+        get_order_store().enable_journal(ORDER_JOURNAL)
+
         # Trade updates stream (order fills, cancellations)
         self.trade_stream = AlpacaTradeStream(
             paper=self.paper,
@@ -675,6 +679,41 @@ class TradingEngine:
                 except Exception as e:
                     logger.warning(f"Error disconnecting WebSocket: {e}")
 
+            # Let in-flight async DB writes finish, then release the asyncpg pool (bound to this loop)
+            try:
+                from .async_db import get_async_db_writer
+                from .database import dispose_async_engine
+                await get_async_db_writer().drain()
+                await dispose_async_engine()
+            except Exception as e:
+                logger.warning(f"Error closing async DB writes: {e}")
+
+            # Drain queued live bars
+            try:
+                self._live_bar_writer.stop()
+            except Exception as e:
+                logger.warning(f"Error flushing live bars: {e}")
+
+            # Flush journaled order transitions
+            try:
+                from .order_store import get_order_store
+                get_order_store().flush()
+            except Exception as e:
+                logger.warning(f"Error flushing order journal: {e}")
+
+            # Flush queued trace writes
+            try:
+                get_trace_store().flush()
+            except Exception as e:
+                logger.warning(f"Error flushing traces: {e}")
+
+            # Write any buffered active-trade price updates before the loop goes away
+            try:
+                from .active_trade_store import get_active_trade_store
+                get_active_trade_store().close()
+            except Exception as e:
+                logger.warning(f"Error flushing active trade prices: {e}")
+
     async def _run_quote_provider(self):
         """Run the WebSocket quote provider."""
         try:
@@ -809,8 +848,8 @@ class TradingEngine:
         if not is_tracked:
             return
 
-        # Store the bar
-        self._live_bar_store.save_bar(
+        # Queue the bar; the background writer batches it into Postgres
+        self._live_bar_writer.enqueue(
             ticker=ticker,
             timestamp=timestamp,
             open_price=open_price,
@@ -1579,6 +1618,7 @@ class TradingEngine:
         status["active_trades"] = total_active
         status["completed_trades"] = total_completed
         status["orphaned_tickers"] = list(self._orphaned_tickers)
+        status["live_bar_writer"] = self._live_bar_writer.stats()
 
         if self.trader:
             # Use cached values if fresh, otherwise fetch from Alpaca
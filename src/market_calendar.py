@@ -0,0 +1,183 @@
+"""NYSE trading calendar, loaded once into lookup tables.
+
+pandas_market_calendars builds a schedule on every valid_days() call, which made
+get_effective_start_time cost one calendar query per announcement. TradingCalendar
+loads all sessions (with early closes) for a fixed date range once: "next session" is
+an index into a per-day table, and the plural variants (next_sessions_on_or_after,
+session_opens_utc) work on numpy arrays for bulk recomputes. Without pandas_market_calendars every weekday counts as a full session,
+as before; dates outside the loaded range use the same weekday rule.
+"""
+
+import bisect
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional
+
+from .models import ET_TZ, MARKET_CLOSE, MARKET_OPEN, UTC_TZ
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pandas_market_calendars as _mcal  # type: ignore
+except Exception:  # pragma: no cover
+    _mcal = None
+
+CALENDAR_START = date(2010, 1, 1)
+CALENDAR_YEARS_AHEAD = 2
+
+
+def _is_weekend(d: date) -> bool:
+    return d.weekday() >= 5  # 5=Sat, 6=Sun
+
+
+def _weekday_on_or_after(d: date) -> date:
+    while _is_weekend(d):
+        d = d + timedelta(days=1)
+    return d
+
+
+def _et_to_utc(d: date, t: time) -> datetime:
+    return datetime.combine(d, t, tzinfo=ET_TZ).astimezone(UTC_TZ).replace(tzinfo=None)
+
+
+class TradingCalendar:
+    """NYSE sessions in [start, end] with O(1) lookups by date."""
+
+    def __init__(self, start: date = CALENDAR_START, end: Optional[date] = None):
+        self.start = start
+        self.end = end or date(date.today().year + CALENDAR_YEARS_AHEAD, 12, 31)
+        self.sessions: List[date] = []
+        self.early_closes: Dict[date, time] = {}
+        self._load()
+
+        self._index: Dict[date, int] = {d: i for i, d in enumerate(self.sessions)}
+        self._opens_utc = [_et_to_utc(d, MARKET_OPEN) for d in self.sessions]
+        # _next_index[(d - start).days] = index of the first session on or after d
+        self._next_index: List[int] = []
+        i = 0
+        for offset in range((self.end - self.start).days + 1):
+            d = self.start + timedelta(days=offset)
+            while i < len(self.sessions) and self.sessions[i] < d:
+                i += 1
+            self._next_index.append(i)
+        self._sessions_np = None
+
+    def _load(self) -> None:
+        if _mcal is not None:
+            try:
+                schedule = _mcal.get_calendar("NYSE").schedule(start_date=self.start, end_date=self.end)
+                for day, close in zip(schedule.index, schedule["market_close"]):
+                    d = day.date()
+                    self.sessions.append(d)
+                    close_et = close.tz_convert(ET_TZ).time()
+                    if close_et < MARKET_CLOSE:
+                        self.early_closes[d] = close_et
+                logger.debug(f"Loaded {len(self.sessions)} NYSE sessions ({len(self.early_closes)} early closes)")
+                return
+            except Exception as e:
+                logger.warning(f"NYSE calendar unavailable ({e}); using weekdays only")
+                self.sessions.clear()
+                self.early_closes.clear()
+
+        d = self.start
+        while d <= self.end:
+            if not _is_weekend(d):
+                self.sessions.append(d)
+            d = d + timedelta(days=1)
+
+    # ------------------------------------------------------------------
+    # Scalar lookups
+    # ------------------------------------------------------------------
+
+    def is_session(self, d: date) -> bool:
+        if self.start <= d <= self.end:
+            return d in self._index
+        return not _is_weekend(d)
+
+    def next_session_on_or_after(self, d: date) -> date:
+        """First session on/after d."""
+        if self.start <= d <= self.end:
+            i = self._next_index[(d - self.start).days]
+            if i < len(self.sessions):
+                return self.sessions[i]
+        return _weekday_on_or_after(d)
+
+    def next_session_after(self, d: date) -> date:
+        """First session strictly after d."""
+        return self.next_session_on_or_after(d + timedelta(days=1))
+
+    def previous_session_before(self, d: date) -> date:
+        """Last session strictly before d."""
+        i = bisect.bisect_left(self.sessions, d)
+        if self.start <= d <= self.end + timedelta(days=1) and i > 0:
+            return self.sessions[i - 1]
+        d = d - timedelta(days=1)
+        while _is_weekend(d):
+            d = d - timedelta(days=1)
+        return d
+
+    def sessions_between(self, start: date, end: date) -> List[date]:
+        """Sessions in [start, end]."""
+        if start >= self.start and end <= self.end:
+            lo = bisect.bisect_left(self.sessions, start)
+            hi = bisect.bisect_right(self.sessions, end)
+            return self.sessions[lo:hi]
+        days = []
+        d = start
+        while d <= end:
+            if self.is_session(d):
+                days.append(d)
+            d = d + timedelta(days=1)
+        return days
+
+    def close_time(self, d: date) -> time:
+        """Regular-session close in ET (13:00 on early-close days)."""
+        return self.early_closes.get(d, MARKET_CLOSE)
+
+    def session_open_utc(self, d: date) -> datetime:
+        """09:30 ET on d as naive UTC."""
+        i = self._index.get(d)
+        return self._opens_utc[i] if i is not None else _et_to_utc(d, MARKET_OPEN)
+
+    # ------------------------------------------------------------------
+    # Vectorized lookups (numpy datetime64[D] arrays)
+    # ------------------------------------------------------------------
+
+    def next_sessions_on_or_after(self, days):
+        """next_session_on_or_after for an array of dates; returns datetime64[D]."""
+        import numpy as np
+
+        if self._sessions_np is None:
+            self._sessions_np = np.array(self.sessions, dtype="datetime64[D]")
+        days = np.asarray(days, dtype="datetime64[D]")
+        idx = np.searchsorted(self._sessions_np, days, side="left")
+        result = self._sessions_np[np.minimum(idx, len(self._sessions_np) - 1)]
+
+        # Before or past the loaded range: same weekday rule as the scalar lookup
+        outside = (idx >= len(self._sessions_np)) | (days < np.datetime64(self.start, "D"))
+        for i in np.flatnonzero(outside):
+            result[i] = np.datetime64(self.next_session_on_or_after(days[i].item()), "D")
+        return result
+
+    @staticmethod
+    def session_opens_utc(days):
+        """09:30 ET on each date as naive-UTC datetime64[ns]."""
+        import pandas as pd
+
+        idx = pd.DatetimeIndex(days) + pd.Timedelta(hours=MARKET_OPEN.hour, minutes=MARKET_OPEN.minute)
+        return idx.tz_localize(ET_TZ).tz_convert(UTC_TZ).tz_localize(None).values
+
+
+_calendar: Optional[TradingCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_trading_calendar() -> TradingCalendar:
+    """Get the process-wide calendar (loaded on first use)."""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = TradingCalendar()
+    return _calendar
@@ -0,0 +1,461 @@
+"""Local stand-in for the Polygon, Alpaca and InsightSentry market data APIs.
+
+Load tests of the fetch pipeline and soak tests of the live engine used to need the
+real APIs. StandinServer answers the same endpoints on one local port:
+
+    Polygon        GET /v2/aggs/ticker/{ticker}/range/1/{timespan}/{from}/{to}
+    Alpaca         GET /v2/stocks/{ticker}/bars
+    InsightSentry  GET /v3/symbols/search, GET /v3/symbols/{code}/series, WS /live
+
+Bars come from the Parquet history (DuckDBClient.get_ohlcv_range). History only
+covers the windows around announcements, so an ET day with no stored bars is filled
+with a synthetic random walk seeded by ticker and day. Responses are therefore
+stable across runs and full-day pulls have a realistic size.
+
+Each API has a FaultProfile: added latency with jitter, a random 5xx rate, and a
+sliding-window rate limit answered with 429 + Retry-After. On the WebSocket the
+error rate drops the connection instead. Point the clients here with MASSIVE_BASE_URL,
+ALPACA_DATA_URL, INSIGHT_SENTRY_API_URL and INSIGHT_SENTRY_WS_URL
+(scripts/run_standin_server.py prints them).
+"""
+
+import asyncio
+import base64
+import logging
+import math
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+from aiohttp import WSMsgType, web
+
+from .data_providers.columnar import OHLCVColumns, json_dumps, json_loads
+from .models import ET_TZ, POSTMARKET_END, PREMARKET_START, UTC_TZ, get_et_date
+
+logger = logging.getLogger(__name__)
+
+PROVIDERS = ("polygon", "alpaca", "insightsentry")
+HEARTBEAT_INTERVAL_S = 10.0
+_EPOCH = datetime(1970, 1, 1)
+_ALPACA_TIMEFRAMES = {"1Min": "minute", "1Hour": "hour", "1Day": "day"}
+
+
+def _et_to_utc(d: date, t) -> datetime:
+    return datetime.combine(d, t, tzinfo=ET_TZ).astimezone(UTC_TZ).replace(tzinfo=None)
+
+
+def synthetic_session(ticker: str, session_date: date) -> OHLCVColumns:
+    """04:00-20:00 ET minute bars: a random walk seeded by ticker and day."""
+    rng = np.random.default_rng(zlib.crc32(f"{ticker}|{session_date.isoformat()}".encode()))
+    start = _et_to_utc(session_date, PREMARKET_START)
+    n = int((_et_to_utc(session_date, POSTMARKET_END) - start) / timedelta(minutes=1))
+
+    base = 1.0 + (zlib.crc32(ticker.encode()) % 2000) / 100.0  # stable per ticker
+    close = base * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+    open_ = np.concatenate(([base], close[:-1]))
+    wick = np.abs(rng.normal(0.0, 0.001, n)) * close
+    high = np.maximum(open_, close) + wick
+    low = np.minimum(open_, close) - wick
+    return OHLCVColumns(
+        np.datetime64(start, "ns") + np.arange(n) * np.timedelta64(1, "m"),
+        open_, high, low, close,
+        rng.lognormal(7.0, 1.0, n).astype(np.int64),
+        (high + low + close) / 3.0,
+    )
+
+
+def aggregate(columns: OHLCVColumns, timespan: str) -> OHLCVColumns:
+    """Roll sorted minute bars up to hour bars or ET-day bars (stamped at ET midnight)."""
+    if timespan == "minute" or not len(columns):
+        return columns
+    if timespan == "hour":
+        buckets = columns.timestamp.astype("datetime64[h]").astype("datetime64[ns]")
+    else:
+        import pandas as pd
+        et = pd.DatetimeIndex(columns.timestamp).tz_localize("UTC").tz_convert(ET_TZ)
+        buckets = et.normalize().tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[ns]")
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+    volume = np.add.reduceat(columns.volume, starts)
+    vwap = np.where(np.isnan(columns.vwap), columns.close, columns.vwap)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        vwap = np.add.reduceat(vwap * columns.volume, starts) / volume
+    return OHLCVColumns(
+        buckets[starts],
+        columns.open[starts],
+        np.maximum.reduceat(columns.high, starts),
+        np.minimum.reduceat(columns.low, starts),
+        columns.close[ends],
+        volume,
+        vwap,
+    )
+
+
+class HistoryBars:
+    """Minute bars per (ticker, ET day) from Parquet history, kept in an LRU."""
+
+    def __init__(self, duckdb_client=None, synthetic: bool = True, cache_days: int = 4096):
+        self.duckdb_client = duckdb_client
+        self.synthetic = synthetic
+        self.cache_days = cache_days
+        self._lock = threading.Lock()  # DuckDB connections are not thread-safe
+        self._days: "OrderedDict[Tuple[str, date], OHLCVColumns]" = OrderedDict()
+
+    def day(self, ticker: str, session_date: date) -> OHLCVColumns:
+        key = (ticker, session_date)
+        with self._lock:
+            columns = self._days.get(key)
+            if columns is None:
+                columns = self._load_day(ticker, session_date)
+                self._days[key] = columns
+                if len(self._days) > self.cache_days:
+                    self._days.popitem(last=False)
+            else:
+                self._days.move_to_end(key)
+            return columns
+
+    def range(self, ticker: str, start: datetime, end: datetime, timespan: str = "minute") -> OHLCVColumns:
+        """Bars with start <= timestamp <= end (naive UTC)."""
+        days = []
+        d = get_et_date(start)
+        while d <= get_et_date(end):
+            days.append(self.day(ticker, d))
+            d += timedelta(days=1)
+        columns = OHLCVColumns.concat(days)
+        ts = columns.timestamp
+        columns = columns.select((ts >= np.datetime64(start, "ns")) & (ts <= np.datetime64(end, "ns")))
+        return aggregate(columns, timespan)
+
+    def _load_day(self, ticker: str, session_date: date) -> OHLCVColumns:
+        columns = OHLCVColumns.empty()
+        if self.duckdb_client is not None:
+            df = self.duckdb_client.get_ohlcv_range(
+                ticker,
+                _et_to_utc(session_date, datetime.min.time()),
+                _et_to_utc(session_date + timedelta(days=1), datetime.min.time()),
+            )
+            columns = OHLCVColumns.from_frame(df)
+        if not len(columns) and self.synthetic and session_date.weekday() < 5:
+            columns = synthetic_session(ticker, session_date)
+        return columns
+
+
+@dataclass
+class FaultProfile:
+    """Injected behaviour for one API."""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0       # fraction of requests answered with 5xx
+    rate_limit: int = 0           # requests per rate_window_s, 0 = unlimited
+    rate_window_s: float = 60.0
+
+
+class _SlidingWindow:
+    """Request timestamps in the last window_s seconds (event loop only, no locking)."""
+
+    def __init__(self, limit: int, window_s: float):
+        self.limit = limit
+        self.window_s = window_s
+        self._times: Deque[float] = deque()
+
+    def acquire(self, now: float) -> Optional[float]:
+        """None if the request is allowed, else seconds until a slot frees up."""
+        while self._times and now - self._times[0] >= self.window_s:
+            self._times.popleft()
+        if self.limit and len(self._times) >= self.limit:
+            return self.window_s - (now - self._times[0])
+        self._times.append(now)
+        return None
+
+
+def _parse_polygon_time(value: str, is_end: bool) -> datetime:
+    if value.isdigit():
+        return _EPOCH + timedelta(milliseconds=int(value))
+    d = date.fromisoformat(value)
+    if is_end:
+        return _et_to_utc(d + timedelta(days=1), datetime.min.time()) - timedelta(microseconds=1)
+    return _et_to_utc(d, datetime.min.time())
+
+
+def _parse_rfc3339(value: str) -> datetime:
+    if len(value) == 10:
+        return _et_to_utc(date.fromisoformat(value), datetime.min.time())
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def _json_response(body, status: int = 200, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.Response(text=json_dumps(body), status=status, headers=headers, content_type="application/json")
+
+
+class StandinServer:
+    """aiohttp app serving the stand-in endpoints, with per-API fault injection."""
+
+    def __init__(
+        self,
+        history: Optional[HistoryBars] = None,
+        profiles: Optional[Dict[str, FaultProfile]] = None,
+        tick_interval_s: float = 1.0,
+        max_symbols: int = 10,
+        replay_date: Optional[date] = None,
+        seed: Optional[int] = None,
+    ):
+        self.history = history or HistoryBars()
+        self.profiles = {name: FaultProfile() for name in PROVIDERS}
+        self.profiles.update(profiles or {})
+        self.tick_interval_s = tick_interval_s
+        self.max_symbols = max_symbols
+        if replay_date is None:
+            from .market_calendar import get_trading_calendar
+            replay_date = get_trading_calendar().previous_session_before(get_et_date(datetime.utcnow()))
+        self.replay_date = replay_date
+
+        self.stats = {name: {"requests": 0, "rate_limited": 0, "errors": 0} for name in PROVIDERS}
+        self._windows = {
+            name: _SlidingWindow(p.rate_limit, p.rate_window_s) for name, p in self.profiles.items()
+        }
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self._runner: Optional[web.AppRunner] = None
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{start}/{end}", self._polygon_aggs)
+        app.router.add_get("/v2/stocks/{ticker}/bars", self._alpaca_bars)
+        app.router.add_get("/v3/symbols/search", self._symbol_search)
+        app.router.add_get("/v3/symbols/{code}/series", self._symbol_series)
+        app.router.add_get("/live", self._live)
+        app.router.add_get("/standin/stats", self._stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving in the running loop; returns the base URL (port 0 picks one)."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        return f"http://{host}:{self._runner.addresses[0][1]}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    # ------------------------------------------------------------------
+    # Fault injection
+    # ------------------------------------------------------------------
+
+    async def _inject_faults(self, provider: str) -> Optional[web.Response]:
+        profile = self.profiles[provider]
+        stats = self.stats[provider]
+        stats["requests"] += 1
+
+        wait = self._windows[provider].acquire(time.monotonic())
+        if wait is not None:
+            stats["rate_limited"] += 1
+            return _json_response(
+                {"status": "ERROR", "error": "Rate limit exceeded"},
+                status=429, headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+        delay_ms = profile.latency_ms + self._random.uniform(0.0, profile.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if profile.error_rate and self._random.random() < profile.error_rate:
+            stats["errors"] += 1
+            return _json_response(
+                {"status": "ERROR", "error": "Injected failure"}, status=self._random.choice((500, 502, 503)),
+            )
+        return None
+
+    async def _bars(self, ticker: str, start: datetime, end: datetime, timespan: str) -> OHLCVColumns:
+        # History loads hit DuckDB; keep them off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.history.range, ticker, start, end, timespan)
+
+    # ------------------------------------------------------------------
+    # Polygon / Alpaca
+    # ------------------------------------------------------------------
+
+    async def _polygon_aggs(self, request: web.Request) -> web.Response:
+        fault = await self._inject_faults("polygon")
+        if fault is not None:
+            return fault
+
+        info = request.match_info
+        ticker = info["ticker"].upper()
+        if info["multiplier"] != "1" or info["timespan"] not in ("minute", "hour", "day"):
+            return _json_response({"status": "ERROR", "error": "Unsupported multiplier/timespan"}, status=400)
+        try:
+            start = _parse_polygon_time(info["start"], is_end=False)
+            end = _parse_polygon_time(info["end"], is_end=True)
+        except ValueError:
+            return _json_response({"status": "ERROR", "error": "Invalid from/to"}, status=400)
+
+        columns = await self._bars(ticker, start, end, info["timespan"])
+        columns = columns.select(slice(0, int(request.query.get("limit", 5000))))
+        if request.query.get("sort") == "desc":
+            columns = columns.select(slice(None, None, -1))
+
+        body = {
+            "ticker": ticker,
+            "status": "OK",
+            "adjusted": request.query.get("adjusted", "true") == "true",
+            "queryCount": len(columns),
+            "resultsCount": len(columns),
+        }
+        if len(columns):
+            data = columns.to_dict()
+            keys = ("v", "vw", "o", "c", "h", "l", "t")
+            body["results"] = [dict(zip(keys, row)) for row in zip(*(data[k] for k in keys))]
+        return _json_response(body)
+
+    async def _alpaca_bars(self, request: web.Request) -> web.Response:
+        fault = await self._inject_faults("alpaca")
+        if fault is not None:
+            return fault
+
+        ticker = request.match_info["ticker"].upper()
+        query = request.query
+        timespan = _ALPACA_TIMEFRAMES.get(query.get("timeframe", "1Min"))
+        if timespan is None:
+            return _json_response({"message": "invalid timeframe"}, status=422)
+        try:
+            start = _parse_rfc3339(query["start"])
+            end = _parse_rfc3339(query["end"]) if "end" in query else datetime.utcnow()
+            offset = int(base64.urlsafe_b64decode(query["page_token"])) if "page_token" in query else 0
+        except (KeyError, ValueError):
+            return _json_response({"message": "invalid start/end/page_token"}, status=422)
+        limit = min(int(query.get("limit", 1000)), 10000)
+
+        columns = await self._bars(ticker, start, end, timespan)
+        if query.get("sort") == "desc":
+            columns = columns.select(slice(None, None, -1))
+        page = columns.select(slice(offset, offset + limit))
+        next_offset = offset + limit
+
+        data = page.to_dict()
+        data["t"] = [f"{t}Z" for t in np.datetime_as_string(page.timestamp, unit="s")]
+        keys = ("t", "o", "h", "l", "c", "v", "vw")
+        return _json_response({
+            "bars": [dict(zip(keys, row)) for row in zip(*(data[k] for k in keys))],
+            "symbol": ticker,
+            "next_page_token": (
+                base64.urlsafe_b64encode(str(next_offset).encode()).decode()
+                if next_offset < len(columns) else None
+            ),
+        })
+
+    # ------------------------------------------------------------------
+    # InsightSentry
+    # ------------------------------------------------------------------
+
+    async def _symbol_search(self, request: web.Request) -> web.Response:
+        fault = await self._inject_faults("insightsentry")
+        if fault is not None:
+            return fault
+        ticker = request.query.get("query", "").upper()
+        symbols = [{"name": ticker, "type": "STOCK", "code": f"NASDAQ:{ticker}", "exchange": "NASDAQ"}]
+        return _json_response({"symbols": symbols if ticker else []})
+
+    async def _symbol_series(self, request: web.Request) -> web.Response:
+        fault = await self._inject_faults("insightsentry")
+        if fault is not None:
+            return fault
+        ticker = request.match_info["code"].split(":")[-1].upper()
+        bar = await self._live_bar(ticker)
+        bar["time"] -= bar["time"] % 60
+        return _json_response({"code": request.match_info["code"], "series": [bar]})
+
+    async def _live_bar(self, ticker: str) -> dict:
+        """The replay session's bar at the current tick, stamped now.
+
+        Every tick advances one minute of the replay date, shared by all connections,
+        and wraps around at the end of the session.
+        """
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(None, self.history.day, ticker, self.replay_date)
+        if not len(session):
+            session = synthetic_session(ticker, self.replay_date)
+        tick = int((time.monotonic() - self._started) / self.tick_interval_s)
+        i = tick % len(session)
+        return {
+            "time": int(time.time()),
+            "open": float(session.open[i]),
+            "high": float(session.high[i]),
+            "low": float(session.low[i]),
+            "close": float(session.close[i]),
+            "volume": int(session.volume[i]),
+        }
+
+    async def _live(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        codes: Dict[str, str] = {}  # "NASDAQ:AAPL" -> "AAPL"
+        stream = asyncio.create_task(self._stream(ws, codes))
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    data = json_loads(msg.data)
+                except ValueError:
+                    await ws.send_str(json_dumps({"message": "Invalid message"}))
+                    continue
+                subs = data.get("subscriptions") if isinstance(data, dict) else None
+                if not isinstance(subs, list) or not subs or not data.get("api_key"):
+                    await ws.send_str(json_dumps({"message": "Subscriptions field or value is invalid"}))
+                    continue
+                if len(subs) > self.max_symbols:
+                    await ws.send_str(json_dumps({
+                        "message": f"Subscription count ({len(subs)}) exceeds the number of symbols "
+                                   f"allowed by your plan ({self.max_symbols})",
+                    }))
+                    continue
+                codes.clear()
+                codes.update({s["code"]: s["code"].split(":")[-1] for s in subs if s.get("code")})
+        finally:
+            stream.cancel()
+            try:
+                await stream
+            except asyncio.CancelledError:
+                pass
+        return ws
+
+    async def _stream(self, ws: web.WebSocketResponse, codes: Dict[str, str]) -> None:
+        profile = self.profiles["insightsentry"]
+        stats = self.stats["insightsentry"]
+        last_heartbeat = 0.0
+        while not ws.closed:
+            await asyncio.sleep(self.tick_interval_s)
+            now = time.time()
+            if now - last_heartbeat >= HEARTBEAT_INTERVAL_S:
+                await ws.send_str(json_dumps({"server_time": int(now * 1000)}))
+                last_heartbeat = now
+
+            for code, ticker in list(codes.items()):
+                delay_ms = profile.latency_ms + self._random.uniform(0.0, profile.jitter_ms)
+                if delay_ms > 0:
+                    await asyncio.sleep(delay_ms / 1000)
+                if profile.error_rate and self._random.random() < profile.error_rate:
+                    stats["errors"] += 1
+                    await ws.close(code=1011, message=b"injected failure")
+                    return
+                bar = await self._live_bar(ticker)
+                await ws.send_str(json_dumps({"code": code, "series": [bar]}))
+                await ws.send_str(json_dumps({
+                    "data": [{"code": code, "last_price": bar["close"], "volume": bar["volume"]}],
+                }))
+
+    async def _stats(self, request: web.Request) -> web.Response:
+        return _json_response(self.stats)
@@ -5,61 +5,25 @@ from .models import (
     OHLCVBar,
     get_market_session,
     MARKET_OPEN,
+    PREMARKET_START,
+    POSTMARKET_END,
     ET_TZ,
     UTC_TZ,
 )
-from .data_providers import get_provider, OHLCVDataProvider
+from .data_providers import FetchRequest, OHLCVDataProvider, get_async_fetcher, get_provider
+from .market_calendar import get_trading_calendar
 
 logger = logging.getLogger(__name__)
 
-try:
-    import pandas_market_calendars as _mcal  # type: ignore
-except Exception:  # pragma: no cover
-    _mcal = None
-
-_NYSE_CAL = None
-
-
-def _is_weekend(d: date_type) -> bool:
-    return d.weekday() >= 5  # 5=Sat, 6=Sun
-
-
-def _get_nyse_calendar():
-    global _NYSE_CAL
-    if _NYSE_CAL is not None:
-        return _NYSE_CAL
-    if _mcal is None:
-        return None
-    try:
-        _NYSE_CAL = _mcal.get_calendar("NYSE")
-        return _NYSE_CAL
-    except Exception:
-        return None
-
 
 def _first_trading_day_on_or_after(d: date_type) -> date_type:
-    """
-    First NYSE trading day on/after `d`.
-    Falls back to weekday-only logic if market calendar library isn't installed.
-    """
-    cal = _get_nyse_calendar()
-    if cal is not None:
-        # Look ahead up to 2 weeks to handle holiday clusters.
-        days = cal.valid_days(start_date=d, end_date=d + timedelta(days=14))
-        if len(days) > 0:
-            # valid_days returns tz-aware timestamps (UTC). We only need the session date.
-            return days[0].to_pydatetime().date()
-
-    # Fallback: skip weekends only
-    nd = d
-    while _is_weekend(nd):
-        nd = nd + timedelta(days=1)
-    return nd
+    """First NYSE trading day on/after `d` (see TradingCalendar)."""
+    return get_trading_calendar().next_session_on_or_after(d)
 
 
 def _first_trading_day_after(d: date_type) -> date_type:
     """First NYSE trading day strictly after `d`."""
-    return _first_trading_day_on_or_after(d + timedelta(days=1))
+    return get_trading_calendar().next_session_after(d)
 
 
 def _combine_et(d: date_type, t: time_type, naive_input: bool) -> datetime:
@@ -79,6 +43,109 @@ def _floor_to_minute(dt: datetime) -> datetime:
     return dt.replace(second=0, microsecond=0)
 
 
+def get_effective_start_time(announcement_time: datetime) -> datetime:
+    """
+    Compute the effective OHLCV start time for an announcement.
+
+    Returns naive datetime in UTC (to match OHLCV storage format).
+
+    Args:
+        announcement_time: Naive datetime assumed to be UTC (from database),
+                          or timezone-aware datetime.
+
+    Returns:
+        Naive datetime in UTC representing:
+        - Market: announcement time (already UTC)
+        - Premarket: same-day market open (in UTC)
+        - Postmarket: announcement time (Alpaca has extended hours data)
+        - Closed: next market open (in UTC)
+    """
+    # Convert to Eastern Time for session logic, keep UTC for return
+    if announcement_time.tzinfo is None:
+        utc_time = announcement_time.replace(tzinfo=UTC_TZ)
+        et_time = utc_time.astimezone(ET_TZ).replace(tzinfo=None)
+    else:
+        utc_time = announcement_time.astimezone(UTC_TZ)
+        et_time = announcement_time.astimezone(ET_TZ).replace(tzinfo=None)
+
+    # If the calendar day (in ET) isn't a trading day, roll forward to next session open.
+    trading_day = _first_trading_day_on_or_after(et_time.date())
+    if trading_day != et_time.date():
+        return get_trading_calendar().session_open_utc(trading_day)
+
+    # Use the original timestamp for session check (handles UTC correctly)
+    session = get_market_session(announcement_time)
+
+    if session == "market":
+        # Return the UTC time (naive), floored to minute start for Alpaca API
+        if announcement_time.tzinfo is None:
+            return _floor_to_minute(announcement_time)
+        return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
+
+    if session == "premarket":
+        # Alpaca has extended hours data - return announcement time floored to minute
+        if announcement_time.tzinfo is None:
+            return _floor_to_minute(announcement_time)
+        return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
+
+    # For postmarket, return announcement time floored to minute (Alpaca has extended hours data)
+    if session == "postmarket":
+        if announcement_time.tzinfo is None:
+            return _floor_to_minute(announcement_time)
+        return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
+
+    # For closed times, determine next market open
+    if session == "closed":
+        t = et_time.time()
+        if t < MARKET_OPEN:
+            # Overnight before the bell: same-day open (in UTC)
+            day = _first_trading_day_on_or_after(et_time.date())
+            return get_trading_calendar().session_open_utc(day)
+
+        # Late evening: next weekday open (in UTC)
+        next_day = _first_trading_day_after(et_time.date())
+        return get_trading_calendar().session_open_utc(next_day)
+
+    # Fallback: next market open (in UTC)
+    next_day = _first_trading_day_after(et_time.date())
+    return get_trading_calendar().session_open_utc(next_day)
+
+
+def get_effective_start_times(timestamps):
+    """
+    Vectorized get_effective_start_time for bulk recomputes.
+
+    Args:
+        timestamps: Sequence (list, Series, DatetimeIndex) of naive-UTC or aware timestamps
+
+    Returns:
+        numpy datetime64[ns] array of naive-UTC effective starts, aligned with the input
+    """
+    import numpy as np
+    import pandas as pd
+
+    cal = get_trading_calendar()
+    idx = pd.DatetimeIndex(timestamps)
+    idx = idx.tz_localize(UTC_TZ) if idx.tz is None else idx.tz_convert(UTC_TZ)
+    et = idx.tz_convert(ET_TZ)
+    days = np.asarray(et.tz_localize(None).normalize().values, dtype="datetime64[D]")
+    minutes = np.asarray(et.hour * 60 + et.minute)
+
+    session_day = cal.next_sessions_on_or_after(days)
+    next_day = cal.next_sessions_on_or_after(days + np.timedelta64(1, "D"))
+    floored = idx.tz_localize(None).floor("min").values
+
+    # Same rules as the scalar version: non-trading day -> next open; pre/regular/post
+    # -> the announcement minute; overnight -> same-day open before 04:00, else next open
+    extended_start = PREMARKET_START.hour * 60 + PREMARKET_START.minute
+    extended_end = POSTMARKET_END.hour * 60 + POSTMARKET_END.minute
+    in_hours = (minutes >= extended_start) & (minutes < extended_end)
+    open_day = np.where(session_day != days, session_day,
+                        np.where(minutes < extended_start, days, next_day))
+    opens = cal.session_opens_utc(open_day)
+    return np.where((session_day == days) & in_hours, floored, opens)
+
+
 class MassiveClient:
     """Client for fetching OHLCV data with market session logic.
 
@@ -121,8 +188,10 @@ class MassiveClient:
         Returns:
             List of OHLCVBar objects
         """
-        # Delegate to provider (no local caching - use PostgresClient for that)
-        return self._provider.fetch_ohlcv(ticker, start, end, timespan)
+        # Delegate to provider (no local caching - use PostgresClient for that), through
+        # its shared fetcher so this is paced by the same token bucket as batch fetches
+        request = FetchRequest(ticker, start, end, timespan)
+        return get_async_fetcher(self._provider).submit(request).result()
 
     def fetch_after_announcement(
         self,
@@ -190,68 +259,5 @@ class MassiveClient:
         return self.fetch_ohlcv(ticker, pre_start, end_time)
 
     def get_effective_start_time(self, announcement_time: datetime) -> datetime:
-        """
-        Compute the effective OHLCV start time for an announcement.
-
-        Returns naive datetime in UTC (to match OHLCV storage format).
-
-        Args:
-            announcement_time: Naive datetime assumed to be UTC (from database),
-                              or timezone-aware datetime.
-
-        Returns:
-            Naive datetime in UTC representing:
-            - Market: announcement time (already UTC)
-            - Premarket: same-day market open (in UTC)
-            - Postmarket: announcement time (Alpaca has extended hours data)
-            - Closed: next market open (in UTC)
-        """
-        # Convert to Eastern Time for session logic, keep UTC for return
-        if announcement_time.tzinfo is None:
-            utc_time = announcement_time.replace(tzinfo=UTC_TZ)
-            et_time = utc_time.astimezone(ET_TZ).replace(tzinfo=None)
-        else:
-            utc_time = announcement_time.astimezone(UTC_TZ)
-            et_time = announcement_time.astimezone(ET_TZ).replace(tzinfo=None)
-
-        # If the calendar day (in ET) isn't a trading day, roll forward to next session open.
-        trading_day = _first_trading_day_on_or_after(et_time.date())
-        if trading_day != et_time.date():
-            return _combine_et_to_utc(trading_day, MARKET_OPEN)
-
-        # Use the original timestamp for session check (handles UTC correctly)
-        session = get_market_session(announcement_time)
-
-        if session == "market":
-            # Return the UTC time (naive), floored to minute start for Alpaca API
-            if announcement_time.tzinfo is None:
-                return _floor_to_minute(announcement_time)
-            return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
-
-        if session == "premarket":
-            # Alpaca has extended hours data - return announcement time floored to minute
-            if announcement_time.tzinfo is None:
-                return _floor_to_minute(announcement_time)
-            return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
-
-        # For postmarket, return announcement time floored to minute (Alpaca has extended hours data)
-        if session == "postmarket":
-            if announcement_time.tzinfo is None:
-                return _floor_to_minute(announcement_time)
-            return _floor_to_minute(announcement_time.astimezone(UTC_TZ).replace(tzinfo=None))
-
-        # For closed times, determine next market open
-        if session == "closed":
-            t = et_time.time()
-            if t < MARKET_OPEN:
-                # Overnight before the bell: same-day open (in UTC)
-                day = _first_trading_day_on_or_after(et_time.date())
-                return _combine_et_to_utc(day, MARKET_OPEN)
-
-            # Late evening: next weekday open (in UTC)
-            next_day = _first_trading_day_after(et_time.date())
-            return _combine_et_to_utc(next_day, MARKET_OPEN)
-
-        # Fallback: next market open (in UTC)
-        next_day = _first_trading_day_after(et_time.date())
-        return _combine_et_to_utc(next_day, MARKET_OPEN)
+        """Compute the effective OHLCV start time (see module-level get_effective_start_time)."""
+        return get_effective_start_time(announcement_time)
@@ -1,7 +1,7 @@
 import math
-from dataclasses import dataclass, field
-from datetime import datetime, time
-from typing import Optional, List
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime, time
+from typing import Optional, List, Sequence
 from zoneinfo import ZoneInfo
 
 
@@ -44,6 +44,48 @@ def get_market_session(timestamp: datetime) -> str:
         return "closed"
 
 
+def get_et_date(timestamp: datetime) -> date:
+    """Calendar date in Eastern Time (naive timestamps assumed UTC)."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=UTC_TZ)
+    return timestamp.astimezone(ET_TZ).date()
+
+
+def classify_market_sessions(timestamps) -> tuple:
+    """
+    Vectorized get_market_session / get_et_date for bulk recomputes.
+
+    Args:
+        timestamps: Sequence (list, Series, DatetimeIndex) of naive-UTC timestamps
+
+    Returns:
+        (sessions, et_dates) as numpy arrays aligned with the input
+    """
+    import numpy as np
+    import pandas as pd
+
+    idx = pd.DatetimeIndex(timestamps)
+    if idx.tz is None:
+        idx = idx.tz_localize(UTC_TZ)
+    et = idx.tz_convert(ET_TZ)
+    minutes = np.asarray(et.hour * 60 + et.minute)
+
+    def to_minutes(t: time) -> int:
+        return t.hour * 60 + t.minute
+
+    sessions = np.select(
+        [
+            (minutes >= to_minutes(PREMARKET_START)) & (minutes < to_minutes(MARKET_OPEN)),
+            (minutes >= to_minutes(MARKET_OPEN)) & (minutes < to_minutes(MARKET_CLOSE)),
+            (minutes >= to_minutes(MARKET_CLOSE)) & (minutes < to_minutes(POSTMARKET_END)),
+        ],
+        ["premarket", "market", "postmarket"],
+        default="closed",
+    )
+    et_dates = np.asarray(et.date)
+    return sessions, et_dates
+
+
 @dataclass
 class Announcement:
     """Represents a press release announcement from Discord."""
@@ -93,10 +135,46 @@ class Announcement:
     # OHLCV fetch status: 'pending' | 'fetched' | 'no_data' | 'error'
     ohlcv_status: Optional[str] = 'pending'
 
-    @property
-    def market_session(self) -> str:
-        """Returns the market session: premarket, market, postmarket, or closed."""
-        return get_market_session(self.timestamp)
+    # Derived from timestamp once (at parse time, or loaded from the stored columns)
+    market_session: Optional[str] = None  # premarket | market | postmarket | closed
+    et_date: Optional[date] = None  # Calendar date in Eastern Time
+    effective_start: Optional[datetime] = None  # Naive UTC start of the OHLCV window (set at save time)
+
+    def __post_init__(self):
+        if isinstance(self.timestamp, datetime):
+            if self.market_session is None:
+                self.market_session = get_market_session(self.timestamp)
+            if self.et_date is None:
+                self.et_date = get_et_date(self.timestamp)
+
+
+# Announcement fields holding large raw message text. Bulk loads for the dashboard and
+# backtests skip these; fetch them per announcement with load_announcement_sources().
+ANNOUNCEMENT_HEAVY_FIELDS = ("source_message", "source_html")
+
+# Every Announcement field except the heavy text columns
+ANNOUNCEMENT_LIGHT_FIELDS = tuple(
+    f.name for f in fields(Announcement) if f.name not in ANNOUNCEMENT_HEAVY_FIELDS
+)
+
+# Fields without a dataclass default - always loaded regardless of the requested projection
+ANNOUNCEMENT_REQUIRED_FIELDS = ("ticker", "timestamp", "price_threshold", "headline", "country")
+
+
+def resolve_announcement_fields(requested: Optional[Sequence[str]] = None) -> tuple:
+    """Return the Announcement fields to load for a requested projection.
+
+    None means all fields. Required fields are always included and unknown names raise
+    ValueError so typos don't silently drop data.
+    """
+    all_fields = tuple(f.name for f in fields(Announcement))
+    if requested is None:
+        return all_fields
+    unknown = set(requested) - set(all_fields)
+    if unknown:
+        raise ValueError(f"Unknown announcement fields: {sorted(unknown)}")
+    wanted = set(requested) | set(ANNOUNCEMENT_REQUIRED_FIELDS)
+    return tuple(name for name in all_fields if name in wanted)
 
 
 @dataclass
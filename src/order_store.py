@@ -1,18 +1,89 @@
 """Order persistence for tracking orders and events."""
 
+import atexit
 import json
 import logging
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, List, Optional, Dict, Any, Sequence, Set, Tuple
+
+from sqlalchemy import DateTime, Integer, String, column, insert, or_, select, text, true, update, values
+from sqlalchemy.exc import OperationalError
 
 from .base_store import BaseStore
 from .database import OrderDB, OrderEventDB
 
 logger = logging.getLogger(__name__)
 
+# Journal mode (used by the live trading engine): order transitions are appended to an
+# in-memory journal and written in batches, so creating an order record no longer sits
+# between the entry signal and the broker submit. ORDER_JOURNAL=0 disables it.
+ORDER_JOURNAL = os.getenv("ORDER_JOURNAL", "1") == "1"
+ORDER_JOURNAL_FLUSH_INTERVAL = float(os.getenv("ORDER_JOURNAL_FLUSH_INTERVAL", "0.25"))
+# Order ids are reserved from the orders sequence in blocks so create_order can hand
+# out a real primary key without a round-trip.
+ORDER_ID_BLOCK = 20
+
+# (sequence number, op kind, payload); kind is "order", "broker_id", "status" or "event"
+JournalEntry = Tuple[int, str, Dict[str, Any]]
+
+# Legacy trades (no trade_id on their orders) are matched to orders created within this
+# window around the entry/exit fill time.
+LEGACY_ORDER_MATCH_BEFORE = timedelta(seconds=120)
+LEGACY_ORDER_MATCH_AFTER = timedelta(seconds=5)
+
+# An order with its events, oldest event first
+OrderWithEvents = Tuple[OrderDB, List[OrderEventDB]]
+
 
 class OrderStore(BaseStore):
-    """CRUD operations for orders and order events."""
+    """CRUD operations for orders and order events.
+
+    By default every call commits on its own. With journal mode enabled
+    (enable_journal()), create_order, update_order_status and record_event append to an
+    ordered in-memory journal that a background thread flushes in one transaction per
+    batch. update_broker_order_id flushes synchronously, so once an order is placed with
+    the broker its row and broker id are durable for fill matching and recovery. Reads
+    flush the journal first.
+    """
+
+    def __init__(self, journal: bool = False, flush_interval: float = ORDER_JOURNAL_FLUSH_INTERVAL):
+        self._journal_enabled = False
+        self._flush_interval = flush_interval
+        self._journal: Deque[JournalEntry] = deque()
+        self._seq = 0
+        # Entries the per-entry fallback in flush() gave up on, by seq, and the ids of
+        # orders whose row insert was dropped
+        self._dropped_seqs: Set[int] = set()
+        self._dropped_order_ids: Set[int] = set()
+        self._id_pool: Deque[int] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if journal:
+            self.enable_journal()
+
+    def enable_journal(self, enabled: bool = True) -> None:
+        """Switch journal mode on or off (off flushes whatever is journaled)."""
+        if not enabled:
+            self.close()
+            self._journal_enabled = False
+            return
+        if self._journal_enabled:
+            return
+        self._journal_enabled = True
+        self._refill_id_pool()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="OrderJournal")
+        self._thread.start()
+        logger.info("Order journal mode enabled")
+
+    @property
+    def journal_enabled(self) -> bool:
+        return self._journal_enabled
 
     def create_order(
         self,
@@ -34,6 +105,32 @@ class OrderStore(BaseStore):
         Returns:
             Order ID if successful, None otherwise.
         """
+        if self._journal_enabled:
+            order_id = self._reserve_order_id()
+            if order_id is not None:
+                now = datetime.utcnow()
+                self._append("order", {
+                    "id": order_id,
+                    "ticker": ticker,
+                    "side": side,
+                    "order_type": order_type,
+                    "requested_shares": requested_shares,
+                    "limit_price": limit_price,
+                    "broker_order_id": broker_order_id,
+                    "strategy_id": strategy_id,
+                    "strategy_name": strategy_name,
+                    "active_trade_id": active_trade_id,
+                    "trade_id": trade_id,
+                    "paper": paper,
+                    "status": "pending",
+                    "filled_shares": 0,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+                logger.info(f"[{ticker}] Created order {order_id}: {side} {requested_shares} shares (journaled)")
+                return order_id
+            # Couldn't reserve an id (DB unreachable?) - fall through to a direct insert
+
         try:
             with self._db_session() as session:
                 order = OrderDB(
@@ -60,7 +157,22 @@ class OrderStore(BaseStore):
             return None
 
     def update_broker_order_id(self, order_id: int, broker_order_id: str) -> bool:
-        """Update the broker order ID after order submission."""
+        """Update the broker order ID after order submission.
+
+        In journal mode this is the synchronous point: the journal (including the
+        order row) is flushed before returning. Returns False unless both the order
+        row and the broker id were written.
+        """
+        if self._journal_enabled:
+            seq = self._append("broker_id", {"id": order_id, "broker_order_id": broker_order_id})
+            self.flush()
+            with self._lock:
+                if seq in self._dropped_seqs or order_id in self._dropped_order_ids:
+                    self._dropped_seqs.discard(seq)
+                    logger.error(f"Broker order ID {broker_order_id} for order {order_id} was not persisted")
+                    return False
+                return not any(s == seq for s, _, _ in self._journal)
+
         try:
             with self._db_session() as session:
                 order = session.query(OrderDB).filter(OrderDB.id == order_id).first()
@@ -82,6 +194,20 @@ class OrderStore(BaseStore):
         avg_fill_price: Optional[float] = None,
     ) -> bool:
         """Update order status and fill info."""
+        if self._journal_enabled:
+            if not order_id and not broker_order_id:
+                return False
+            values: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+            if status:
+                values["status"] = status
+            if filled_shares is not None:
+                values["filled_shares"] = filled_shares
+            if avg_fill_price is not None:
+                values["avg_fill_price"] = avg_fill_price
+            self._append("status", {"id": order_id, "broker_order_id": broker_order_id, "values": values})
+            logger.info(f"Journaled order {order_id or broker_order_id}: status={status}, filled={filled_shares}")
+            return True
+
         try:
             with self._db_session() as session:
                 if order_id:
@@ -123,8 +249,21 @@ class OrderStore(BaseStore):
         Record an order event.
 
         Returns:
-            Event ID if successful, None otherwise.
+            Event ID if successful, None otherwise (always None in journal mode).
         """
+        if self._journal_enabled:
+            self._append("event", {
+                "order_id": order_id,
+                "broker_order_id": broker_order_id,
+                "event_type": event_type,
+                "filled_shares": filled_shares,
+                "fill_price": fill_price,
+                "cumulative_filled": cumulative_filled,
+                "raw_data": json.dumps(raw_data) if raw_data else None,
+                "event_timestamp": event_timestamp,
+            })
+            return None
+
         try:
             with self._db_session() as session:
                 # If we only have broker_order_id, try to find our order_id
@@ -154,8 +293,135 @@ class OrderStore(BaseStore):
             logger.error(f"Failed to record order event: {e}")
             return None
 
+    # ------------------------------------------------------------------
+    # Journal
+    # ------------------------------------------------------------------
+
+    def flush(self) -> int:
+        """Write journaled transitions in order, one transaction. Returns entries written.
+
+        If the batch fails for a reason other than connectivity, entries are applied one
+        by one and those that still fail are dropped (recorded in _dropped_seqs).
+        """
+        if not self._journal:
+            return 0
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._journal)
+                self._journal.clear()
+            if not batch:
+                return 0
+
+            try:
+                with self._db_session() as session:
+                    self._apply_entries(session, batch)
+                return len(batch)
+            except OperationalError as e:
+                logger.error(f"Order journal flush failed, will retry: {e}")
+                with self._lock:
+                    self._journal.extendleft(reversed(batch))
+                return 0
+            except Exception as e:
+                logger.error(f"Order journal batch of {len(batch)} failed, applying individually: {e}")
+
+            written = 0
+            for entry in batch:
+                try:
+                    with self._db_session() as session:
+                        self._apply_entries(session, [entry])
+                    written += 1
+                except Exception as e:
+                    logger.error(f"Dropping journaled order {entry[1]} #{entry[0]}: {e}")
+                    with self._lock:
+                        self._dropped_seqs.add(entry[0])
+                        if entry[1] == "order":
+                            self._dropped_order_ids.add(entry[2]["id"])
+            return written
+
+    def close(self) -> None:
+        """Stop the journal thread and flush what's left."""
+        self._stop_event.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self._flush_interval * 4 + 5)
+        self.flush()
+
+    def _append(self, kind: str, payload: Dict[str, Any]) -> int:
+        with self._lock:
+            self._seq += 1
+            self._journal.append((self._seq, kind, payload))
+            return self._seq
+
+    def _reserve_order_id(self) -> Optional[int]:
+        with self._lock:
+            if self._id_pool:
+                return self._id_pool.popleft()
+        self._refill_id_pool()
+        with self._lock:
+            return self._id_pool.popleft() if self._id_pool else None
+
+    def _refill_id_pool(self) -> None:
+        """Reserve a block of ids from the orders sequence."""
+        try:
+            with self._db_session() as session:
+                ids = session.execute(
+                    text("SELECT nextval(pg_get_serial_sequence('orders', 'id')) FROM generate_series(1, :n)"),
+                    {"n": ORDER_ID_BLOCK},
+                ).scalars().all()
+            with self._lock:
+                self._id_pool.extend(ids)
+        except Exception as e:
+            logger.error(f"Failed to reserve order ids: {e}")
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._flush_interval):
+            try:
+                self.flush()
+                if len(self._id_pool) < ORDER_ID_BLOCK // 2:
+                    self._refill_id_pool()
+            except Exception as e:
+                logger.error(f"Order journal error: {e}", exc_info=True)
+
+    @staticmethod
+    def _apply_entries(session, entries: List[JournalEntry]) -> None:
+        """Apply journal entries in sequence order; runs of inserts go out as executemany."""
+        conn = session.connection()
+        i = 0
+        while i < len(entries):
+            kind = entries[i][1]
+            if kind in ("order", "event"):
+                j = i
+                while j < len(entries) and entries[j][1] == kind:
+                    j += 1
+                rows = [dict(p) for _, _, p in entries[i:j]]
+                if kind == "event":
+                    for row in rows:
+                        if row["order_id"] is None and row["broker_order_id"]:
+                            row["order_id"] = conn.execute(
+                                select(OrderDB.id).where(OrderDB.broker_order_id == row["broker_order_id"])
+                            ).scalar()
+                conn.execute(insert(OrderDB if kind == "order" else OrderEventDB), rows)
+                i = j
+                continue
+
+            payload = entries[i][2]
+            if kind == "broker_id":
+                conn.execute(
+                    update(OrderDB)
+                    .where(OrderDB.id == payload["id"])
+                    .values(broker_order_id=payload["broker_order_id"], updated_at=datetime.utcnow())
+                )
+            elif kind == "status":
+                key = (
+                    OrderDB.id == payload["id"] if payload["id"]
+                    else OrderDB.broker_order_id == payload["broker_order_id"]
+                )
+                conn.execute(update(OrderDB).where(key).values(**payload["values"]))
+            i += 1
+
     def get_order(self, order_id: Optional[int] = None, broker_order_id: Optional[str] = None) -> Optional[OrderDB]:
         """Get an order by ID or broker order ID."""
+        self.flush()
         with self._db_session() as session:
             if order_id:
                 order = session.query(OrderDB).filter(OrderDB.id == order_id).first()
@@ -170,6 +436,7 @@ class OrderStore(BaseStore):
 
     def get_pending_orders(self, ticker: Optional[str] = None, strategy_id: Optional[str] = None) -> List[OrderDB]:
         """Get all pending orders, optionally filtered by ticker or strategy."""
+        self.flush()
         with self._db_session() as session:
             query = session.query(OrderDB).filter(OrderDB.status.in_(['pending', 'partial']))
 
@@ -185,6 +452,7 @@ class OrderStore(BaseStore):
 
     def get_orders_for_strategy(self, strategy_id: str, limit: int = 100) -> List[OrderDB]:
         """Get recent orders for a strategy."""
+        self.flush()
         with self._db_session() as session:
             orders = session.query(OrderDB).filter(
                 OrderDB.strategy_id == strategy_id
@@ -195,6 +463,7 @@ class OrderStore(BaseStore):
 
     def get_events_for_order(self, order_id: int) -> List[OrderEventDB]:
         """Get all events for an order."""
+        self.flush()
         with self._db_session() as session:
             events = session.query(OrderEventDB).filter(
                 OrderEventDB.order_id == order_id
@@ -203,6 +472,94 @@ class OrderStore(BaseStore):
                 session.expunge(e)
             return events
 
+    def get_orders_with_events_for_trades(self, trades: Sequence[Any]) -> Dict[int, List[OrderWithEvents]]:
+        """Get the orders and events behind a page of completed trades.
+
+        Orders are found by trade_id; trades with none (recorded before orders carried a
+        trade_id) fall back to the buy/sell order created just before their entry/exit
+        fill time. Takes at most three queries however many trades are passed: orders by
+        trade_id, one range join for the legacy fallback, and events by order id.
+
+        Args:
+            trades: TradeDB rows (anything with id, trade_id, ticker, entry_time,
+                exit_time and strategy_id)
+
+        Returns:
+            Dict of trade DB id -> [(order, events)] ordered by order creation time
+            (trades with no matching orders are left out)
+        """
+        self.flush()
+        if not trades:
+            return {}
+
+        orders_by_trade: Dict[int, List[OrderDB]] = {}
+        with self._db_session() as session:
+            trade_ids = {t.trade_id: t.id for t in trades if t.trade_id}
+            if trade_ids:
+                for order in session.query(OrderDB).filter(OrderDB.trade_id.in_(list(trade_ids))):
+                    orders_by_trade.setdefault(trade_ids[order.trade_id], []).append(order)
+
+            legacy = [t for t in trades if t.id not in orders_by_trade]
+            if legacy:
+                for trade_key, order in self._match_legacy_orders(session, legacy):
+                    orders_by_trade.setdefault(trade_key, []).append(order)
+
+            order_ids = [o.id for orders in orders_by_trade.values() for o in orders]
+            events_by_order: Dict[int, List[OrderEventDB]] = {}
+            if order_ids:
+                events = session.query(OrderEventDB).filter(
+                    OrderEventDB.order_id.in_(order_ids)
+                ).order_by(OrderEventDB.order_id, OrderEventDB.event_timestamp.asc()).all()
+                for e in events:
+                    events_by_order.setdefault(e.order_id, []).append(e)
+
+            session.expunge_all()
+
+        return {
+            trade_key: [
+                (order, events_by_order.get(order.id, []))
+                for order in sorted(orders, key=lambda o: o.created_at)
+            ]
+            for trade_key, orders in orders_by_trade.items()
+        }
+
+    @staticmethod
+    def _match_legacy_orders(session, trades: Sequence[Any]) -> List[Tuple[int, OrderDB]]:
+        """Find the earliest buy order near entry and sell order near exit for each trade, in one query."""
+        windows = values(
+            column("trade_key", Integer),
+            column("ticker", String),
+            column("side", String),
+            column("window_start", DateTime),
+            column("window_end", DateTime),
+            column("strategy_id", String),
+            name="windows",
+        ).data([
+            (t.id, t.ticker, side, fill_time - LEGACY_ORDER_MATCH_BEFORE, fill_time + LEGACY_ORDER_MATCH_AFTER, t.strategy_id)
+            for t in trades
+            for side, fill_time in (("buy", t.entry_time), ("sell", t.exit_time))
+        ])
+        match = (
+            select(OrderDB.id)
+            .where(
+                OrderDB.ticker == windows.c.ticker,
+                OrderDB.side == windows.c.side,
+                OrderDB.created_at >= windows.c.window_start,
+                OrderDB.created_at <= windows.c.window_end,
+                or_(windows.c.strategy_id.is_(None), OrderDB.strategy_id == windows.c.strategy_id),
+            )
+            .order_by(OrderDB.created_at.asc())
+            .limit(1)
+            .lateral("match")
+        )
+        return (
+            session.query(windows.c.trade_key, OrderDB)
+            .select_from(windows)
+            .join(match, true())
+            .join(OrderDB, OrderDB.id == match.c.id)
+            .all()
+        )
+
 
 # Global instance
 _order_store: Optional[OrderStore] = None
@@ -213,4 +570,5 @@ def get_order_store() -> OrderStore:
     global _order_store
     if _order_store is None:
         _order_store = OrderStore()
+        atexit.register(_order_store.close)
     return _order_store
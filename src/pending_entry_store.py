@@ -4,7 +4,10 @@ import logging
 from datetime import datetime
 from typing import List, Optional
 
-from .base_store import BaseStore
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from .base_store import BaseStore, mark_trade_data_changed
 from .database import PendingEntryDB
 
 logger = logging.getLogger(__name__)
@@ -49,8 +52,9 @@ class PendingEntryStore(BaseStore):
                     )
                     session.add(entry)
 
-                logger.info(f"[{ticker}] Saved pending entry to database (trade_id={trade_id[:8]})")
-                return True
+            mark_trade_data_changed()
+            logger.info(f"[{ticker}] Saved pending entry to database (trade_id={trade_id[:8]})")
+            return True
 
         except Exception as e:
             logger.error(f"Failed to save pending entry: {e}")
@@ -68,9 +72,62 @@ class PendingEntryStore(BaseStore):
                     ticker = entry.ticker
                     session.delete(entry)
                     logger.info(f"[{ticker}] Deleted pending entry from database (trade_id={trade_id[:8]})")
-                    return True
-                return False
+                else:
+                    return False
+            mark_trade_data_changed()
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to delete pending entry: {e}")
+            return False
+
+    async def asave_entry(
+        self,
+        trade_id: str,
+        ticker: str,
+        strategy_id: Optional[str],
+        strategy_name: Optional[str],
+        alert_time: datetime,
+        first_price: Optional[float],
+        announcement_ticker: str,
+        announcement_timestamp: datetime,
+    ) -> bool:
+        """Async save_entry (single upsert on trade_id)."""
+        stmt = pg_insert(PendingEntryDB).values(
+            trade_id=trade_id,
+            ticker=ticker,
+            strategy_id=strategy_id,
+            strategy_name=strategy_name,
+            alert_time=alert_time,
+            first_price=first_price,
+            announcement_ticker=announcement_ticker,
+            announcement_timestamp=announcement_timestamp,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["trade_id"],
+            set_={"first_price": stmt.excluded.first_price},
+        )
+        try:
+            async with self._async_db_session() as session:
+                await session.execute(stmt)
+            mark_trade_data_changed()
+            logger.info(f"[{ticker}] Saved pending entry to database (trade_id={trade_id[:8]})")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save pending entry: {e}")
+            return False
 
+    async def adelete_entry(self, trade_id: str) -> bool:
+        """Async delete_entry."""
+        try:
+            async with self._async_db_session() as session:
+                result = await session.execute(
+                    delete(PendingEntryDB).where(PendingEntryDB.trade_id == trade_id)
+                )
+            if result.rowcount:
+                mark_trade_data_changed()
+                logger.info(f"Deleted pending entry from database (trade_id={trade_id[:8]})")
+            return bool(result.rowcount)
         except Exception as e:
             logger.error(f"Failed to delete pending entry: {e}")
             return False
@@ -111,8 +168,10 @@ class PendingEntryStore(BaseStore):
                 count = session.query(PendingEntryDB).filter(
                     PendingEntryDB.strategy_id == strategy_id
                 ).delete()
-                logger.info(f"Cleared {count} pending entries for strategy {strategy_id}")
-                return count
+            if count:
+                mark_trade_data_changed()
+            logger.info(f"Cleared {count} pending entries for strategy {strategy_id}")
+            return count
         except Exception as e:
             logger.error(f"Failed to clear strategy entries: {e}")
             return 0
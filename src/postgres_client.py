@@ -4,7 +4,7 @@ import logging
 import os
 from datetime import datetime, timedelta
 from functools import lru_cache
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
 from sqlalchemy.orm import Session
@@ -12,15 +12,49 @@ from sqlalchemy.orm import aliased
 from sqlalchemy import and_, or_, tuple_
 from sqlalchemy import String, Time, cast, case, func, literal
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from .database import SessionLocal, AnnouncementDB, OHLCVBarDB, RawMessageDB
-from .models import Announcement, OHLCVBar, get_market_session
-from .data_providers import get_provider, OHLCVDataProvider
+from .models import (
+    Announcement,
+    OHLCVBar,
+    get_et_date,
+    get_market_session,
+    resolve_announcement_fields,
+)
+from .data_providers import (
+    FetchRequest,
+    FetchWindow,
+    OHLCVDataProvider,
+    get_async_fetcher,
+    get_provider,
+    plan_fetches,
+)
 
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Bars linked to an announcement fall within [announcement - pre-window, effective start +
+# window]; the effective start can roll over a weekend/holiday. These bounds let
+# announcement-key lookups carry a timestamp range so a partitioned ohlcv_bars table
+# only scans the months that can contain matching rows. Pre-windows longer than
+# OHLCV_LINK_MAX_BEFORE are rejected (_announcement_window, backfill_pre_announcement_bars.py).
+OHLCV_LINK_MAX_BEFORE = timedelta(minutes=30)
+OHLCV_LINK_MAX_AFTER = timedelta(days=7)
+
+
+class _NotAvailableYet(tuple):
+    """Empty result marking a window that can't be fetched yet (see NOT_AVAILABLE_YET)."""
+
+    def __repr__(self) -> str:
+        return "NOT_AVAILABLE_YET"
+
+
+# fetch_after_announcements result for an announcement whose trading window is today
+# or later: nothing was fetched and its status is untouched, so callers should defer it
+NOT_AVAILABLE_YET = _NotAvailableYet()
+
 
 class PostgresClient:
     """Client for storing/retrieving announcements and OHLCV data in PostgreSQL.
@@ -100,16 +134,19 @@ class PostgresClient:
         finally:
             db.close()
 
-    def load_announcements(self, source: Optional[str] = 'backfill') -> List[Announcement]:
+    def load_announcements(self, source: Optional[str] = 'backfill',
+                           fields: Optional[Sequence[str]] = None) -> List[Announcement]:
         """Load announcements from the database.
 
         Args:
             source: Filter by source ('backfill', 'live', or None for all).
                     Defaults to 'backfill' to exclude live alerts from backtest data.
+            fields: Announcement fields to load (None = all). Use ANNOUNCEMENT_LIGHT_FIELDS
+                    to skip source_message/source_html; unloaded fields keep their defaults.
         """
         db = self._get_db()
         try:
-            query = db.query(AnnouncementDB)
+            query = db.query(*self._announcement_columns(AnnouncementDB, fields))
             if source:
                 query = query.filter(AnnouncementDB.source == source)
             rows = query.order_by(AnnouncementDB.timestamp.desc()).all()
@@ -177,11 +214,13 @@ class PostgresClient:
         rvol_max: float = 0.0,
         exclude_financing_types: Optional[List[str]] = None,
         exclude_biotech: bool = False,
+        fields: Optional[Sequence[str]] = None,  # Announcement fields to load (None = all)
     ) -> tuple[int, List[Announcement]]:
         """
         Load announcements using SQL for speed.
 
         Preserves the dashboard's semantics: sampling is applied FIRST, then filters.
+        Only the requested `fields` are selected, so heavy text columns can be skipped.
 
         Returns:
             (total_before_sampling, announcements)
@@ -231,7 +270,9 @@ class PostgresClient:
                     q = base
 
             # Apply filters to sampled rows
-            # Session filter: compute ET time-of-day from UTC timestamp (matches src.models.get_market_session).
+            # Session filter: uses the precomputed market_session column; rows saved before the
+            # column existed fall back to computing the ET time-of-day from the UTC timestamp
+            # (matches src.models.get_market_session).
             if sessions:
                 # timestamp column is stored as naive UTC
                 et_ts = func.timezone("America/New_York", func.timezone("UTC", A.timestamp))
@@ -251,7 +292,12 @@ class PostgresClient:
                     ),
                     else_=literal("closed"),
                 )
-                q = q.filter(session_case.in_(sessions))
+                q = q.filter(
+                    or_(
+                        A.market_session.in_(sessions),
+                        and_(A.market_session.is_(None), session_case.in_(sessions)),
+                    )
+                )
 
             if countries:
                 q = q.filter(A.country.in_(countries))
@@ -333,7 +379,7 @@ class PostgresClient:
             # Keep a stable sort for UI
             q = q.order_by(A.timestamp.desc())
 
-            rows = q.all()
+            rows = q.with_entities(*self._announcement_columns(A, fields)).all()
             return total_before_sampling, [self._db_to_announcement(r) for r in rows]
         finally:
             db.close()
@@ -391,6 +437,44 @@ class PostgresClient:
         finally:
             db.close()
 
+    def load_announcement_sources(self, keys: List[tuple]) -> Dict[tuple, dict]:
+        """Fetch the heavy source text for specific announcements.
+
+        Counterpart to projected loads that skip source_message/source_html: the detail
+        view asks for just the rows it displays.
+
+        Args:
+            keys: List of (ticker, timestamp) tuples
+
+        Returns:
+            Dict mapping (ticker, timestamp) to {"source_message": ..., "source_html": ...}
+        """
+        if not keys:
+            return {}
+
+        db = self._get_db()
+        try:
+            result = {}
+            key_col = tuple_(AnnouncementDB.ticker, AnnouncementDB.timestamp)
+            for start_idx in range(0, len(keys), 1000):
+                batch = keys[start_idx:start_idx + 1000]
+                rows = db.execute(
+                    select(
+                        AnnouncementDB.ticker,
+                        AnnouncementDB.timestamp,
+                        AnnouncementDB.source_message,
+                        AnnouncementDB.source_html,
+                    ).where(key_col.in_(batch))
+                ).all()
+                for ticker, ts, source_message, source_html in rows:
+                    result[(ticker, ts)] = {
+                        "source_message": source_message,
+                        "source_html": source_html,
+                    }
+            return result
+        finally:
+            db.close()
+
     def toggle_announcement_blacklist(self, ticker: str, timestamp: datetime) -> bool:
         """Toggle the blacklist status of an announcement. Returns the new status."""
         db = self._get_db()
@@ -430,33 +514,40 @@ class PostgresClient:
     def save_ohlcv_bars(self, ticker: str, bars: List[OHLCVBar],
                         announcement_ticker: str = None,
                         announcement_timestamp: datetime = None) -> int:
-        """Save OHLCV bars to the database. Returns count of new records."""
+        """Save OHLCV bars to the database. Returns count of new records.
+
+        Uses multi-row INSERT ... ON CONFLICT DO NOTHING on (ticker, timestamp) instead of
+        a SELECT per bar, which works the same on the plain and partitioned layouts.
+        """
+        if not bars:
+            return 0
+
         db = self._get_db()
         new_count = 0
         try:
-            for bar in bars:
-                existing = db.query(OHLCVBarDB).filter(
-                    and_(
-                        OHLCVBarDB.ticker == ticker,
-                        OHLCVBarDB.timestamp == bar.timestamp
-                    )
-                ).first()
-
-                if not existing:
-                    db_bar = OHLCVBarDB(
-                        ticker=ticker,
-                        timestamp=bar.timestamp,
-                        open=bar.open,
-                        high=bar.high,
-                        low=bar.low,
-                        close=bar.close,
-                        volume=bar.volume,
-                        vwap=bar.vwap,
-                        announcement_ticker=announcement_ticker,
-                        announcement_timestamp=announcement_timestamp,
-                    )
-                    db.add(db_bar)
-                    new_count += 1
+            rows = [
+                {
+                    "ticker": ticker,
+                    "timestamp": bar.timestamp,
+                    "open": bar.open,
+                    "high": bar.high,
+                    "low": bar.low,
+                    "close": bar.close,
+                    "volume": bar.volume,
+                    "vwap": bar.vwap,
+                    "announcement_ticker": announcement_ticker,
+                    "announcement_timestamp": announcement_timestamp,
+                }
+                for bar in bars
+            ]
+            for start_idx in range(0, len(rows), 1000):
+                stmt = (
+                    pg_insert(OHLCVBarDB)
+                    .values(rows[start_idx:start_idx + 1000])
+                    .on_conflict_do_nothing(index_elements=["ticker", "timestamp"])
+                )
+                result = db.execute(stmt)
+                new_count += max(result.rowcount or 0, 0)
 
             db.commit()
             return new_count
@@ -522,13 +613,19 @@ class PostgresClient:
         # Pre-create result map with all keys (even those with no bars)
         result = {key: [] for key in announcement_keys}
 
+        # Chunk in timestamp order so each statement's time bounds stay narrow
+        # (partition pruning on ohlcv_bars when it is range-partitioned by month).
+        ordered_keys = sorted(announcement_keys, key=lambda k: k[1])
+
         db = self._get_db()
         try:
             total_rows = 0
             key_col = tuple_(OHLCVBarDB.announcement_ticker, OHLCVBarDB.announcement_timestamp)
 
-            for start_idx in range(0, len(announcement_keys), chunk_size):
-                batch = announcement_keys[start_idx:start_idx + chunk_size]
+            for start_idx in range(0, len(ordered_keys), chunk_size):
+                batch = ordered_keys[start_idx:start_idx + chunk_size]
+                ts_lo = batch[0][1] - OHLCV_LINK_MAX_BEFORE
+                ts_hi = batch[-1][1] + OHLCV_LINK_MAX_AFTER
 
                 # Use a Core select returning raw tuples to avoid ORM object materialization overhead.
                 stmt = (
@@ -544,6 +641,8 @@ class PostgresClient:
                         OHLCVBarDB.vwap,
                     )
                     .where(key_col.in_(batch))
+                    .where(OHLCVBarDB.timestamp >= ts_lo)
+                    .where(OHLCVBarDB.timestamp <= ts_hi)
                     .order_by(
                         OHLCVBarDB.announcement_ticker,
                         OHLCVBarDB.announcement_timestamp,
@@ -725,8 +824,9 @@ class PostgresClient:
         if use_cache and self.has_ohlcv_data(ticker, start, end):
             return self.get_ohlcv_bars(ticker, start, end)
 
-        # Delegate to the configured provider
-        bars = self._provider.fetch_ohlcv(ticker, start, end)
+        # Through the provider's shared fetcher, so single fetches and batches are
+        # paced by the same token bucket
+        bars = get_async_fetcher(self._provider).submit(FetchRequest(ticker, start, end)).result()
 
         # Cache in database with announcement link
         if bars:
@@ -782,25 +882,11 @@ class PostgresClient:
         Returns:
             List of OHLCV bars (timestamps in ET) or empty list
         """
-        from datetime import date
-        from .massive_client import MassiveClient
-
-        # Use MassiveClient's timezone-aware effective start calculation
-        # This properly converts UTC announcement time to ET for OHLCV queries
-        massive_client = MassiveClient()
-        effective_start = massive_client.get_effective_start_time(announcement_time)
-
-        # Skip fetching if effective trading window is today (data not yet available)
-        if effective_start.date() >= date.today():
-            logger.debug(f"Skipping {ticker}: trading window is today/future ({effective_start.date()})")
+        window = self._announcement_window(announcement_time, window_minutes, pre_window_minutes)
+        if window is None:
+            logger.debug(f"Skipping {ticker}: trading window is today/future")
             return []
-
-        # Calculate pre-window start: fetch 5 minutes before the announcement time
-        # (not before the effective start, since we want actual pre-announcement bars)
-        pre_start = announcement_time - timedelta(minutes=pre_window_minutes)
-
-        # End time is after the effective start (handles premarket -> market open logic)
-        end_time = effective_start + timedelta(minutes=window_minutes)
+        pre_start, end_time = window
 
         try:
             bars = self.fetch_ohlcv(
@@ -826,6 +912,138 @@ class PostgresClient:
                 self.update_ohlcv_status(ticker, announcement_time, 'error')
             raise
 
+    def fetch_after_announcements(self, announcements: Sequence[Tuple[str, datetime]],
+                                  window_minutes: int = 120,
+                                  pre_window_minutes: int = 5,
+                                  use_cache: bool = True,
+                                  update_status: bool = True,
+                                  replace: bool = False) -> List[Optional[List[OHLCVBar]]]:
+        """Batch fetch_after_announcement: provider calls run concurrently through the
+        shared async fetcher (rate limited by its token bucket).
+
+        Overlapping windows of the same ticker and trading day are coalesced into one
+        provider request and the bars split back per announcement (see plan_fetches).
+
+        Args:
+            announcements: (ticker, announcement_time) pairs, announcement_time naive UTC
+            replace: Delete the bars stored for an announcement before saving the new
+                ones (only when new bars were fetched). Use with use_cache=False.
+
+        Returns:
+            Per announcement, in order: bars, [] if there is no data, None if the fetch
+            failed and should be retried, or NOT_AVAILABLE_YET (compare with `is`) if
+            the trading window isn't over yet. Status is left alone for the latter.
+        """
+        results: List[Optional[List[OHLCVBar]]] = [[] for _ in announcements]
+        to_fetch: List[FetchWindow] = []
+        skipped = set()
+
+        for i, (ticker, announcement_time) in enumerate(announcements):
+            window = self._announcement_window(announcement_time, window_minutes, pre_window_minutes)
+            if window is None:
+                results[i] = NOT_AVAILABLE_YET
+                skipped.add(i)
+                continue
+            pre_start, end_time = window
+            if use_cache and self.has_ohlcv_data(ticker, pre_start, end_time):
+                results[i] = self.get_ohlcv_bars(ticker, pre_start, end_time)
+                continue
+            to_fetch.append(FetchWindow(i, ticker, pre_start, end_time))
+
+        if to_fetch:
+            plan = plan_fetches(to_fetch)
+            fetched = get_async_fetcher(self._provider).fetch_batch([p.request for p in plan])
+            for coalesced, bars in zip(plan, fetched):
+                results_by_index = coalesced.split(bars)
+                # Earliest announcement first: bars are unique per (ticker, timestamp), so
+                # shared bars stay linked to the first announcement that covers them
+                for i in sorted(results_by_index, key=lambda idx: announcements[idx][1]):
+                    ticker, announcement_time = announcements[i]
+                    window_bars = results_by_index[i]
+                    if window_bars:
+                        if replace:
+                            self._delete_announcement_bars(ticker, announcement_time)
+                        self.save_ohlcv_bars(ticker, window_bars,
+                                             announcement_ticker=ticker,
+                                             announcement_timestamp=announcement_time)
+                    results[i] = window_bars
+
+        if update_status:
+            by_status: Dict[str, List[Tuple[str, datetime]]] = {}
+            for i, (key, bars) in enumerate(zip(announcements, results)):
+                if i in skipped:
+                    continue
+                status = 'error' if bars is None else ('fetched' if bars else 'no_data')
+                by_status.setdefault(status, []).append(tuple(key))
+            self._update_ohlcv_statuses(by_status)
+
+        return results
+
+    @staticmethod
+    def announcement_available_at(announcement_time: datetime) -> datetime:
+        """Earliest time fetch_after_announcement(s) will fetch this announcement's
+        window: midnight after its effective trading day (same clock as date.today())."""
+        from .massive_client import get_effective_start_time
+
+        effective_date = get_effective_start_time(announcement_time).date()
+        return datetime.combine(effective_date + timedelta(days=1), datetime.min.time())
+
+    @staticmethod
+    def _announcement_window(announcement_time: datetime, window_minutes: int,
+                             pre_window_minutes: int) -> Optional[Tuple[datetime, datetime]]:
+        """Fetch window [pre_start, end] for an announcement, or None if its trading
+        window is today or later (data not yet available)."""
+        from datetime import date
+        from .massive_client import get_effective_start_time
+
+        if timedelta(minutes=pre_window_minutes) > OHLCV_LINK_MAX_BEFORE:
+            raise ValueError(
+                f"pre_window_minutes={pre_window_minutes} exceeds OHLCV_LINK_MAX_BEFORE "
+                f"({OHLCV_LINK_MAX_BEFORE}); earlier bars would not be found by announcement"
+            )
+
+        # Timezone-aware effective start calculation
+        # This properly converts UTC announcement time to ET for OHLCV queries
+        effective_start = get_effective_start_time(announcement_time)
+
+        # Skip fetching if effective trading window is today (data not yet available)
+        if effective_start.date() >= date.today():
+            return None
+
+        # Calculate pre-window start: fetch N minutes before the announcement time
+        # (not before the effective start, since we want actual pre-announcement bars)
+        pre_start = announcement_time - timedelta(minutes=pre_window_minutes)
+
+        # End time is after the effective start (handles premarket -> market open logic)
+        end_time = effective_start + timedelta(minutes=window_minutes)
+        return pre_start, end_time
+
+    def _delete_announcement_bars(self, ticker: str, announcement_time: datetime) -> int:
+        """Delete the bars linked to an announcement. Returns the number deleted."""
+        db = self._get_db()
+        try:
+            deleted = db.query(OHLCVBarDB).filter(
+                OHLCVBarDB.announcement_ticker == ticker,
+                OHLCVBarDB.announcement_timestamp == announcement_time,
+            ).delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def _update_ohlcv_statuses(self, keys_by_status: Dict[str, List[Tuple[str, datetime]]]) -> None:
+        """Set ohlcv_status for many announcements (one UPDATE per status)."""
+        db = self._get_db()
+        try:
+            for status, keys in keys_by_status.items():
+                if keys:
+                    db.query(AnnouncementDB).filter(
+                        tuple_(AnnouncementDB.ticker, AnnouncementDB.timestamp).in_(keys)
+                    ).update({AnnouncementDB.ohlcv_status: status}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
     # ─────────────────────────────────────────────────────────────────────────────
     # Raw Messages
     # ─────────────────────────────────────────────────────────────────────────────
@@ -888,7 +1106,17 @@ class PostgresClient:
     # ─────────────────────────────────────────────────────────────────────────────
 
     def _announcement_to_dict(self, ann: Announcement, source: str = 'backfill') -> dict:
-        """Convert Announcement dataclass to dict for database."""
+        """Convert Announcement dataclass to dict for database.
+
+        Session, ET date and effective start are derived here (once per save) so readers
+        can filter on the stored columns instead of converting timezones per row.
+        """
+        from .massive_client import get_effective_start_time
+
+        effective_start = ann.effective_start
+        if effective_start is None and ann.timestamp is not None:
+            effective_start = get_effective_start_time(ann.timestamp)
+
         return {
             "ticker": ann.ticker,
             "timestamp": ann.timestamp,
@@ -925,46 +1153,64 @@ class PostgresClient:
             "source_message": ann.source_message,
             "source_html": ann.source_html,
             "source": source,
+            "market_session": ann.market_session or get_market_session(ann.timestamp),
+            "et_date": ann.et_date or get_et_date(ann.timestamp),
+            "effective_start": effective_start,
         }
 
-    def _db_to_announcement(self, row: AnnouncementDB) -> Announcement:
-        """Convert database row to Announcement dataclass."""
+    @staticmethod
+    def _announcement_columns(entity, fields: Optional[Sequence[str]] = None) -> list:
+        """Columns of `entity` (AnnouncementDB or an alias) for a field projection."""
+        return [getattr(entity, name) for name in resolve_announcement_fields(fields)]
+
+    def _db_to_announcement(self, row) -> Announcement:
+        """Convert database row (ORM object or projected Row) to Announcement dataclass.
+
+        Columns missing from a projected row fall back to the dataclass defaults.
+        """
+        def get(name):
+            return getattr(row, name, None)
+
+        has_news = get("has_news")
         return Announcement(
             ticker=row.ticker,
             timestamp=row.timestamp,
             price_threshold=row.price_threshold,
             headline=row.headline or "",
             country=row.country or "",
-            channel=row.channel,
-            author=row.author,
-            float_shares=row.float_shares,
-            io_percent=row.io_percent,
-            market_cap=row.market_cap,
-            short_interest=row.short_interest,
-            reg_sho=row.reg_sho or False,
-            high_ctb=row.high_ctb or False,
-            direction=row.direction,
-            headline_is_financing=row.headline_is_financing,
-            headline_financing_type=row.headline_financing_type,
-            headline_financing_tags=row.headline_financing_tags,
-            prev_close=row.prev_close,
-            regular_open=row.regular_open,
-            premarket_gap_pct=row.premarket_gap_pct,
-            premarket_volume=row.premarket_volume,
-            premarket_dollar_volume=row.premarket_dollar_volume,
-            scanner_gain_pct=row.scanner_gain_pct,
-            is_nhod=row.is_nhod or False,
-            is_nsh=row.is_nsh or False,
-            rvol=row.rvol,
-            mention_count=row.mention_count,
-            has_news=row.has_news if row.has_news is not None else True,
-            green_bars=row.green_bars,
-            bar_minutes=row.bar_minutes,
-            scanner_test=row.scanner_test or False,
-            scanner_after_lull=row.scanner_after_lull or False,
-            source_message=row.source_message,
-            source_html=row.source_html,
-            ohlcv_status=row.ohlcv_status or 'pending',
+            channel=get("channel"),
+            author=get("author"),
+            float_shares=get("float_shares"),
+            io_percent=get("io_percent"),
+            market_cap=get("market_cap"),
+            short_interest=get("short_interest"),
+            reg_sho=get("reg_sho") or False,
+            high_ctb=get("high_ctb") or False,
+            direction=get("direction"),
+            headline_is_financing=get("headline_is_financing"),
+            headline_financing_type=get("headline_financing_type"),
+            headline_financing_tags=get("headline_financing_tags"),
+            prev_close=get("prev_close"),
+            regular_open=get("regular_open"),
+            premarket_gap_pct=get("premarket_gap_pct"),
+            premarket_volume=get("premarket_volume"),
+            premarket_dollar_volume=get("premarket_dollar_volume"),
+            scanner_gain_pct=get("scanner_gain_pct"),
+            is_nhod=get("is_nhod") or False,
+            is_nsh=get("is_nsh") or False,
+            rvol=get("rvol"),
+            mention_count=get("mention_count"),
+            has_news=has_news if has_news is not None else True,
+            green_bars=get("green_bars"),
+            bar_minutes=get("bar_minutes"),
+            scanner_test=get("scanner_test") or False,
+            scanner_after_lull=get("scanner_after_lull") or False,
+            source_message=get("source_message"),
+            source_html=get("source_html"),
+            ohlcv_status=get("ohlcv_status") or 'pending',
+            market_session=get("market_session"),
+            et_date=get("et_date"),
+            effective_start=get("effective_start"),
         )
 
 
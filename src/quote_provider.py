@@ -30,7 +30,7 @@ class InsightSentryQuoteProvider:
     """
 
     WS_URL = "wss://realtime.insightsentry.com/live"
-    KEY_URL = "https://api.insightsentry.com/v2/websocket-key"
+    API_URL = "https://api.insightsentry.com"
 
     def __init__(
         self,
@@ -38,6 +38,8 @@ class InsightSentryQuoteProvider:
         on_quote: Optional[Callable[[str, float, int, datetime], None]] = None,
         on_bar: Optional[Callable[[str, datetime, float, float, float, float, int], None]] = None,
         on_symbol_error: Optional[Callable[[str, str, str], None]] = None,
+        ws_url: Optional[str] = None,
+        api_url: Optional[str] = None,
     ):
         """
         Initialize the quote provider.
@@ -47,8 +49,13 @@ class InsightSentryQuoteProvider:
             on_quote: Callback for quote updates (ticker, price, volume, timestamp)
             on_bar: Callback for full bar data (ticker, timestamp, open, high, low, close, volume)
             on_symbol_error: Callback for symbol errors (ticker, error_type, message)
+            ws_url: WebSocket URL override (default INSIGHT_SENTRY_WS_URL, then WS_URL)
+            api_url: REST base URL override (default INSIGHT_SENTRY_API_URL, then API_URL)
         """
         self.api_key = api_key or os.getenv("INSIGHT_SENTRY_KEY")
+        # Overrides point at a stand-in server (scripts/run_standin_server.py)
+        self.ws_url = ws_url or os.getenv("INSIGHT_SENTRY_WS_URL") or self.WS_URL
+        self.api_url = (api_url or os.getenv("INSIGHT_SENTRY_API_URL") or self.API_URL).rstrip("/")
         self.on_quote = on_quote
         self.on_bar = on_bar
         self.on_symbol_error = on_symbol_error
@@ -119,7 +126,7 @@ class InsightSentryQuoteProvider:
             return None
 
         try:
-            url = "https://api.insightsentry.com/v3/symbols/search"
+            url = f"{self.api_url}/v3/symbols/search"
             params = {
                 "query": ticker,
                 "type": "none",
@@ -173,7 +180,7 @@ class InsightSentryQuoteProvider:
             return None
 
         try:
-            url = f"https://api.insightsentry.com/v3/symbols/{code}/series"
+            url = f"{self.api_url}/v3/symbols/{code}/series"
             params = {
                 "bar_type": "minute",
                 "bar_interval": "1",
@@ -259,10 +266,10 @@ class InsightSentryQuoteProvider:
 
     async def _connect_and_run(self):
         """Connect and run the WebSocket message loop."""
-        logger.info(f"Connecting to {self.WS_URL}")
+        logger.info(f"Connecting to {self.ws_url}")
 
         async with self._session.ws_connect(
-            self.WS_URL,
+            self.ws_url,
             heartbeat=30,
             timeout=aiohttp.ClientTimeout(total=60),
         ) as ws:
@@ -0,0 +1,202 @@
+"""Retention and rollup for high-volume live tables.
+
+- live_bars: 1-second bars older than LIVE_BAR_RETENTION_DAYS are rolled into
+  1-minute bars (live_bars_1m) and deleted, one hour-window per transaction.
+- traces / trace_events: traces older than TRACE_RETENTION_DAYS are archived with
+  their events to Parquet (data/parquet/traces, data/parquet/trace_events, hive
+  partitioned by month) and deleted in bounded batches. The archive is queryable via
+  DuckDBClient.get_archived_traces / get_archived_trace_events.
+
+Every step commits per window/batch so it stays well inside the statement timeout and
+can be interrupted and re-run safely. Run it from cron via scripts/run_retention.py.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy import text
+
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+LIVE_BAR_RETENTION_DAYS = int(os.getenv("LIVE_BAR_RETENTION_DAYS", "7"))
+TRACE_RETENTION_DAYS = int(os.getenv("TRACE_RETENTION_DAYS", "30"))
+TRACE_ARCHIVE_BATCH_SIZE = 1000
+
+ARCHIVE_DIR = Path(__file__).parent.parent / "data" / "parquet"
+TRACE_ARCHIVE_DIRNAME = "traces"
+TRACE_EVENT_ARCHIVE_DIRNAME = "trace_events"
+
+_ROLLUP_WINDOW_SQL = text("""
+    WITH moved AS (
+        DELETE FROM live_bars
+        WHERE timestamp >= :start AND timestamp < :end
+        RETURNING ticker, timestamp, open, high, low, close, volume, strategy_id
+    )
+    INSERT INTO live_bars_1m (ticker, timestamp, open, high, low, close, volume, strategy_id)
+    SELECT
+        ticker,
+        date_trunc('minute', timestamp) AS minute,
+        (array_agg(open ORDER BY timestamp))[1],
+        max(high),
+        min(low),
+        (array_agg(close ORDER BY timestamp DESC))[1],
+        sum(volume),
+        max(strategy_id)
+    FROM moved
+    GROUP BY ticker, minute
+    ON CONFLICT (ticker, timestamp) DO UPDATE SET
+        high = GREATEST(live_bars_1m.high, EXCLUDED.high),
+        low = LEAST(live_bars_1m.low, EXCLUDED.low),
+        close = EXCLUDED.close,
+        volume = live_bars_1m.volume + EXCLUDED.volume,
+        strategy_id = COALESCE(live_bars_1m.strategy_id, EXCLUDED.strategy_id)
+""")
+
+
+def _floor_hour(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_live_bars(
+    older_than_days: int = LIVE_BAR_RETENTION_DAYS,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+) -> int:
+    """Roll 1-second live bars older than the cutoff into 1-minute bars and delete them.
+
+    Works through hour windows oldest first; each window is a single statement
+    (DELETE ... RETURNING feeding the rollup INSERT), so a window is either fully
+    rolled up or untouched.
+
+    Returns:
+        Number of 1-second bars rolled up (or that would be, with dry_run).
+    """
+    cutoff = _floor_hour((now or datetime.utcnow()) - timedelta(days=older_than_days))
+
+    with engine.connect() as conn:
+        oldest, count = conn.execute(
+            text("SELECT min(timestamp), count(*) FROM live_bars WHERE timestamp < :cutoff"),
+            {"cutoff": cutoff},
+        ).one()
+    if oldest is None:
+        logger.info(f"live_bars: nothing older than {cutoff}")
+        return 0
+    if dry_run:
+        logger.info(f"live_bars: would roll up {count:,} bars older than {cutoff}")
+        return count
+
+    minutes = 0
+    window_start = _floor_hour(oldest)
+    while window_start is not None and window_start < cutoff:
+        window_end = window_start + timedelta(hours=1)
+        with engine.begin() as conn:
+            result = conn.execute(_ROLLUP_WINDOW_SQL, {"start": window_start, "end": window_end})
+            minutes += max(result.rowcount or 0, 0)
+            # Skip straight to the next hour that has data
+            next_ts = conn.execute(
+                text("SELECT min(timestamp) FROM live_bars WHERE timestamp >= :end AND timestamp < :cutoff"),
+                {"end": window_end, "cutoff": cutoff},
+            ).scalar()
+        window_start = _floor_hour(next_ts) if next_ts else None
+
+    logger.info(f"live_bars: rolled {count:,} 1-second bars older than {cutoff} into {minutes:,} minute bars")
+    return count
+
+
+def _write_archive(df: pd.DataFrame, dirname: str, month_col: str, part_name: str, archive_dir: Path) -> None:
+    """Write rows to <archive_dir>/<dirname>/month=YYYY-MM/<part_name>.parquet.
+
+    Part names are derived from the batch's id range, so re-running an interrupted
+    batch overwrites the same file instead of duplicating rows.
+    """
+    if df.empty:
+        return
+    months = df[month_col].dt.strftime("%Y-%m")
+    for month, part in df.groupby(months):
+        out_dir = archive_dir / dirname / f"month={month}"
+        out_dir.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(out_dir / f"{part_name}.parquet", index=False)
+
+
+def archive_traces(
+    older_than_days: int = TRACE_RETENTION_DAYS,
+    batch_size: int = TRACE_ARCHIVE_BATCH_SIZE,
+    archive_dir: Path = ARCHIVE_DIR,
+    now: Optional[datetime] = None,
+    dry_run: bool = False,
+) -> int:
+    """Archive traces (and their events) older than the cutoff to Parquet, then delete them.
+
+    Returns:
+        Number of traces archived (or that would be, with dry_run).
+    """
+    cutoff = (now or datetime.utcnow()) - timedelta(days=older_than_days)
+
+    if dry_run:
+        with engine.connect() as conn:
+            count = conn.execute(
+                text("SELECT count(*) FROM traces WHERE created_at < :cutoff"), {"cutoff": cutoff}
+            ).scalar()
+        logger.info(f"traces: would archive {count:,} traces older than {cutoff}")
+        return count
+
+    archived = 0
+    while True:
+        with engine.begin() as conn:
+            traces = pd.read_sql(
+                text("""
+                    SELECT * FROM traces
+                    WHERE created_at < :cutoff
+                    ORDER BY id
+                    LIMIT :limit
+                """),
+                conn,
+                params={"cutoff": cutoff, "limit": batch_size},
+            )
+            if traces.empty:
+                break
+
+            trace_ids = traces["trace_id"].tolist()
+            events = pd.read_sql(
+                text("""
+                    SELECT e.*, t.created_at AS trace_created_at
+                    FROM trace_events e
+                    JOIN traces t ON t.trace_id = e.trace_id
+                    WHERE e.trace_id = ANY(:ids)
+                    ORDER BY e.id
+                """),
+                conn,
+                params={"ids": trace_ids},
+            )
+
+            part_name = f"part-{int(traces['id'].min()):010d}-{int(traces['id'].max()):010d}"
+            _write_archive(traces, TRACE_ARCHIVE_DIRNAME, "created_at", part_name, archive_dir)
+            # Events are filed under their trace's month so a trace and its events stay together
+            _write_archive(events, TRACE_EVENT_ARCHIVE_DIRNAME, "trace_created_at", part_name, archive_dir)
+
+            conn.execute(text("DELETE FROM trace_events WHERE trace_id = ANY(:ids)"), {"ids": trace_ids})
+            conn.execute(text("DELETE FROM traces WHERE trace_id = ANY(:ids)"), {"ids": trace_ids})
+
+        archived += len(trace_ids)
+        logger.info(f"traces: archived {archived:,} so far")
+
+    logger.info(f"traces: archived {archived:,} traces older than {cutoff} to {archive_dir}")
+    return archived
+
+
+def run_retention(
+    live_bar_days: int = LIVE_BAR_RETENTION_DAYS,
+    trace_days: int = TRACE_RETENTION_DAYS,
+    dry_run: bool = False,
+) -> dict:
+    """Run all retention steps. Returns counts per step."""
+    return {
+        "live_bars_rolled": rollup_live_bars(live_bar_days, dry_run=dry_run),
+        "traces_archived": archive_traces(trace_days, dry_run=dry_run),
+    }
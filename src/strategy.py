@@ -5,12 +5,14 @@ import os
 import threading
 import uuid
 from dataclasses import dataclass, field
+from functools import partial
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Callable
 from urllib.parse import urlparse, parse_qs
 
 from .models import Announcement
 from .trading import TradingClient, Position
+from .async_db import get_async_db_writer
 from .trade_store import get_trade_store
 from .active_trade_store import get_active_trade_store
 from .pending_entry_store import get_pending_entry_store
@@ -417,6 +419,9 @@ class StrategyEngine:
         self._trade_store = get_trade_store()
         self._active_trade_store = get_active_trade_store()
         self._order_store = get_order_store()
+        # Non-critical writes (pending entries, completed trades) go through the async
+        # writer so they don't block the trading loop
+        self._db_writer = get_async_db_writer()
 
         # Recover any open positions from database and broker
         self._recover_positions()
@@ -866,7 +871,7 @@ class StrategyEngine:
 
         # Persist pending entry to database for recovery on restart
         store = get_pending_entry_store()
-        store.save_entry(
+        entry_kwargs = dict(
             trade_id=trade_id,
             ticker=ticker,
             strategy_id=self.strategy_id,
@@ -876,6 +881,11 @@ class StrategyEngine:
             announcement_ticker=announcement.ticker,
             announcement_timestamp=announcement.timestamp,
         )
+        self._db_writer.submit(
+            trade_id,
+            partial(store.asave_entry, **entry_kwargs),
+            partial(store.save_entry, **entry_kwargs),
+        )
 
         # Record pending entry created event
         if trace_store and trace_id:
@@ -895,6 +905,15 @@ class StrategyEngine:
 
         return True
 
+    def _delete_pending_entry_record(self, trade_id: str):
+        """Remove a pending entry's DB record without blocking the trading loop."""
+        store = get_pending_entry_store()
+        self._db_writer.submit(
+            trade_id,
+            partial(store.adelete_entry, trade_id),
+            partial(store.delete_entry, trade_id),
+        )
+
     def initialize_building_candle(self, ticker: str, candle_data: dict):
         """
         Initialize the building candle with data from REST API.
@@ -1326,7 +1345,7 @@ class StrategyEngine:
             )
 
         # Remove from database (entry is being executed)
-        get_pending_entry_store().delete_entry(trade_id)
+        self._delete_pending_entry_record(trade_id)
         cfg = self.config
 
         # Calculate stop loss price
@@ -1762,13 +1781,18 @@ class StrategyEngine:
                 "pnl": completed["pnl"],
                 "strategy_params": self.config.to_dict(),
             }
-            self._trade_store.save_trade(
+            trade_kwargs = dict(
                 trade=trade_record,
                 paper=self.paper,
                 strategy_id=self.strategy_id,
                 strategy_name=self.strategy_name,
                 trade_id=pending.trade_id,
             )
+            self._db_writer.submit(
+                pending.trade_id or ticker,
+                partial(self._trade_store.asave_trade, **trade_kwargs),
+                partial(self._trade_store.save_trade, **trade_kwargs),
+            )
         except Exception as e:
             logger.error(f"[{self.strategy_name}] [{ticker}] Failed to record trade: {e}", exc_info=True)
 
@@ -1981,6 +2005,9 @@ class StrategyEngine:
         if trade.needs_manual_exit:
             return
 
+        # Persist buffered price ticks now so the high-water mark is durable before we sell
+        self._active_trade_store.flush([trade_id])
+
         # Check if we already have a pending sell order for this trade_id (in-memory)
         for pending in self.pending_orders.values():
             if pending.trade_id == trade_id and pending.side == "sell":
@@ -2243,7 +2270,7 @@ class StrategyEngine:
                 )
 
             # Remove from database
-            get_pending_entry_store().delete_entry(trade_id)
+            self._delete_pending_entry_record(trade_id)
             # Only unsubscribe if no more pending entries or active trades for this ticker
             if not self._has_pending_or_trade(ticker):
                 # Also clear shared candle data for this ticker
@@ -2556,13 +2583,18 @@ class StrategyEngine:
                 "pnl": 0,
                 "strategy_params": self.config.to_dict(),
             }
-            self._trade_store.save_trade(
+            trade_kwargs = dict(
                 trade=trade_record,
                 paper=self.paper,
                 strategy_id=self.strategy_id,
                 strategy_name=self.strategy_name,
                 trade_id=trade_id,
             )
+            self._db_writer.submit(
+                trade_id or ticker,
+                partial(self._trade_store.asave_trade, **trade_kwargs),
+                partial(self._trade_store.save_trade, **trade_kwargs),
+            )
         except Exception as e:
             logger.error(f"[{self.strategy_name}] [{ticker}] Failed to record orphaned trade: {e}", exc_info=True)
 
@@ -2,15 +2,17 @@
 
 import json
 import logging
+import threading
+import time
 import uuid
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 
-from .base_store import BaseStore
-from .database import StrategyDB, ActiveTradeDB
+from .base_store import BaseStore, trade_data_version
+from .database import StrategyDB, ActiveTradeDB, PendingEntryDB, TradeDB
 from .strategy import StrategyConfig
 
 logger = logging.getLogger(__name__)
@@ -29,9 +31,31 @@ class Strategy:
     updated_at: datetime
 
 
+@dataclass
+class StrategySummary:
+    """Live counts and P&L for one strategy (strategies dashboard)."""
+    strategy_id: str
+    pending: int = 0
+    active: int = 0
+    completed_today: int = 0
+    realized_pnl_today: float = 0.0
+    unrealized_pnl: float = 0.0  # Open positions marked at their last price
+
+
+# Dashboard summaries are reused for this long unless a trade write in this process
+# invalidates them first (writes from another process are picked up after the TTL).
+STRATEGY_SUMMARY_TTL = 2.0
+
+
 class StrategyStore(BaseStore):
     """CRUD operations for trading strategies."""
 
+    def __init__(self, summary_ttl: float = STRATEGY_SUMMARY_TTL):
+        self._summary_ttl = summary_ttl
+        self._summary_lock = threading.Lock()
+        # (since, trade data version, monotonic time, summaries)
+        self._summary_cache: Optional[Tuple[datetime, int, float, Dict[str, StrategySummary]]] = None
+
     def save_strategy(
         self,
         name: str,
@@ -225,6 +249,95 @@ class StrategyStore(BaseStore):
             logger.info(f"Moved strategy {strategy_id} down (priority {current.priority} <-> {below.priority})")
             return True
 
+    def get_dashboard_summary(
+        self,
+        since: Optional[datetime] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, StrategySummary]:
+        """
+        Get pending/active/completed counts and P&L for every strategy in one query.
+
+        Args:
+            since: Start of the "completed today" window (default: local midnight)
+            use_cache: Reuse a result younger than the summary TTL if no trade data
+                changed in this process since it was computed
+
+        Returns:
+            Dict of strategy ID -> StrategySummary (every strategy has an entry)
+        """
+        if since is None:
+            since = datetime.combine(date.today(), datetime.min.time())
+
+        version = trade_data_version()
+        if use_cache and self._summary_ttl > 0:
+            with self._summary_lock:
+                cached = self._summary_cache
+            if cached is not None:
+                cached_since, cached_version, cached_at, summaries = cached
+                if (
+                    cached_since == since
+                    and cached_version == version
+                    and time.monotonic() - cached_at < self._summary_ttl
+                ):
+                    return summaries
+
+        pending = (
+            select(PendingEntryDB.strategy_id, func.count().label("pending"))
+            .group_by(PendingEntryDB.strategy_id)
+            .subquery()
+        )
+        mark_price = func.coalesce(func.nullif(ActiveTradeDB.last_price, 0), ActiveTradeDB.entry_price)
+        active = (
+            select(
+                ActiveTradeDB.strategy_id,
+                func.count().label("active"),
+                func.sum((mark_price - ActiveTradeDB.entry_price) * ActiveTradeDB.shares).label("unrealized_pnl"),
+            )
+            .group_by(ActiveTradeDB.strategy_id)
+            .subquery()
+        )
+        completed = (
+            select(
+                TradeDB.strategy_id,
+                func.count().label("completed"),
+                func.sum(TradeDB.pnl).label("realized_pnl"),
+            )
+            .where(TradeDB.exit_time >= since)
+            .group_by(TradeDB.strategy_id)
+            .subquery()
+        )
+
+        with self._db_session() as session:
+            rows = (
+                session.query(
+                    StrategyDB.id,
+                    pending.c.pending,
+                    active.c.active,
+                    active.c.unrealized_pnl,
+                    completed.c.completed,
+                    completed.c.realized_pnl,
+                )
+                .outerjoin(pending, pending.c.strategy_id == StrategyDB.id)
+                .outerjoin(active, active.c.strategy_id == StrategyDB.id)
+                .outerjoin(completed, completed.c.strategy_id == StrategyDB.id)
+                .all()
+            )
+
+        summaries = {
+            strategy_id: StrategySummary(
+                strategy_id=strategy_id,
+                pending=n_pending or 0,
+                active=n_active or 0,
+                completed_today=n_completed or 0,
+                realized_pnl_today=float(realized or 0.0),
+                unrealized_pnl=float(unrealized or 0.0),
+            )
+            for strategy_id, n_pending, n_active, unrealized, n_completed, realized in rows
+        }
+        with self._summary_lock:
+            self._summary_cache = (since, version, time.monotonic(), summaries)
+        return summaries
+
     def _db_to_strategy(self, row: StrategyDB) -> Strategy:
         """Convert database row to Strategy."""
         config_dict = {}
@@ -1,17 +1,91 @@
 """Trace persistence for alert lifecycle tracking."""
 
+import atexit
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import date, datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Any, Tuple
 
-from .database import SessionLocal, TraceDB, TraceEventDB
+from sqlalchemy import exists, func, select, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import OperationalError
+
+from .database import SessionLocal, TraceDB, TraceEventDB, TraceFunnelDailyDB, TraceRejectionDailyDB
 
 logger = logging.getLogger(__name__)
 
+# Trace writes are queued and flushed in batches by a background thread so tracing
+# never costs a DB round-trip on the alert/trading path. TRACE_ASYNC_WRITES=0 restores
+# synchronous writes.
+TRACE_ASYNC_WRITES = os.getenv("TRACE_ASYNC_WRITES", "1") == "1"
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "0.5"))
+TRACE_BATCH_SIZE = 500
+
+# Append-only log of queued operations. Replayed on the next start if the process dies
+# with writes still queued; truncated whenever the queue drains. Ops are appended with a
+# flush to the OS but no fsync (tracing stays off the disk's latency), so they survive a
+# process crash but not a power loss; the committed watermark is fsynced. Replay is
+# idempotent either way: creates conflict on trace_id and events on their event_key.
+TRACE_SPILL_FILE = Path(__file__).parent.parent / "data" / ".trace_spill.jsonl"
+
+_DATETIME_FIELDS = ("alert_timestamp", "event_timestamp", "completed_at", "created_at")
+
+# (sequence number, op kind, payload); kind is "create", "status" or "event"
+TraceOp = Tuple[int, str, Dict[str, Any]]
+
+
+def _encode_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: v.isoformat() if k in _DATETIME_FIELDS and v is not None else v
+        for k, v in payload.items()
+    }
+
+
+def _decode_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        k: datetime.fromisoformat(v) if k in _DATETIME_FIELDS and v is not None else v
+        for k, v in payload.items()
+    }
+
 
 class TraceStore:
-    """CRUD operations for traces and trace events."""
+    """CRUD operations for traces and trace events.
+
+    Writes (create_trace, update_trace_status, add_event) are queued in a single FIFO and
+    applied by a background thread, one transaction per batch, so per-trace ordering is
+    preserved. Queued operations are also appended to a spill file so they survive a
+    crash. Read methods flush the queue first.
+    """
+
+    def __init__(
+        self,
+        async_writes: bool = TRACE_ASYNC_WRITES,
+        spill_path: Optional[Path] = TRACE_SPILL_FILE,
+        flush_interval: float = TRACE_FLUSH_INTERVAL,
+        batch_size: int = TRACE_BATCH_SIZE,
+    ):
+        self._async_writes = async_writes
+        self._spill_path = spill_path
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+
+        self._queue: Deque[TraceOp] = deque()
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._spill_fh = None
+
+    # ------------------------------------------------------------------
+    # Write API
+    # ------------------------------------------------------------------
 
     def create_trace(
         self,
@@ -30,33 +104,27 @@ class TraceStore:
         Create a new trace record.
 
         Returns:
-            Trace DB ID if successful, None otherwise.
+            Trace DB ID if written synchronously, None if queued or on failure.
         """
-        session = SessionLocal()
-        try:
-            trace = TraceDB(
-                trace_id=trace_id,
-                ticker=ticker,
-                alert_timestamp=alert_timestamp,
-                alert_key=alert_key,
-                channel=channel,
-                author=author,
-                price_threshold=price_threshold,
-                headline=headline,
-                raw_content=raw_content,
-                announcement_id=announcement_id,
-                status='received',
-            )
-            session.add(trace)
-            session.commit()
+        payload = {
+            "trace_id": trace_id,
+            "ticker": ticker,
+            "alert_timestamp": alert_timestamp,
+            "alert_key": alert_key,
+            "channel": channel,
+            "author": author,
+            "price_threshold": price_threshold,
+            "headline": headline,
+            "raw_content": raw_content,
+            "announcement_id": announcement_id,
+            "status": "received",
+            "created_at": datetime.utcnow(),
+        }
+        if self._async_writes:
+            self._enqueue("create", payload)
             logger.info(f"[{ticker}] Created trace {trace_id}")
-            return trace.id
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to create trace: {e}")
             return None
-        finally:
-            session.close()
+        return self._write_now("create", payload)
 
     def update_trace_status(
         self,
@@ -70,39 +138,23 @@ class TraceStore:
         return_pct: Optional[float] = None,
         completed_at: Optional[datetime] = None,
     ) -> bool:
-        """Update trace status and outcome fields."""
-        session = SessionLocal()
-        try:
-            trace = session.query(TraceDB).filter(TraceDB.trace_id == trace_id).first()
-            if not trace:
-                logger.warning(f"Trace not found: {trace_id}")
-                return False
-
-            trace.status = status
-            if pending_entry_trade_id is not None:
-                trace.pending_entry_trade_id = pending_entry_trade_id
-            if active_trade_id is not None:
-                trace.active_trade_id = active_trade_id
-            if completed_trade_id is not None:
-                trace.completed_trade_id = completed_trade_id
-            if exit_reason is not None:
-                trace.exit_reason = exit_reason
-            if pnl is not None:
-                trace.pnl = pnl
-            if return_pct is not None:
-                trace.return_pct = return_pct
-            if completed_at is not None:
-                trace.completed_at = completed_at
-
-            session.commit()
-            logger.debug(f"Updated trace {trace_id}: status={status}")
+        """Update trace status and outcome fields (None fields are left unchanged)."""
+        payload = {
+            "trace_id": trace_id,
+            "status": status,
+            "pending_entry_trade_id": pending_entry_trade_id,
+            "active_trade_id": active_trade_id,
+            "completed_trade_id": completed_trade_id,
+            "exit_reason": exit_reason,
+            "pnl": pnl,
+            "return_pct": return_pct,
+            "completed_at": completed_at,
+        }
+        payload = {k: v for k, v in payload.items() if v is not None}
+        if self._async_writes:
+            self._enqueue("status", payload)
             return True
-        except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to update trace status: {e}")
-            return False
-        finally:
-            session.close()
+        return bool(self._write_now("status", payload))
 
     def add_event(
         self,
@@ -118,32 +170,246 @@ class TraceStore:
         Add an event to a trace.
 
         Returns:
-            Event ID if successful, None otherwise.
+            Event ID if written synchronously, None if queued or on failure.
+        """
+        payload = {
+            "trace_id": trace_id,
+            "event_type": event_type,
+            "event_timestamp": event_timestamp,
+            "strategy_id": strategy_id,
+            "strategy_name": strategy_name,
+            "reason": reason,
+            "details": json.dumps(details, default=str) if details else None,
+            "created_at": datetime.utcnow(),
+            "event_key": str(uuid.uuid4()),
+        }
+        if self._async_writes:
+            self._enqueue("event", payload)
+            return None
+        return self._write_now("event", payload)
+
+    def flush(self) -> int:
+        """Apply all queued writes now. Returns number of operations applied."""
+        applied = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    if not self._queue:
+                        break
+                    count = min(self._batch_size, len(self._queue))
+                    batch = [self._queue.popleft() for _ in range(count)]
+
+                if not self._write_batch(batch):
+                    # Database unreachable: keep the ops (still in the spill file) for the next flush
+                    with self._lock:
+                        self._queue.extendleft(reversed(batch))
+                    break
+                applied += len(batch)
+                self._mark_committed(batch[-1][0])
+        return applied
+
+    def close(self) -> None:
+        """Stop the writer thread and flush anything still queued."""
+        self._stop_event.set()
+        self._wake.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self._flush_interval * 4 + 5)
+        self.flush()
+
+    def pending_count(self) -> int:
+        """Number of queued, not yet written operations."""
+        with self._lock:
+            return len(self._queue)
+
+    # ------------------------------------------------------------------
+    # Queue / spill file
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, kind: str, payload: Dict[str, Any]) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._start()
+        with self._lock:
+            self._seq += 1
+            self._queue.append((self._seq, kind, payload))
+            self._spill(self._seq, kind, payload)
+            depth = len(self._queue)
+        if depth >= self._batch_size:
+            self._wake.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._replay_spill()
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="TraceWriter")
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Trace writer error: {e}", exc_info=True)
+
+    def _spill(self, seq: int, kind: str, payload: Dict[str, Any]) -> None:
+        """Append an op to the spill file (caller holds self._lock)."""
+        if self._spill_fh is None:
+            return
+        try:
+            self._spill_fh.write(json.dumps({"seq": seq, "op": kind, "data": _encode_payload(payload)}) + "\n")
+            self._spill_fh.flush()
+        except Exception as e:
+            logger.warning(f"Trace spill write failed: {e}")
+
+    def _mark_committed(self, seq: int) -> None:
+        """Record that everything up to seq is in the DB; truncate once the queue is empty."""
+        with self._lock:
+            if self._spill_fh is None:
+                return
+            try:
+                if not self._queue:
+                    self._spill_fh.seek(0)
+                    self._spill_fh.truncate()
+                else:
+                    self._spill_fh.write(json.dumps({"committed": seq}) + "\n")
+                self._spill_fh.flush()
+                os.fsync(self._spill_fh.fileno())
+            except Exception as e:
+                logger.warning(f"Trace spill update failed: {e}")
+
+    def _replay_spill(self) -> None:
+        """Load ops left in the spill file by a previous run (caller holds self._lock)."""
+        if self._spill_path is None or self._spill_fh is not None:
+            return
+        replayed: List[TraceOp] = []
+        try:
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            if self._spill_path.exists():
+                committed = 0
+                ops: List[TraceOp] = []
+                with open(self._spill_path) as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue  # torn last line from a crash
+                        if "committed" in record:
+                            committed = max(committed, record["committed"])
+                        else:
+                            ops.append((record["seq"], record["op"], _decode_payload(record["data"])))
+                replayed = [op for op in ops if op[0] > committed]
+            self._spill_fh = open(self._spill_path, "a+")
+        except Exception as e:
+            logger.warning(f"Trace spill file unavailable ({self._spill_path}): {e}")
+            self._spill_fh = None
+            return
+
+        if replayed:
+            logger.warning(f"Replaying {len(replayed)} unflushed trace writes from {self._spill_path}")
+            self._seq = max(self._seq, replayed[-1][0])
+            self._queue.extendleft(reversed(replayed))
+
+    # ------------------------------------------------------------------
+    # DB writes
+    # ------------------------------------------------------------------
+
+    def _write_batch(self, batch: List[TraceOp]) -> bool:
+        """Apply a batch in one transaction.
+
+        Falls back to op-by-op on a data error so one bad row doesn't sink the batch.
+        Returns False only if the database looks unreachable.
         """
         session = SessionLocal()
         try:
-            event = TraceEventDB(
-                trace_id=trace_id,
-                event_type=event_type,
-                event_timestamp=event_timestamp,
-                strategy_id=strategy_id,
-                strategy_name=strategy_name,
-                reason=reason,
-                details=json.dumps(details) if details else None,
+            self._apply_batch(session, batch)
+            session.commit()
+            return True
+        except Exception as e:
+            session.rollback()
+            if isinstance(e, OperationalError):
+                logger.error(f"Trace batch failed, database unavailable: {e}")
+                return False
+            logger.error(f"Trace batch of {len(batch)} failed, retrying individually: {e}")
+        finally:
+            session.close()
+
+        for _, kind, payload in batch:
+            self._write_now(kind, payload)
+        return True
+
+    def _apply_batch(self, session, batch: List[TraceOp]) -> None:
+        """Creates first, then events in order, then status updates merged per trace in order."""
+        creates = [payload for _, kind, payload in batch if kind == "create"]
+        # Spill files written before event keys existed have none
+        events = [{"event_key": None, **payload} for _, kind, payload in batch if kind == "event"]
+        statuses: Dict[str, Dict[str, Any]] = {}
+        for _, kind, payload in batch:
+            if kind == "status":
+                statuses.setdefault(payload["trace_id"], {}).update(payload)
+
+        if creates:
+            session.execute(
+                pg_insert(TraceDB).values(creates).on_conflict_do_nothing(index_elements=["trace_id"])
             )
-            session.add(event)
+        if events:
+            session.execute(
+                pg_insert(TraceEventDB).values(events).on_conflict_do_nothing(index_elements=["event_key"])
+            )
+        for trace_id, values in statuses.items():
+            values = {k: v for k, v in values.items() if k != "trace_id"}
+            updated = session.query(TraceDB).filter(TraceDB.trace_id == trace_id).update(
+                values, synchronize_session=False
+            )
+            if not updated:
+                logger.warning(f"Trace not found: {trace_id}")
+
+    def _write_now(self, kind: str, payload: Dict[str, Any]):
+        """Write a single op in its own transaction (sync mode and batch fallback)."""
+        session = SessionLocal()
+        try:
+            if kind == "create":
+                trace = TraceDB(**payload)
+                session.add(trace)
+                session.commit()
+                logger.info(f"[{payload['ticker']}] Created trace {payload['trace_id']}")
+                return trace.id
+            if kind == "event":
+                event_id = session.execute(
+                    pg_insert(TraceEventDB).values(**payload)
+                    .on_conflict_do_nothing(index_elements=["event_key"])
+                    .returning(TraceEventDB.id)
+                ).scalar()
+                session.commit()
+                logger.debug(f"Recorded trace event: {payload['event_type']} for trace {payload['trace_id']}")
+                return event_id
+
+            trace = session.query(TraceDB).filter(TraceDB.trace_id == payload["trace_id"]).first()
+            if not trace:
+                logger.warning(f"Trace not found: {payload['trace_id']}")
+                return False
+            for key, value in payload.items():
+                setattr(trace, key, value)
             session.commit()
-            logger.debug(f"Recorded trace event: {event_type} for trace {trace_id}")
-            return event.id
+            logger.debug(f"Updated trace {payload['trace_id']}: status={payload['status']}")
+            return True
         except Exception as e:
             session.rollback()
-            logger.error(f"Failed to record trace event: {e}")
-            return None
+            logger.error(f"Failed to write trace {kind}: {e}")
+            return None if kind != "status" else False
         finally:
             session.close()
 
+    # ------------------------------------------------------------------
+    # Read API
+    # ------------------------------------------------------------------
+
     def get_trace(self, trace_id: str) -> Optional[TraceDB]:
         """Get a trace by ID."""
+        self.flush()
         session = SessionLocal()
         try:
             trace = session.query(TraceDB).filter(TraceDB.trace_id == trace_id).first()
@@ -155,6 +421,7 @@ class TraceStore:
 
     def get_trace_by_alert_key(self, alert_key: str) -> Optional[TraceDB]:
         """Get a trace by its alert key (for deduplication lookup)."""
+        self.flush()
         session = SessionLocal()
         try:
             trace = session.query(TraceDB).filter(TraceDB.alert_key == alert_key).first()
@@ -166,6 +433,7 @@ class TraceStore:
 
     def get_events_for_trace(self, trace_id: str) -> List[TraceEventDB]:
         """Get all events for a trace, ordered by timestamp."""
+        self.flush()
         session = SessionLocal()
         try:
             events = session.query(TraceEventDB).filter(
@@ -185,6 +453,7 @@ class TraceStore:
         strategy_id: Optional[str] = None,
     ) -> List[TraceDB]:
         """Get recent traces with optional filters."""
+        self.flush()
         session = SessionLocal()
         try:
             query = session.query(TraceDB)
@@ -213,6 +482,7 @@ class TraceStore:
         end: Optional[datetime] = None,
     ) -> List[TraceEventDB]:
         """Get all filter rejection events for a strategy."""
+        self.flush()
         session = SessionLocal()
         try:
             query = session.query(TraceEventDB).filter(
@@ -232,6 +502,117 @@ class TraceStore:
         finally:
             session.close()
 
+    def get_trace_summaries(
+        self,
+        limit: int = 100,
+        status: Optional[str] = None,
+        ticker: Optional[str] = None,
+        strategy_id: Optional[str] = None,
+        start: Optional[datetime] = None,
+    ) -> List[TraceDB]:
+        """Get recent traces with the first strategy name from their events, in one query.
+
+        Each returned trace has a `strategy_name` attribute ("-" if no event named one),
+        found with a LATERAL lookup on (trace_id, event_timestamp) per trace row.
+        """
+        self.flush()
+        session = SessionLocal()
+        try:
+            first_strategy = (
+                select(TraceEventDB.strategy_name)
+                .where(
+                    TraceEventDB.trace_id == TraceDB.trace_id,
+                    TraceEventDB.strategy_name.isnot(None),
+                )
+                .order_by(TraceEventDB.event_timestamp.asc())
+                .limit(1)
+                .lateral("first_strategy")
+            )
+            query = session.query(TraceDB, first_strategy.c.strategy_name).outerjoin(first_strategy, true())
+
+            if status:
+                query = query.filter(TraceDB.status == status)
+            if ticker:
+                query = query.filter(TraceDB.ticker == ticker.upper())
+            if strategy_id:
+                query = query.filter(exists().where(
+                    TraceEventDB.trace_id == TraceDB.trace_id,
+                    TraceEventDB.strategy_id == strategy_id,
+                ))
+            if start:
+                query = query.filter(TraceDB.alert_timestamp >= start)
+
+            traces = []
+            for trace, strategy_name in query.order_by(TraceDB.created_at.desc()).limit(limit):
+                session.expunge(trace)
+                trace.strategy_name = strategy_name or "-"
+                traces.append(trace)
+            return traces
+        finally:
+            session.close()
+
+    def get_funnel_stats(self, start: Optional[date] = None) -> Dict[str, Any]:
+        """Get trace counts by outcome from the daily funnel counters.
+
+        Counters are kept per ET day, so a datetime `start` covers its whole day.
+        """
+        self.flush()
+        if isinstance(start, datetime):
+            start = start.date()
+        session = SessionLocal()
+        try:
+            query = session.query(
+                TraceFunnelDailyDB.status,
+                func.sum(TraceFunnelDailyDB.traces),
+                func.sum(TraceFunnelDailyDB.winners),
+                func.sum(TraceFunnelDailyDB.losers),
+                func.sum(TraceFunnelDailyDB.pnl),
+            )
+            if start:
+                query = query.filter(TraceFunnelDailyDB.day >= start)
+            rows = query.group_by(TraceFunnelDailyDB.status).all()
+
+            by_status = {status: int(count or 0) for status, count, _, _, _ in rows}
+            completed = next((r for r in rows if r[0] == "completed"), None)
+            return {
+                "total_received": sum(by_status.values()),
+                "filtered": by_status.get("filtered", 0),
+                "pending_entry": by_status.get("pending_entry", 0),
+                "entry_timeout": by_status.get("entry_timeout", 0),
+                "active_trade": by_status.get("active_trade", 0),
+                "completed": by_status.get("completed", 0),
+                "winners": int(completed[2] or 0) if completed else 0,
+                "losers": int(completed[3] or 0) if completed else 0,
+                "total_pnl": float(completed[4] or 0) if completed else 0.0,
+            }
+        finally:
+            session.close()
+
+    def get_filter_rejection_summary(
+        self,
+        strategy_id: Optional[str] = None,
+        start: Optional[date] = None,
+    ) -> List[Tuple[str, int]]:
+        """Get (reason, count) for filter rejections, most frequent first.
+
+        Read from the daily rejection counters; a datetime `start` covers its whole ET day.
+        """
+        self.flush()
+        if isinstance(start, datetime):
+            start = start.date()
+        session = SessionLocal()
+        try:
+            total = func.sum(TraceRejectionDailyDB.rejections)
+            query = session.query(TraceRejectionDailyDB.reason, total)
+            if strategy_id:
+                query = query.filter(TraceRejectionDailyDB.strategy_id == strategy_id)
+            if start:
+                query = query.filter(TraceRejectionDailyDB.day >= start)
+            rows = query.group_by(TraceRejectionDailyDB.reason).having(total > 0).order_by(total.desc()).all()
+            return [(reason, int(count)) for reason, count in rows]
+        finally:
+            session.close()
+
 
 # Global instance
 _trace_store: Optional[TraceStore] = None
@@ -242,4 +623,5 @@ def get_trace_store() -> TraceStore:
     global _trace_store
     if _trace_store is None:
         _trace_store = TraceStore()
+        atexit.register(_trace_store.close)
     return _trace_store
@@ -3,10 +3,12 @@
 import json
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 from dataclasses import dataclass
 
-from .base_store import BaseStore
+from sqlalchemy import and_, func, or_
+
+from .base_store import BaseStore, mark_trade_data_changed
 from .database import TradeDB
 
 logger = logging.getLogger(__name__)
@@ -58,36 +60,65 @@ class TradeStore(BaseStore):
             ID of the saved trade
         """
         with self._db_session() as session:
-            # Parse times if they're strings
-            entry_time = trade["entry_time"]
-            if isinstance(entry_time, str):
-                entry_time = datetime.fromisoformat(entry_time)
-
-            exit_time = trade["exit_time"]
-            if isinstance(exit_time, str):
-                exit_time = datetime.fromisoformat(exit_time)
-
-            db_trade = TradeDB(
-                ticker=trade["ticker"],
-                trade_id=trade_id,
-                entry_price=trade["entry_price"],
-                entry_time=entry_time,
-                exit_price=trade["exit_price"],
-                exit_time=exit_time,
-                exit_reason=trade.get("exit_reason", ""),
-                shares=trade["shares"],
-                return_pct=trade.get("return_pct", 0),
-                pnl=trade.get("pnl", 0),
-                paper=paper,
-                strategy_id=strategy_id,
-                strategy_name=strategy_name,
-                strategy_params=json.dumps(trade.get("strategy_params", {})),
-            )
+            db_trade = self._build_trade_row(trade, paper, strategy_id, strategy_name, trade_id)
             session.add(db_trade)
             session.flush()
             trade_db_id = db_trade.id
-            logger.info(f"Saved trade {trade_db_id}: {trade['ticker']} {trade['return_pct']:+.2f}%")
-            return trade_db_id
+        mark_trade_data_changed()
+        logger.info(f"Saved trade {trade_db_id}: {trade['ticker']} {trade['return_pct']:+.2f}%")
+        return trade_db_id
+
+    async def asave_trade(
+        self,
+        trade: dict,
+        paper: bool = True,
+        strategy_id: Optional[str] = None,
+        strategy_name: Optional[str] = None,
+        trade_id: Optional[str] = None,
+    ) -> int:
+        """Async save_trade (same arguments and return value)."""
+        async with self._async_db_session() as session:
+            db_trade = self._build_trade_row(trade, paper, strategy_id, strategy_name, trade_id)
+            session.add(db_trade)
+            await session.flush()
+            trade_db_id = db_trade.id
+        mark_trade_data_changed()
+        logger.info(f"Saved trade {trade_db_id}: {trade['ticker']} {trade['return_pct']:+.2f}%")
+        return trade_db_id
+
+    @staticmethod
+    def _build_trade_row(
+        trade: dict,
+        paper: bool,
+        strategy_id: Optional[str],
+        strategy_name: Optional[str],
+        trade_id: Optional[str],
+    ) -> TradeDB:
+        # Parse times if they're strings
+        entry_time = trade["entry_time"]
+        if isinstance(entry_time, str):
+            entry_time = datetime.fromisoformat(entry_time)
+
+        exit_time = trade["exit_time"]
+        if isinstance(exit_time, str):
+            exit_time = datetime.fromisoformat(exit_time)
+
+        return TradeDB(
+            ticker=trade["ticker"],
+            trade_id=trade_id,
+            entry_price=trade["entry_price"],
+            entry_time=entry_time,
+            exit_price=trade["exit_price"],
+            exit_time=exit_time,
+            exit_reason=trade.get("exit_reason", ""),
+            shares=trade["shares"],
+            return_pct=trade.get("return_pct", 0),
+            pnl=trade.get("pnl", 0),
+            paper=paper,
+            strategy_id=strategy_id,
+            strategy_name=strategy_name,
+            strategy_params=json.dumps(trade.get("strategy_params", {})),
+        )
 
     def get_trades(
         self,
@@ -97,9 +128,11 @@ class TradeStore(BaseStore):
         end: Optional[datetime] = None,
         strategy_id: Optional[str] = None,
         limit: int = 100,
+        strategy_name: Optional[str] = None,
+        before: Optional[Tuple[datetime, int]] = None,
     ) -> List[CompletedTrade]:
         """
-        Load trades with optional filters.
+        Load trades with optional filters, newest first.
 
         Args:
             paper: Filter by paper/live trading
@@ -108,61 +141,119 @@ class TradeStore(BaseStore):
             end: Filter by entry time <= end
             strategy_id: Filter by strategy ID
             limit: Max number of trades to return
+            strategy_name: Filter by strategy name
+            before: Keyset cursor (entry_time, id) of the last trade on the previous
+                page; returns the trades that sort after it. Use next_page_cursor().
         """
         with self._db_session() as session:
-            query = session.query(TradeDB)
-
-            if paper is not None:
-                query = query.filter(TradeDB.paper == paper)
-            if ticker:
-                query = query.filter(TradeDB.ticker == ticker)
-            if start:
-                query = query.filter(TradeDB.entry_time >= start)
-            if end:
-                query = query.filter(TradeDB.entry_time <= end)
-            if strategy_id:
-                query = query.filter(TradeDB.strategy_id == strategy_id)
+            query = self._filter_trades(
+                session.query(TradeDB), paper, ticker, start, end, strategy_id, strategy_name
+            )
+            if before is not None:
+                before_time, before_id = before
+                query = query.filter(or_(
+                    TradeDB.entry_time < before_time,
+                    and_(TradeDB.entry_time == before_time, TradeDB.id < before_id),
+                ))
 
-            rows = query.order_by(TradeDB.entry_time.desc()).limit(limit).all()
+            rows = query.order_by(TradeDB.entry_time.desc(), TradeDB.id.desc()).limit(limit).all()
 
             return [self._db_to_trade(row) for row in rows]
 
-    def get_trade_stats(self, paper: Optional[bool] = None) -> dict:
-        """Get aggregate statistics for trades."""
+    @staticmethod
+    def next_page_cursor(trades: List[CompletedTrade], limit: int) -> Optional[Tuple[datetime, int]]:
+        """Cursor for the page after `trades` (None if this was the last page)."""
+        if len(trades) < limit:
+            return None
+        return (trades[-1].entry_time, trades[-1].id)
+
+    def get_trade_stats(
+        self,
+        paper: Optional[bool] = None,
+        ticker: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        strategy_id: Optional[str] = None,
+        strategy_name: Optional[str] = None,
+        group_by: Optional[str] = None,
+    ) -> Union[dict, List[dict]]:
+        """Get aggregate statistics for trades, computed in SQL.
+
+        Args:
+            Filters are the same as get_trades().
+            group_by: None for one overall dict, "strategy" for one dict per strategy
+                (key: strategy_name), or "day" for one dict per Eastern Time entry date
+                (key: day).
+
+        Returns:
+            A stats dict, or a list of stats dicts (each with its group key) if grouped.
+        """
+        if group_by not in (None, "strategy", "day"):
+            raise ValueError(f"group_by must be None, 'strategy' or 'day', got {group_by!r}")
+
+        total = func.count(TradeDB.id)
+        wins = func.count(TradeDB.id).filter(TradeDB.pnl > 0)
+        aggregates = [
+            total.label("total_trades"),
+            wins.label("wins"),
+            func.coalesce(func.sum(TradeDB.pnl), 0).label("total_pnl"),
+            func.coalesce(func.avg(TradeDB.return_pct), 0).label("avg_return_pct"),
+            func.coalesce(func.max(TradeDB.return_pct), 0).label("best_trade_pct"),
+            func.coalesce(func.min(TradeDB.return_pct), 0).label("worst_trade_pct"),
+        ]
+
+        group_col = None
+        if group_by == "strategy":
+            group_col = TradeDB.strategy_name.label("strategy_name")
+        elif group_by == "day":
+            group_col = func.date(
+                func.timezone("America/New_York", func.timezone("UTC", TradeDB.entry_time))
+            ).label("day")
+
         with self._db_session() as session:
-            query = session.query(TradeDB)
-            if paper is not None:
-                query = query.filter(TradeDB.paper == paper)
-
-            trades = query.all()
-
-            if not trades:
-                return {
-                    "total_trades": 0,
-                    "wins": 0,
-                    "losses": 0,
-                    "win_rate": 0,
-                    "total_pnl": 0,
-                    "avg_return_pct": 0,
-                    "best_trade_pct": 0,
-                    "worst_trade_pct": 0,
-                }
-
-            wins = sum(1 for t in trades if t.pnl > 0)
-            losses = sum(1 for t in trades if t.pnl <= 0)
-            total_pnl = sum(t.pnl for t in trades)
-            returns = [t.return_pct for t in trades]
-
-            return {
-                "total_trades": len(trades),
-                "wins": wins,
-                "losses": losses,
-                "win_rate": wins / len(trades) * 100 if trades else 0,
-                "total_pnl": total_pnl,
-                "avg_return_pct": sum(returns) / len(returns) if returns else 0,
-                "best_trade_pct": max(returns) if returns else 0,
-                "worst_trade_pct": min(returns) if returns else 0,
-            }
+            columns = ([group_col] if group_col is not None else []) + aggregates
+            query = self._filter_trades(
+                session.query(*columns), paper, ticker, start, end, strategy_id, strategy_name
+            )
+            if group_col is None:
+                return self._stats_row_to_dict(query.one())
+
+            rows = query.group_by(group_col).order_by(group_col).all()
+            return [
+                {group_col.name: getattr(row, group_col.name), **self._stats_row_to_dict(row)}
+                for row in rows
+            ]
+
+    @staticmethod
+    def _filter_trades(query, paper, ticker, start, end, strategy_id, strategy_name):
+        if paper is not None:
+            query = query.filter(TradeDB.paper == paper)
+        if ticker:
+            query = query.filter(TradeDB.ticker == ticker)
+        if start:
+            query = query.filter(TradeDB.entry_time >= start)
+        if end:
+            query = query.filter(TradeDB.entry_time <= end)
+        if strategy_id:
+            query = query.filter(TradeDB.strategy_id == strategy_id)
+        if strategy_name:
+            query = query.filter(TradeDB.strategy_name == strategy_name)
+        return query
+
+    @staticmethod
+    def _stats_row_to_dict(row) -> dict:
+        total = row.total_trades or 0
+        wins = row.wins or 0
+        return {
+            "total_trades": total,
+            "wins": wins,
+            "losses": total - wins,
+            "win_rate": wins / total * 100 if total else 0,
+            "total_pnl": float(row.total_pnl or 0),
+            "avg_return_pct": float(row.avg_return_pct or 0),
+            "best_trade_pct": float(row.best_trade_pct or 0),
+            "worst_trade_pct": float(row.worst_trade_pct or 0),
+        }
 
     def _db_to_trade(self, row: TradeDB) -> CompletedTrade:
         """Convert database row to CompletedTrade."""
@@ -83,3 +83,13 @@ def test_db_session(test_engine):
     session.close()
     transaction.rollback()
     connection.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_response_cache(tmp_path):
+    """Keep provider responses recorded during a test out of data/ohlcv_cache."""
+    from src.data_providers import response_cache
+
+    response_cache.set_response_cache(response_cache.ResponseCache(directory=tmp_path / "ohlcv_cache"))
+    yield
+    response_cache.set_response_cache(None)
@@ -0,0 +1,75 @@
+"""Tests for ActiveTradeStore write-behind price updates."""
+
+from datetime import datetime
+
+from src.active_trade_store import ActiveTradeStore
+
+
+def _save(store: ActiveTradeStore, trade_id: str = "trade-wb-1"):
+    store.save_trade(
+        trade_id=trade_id,
+        ticker="TEST",
+        strategy_id="strategy-1",
+        strategy_name="Test",
+        entry_price=10.0,
+        entry_time=datetime(2026, 1, 5, 14, 30),
+        first_candle_open=9.9,
+        shares=100,
+        stop_loss_price=9.0,
+        take_profit_price=11.0,
+        highest_since_entry=10.0,
+    )
+
+
+def test_update_price_is_buffered_until_flush():
+    store = ActiveTradeStore(write_behind=True, flush_interval=3600)
+    _save(store)
+
+    store.update_price("trade-wb-1", 10.5, 10.5, datetime(2026, 1, 5, 14, 31))
+    store.update_price("trade-wb-1", 10.8, 10.8, datetime(2026, 1, 5, 14, 32))
+    assert store._pending["trade-wb-1"].last_price == 10.8
+
+    assert store.flush() == 1
+    assert store._pending == {}
+
+    trade = store.get_trade("trade-wb-1")
+    assert trade.last_price == 10.8
+    assert trade.highest_since_entry == 10.8
+    assert trade.last_quote_time == datetime(2026, 1, 5, 14, 32)
+    store.close()
+
+
+def test_high_water_mark_never_decreases():
+    store = ActiveTradeStore(write_behind=True, flush_interval=3600)
+    _save(store)
+
+    store.update_price("trade-wb-1", 12.0, 12.0, datetime(2026, 1, 5, 14, 31))
+    # A lower high-water mark arriving later must not overwrite the higher one
+    store.update_price("trade-wb-1", 11.0, 11.5, datetime(2026, 1, 5, 14, 32))
+    store.flush()
+
+    store.update_price("trade-wb-1", 10.5, 10.5, datetime(2026, 1, 5, 14, 33))
+    trade = store.get_trade("trade-wb-1")
+    assert trade.last_price == 10.5
+    assert trade.highest_since_entry == 12.0
+    store.close()
+
+
+def test_delete_discards_pending_update():
+    store = ActiveTradeStore(write_behind=True, flush_interval=3600)
+    _save(store)
+
+    store.update_price("trade-wb-1", 10.5, 10.5, datetime(2026, 1, 5, 14, 31))
+    assert store.delete_trade("trade-wb-1")
+    assert "trade-wb-1" not in store._pending
+    assert store.get_trade("trade-wb-1") is None
+    store.close()
+
+
+def test_write_through_mode_updates_immediately():
+    store = ActiveTradeStore(write_behind=False)
+    _save(store)
+
+    assert store.update_price("trade-wb-1", 10.2, 10.2, datetime(2026, 1, 5, 14, 31))
+    assert store._pending == {}
+    assert store.get_trade("trade-wb-1").last_price == 10.2
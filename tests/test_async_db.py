@@ -0,0 +1,81 @@
+"""Tests for the ordered async DB writer used on the trading loop."""
+
+import asyncio
+from unittest.mock import patch
+
+from src.async_db import AsyncDBWriter
+
+
+def test_submit_without_loop_runs_sync():
+    calls = []
+    writer = AsyncDBWriter()
+
+    async def async_write():
+        calls.append("async")
+
+    writer.submit("t-1", async_write, lambda: calls.append("sync"))
+    assert calls == ["sync"]
+
+
+def test_same_key_writes_run_in_order():
+    calls = []
+
+    def make(name, delay):
+        async def write():
+            await asyncio.sleep(delay)
+            calls.append(name)
+        return write
+
+    async def main():
+        writer = AsyncDBWriter(max_concurrency=4)
+        # First write is slower; per-key ordering must still hold
+        writer.submit("t-1", make("save", 0.05), lambda: None)
+        writer.submit("t-1", make("delete", 0), lambda: None)
+        writer.submit("t-2", make("other", 0), lambda: None)
+        assert writer.pending() == 3
+        await writer.drain()
+        assert writer.pending() == 0
+
+    with patch("src.async_db.database.get_async_sessionmaker"):
+        asyncio.run(main())
+
+    assert calls.index("save") < calls.index("delete")
+    assert calls[0] == "other"
+
+
+def test_falls_back_to_thread_pool_without_asyncpg():
+    calls = []
+
+    async def async_write():
+        calls.append("async")
+
+    async def main():
+        writer = AsyncDBWriter()
+        writer.submit("t-1", async_write, lambda: calls.append("sync"))
+        await writer.drain()
+
+    with patch("src.async_db.database.get_async_sessionmaker", side_effect=ImportError("asyncpg")):
+        asyncio.run(main())
+
+    assert calls == ["sync"]
+
+
+def test_failed_write_does_not_block_later_writes():
+    calls = []
+
+    async def failing():
+        raise RuntimeError("boom")
+
+    async def ok():
+        calls.append("ok")
+
+    async def main():
+        writer = AsyncDBWriter()
+        writer.submit("t-1", failing, lambda: None)
+        writer.submit("t-1", ok, lambda: None)
+        await writer.drain()
+
+    with patch("src.async_db.database.get_async_sessionmaker"):
+        asyncio.run(main())
+
+    assert calls == ["ok"]
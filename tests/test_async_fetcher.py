@@ -0,0 +1,88 @@
+"""Tests for the shared token bucket and concurrent OHLCV fetcher."""
+
+import asyncio
+import time
+from datetime import datetime
+
+from src.data_providers.async_fetcher import AsyncOHLCVFetcher, FetchRequest, TokenBucket, parse_retry_after
+from src.data_providers.base import OHLCVDataProvider
+from src.models import OHLCVBar
+
+
+class FakeProvider(OHLCVDataProvider):
+    """Returns one bar per request after a short delay; tracks concurrency."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_seen = 0
+
+    def fetch_ohlcv(self, ticker, start, end, timespan="minute"):
+        raise AssertionError("sync path should not be used")
+
+    async def afetch_ohlcv(self, fetcher, ticker, start, end, timespan="minute"):
+        await fetcher.bucket.acquire()
+        self.in_flight += 1
+        self.max_seen = max(self.max_seen, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+            fetcher.bucket.release()
+        if ticker == "NONE":
+            return []
+        return [OHLCVBar(timestamp=start, open=1.0, high=1.0, low=1.0, close=1.0, volume=100)]
+
+    def supports_extended_hours(self) -> bool:
+        return True
+
+    @property
+    def rate_limit_delay(self) -> float:
+        return 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+
+
+def test_bucket_caps_in_flight_and_results_keep_order():
+    provider = FakeProvider()
+    fetcher = AsyncOHLCVFetcher(provider, rps=1000, max_in_flight=3)
+    try:
+        start = datetime(2026, 1, 5, 14, 30)
+        requests = [FetchRequest(f"T{i}", start, start) for i in range(9)] + [FetchRequest("NONE", start, start)]
+        results = fetcher.fetch_batch(requests)
+    finally:
+        fetcher.close()
+
+    assert provider.max_seen == 3
+    assert all(len(r) == 1 for r in results[:9])
+    assert results[9] == []
+
+
+def test_bucket_paces_requests():
+    async def run():
+        bucket = TokenBucket(rate=20, max_in_flight=10)
+        began = time.monotonic()
+        for _ in range(30):  # 20 burst tokens, then 10 more at 20/s
+            await bucket.acquire()
+            bucket.release()
+        return time.monotonic() - began
+
+    assert asyncio.run(run()) >= 0.45
+
+
+def test_throttle_pauses_and_halves_rate():
+    async def run():
+        bucket = TokenBucket(rate=100, max_in_flight=1)
+        await bucket.acquire()
+        bucket.release(throttled=True, retry_after=0.2)
+        assert bucket.current_rate == 50
+        began = time.monotonic()
+        await bucket.acquire()
+        bucket.release()
+        return time.monotonic() - began
+
+    assert asyncio.run(run()) >= 0.19
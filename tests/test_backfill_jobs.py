@@ -0,0 +1,87 @@
+"""Tests for the resumable backfill job table and runner."""
+
+from datetime import datetime, timedelta
+
+from src import postgres_client
+from src.backfill_jobs import BackfillJobStore, BackfillRunner
+from src.database import BackfillJobDB
+
+BASE = datetime(2026, 1, 5, 14, 30)
+
+
+def test_claim_order_retry_and_requeue():
+    store = BackfillJobStore()
+    keys = [("JOBA", BASE), ("JOBB", BASE + timedelta(days=1)), ("JOBC", BASE + timedelta(days=2))]
+    assert store.enqueue(keys) == 3
+    assert store.enqueue(keys) == 0  # already queued
+    store.enqueue([("JOBA", BASE)], priority=5, requeue=True)
+
+    jobs = store.claim("w1", 2)
+    # Priority first, then most recent announcement
+    assert {j.ticker for j in jobs} == {"JOBA", "JOBC"}
+    assert store.claim("w2", 10)[0].ticker == "JOBB"
+    assert store.claim("w3", 10) == []
+
+    by_ticker = {j.ticker: j for j in jobs}
+    assert store.finish(by_ticker["JOBA"], 120) == "done"
+    assert store.finish(by_ticker["JOBC"], None, "HTTP 500") == "pending"
+    # Retry is deferred, so nothing is due yet
+    assert store.claim("w1", 10) == []
+
+    counts = store.progress()
+    assert (counts["done"], counts["pending"], counts["running"]) == (1, 1, 1)
+
+
+def test_claim_by_keys_ignores_other_due_jobs():
+    store = BackfillJobStore()
+    store.enqueue([("KEYA", BASE), ("KEYB", BASE + timedelta(days=1))], priority=9)
+
+    jobs = store.claim("w1", 10, keys=[("KEYA", BASE)])
+    assert [j.ticker for j in jobs] == ["KEYA"]
+    assert store.claim("w1", 10, keys=[("KEYA", BASE)]) == []
+    assert store.get_states([("KEYB", BASE + timedelta(days=1))]) == {("KEYB", BASE + timedelta(days=1)): "pending"}
+
+
+def test_stale_running_jobs_are_released():
+    store = BackfillJobStore()
+    store.enqueue([("JOBS", BASE)])
+    assert len(store.claim("dead-worker", 1)) == 1
+
+    assert store.release_stale(timedelta(minutes=15)) == 0
+    assert store.release_stale(timedelta(seconds=-1)) == 1
+    assert store.claim("w1", 1)[0].attempts == 2
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+
+    def fetch_after_announcements(self, keys, **kwargs):
+        self.calls.append((list(keys), kwargs))
+        results = {
+            "GOOD": [object()] * 3, "NONE": [], "FAIL": None,
+            "TODAY": postgres_client.NOT_AVAILABLE_YET,
+        }
+        return [results[ticker] for ticker, _ in keys]
+
+
+def test_runner_drains_queue(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(postgres_client, "get_postgres_client", lambda backend=None: client)
+    store = BackfillJobStore()
+    store.enqueue([("GOOD", BASE), ("NONE", BASE), ("FAIL", BASE), ("TODAY", BASE)])
+    store.enqueue([("GOOD", BASE + timedelta(days=1))], backend="polygon", replace=True)
+
+    finished = BackfillRunner(store, workers=2, batch_size=2).run(progress_interval=0.1)
+
+    assert finished == {"done": 2, "no_data": 1, "pending": 2}
+    assert store.get_states([("FAIL", BASE), ("TODAY", BASE)]) == {
+        ("FAIL", BASE): "pending", ("TODAY", BASE): "pending",
+    }
+    replace_calls = [kwargs for _, kwargs in client.calls if kwargs["replace"]]
+    assert replace_calls and replace_calls[0]["use_cache"] is False
+
+    # A window that isn't over yet is deferred without using an attempt
+    with store._db_session() as session:
+        job = session.query(BackfillJobDB).filter_by(ticker="TODAY").one()
+        assert job.attempts == 0 and job.next_attempt_at > datetime.utcnow()
@@ -0,0 +1,48 @@
+"""Tests for columnar decoding of provider responses."""
+
+from datetime import datetime
+
+from src.data_providers.alpaca import AlpacaProvider
+from src.data_providers.columnar import OHLCVColumns, json_loads
+from src.data_providers.polygon import PolygonProvider
+from src.models import OHLCVBar
+
+POLYGON_BODY = b"""{"status":"OK","resultsCount":2,"results":[
+    {"t":1704292200000,"o":10.0,"h":10.5,"l":9.9,"c":10.2,"v":1200,"vw":10.1},
+    {"t":1704292260000,"o":10.2,"h":10.4,"l":10.1,"c":10.3,"v":850.6}
+]}"""
+
+ALPACA_BARS = [
+    {"t": "2024-01-03T14:30:00Z", "o": 10.0, "h": 10.5, "l": 9.9, "c": 10.2, "v": 1200, "vw": 10.1},
+    {"t": "2024-01-03T14:31:00Z", "o": 10.2, "h": 10.4, "l": 10.1, "c": 10.3, "v": 851},
+]
+
+EXPECTED = [
+    OHLCVBar(timestamp=datetime(2024, 1, 3, 14, 30), open=10.0, high=10.5, low=9.9,
+             close=10.2, volume=1200, vwap=10.1),
+    OHLCVBar(timestamp=datetime(2024, 1, 3, 14, 31), open=10.2, high=10.4, low=10.1,
+             close=10.3, volume=851, vwap=None),
+]
+
+
+def test_polygon_epoch_ms_decode_as_naive_utc():
+    bars = PolygonProvider(api_key="x")._parse_bars("TEST", json_loads(POLYGON_BODY))
+    assert bars == EXPECTED
+    assert type(bars[0].volume) is int
+    assert PolygonProvider(api_key="x")._parse_bars("TEST", {"status": "OK", "results": []}) == []
+
+
+def test_alpaca_rfc3339_decode():
+    assert AlpacaProvider._parse_bars(ALPACA_BARS) == EXPECTED
+    # Explicit offsets take the slow path but land on the same UTC instant
+    offset = [dict(ALPACA_BARS[0], t="2024-01-03T09:30:00-05:00")]
+    assert AlpacaProvider._parse_bars(offset) == EXPECTED[:1]
+
+
+def test_round_trip_and_concat():
+    columns = OHLCVColumns.from_alpaca(ALPACA_BARS)
+    assert OHLCVColumns.from_epoch_ms(columns.to_dict()).to_bars() == EXPECTED
+
+    combined = OHLCVColumns.concat([columns, OHLCVColumns.empty(), columns])
+    assert len(combined) == 4
+    assert combined.to_bars()[2:] == EXPECTED
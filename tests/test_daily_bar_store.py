@@ -0,0 +1,51 @@
+"""Tests for the daily bar cache behind premarket features."""
+
+from datetime import date, datetime, timedelta
+
+from src.daily_bar_store import DailyBarStore
+from src.features import compute_premarket_features_bulk
+from src.models import OHLCVBar
+
+
+class FakeClient:
+    """Daily bars at ET midnight (close = day of month), two 08:00 ET premarket bars."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_ohlcv(self, ticker, start, end, timespan="minute"):
+        self.calls.append((ticker, timespan))
+        if timespan == "day":
+            bars = []
+            d = start.date()
+            while d <= end.date():
+                ts = datetime(d.year, d.month, d.day, 5, 0)  # midnight EST in UTC
+                if start <= ts <= end and d.weekday() < 5:
+                    bars.append(OHLCVBar(timestamp=ts, open=d.day + 0.5, high=d.day + 1, low=d.day - 1,
+                                         close=float(d.day), volume=1000))
+                d += timedelta(days=1)
+            return bars
+        ts = start + timedelta(hours=4)
+        return [OHLCVBar(timestamp=ts + timedelta(minutes=m), open=2.0, high=2.0, low=2.0, close=2.0, volume=100)
+                for m in range(2)]
+
+
+def test_bulk_features_use_one_daily_fetch_per_ticker():
+    client = FakeClient()
+    store = DailyBarStore()
+    items = [("DBAR", date(2026, 1, 6)), ("DBAR", date(2026, 1, 8)), ("DBAR", date(2026, 1, 8))]
+
+    features = compute_premarket_features_bulk(client, items, store=store)
+
+    assert [c for c in client.calls if c[1] == "day"] == [("DBAR", "day")]
+    assert features[0]["prev_close"] == 5.0
+    assert features[0]["regular_open"] == 6.5
+    assert round(features[0]["premarket_gap_pct"], 2) == 30.0
+    assert features[1]["premarket_volume"] == 200
+    assert features[1]["premarket_dollar_volume"] == 400.0
+    # Premarket totals are cached per session: one minute fetch per distinct date
+    assert len([c for c in client.calls if c[1] == "minute"]) == 2
+
+    client.calls.clear()
+    assert compute_premarket_features_bulk(client, items, store=store) == features
+    assert client.calls == []
@@ -0,0 +1,146 @@
+"""Tests for src/duckdb_client.py"""
+
+from datetime import datetime, timedelta, timezone
+
+import duckdb
+import pandas as pd
+
+from src.duckdb_client import (
+    MARKET_SESSION_SQL,
+    OHLCV_PARTITION_BUCKETS,
+    OHLCV_PARTITION_DIRNAME,
+    DuckDBClient,
+    ohlcv_partition_bucket,
+    ohlcv_partition_relpath,
+)
+from src.models import get_market_session
+from src.retention import TRACE_ARCHIVE_DIRNAME, TRACE_EVENT_ARCHIVE_DIRNAME, _write_archive
+
+
+class TestOHLCVPartitioning:
+    """Partition paths must be stable so exports and queries agree."""
+
+    def test_bucket_is_stable_and_in_range(self):
+        for ticker in ["AAPL", "TSLA", "MULN", "A", "ZZZZ"]:
+            bucket = ohlcv_partition_bucket(ticker)
+            assert 0 <= bucket < OHLCV_PARTITION_BUCKETS
+            assert bucket == ohlcv_partition_bucket(ticker)
+
+    def test_known_bucket_value(self):
+        # crc32("AAPL") is fixed; guards against switching to the salted built-in hash()
+        assert ohlcv_partition_bucket("AAPL") == 12
+        assert ohlcv_partition_bucket("AAPL", buckets=1) == 0
+
+    def test_relpath_uses_announcement_month(self):
+        ts = datetime(2025, 3, 31, 23, 59)
+        bucket = ohlcv_partition_bucket("MULN")
+        assert ohlcv_partition_relpath("MULN", ts) == f"month=2025-03/bucket={bucket:02d}.parquet"
+
+    def test_bulk_lookup_normalizes_aware_keys_to_naive_utc(self, tmp_path):
+        # 2025-03-31 23:59 UTC is still March in UTC but April 1 in UTC+1
+        ts = datetime(2025, 3, 31, 23, 59)
+        path = tmp_path / OHLCV_PARTITION_DIRNAME / ohlcv_partition_relpath("MULN", ts)
+        path.parent.mkdir(parents=True)
+        pd.DataFrame({
+            "announcement_ticker": ["MULN"], "announcement_timestamp": [ts], "timestamp": [ts],
+            "open": [1.0], "high": [1.0], "low": [1.0], "close": [1.0], "volume": [100], "vwap": [1.0],
+        }).to_parquet(path)
+
+        aware = datetime(2025, 4, 1, 0, 59, tzinfo=timezone(timedelta(hours=1)))
+        bars = DuckDBClient(parquet_dir=tmp_path).get_ohlcv_bars_bulk([("MULN", aware)])
+        assert len(bars[("MULN", aware)]) == 1
+
+
+class TestSessionSQL:
+    """The SQL session classifier must agree with get_market_session."""
+
+    def test_matches_python_classifier(self):
+        timestamps = [
+            datetime(2025, 12, 12, 8, 59, 59),   # 03:59:59 ET (EST) - closed
+            datetime(2025, 12, 12, 9, 0, 0),     # 04:00 ET - premarket
+            datetime(2025, 12, 12, 14, 30, 0),   # 09:30 ET - market
+            datetime(2025, 12, 12, 21, 0, 0),    # 16:00 ET - postmarket
+            datetime(2025, 12, 13, 1, 0, 0),     # 20:00 ET - closed
+            datetime(2025, 7, 15, 13, 29, 0),    # 09:29 ET (EDT) - premarket
+            datetime(2025, 7, 15, 13, 30, 0),    # 09:30 ET (EDT) - market
+        ]
+        conn = duckdb.connect(":memory:")
+        conn.execute("CREATE TABLE t (timestamp TIMESTAMP)")
+        conn.executemany("INSERT INTO t VALUES (?)", [(ts,) for ts in timestamps])
+        rows = conn.execute(f"SELECT timestamp, {MARKET_SESSION_SQL} FROM t").fetchall()
+
+        for ts, session in rows:
+            assert session == get_market_session(ts), f"{ts} classified as {session}"
+
+
+class TestRowsToAnnouncements:
+    """Column-wise conversion keeps the per-field defaults."""
+
+    def test_null_handling(self):
+        columns = ["ticker", "timestamp", "price_threshold", "headline", "country",
+                   "is_nhod", "has_news", "float_shares"]
+        rows = [
+            ("ABC", datetime(2025, 1, 2, 14, 0), 1.0, None, None, None, None, None),
+            ("XYZ", datetime(2025, 1, 3, 14, 0), 0.5, "Headline", "CN", True, False, 1e6),
+        ]
+        anns = DuckDBClient._rows_to_announcements(columns, rows)
+
+        assert [a.ticker for a in anns] == ["ABC", "XYZ"]
+        assert anns[0].headline == ""
+        assert anns[0].country == "US"
+        assert anns[0].is_nhod is False
+        assert anns[0].has_news is True
+        assert anns[0].float_shares is None
+        assert anns[1].is_nhod is True
+        assert anns[1].has_news is False
+        assert anns[1].float_shares == 1e6
+        # Columns absent from the projection fall back to dataclass-compatible defaults
+        assert anns[1].source_html is None
+
+
+class TestTraceArchive:
+    """Traces archived by the retention job are queryable through DuckDB."""
+
+    def _write(self, root):
+        traces = pd.DataFrame({
+            "id": [1, 2],
+            "trace_id": ["t-jan", "t-feb"],
+            "ticker": ["AAA", "BBB"],
+            "status": ["filtered", "completed"],
+            "created_at": [datetime(2026, 1, 10, 14, 0), datetime(2026, 2, 3, 15, 0)],
+        })
+        events = pd.DataFrame({
+            "id": [10, 11, 12],
+            "trace_id": ["t-jan", "t-jan", "t-feb"],
+            "event_type": ["alert_received", "filter_rejected", "alert_received"],
+            "event_timestamp": [
+                datetime(2026, 1, 10, 14, 0, 1),
+                datetime(2026, 1, 10, 14, 0, 0),
+                datetime(2026, 2, 3, 15, 0),
+            ],
+            "trace_created_at": [datetime(2026, 1, 10, 14, 0)] * 2 + [datetime(2026, 2, 3, 15, 0)],
+        })
+        _write_archive(traces, TRACE_ARCHIVE_DIRNAME, "created_at", "part-1-2", root)
+        _write_archive(events, TRACE_EVENT_ARCHIVE_DIRNAME, "trace_created_at", "part-1-2", root)
+
+    def test_archive_is_partitioned_by_month(self, tmp_path):
+        self._write(tmp_path)
+        assert (tmp_path / "traces" / "month=2026-01" / "part-1-2.parquet").exists()
+        assert (tmp_path / "trace_events" / "month=2026-02" / "part-1-2.parquet").exists()
+
+    def test_query_archived_traces(self, tmp_path):
+        self._write(tmp_path)
+        client = DuckDBClient(parquet_dir=tmp_path)
+
+        assert client.get_archived_traces()["trace_id"].tolist() == ["t-feb", "t-jan"]
+        jan = client.get_archived_traces(start=datetime(2026, 1, 1), end=datetime(2026, 2, 1))
+        assert jan["trace_id"].tolist() == ["t-jan"]
+        assert client.get_archived_traces(ticker="BBB")["trace_id"].tolist() == ["t-feb"]
+
+        events = client.get_archived_trace_events("t-jan")
+        assert events["event_type"].tolist() == ["filter_rejected", "alert_received"]
+
+    def test_missing_archive_returns_empty(self, tmp_path):
+        client = DuckDBClient(parquet_dir=tmp_path)
+        assert client.get_archived_traces().empty
+        assert client.get_archived_trace_events("t-1").empty
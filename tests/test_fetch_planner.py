@@ -0,0 +1,56 @@
+"""Tests for ticker-day coalescing of OHLCV fetch windows."""
+
+from datetime import datetime, timedelta
+
+from src.data_providers.fetch_planner import FetchWindow, plan_fetches
+from src.models import OHLCVBar
+
+
+def _window(key, ticker, start, minutes=125):
+    return FetchWindow(key, ticker, start, start + timedelta(minutes=minutes))
+
+
+def _bar(ts):
+    return OHLCVBar(timestamp=ts, open=1.0, high=1.0, low=1.0, close=1.0, volume=100)
+
+
+def test_overlapping_windows_share_one_request():
+    base = datetime(2026, 1, 5, 14, 30)  # 09:30 ET
+    plan = plan_fetches([
+        _window("a", "ABC", base),
+        _window("b", "ABC", base + timedelta(minutes=40)),
+        _window("c", "ABC", base + timedelta(hours=5)),  # far enough apart for its own request
+    ])
+
+    assert len(plan) == 2
+    first = plan[0]
+    assert [w.key for w in first.windows] == ["a", "b"]
+    assert first.request.start == base
+    assert first.request.end == base + timedelta(minutes=165)
+
+
+def test_tickers_and_trading_days_are_not_merged():
+    base = datetime(2026, 1, 5, 14, 30)
+    plan = plan_fetches([
+        _window("a", "ABC", base),
+        _window("b", "XYZ", base),
+        _window("c", "ABC", base + timedelta(days=1)),
+    ])
+    assert len(plan) == 3
+
+
+def test_split_returns_bars_per_window_and_propagates_failure():
+    base = datetime(2026, 1, 5, 14, 30)
+    [coalesced] = plan_fetches([
+        _window("a", "ABC", base, minutes=10),
+        _window("b", "ABC", base + timedelta(minutes=5), minutes=10),
+    ])
+    bars = [_bar(base + timedelta(minutes=m)) for m in range(16)]
+
+    split = coalesced.split(bars)
+    assert len(split["a"]) == 11
+    assert split["b"][0].timestamp == base + timedelta(minutes=5)
+    assert len(split["b"]) == 11
+
+    assert coalesced.split([]) == {"a": [], "b": []}
+    assert coalesced.split(None) == {"a": None, "b": None}
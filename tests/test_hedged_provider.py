@@ -0,0 +1,141 @@
+"""Tests for hedged requests and failover across OHLCV providers."""
+
+import asyncio
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.data_providers import get_async_fetcher, get_provider, hedged
+from src.data_providers.base import OHLCVDataProvider
+from src.data_providers.hedged import HedgedProvider
+from src.models import OHLCVBar
+
+START = datetime(2026, 1, 5, 14, 30)
+_ids = itertools.count()
+
+
+class FakeProvider(OHLCVDataProvider):
+    """Answers after `delay` seconds with one bar, or None when failing."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False, min_delay: int = 15):
+        self.delay = delay
+        self.fail = fail
+        self.min_delay = min_delay
+        self.calls = 0
+        self.cancelled = 0
+        self._name = f"Fake{next(_ids)}"  # fetchers are shared per name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def fetch_ohlcv(self, ticker, start, end, timespan="minute"):
+        raise AssertionError("sync path should not be used")
+
+    async def afetch_ohlcv(self, fetcher, ticker, start, end, timespan="minute"):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            return None
+        return [OHLCVBar(timestamp=start, open=1.0, high=1.0, low=1.0, close=1.0, volume=100, vwap=None)]
+
+    def supports_extended_hours(self) -> bool:
+        return True
+
+    @property
+    def rate_limit_delay(self) -> float:
+        return 0.0
+
+    @property
+    def min_delay_minutes(self) -> int:
+        return self.min_delay
+
+
+def test_slow_primary_is_hedged(monkeypatch):
+    monkeypatch.setattr(hedged, "OHLCV_HEDGE_DEFAULT_DELAY_S", 0.1)
+    slow, fast = FakeProvider(delay=2.0), FakeProvider(delay=0.01)
+    provider = HedgedProvider([slow, fast])
+
+    started = time.monotonic()
+    bars = provider.fetch_ohlcv("ABC", START, START + timedelta(hours=1))
+    assert bars and time.monotonic() - started < 1.0
+
+    time.sleep(0.1)  # cancellation reaches the primary's loop
+    assert (slow.calls, slow.cancelled, fast.calls) == (1, 1, 1)
+    stats = provider.stats()
+    assert stats[fast.name]["hedges"] == 1 and stats[fast.name]["wins"] == 1
+    # The cancelled primary still leaves a (lower-bound) latency sample
+    assert list(provider._stats[slow.name]._latencies) == [pytest.approx(0.1, abs=0.05)]
+
+
+def test_throttle_during_wait_hedges_at_once(monkeypatch):
+    monkeypatch.setattr(hedged, "OHLCV_HEDGE_DEFAULT_DELAY_S", 10.0)
+    slow, fast = FakeProvider(delay=2.0), FakeProvider(delay=0.01)
+    provider = HedgedProvider([slow, fast])
+    bucket = get_async_fetcher(slow).bucket
+    # A 429 lands on the primary's bucket while the hedge wait is running
+    threading.Timer(0.1, lambda: setattr(bucket, "_paused_until", time.monotonic() + 5)).start()
+
+    started = time.monotonic()
+    assert provider.fetch_ohlcv("ABC", START, START + timedelta(hours=1))
+    assert time.monotonic() - started < 0.5
+    assert provider.stats()[fast.name]["wins"] == 1
+
+
+def test_failure_fails_over_and_demotes_primary(monkeypatch):
+    monkeypatch.setattr(hedged, "OHLCV_HEDGE_DEFAULT_DELAY_S", 10.0)
+    broken, backup = FakeProvider(fail=True), FakeProvider(delay=0.01)
+    provider = HedgedProvider([broken, backup])
+
+    started = time.monotonic()
+    assert provider.fetch_ohlcv("ABC", START, START + timedelta(hours=1))
+    assert time.monotonic() - started < 1.0  # no hedge wait on a failure
+
+    # After a run of failures the primary goes to the back of the queue
+    end = START + timedelta(hours=1)
+    assert provider._route(end)[0] is backup
+    assert provider.fetch_ohlcv("ABC", START, end)
+    assert broken.calls == 1
+
+    # Nothing valid anywhere: None (retry later)
+    assert HedgedProvider([FakeProvider(fail=True), FakeProvider(fail=True)]).fetch_ohlcv("ABC", START, end) is None
+
+
+def test_unpublished_windows_skip_delayed_providers():
+    delayed, realtime = FakeProvider(min_delay=1440), FakeProvider(min_delay=15)
+    provider = HedgedProvider([delayed, realtime])
+    assert provider.min_delay_minutes == 15
+
+    recent = datetime.utcnow() - timedelta(hours=1)
+    assert provider._route(recent) == [realtime]
+    assert provider._route(START) == [delayed, realtime]
+
+
+def test_comma_separated_backend_builds_hedged_provider():
+    provider = get_provider("polygon,alpaca")
+    assert isinstance(provider, HedgedProvider)
+    assert [p.name for p in provider.providers] == ["PolygonProvider", "AlpacaProvider"]
+
+
+def test_rate_recovery_after_429_pause_is_not_hedged_at_once(monkeypatch):
+    monkeypatch.setattr(hedged, "OHLCV_HEDGE_DEFAULT_DELAY_S", 10.0)
+    primary, backup = FakeProvider(delay=0.05), FakeProvider(delay=0.01)
+    provider = HedgedProvider([primary, backup])
+    bucket = get_async_fetcher(primary).bucket
+    bucket._slots = asyncio.Semaphore(1)  # release() without a prior acquire()
+    bucket.release(throttled=True, retry_after=0.05)
+
+    assert bucket.paused and provider._hedge_delay(primary) == 0.0
+    time.sleep(0.1)
+    # Pause over, rate still recovering: the latency-based delay applies again
+    assert bucket.current_rate < bucket.rate and not bucket.paused
+    assert provider._hedge_delay(primary) == 10.0
+    assert provider.fetch_ohlcv("ABC", START, START + timedelta(hours=1))
+    assert backup.calls == 0
@@ -0,0 +1,145 @@
+"""Tests for IB historical data pacing and request pipelining."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src.data_providers.async_fetcher import AsyncOHLCVFetcher, FetchRequest
+from src.data_providers.ib import IBPacer, IBProvider
+
+START = datetime(2026, 1, 5, 14, 30)
+
+
+def test_pacer_enforces_window_identical_and_contract_rules():
+    async def run():
+        pacer = IBPacer(max_requests=3, window_s=0.3, identical_gap_s=0.2,
+                        per_contract=2, per_contract_window_s=0.15, max_in_flight=10)
+        stamps = {}
+
+        async def request(pacer, name, contract, key):
+            await pacer.acquire(contract, key)
+            stamps[name] = time.monotonic()
+            pacer.release()
+
+        t0 = time.monotonic()
+        await request(pacer, "a", "X", "a")
+        await request(pacer, "a-again", "X", "a")  # identical: waits identical_gap_s
+        await request(pacer, "b", "Y", "b")
+        await request(pacer, "c", "Z", "c")  # 4th in the window: waits for the first to expire
+
+        # Per-contract burst: third request for W inside per_contract_window_s waits
+        pacer = IBPacer(identical_gap_s=0.0, per_contract=2, per_contract_window_s=0.15)
+        await request(pacer, "w1", "W", "w1")
+        await request(pacer, "w2", "W", "w2")
+        await request(pacer, "w3", "W", "w3")
+        return t0, stamps
+
+    t0, stamps = asyncio.run(run())
+    assert stamps["a"] - t0 < 0.05
+    assert stamps["a-again"] - stamps["a"] >= 0.19
+    assert stamps["c"] - stamps["a"] >= 0.29
+    assert stamps["w2"] - stamps["w1"] < 0.05
+    assert stamps["w3"] - stamps["w1"] >= 0.14
+
+
+class RequestError(Exception):
+    """Shape of ib_insync's RequestError."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class FakeIB:
+    """Stands in for ib_insync.IB: tracks concurrency and qualification calls."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_seen = 0
+        self.qualified = []
+        self.fail_with = None
+
+    def isConnected(self):
+        return True
+
+    def disconnect(self):
+        pass
+
+    async def qualifyContractsAsync(self, contract):
+        self.qualified.append(contract.symbol)
+        if contract.symbol == "NOPE":
+            raise RequestError(200, "No security definition has been found for the request")
+        if contract.symbol == "AMBIG":
+            return []  # ambiguous contract: not the same as unknown
+        return [SimpleNamespace(conId=hash(contract.symbol), symbol=contract.symbol)]
+
+    async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, **kwargs):
+        self.in_flight += 1
+        self.max_seen = max(self.max_seen, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if self.fail_with is not None:
+            raise self.fail_with
+        end = datetime.strptime(endDateTime, "%Y%m%d %H:%M:%S")
+        return [
+            SimpleNamespace(date=end - timedelta(minutes=i), open=1.0, high=1.0, low=1.0,
+                            close=1.0, volume=100.0, average=1.0)
+            for i in range(3)
+        ]
+
+
+def make_provider(fake, max_in_flight=4):
+    provider = IBProvider()
+    provider.pacer = IBPacer(max_in_flight=max_in_flight, identical_gap_s=0.0)
+    provider._ib = fake
+    return provider
+
+
+def test_requests_are_pipelined_and_contracts_cached():
+    fake = FakeIB()
+    provider = make_provider(fake)
+    fetcher = AsyncOHLCVFetcher(provider)
+    try:
+        requests = [
+            FetchRequest(ticker, START + timedelta(days=i), START + timedelta(days=i, minutes=30))
+            for i in range(5) for ticker in ("AAA", "BBB")
+        ] + [FetchRequest("NOPE", START, START + timedelta(minutes=30))]
+        results = fetcher.fetch_batch(requests)
+    finally:
+        fetcher.close()
+
+    assert fake.max_seen == 4
+    assert all(len(r) == 3 for r in results[:-1])
+    assert results[-1] == []
+    assert sorted(fake.qualified) == ["AAA", "BBB", "NOPE"]
+
+
+def test_failed_qualification_is_retryable_and_not_cached():
+    fake = FakeIB(delay=0.0)
+    provider = make_provider(fake)
+    fetcher = AsyncOHLCVFetcher(provider)
+    try:
+        request = FetchRequest("AMBIG", START, START + timedelta(minutes=30))
+        assert fetcher.fetch_batch([request, request]) == [None, None]
+    finally:
+        fetcher.close()
+    assert fake.qualified == ["AMBIG", "AMBIG"]
+    assert "AMBIG" not in provider._contracts
+
+
+def test_pacing_violation_pauses_and_is_retryable():
+    fake = FakeIB(delay=0.0)
+    fake.fail_with = RequestError(162, "API historical data query cancelled: pacing violation")
+    provider = make_provider(fake)
+    provider.pacing_penalty_s = 30
+    fetcher = AsyncOHLCVFetcher(provider)
+    try:
+        assert fetcher.fetch_batch([FetchRequest("PACE", START, START + timedelta(minutes=30))]) == [None]
+    finally:
+        fetcher.close()
+    assert provider.pacer._paused_until - time.monotonic() > 25
@@ -0,0 +1,61 @@
+"""Tests for batched live bar writes and the background LiveBarWriter."""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from src.live_bar_store import LiveBarStore, LiveBarWriter
+
+
+def _bar(ticker: str, ts: datetime, close: float = 1.0) -> dict:
+    return {
+        "ticker": ticker,
+        "timestamp": ts,
+        "open": close,
+        "high": close,
+        "low": close,
+        "close": close,
+        "volume": 100,
+        "strategy_id": None,
+    }
+
+
+def test_save_bars_batch_upserts_and_dedupes():
+    store = LiveBarStore()
+    ts = datetime(2026, 1, 5, 14, 30, 0)
+
+    assert store.save_bars_batch([_bar("TEST", ts, 1.0), _bar("TEST", ts, 1.5)]) == 1
+    assert store.save_bars_batch([_bar("TEST", ts, 2.0), _bar("TEST", ts + timedelta(seconds=1))]) == 2
+
+    bars = store.get_bars("TEST", ts, ts + timedelta(seconds=1))
+    assert [b.close for b in bars] == [2.0, 1.0]
+
+
+def test_writer_drops_oldest_when_full():
+    store = MagicMock()
+    store.save_bars_batch.side_effect = lambda bars: len(bars)
+    writer = LiveBarWriter(store, max_queue=3, batch_size=10, flush_interval=3600)
+    writer.start = MagicMock()  # keep the background thread out of the test
+
+    ts = datetime(2026, 1, 5, 14, 30, 0)
+    for i in range(5):
+        writer.enqueue("TEST", ts + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 100)
+
+    assert writer.stats()["dropped"] == 2
+    assert writer.flush() == 3
+    written = store.save_bars_batch.call_args[0][0]
+    assert [b["timestamp"] for b in written] == [ts + timedelta(seconds=i) for i in (2, 3, 4)]
+
+    stats = writer.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["written"] == 3
+
+
+def test_writer_counts_failed_batches():
+    store = MagicMock()
+    store.save_bars_batch.return_value = 0
+    writer = LiveBarWriter(store, max_queue=10, batch_size=10, flush_interval=3600)
+    writer.start = MagicMock()
+
+    writer.enqueue("TEST", datetime(2026, 1, 5, 14, 30, 0), 1.0, 1.0, 1.0, 1.0, 100)
+    assert writer.flush() == 0
+    assert writer.stats()["failed"] == 1
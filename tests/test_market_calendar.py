@@ -0,0 +1,33 @@
+"""Tests for the precomputed trading calendar and vectorized effective starts."""
+
+from datetime import date, datetime, timedelta
+
+from src.market_calendar import TradingCalendar, get_trading_calendar
+from src.massive_client import get_effective_start_time, get_effective_start_times
+
+
+def test_next_and_previous_session_skip_weekends():
+    cal = TradingCalendar(start=date(2026, 1, 1), end=date(2026, 12, 31))
+
+    assert cal.next_session_on_or_after(date(2026, 3, 7)) == date(2026, 3, 9)  # Sat -> Mon
+    assert cal.next_session_on_or_after(date(2026, 3, 9)) == date(2026, 3, 9)
+    assert cal.next_session_after(date(2026, 3, 6)) == date(2026, 3, 9)
+    assert cal.previous_session_before(date(2026, 3, 9)) == date(2026, 3, 6)
+    assert cal.sessions_between(date(2026, 3, 6), date(2026, 3, 9)) == [date(2026, 3, 6), date(2026, 3, 9)]
+    # Outside the loaded range falls back to the weekday rule
+    assert cal.next_session_on_or_after(date(2030, 6, 1)) == date(2030, 6, 3)
+
+
+def test_session_open_is_dst_aware():
+    cal = get_trading_calendar()
+    assert cal.session_open_utc(date(2026, 1, 5)) == datetime(2026, 1, 5, 14, 30)
+    assert cal.session_open_utc(date(2026, 7, 1)) == datetime(2026, 7, 1, 13, 30)
+
+
+def test_vectorized_effective_start_matches_scalar():
+    # Every 37 minutes across two weeks, covering all sessions, weekends and a DST change
+    start = datetime(2026, 3, 2, 0, 7, 13)
+    timestamps = [start + timedelta(minutes=37 * i) for i in range(14 * 24 * 60 // 37)]
+
+    vectorized = get_effective_start_times(timestamps).astype("datetime64[us]").tolist()
+    assert vectorized == [get_effective_start_time(ts) for ts in timestamps]
@@ -0,0 +1,85 @@
+"""Tests for the local stand-in market data server."""
+
+import asyncio
+import threading
+from datetime import date, datetime
+
+import aiohttp
+import pytest
+import requests
+
+from src.data_providers.alpaca import AlpacaProvider
+from src.data_providers.polygon import PolygonProvider
+from src.market_data_standin import FaultProfile, StandinServer
+
+SESSION = date(2026, 1, 5)  # Monday
+
+
+@pytest.fixture
+def standin():
+    """Start a server on its own loop thread; yields (server, base_url)."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = StandinServer(
+        profiles={"insightsentry": FaultProfile(rate_limit=2, rate_window_s=60)},
+        tick_interval_s=0.05,
+        max_symbols=2,
+        replay_date=SESSION,
+        seed=1,
+    )
+    url = asyncio.run_coroutine_threadsafe(server.start(), loop).result(10)
+    try:
+        yield server, url
+    finally:
+        asyncio.run_coroutine_threadsafe(server.stop(), loop).result(10)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(10)
+
+
+def test_polygon_and_alpaca_serve_the_same_bars(standin):
+    server, url = standin
+    start, end = datetime(2026, 1, 5, 14, 30), datetime(2026, 1, 7, 21, 0)
+    polygon = PolygonProvider(api_key="x", base_url=url, rate_limit_delay=0)
+    alpaca = AlpacaProvider(api_key="x", secret_key="y", base_url=url, rate_limit_delay=0)
+
+    bars = polygon.fetch_ohlcv("ABC", start, end)
+    assert bars == alpaca.fetch_ohlcv("ABC", start, end)
+    assert len(bars) > 2000 and bars[0].timestamp == start and bars[-1].timestamp <= end
+
+    daily = polygon.fetch_ohlcv("ABC", start, end, timespan="day")
+    assert [b.timestamp for b in daily] == [datetime(2026, 1, d, 5, 0) for d in (5, 6, 7)]
+    assert sum(b.volume for b in daily) == sum(b.volume for b in bars)
+
+    # Alpaca pagination walks the same rows
+    page = requests.get(f"{url}/v2/stocks/ABC/bars", params={
+        "start": "2026-01-05T14:30:00Z", "end": "2026-01-05T14:39:00Z", "limit": 4,
+    }).json()
+    assert [b["t"] for b in page["bars"]][:2] == ["2026-01-05T14:30:00Z", "2026-01-05T14:31:00Z"]
+    assert page["next_page_token"] is not None
+    assert server.stats["polygon"]["requests"] == 2
+
+
+def test_rate_limit_and_websocket_frames(standin):
+    server, url = standin
+
+    statuses = [requests.get(f"{url}/v3/symbols/search", params={"query": "abc"}) for _ in range(3)]
+    assert [r.status_code for r in statuses] == [200, 200, 429]
+    assert statuses[0].json()["symbols"][0]["code"] == "NASDAQ:ABC"
+    assert int(statuses[2].headers["Retry-After"]) >= 1
+
+    async def session():
+        async with aiohttp.ClientSession() as http:
+            async with http.ws_connect(url.replace("http", "ws") + "/live") as ws:
+                too_many = [{"code": f"NASDAQ:T{i}", "type": "series"} for i in range(3)]
+                await ws.send_json({"api_key": "k", "subscriptions": too_many})
+                frames = [await ws.receive_json(timeout=5)]
+                await ws.send_json({"api_key": "k", "subscriptions": [{"code": "NASDAQ:ABC", "type": "series"}]})
+                while not any("series" in f for f in frames):
+                    frames.append(await ws.receive_json(timeout=5))
+                return frames
+
+    frames = asyncio.run(session())
+    assert "exceeds the number of symbols" in frames[0]["message"]
+    series = next(f for f in frames if "series" in f)
+    assert series["code"] == "NASDAQ:ABC" and series["series"][0]["close"] > 0
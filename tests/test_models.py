@@ -4,7 +4,15 @@ import pytest
 from datetime import datetime, time
 from zoneinfo import ZoneInfo
 
-from src.models import get_market_session
+from src.models import (
+    ANNOUNCEMENT_LIGHT_FIELDS,
+    ANNOUNCEMENT_REQUIRED_FIELDS,
+    Announcement,
+    classify_market_sessions,
+    get_et_date,
+    get_market_session,
+    resolve_announcement_fields,
+)
 
 ET_TZ = ZoneInfo("America/New_York")
 UTC_TZ = ZoneInfo("UTC")
@@ -85,3 +93,61 @@ class TestGetMarketSession:
         # Same time as UTC-aware
         utc_time = datetime(2025, 12, 12, 19, 41, 29, tzinfo=UTC_TZ)
         assert get_market_session(utc_time) == "market"
+
+
+class TestResolveAnnouncementFields:
+    """Tests for announcement field projections."""
+
+    def test_none_means_all_fields(self):
+        resolved = resolve_announcement_fields(None)
+        assert "source_html" in resolved
+        assert "source_message" in resolved
+
+    def test_light_fields_skip_heavy_text(self):
+        resolved = resolve_announcement_fields(ANNOUNCEMENT_LIGHT_FIELDS)
+        assert "source_html" not in resolved
+        assert "source_message" not in resolved
+        assert "ohlcv_status" in resolved
+
+    def test_required_fields_always_included(self):
+        resolved = resolve_announcement_fields(["rvol"])
+        for name in ANNOUNCEMENT_REQUIRED_FIELDS:
+            assert name in resolved
+        assert "rvol" in resolved
+
+    def test_unknown_field_raises(self):
+        with pytest.raises(ValueError):
+            resolve_announcement_fields(["not_a_field"])
+
+
+class TestPrecomputedSessionFields:
+    """Session and ET date are derived once when an Announcement is built."""
+
+    def _ann(self, ts, **kwargs):
+        return Announcement(ticker="ABC", timestamp=ts, price_threshold=1.0,
+                            headline="", country="US", **kwargs)
+
+    def test_post_init_computes_session_and_et_date(self):
+        # 01:30 UTC on Jan 3 = 20:30 ET on Jan 2
+        ann = self._ann(datetime(2025, 1, 3, 1, 30))
+        assert ann.market_session == "closed"
+        assert ann.et_date == datetime(2025, 1, 2).date()
+
+    def test_stored_values_are_kept(self):
+        ann = self._ann(datetime(2025, 1, 3, 15, 0), market_session="premarket")
+        assert ann.market_session == "premarket"
+
+    def test_vectorized_classifier_matches_scalar(self):
+        timestamps = [
+            datetime(2025, 12, 12, 8, 59, 59),
+            datetime(2025, 12, 12, 9, 0, 0),
+            datetime(2025, 12, 12, 14, 30, 0),
+            datetime(2025, 12, 12, 21, 0, 0),
+            datetime(2025, 12, 13, 1, 0, 0),
+            datetime(2025, 7, 15, 13, 29, 0),
+            datetime(2025, 7, 15, 13, 30, 0),
+        ]
+        sessions, et_dates = classify_market_sessions(timestamps)
+        for ts, session, et_date in zip(timestamps, sessions, et_dates):
+            assert session == get_market_session(ts)
+            assert et_date == get_et_date(ts)
@@ -0,0 +1,136 @@
+"""Tests for OrderStore journal mode."""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from src import database
+from src.database import OrderDB, OrderEventDB
+from src.order_store import OrderStore
+
+
+def _journal_store() -> OrderStore:
+    # Long interval keeps the background flusher out of the way; tests flush explicitly
+    return OrderStore(journal=True, flush_interval=3600)
+
+
+def test_create_order_is_journaled_with_reserved_id():
+    store = _journal_store()
+    order_id = store.create_order(
+        ticker="TEST", side="buy", order_type="limit", requested_shares=100, limit_price=1.5,
+    )
+    assert order_id is not None
+
+    db = database.SessionLocal()
+    try:
+        assert db.query(OrderDB).filter(OrderDB.id == order_id).first() is None
+    finally:
+        db.close()
+
+    # Broker id is the synchronous recovery point
+    assert store.update_broker_order_id(order_id, "journal-broker-1")
+    db = database.SessionLocal()
+    try:
+        order = db.query(OrderDB).filter(OrderDB.id == order_id).first()
+        assert order.broker_order_id == "journal-broker-1"
+        assert order.status == "pending"
+    finally:
+        db.close()
+    store.close()
+
+
+def test_dropped_broker_id_is_reported(monkeypatch):
+    store = _journal_store()
+    order_id = store.create_order(ticker="TEST", side="buy", order_type="limit", requested_shares=100)
+    apply_entries = OrderStore._apply_entries
+
+    def failing_apply(session, entries):
+        if any(kind == "broker_id" for _, kind, _ in entries):
+            raise ValueError("constraint violation")
+        apply_entries(session, entries)
+
+    monkeypatch.setattr(store, "_apply_entries", failing_apply)
+    # The batch fails, the order row is written alone and the broker id is dropped
+    assert store.update_broker_order_id(order_id, "journal-broker-dropped") is False
+
+    monkeypatch.setattr(store, "_apply_entries", apply_entries)
+    assert store.get_order(order_id=order_id).broker_order_id is None
+    store.close()
+
+
+def test_journal_preserves_transition_order():
+    store = _journal_store()
+    order_id = store.create_order(ticker="TEST", side="buy", order_type="limit", requested_shares=100)
+    store.update_broker_order_id(order_id, "journal-broker-2")
+
+    store.record_event(
+        event_type="partial_fill", event_timestamp=datetime(2026, 1, 5, 14, 30, 1),
+        broker_order_id="journal-broker-2", filled_shares=40, fill_price=1.0, cumulative_filled=40,
+    )
+    store.update_order_status(order_id=order_id, status="partial", filled_shares=40)
+    store.record_event(
+        event_type="fill", event_timestamp=datetime(2026, 1, 5, 14, 30, 2),
+        order_id=order_id, filled_shares=60, fill_price=1.1, cumulative_filled=100,
+    )
+    store.update_order_status(broker_order_id="journal-broker-2", status="filled", filled_shares=100)
+
+    # Reads flush the journal first
+    order = store.get_order(order_id=order_id)
+    assert order.status == "filled"
+    assert order.filled_shares == 100
+
+    events = store.get_events_for_order(order_id)
+    assert [e.event_type for e in events] == ["partial_fill", "fill"]
+    assert all(e.order_id == order_id for e in events)
+    store.close()
+
+
+def test_direct_mode_unchanged():
+    store = OrderStore()
+    order_id = store.create_order(ticker="TEST", side="sell", order_type="market", requested_shares=10)
+    event_id = store.record_event(event_type="submitted", event_timestamp=datetime.utcnow(), order_id=order_id)
+    assert event_id is not None
+
+    db = database.SessionLocal()
+    try:
+        assert db.query(OrderEventDB).filter(OrderEventDB.id == event_id).first() is not None
+    finally:
+        db.close()
+
+
+def test_orders_with_events_for_trades_by_trade_id_and_legacy_window():
+    store = OrderStore()
+    entry = datetime(2026, 1, 5, 14, 30, 0)
+    exit_ = datetime(2026, 1, 5, 14, 40, 0)
+
+    # Trade with order tracking (trade_id on the orders)
+    buy_id = store.create_order(ticker="BULK", side="buy", order_type="limit", requested_shares=100, trade_id="bulk-trade-1")
+    store.record_event(event_type="submitted", event_timestamp=entry, order_id=buy_id)
+    store.record_event(event_type="fill", event_timestamp=entry, order_id=buy_id, filled_shares=100)
+
+    # Legacy trade: orders only match by ticker/side/time window
+    db = database.SessionLocal()
+    try:
+        legacy_buy = OrderDB(ticker="OLD", side="buy", order_type="market", requested_shares=50,
+                             status="filled", created_at=entry - timedelta(seconds=30))
+        legacy_sell = OrderDB(ticker="OLD", side="sell", order_type="market", requested_shares=50,
+                              status="filled", created_at=exit_ - timedelta(seconds=10))
+        outside = OrderDB(ticker="OLD", side="sell", order_type="market", requested_shares=50,
+                          status="filled", created_at=exit_ + timedelta(minutes=5))
+        db.add_all([legacy_buy, legacy_sell, outside])
+        db.commit()
+        legacy_ids = [legacy_buy.id, legacy_sell.id]
+    finally:
+        db.close()
+
+    trades = [
+        SimpleNamespace(id=1, trade_id="bulk-trade-1", ticker="BULK", entry_time=entry, exit_time=exit_, strategy_id=None),
+        SimpleNamespace(id=2, trade_id=None, ticker="OLD", entry_time=entry, exit_time=exit_, strategy_id=None),
+        SimpleNamespace(id=3, trade_id="no-orders", ticker="NONE", entry_time=entry, exit_time=exit_, strategy_id=None),
+    ]
+    result = store.get_orders_with_events_for_trades(trades)
+
+    assert set(result) == {1, 2}
+    [(order, events)] = result[1]
+    assert order.id == buy_id
+    assert [e.event_type for e in events] == ["submitted", "fill"]
+    assert [o.id for o, _ in result[2]] == legacy_ids
@@ -0,0 +1,75 @@
+"""Tests for the on-disk provider response cache."""
+
+from datetime import datetime, timedelta
+
+from src.data_providers.base import OHLCVDataProvider
+from src.data_providers.response_cache import ResponseCache, cached_fetch, get_response_cache, set_response_cache
+from src.models import OHLCVBar
+
+
+class RecordingProvider(OHLCVDataProvider):
+    """Counts upstream calls; FAIL returns None, EMPTY returns []."""
+
+    def __init__(self):
+        self.calls = 0
+
+    @cached_fetch
+    def fetch_ohlcv(self, ticker, start, end, timespan="minute"):
+        self.calls += 1
+        if ticker == "FAIL":
+            return None
+        if ticker == "EMPTY":
+            return []
+        return [OHLCVBar(timestamp=start + timedelta(minutes=i), open=1.0, high=1.5, low=0.5,
+                         close=1.25, volume=100 + i, vwap=None if i else 1.1) for i in range(3)]
+
+    def supports_extended_hours(self) -> bool:
+        return True
+
+    @property
+    def rate_limit_delay(self) -> float:
+        return 0.0
+
+
+def test_closed_session_is_served_from_disk():
+    provider = RecordingProvider()
+    start = datetime(2026, 1, 5, 14, 30)
+    end = start + timedelta(hours=2)
+
+    first = provider.fetch_ohlcv("ABC", start, end)
+    second = provider.fetch_ohlcv("ABC", start, end)
+
+    assert provider.calls == 1
+    assert second == first
+    assert provider.fetch_ohlcv("EMPTY", start, end) == []
+    assert provider.fetch_ohlcv("EMPTY", start, end) == []
+    assert provider.calls == 2
+    assert get_response_cache().stats()["hits"] == 2
+
+
+def test_failures_are_not_cached_and_today_expires(tmp_path):
+    set_response_cache(ResponseCache(directory=tmp_path, ttl=0))
+    provider = RecordingProvider()
+    start = datetime(2026, 1, 5, 14, 30)
+
+    provider.fetch_ohlcv("FAIL", start, start)
+    provider.fetch_ohlcv("FAIL", start, start)
+    assert provider.calls == 2
+
+    now = datetime.utcnow()
+    provider.fetch_ohlcv("LIVE", now - timedelta(minutes=5), now)
+    provider.fetch_ohlcv("LIVE", now - timedelta(minutes=5), now)
+    assert provider.calls == 4
+    assert get_response_cache().stats()["expired"] == 1
+
+
+def test_offline_mode_never_calls_upstream(tmp_path):
+    start = datetime(2026, 1, 5, 14, 30)
+    provider = RecordingProvider()
+    set_response_cache(ResponseCache(directory=tmp_path))
+    recorded = provider.fetch_ohlcv("ABC", start, start)
+
+    set_response_cache(ResponseCache(directory=tmp_path, offline=True))
+    assert provider.fetch_ohlcv("ABC", start, start) == recorded
+    assert provider.fetch_ohlcv("XYZ", start, start) is None
+    assert provider.calls == 1
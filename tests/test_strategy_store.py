@@ -0,0 +1,62 @@
+"""Tests for the StrategyStore dashboard summary."""
+
+from datetime import datetime, timedelta
+
+from src.active_trade_store import ActiveTradeStore
+from src.pending_entry_store import PendingEntryStore
+from src.strategy import StrategyConfig
+from src.strategy_store import StrategyStore
+from src.trade_store import TradeStore
+
+
+def _save_completed(strategy_id: str, exit_time: datetime, pnl: float) -> None:
+    TradeStore().save_trade(
+        trade={
+            "ticker": "DONE",
+            "entry_price": 1.0,
+            "entry_time": exit_time - timedelta(minutes=5),
+            "exit_price": 1.0,
+            "exit_time": exit_time,
+            "exit_reason": "timeout",
+            "shares": 100,
+            "return_pct": 0.0,
+            "pnl": pnl,
+        },
+        strategy_id=strategy_id,
+    )
+
+
+def test_dashboard_summary_counts_all_strategies():
+    store = StrategyStore(summary_ttl=0)
+    busy = store.save_strategy("Summary Busy", StrategyConfig())
+    idle = store.save_strategy("Summary Idle", StrategyConfig())
+    since = datetime(2026, 1, 5)
+
+    PendingEntryStore().save_entry(
+        "sum-pending-1", "PEND", busy, "Summary Busy", since, 1.0, "PEND", since,
+    )
+    active_store = ActiveTradeStore(write_behind=False)
+    active_store.save_trade(
+        "sum-active-1", "ACTV", busy, "Summary Busy", 2.0, since, 2.0, 100, 1.8, 2.2, 2.0,
+    )
+    active_store.update_price("sum-active-1", 2.1, 2.1, since)
+    _save_completed(busy, since + timedelta(hours=15), 12.5)
+    _save_completed(busy, since - timedelta(hours=1), 99.0)  # before the window
+
+    summaries = store.get_dashboard_summary(since=since)
+    assert summaries[idle].pending == summaries[idle].active == summaries[idle].completed_today == 0
+
+    summary = summaries[busy]
+    assert (summary.pending, summary.active, summary.completed_today) == (1, 1, 1)
+    assert summary.realized_pnl_today == 12.5
+    assert round(summary.unrealized_pnl, 2) == 10.0
+
+
+def test_dashboard_summary_cache_invalidated_by_trade_writes():
+    store = StrategyStore(summary_ttl=3600)
+    strategy_id = store.save_strategy("Summary Cached", StrategyConfig())
+    since = datetime(2026, 1, 5)
+
+    assert store.get_dashboard_summary(since=since)[strategy_id].completed_today == 0
+    _save_completed(strategy_id, since + timedelta(hours=15), 1.0)
+    assert store.get_dashboard_summary(since=since)[strategy_id].completed_today == 1
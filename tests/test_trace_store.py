@@ -0,0 +1,137 @@
+"""Tests for the queued TraceStore writer and its spill file."""
+
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+
+from src import database, trace_store
+from src.trace_store import TraceStore
+
+
+def _store(spill_path) -> TraceStore:
+    return TraceStore(async_writes=True, spill_path=spill_path, flush_interval=3600)
+
+
+def test_writes_are_queued_and_spilled(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    store = _store(spill)
+
+    assert store.create_trace("t-1", "TEST", datetime(2026, 1, 5, 14, 30)) is None
+    assert store.add_event("t-1", "alert_received", datetime(2026, 1, 5, 14, 30)) is None
+    assert store.update_trace_status("t-1", status="filtered") is True
+
+    assert store.pending_count() == 3
+    records = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert [r["op"] for r in records] == ["create", "event", "status"]
+    assert records[0]["data"]["alert_timestamp"] == "2026-01-05T14:30:00"
+
+
+def test_unflushed_writes_are_replayed_in_order(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    crashed = _store(spill)
+    crashed.create_trace("t-1", "TEST", datetime(2026, 1, 5, 14, 30))
+    crashed.add_event("t-1", "alert_received", datetime(2026, 1, 5, 14, 30))
+
+    store = _store(spill)
+    store._write_batch = MagicMock(return_value=True)
+    store.add_event("t-1", "filter_passed", datetime(2026, 1, 5, 14, 31))
+
+    assert store.flush() == 3
+    batch = store._write_batch.call_args[0][0]
+    assert [seq for seq, _, _ in batch] == [1, 2, 3]
+    assert [kind for _, kind, _ in batch] == ["create", "event", "event"]
+    assert batch[0][2]["alert_timestamp"] == datetime(2026, 1, 5, 14, 30)
+    # Queue drained -> spill file truncated
+    assert spill.read_text() == ""
+
+
+def test_committed_ops_are_not_replayed(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    crashed = TraceStore(async_writes=True, spill_path=spill, flush_interval=3600, batch_size=1)
+    crashed._write_batch = MagicMock(side_effect=[True, False])
+    crashed.create_trace("t-1", "TEST", datetime(2026, 1, 5, 14, 30))
+    crashed.add_event("t-1", "alert_received", datetime(2026, 1, 5, 14, 30))
+    crashed.flush()  # first op committed, second fails and stays queued
+
+    store = _store(spill)
+    store._write_batch = MagicMock(return_value=True)
+    store.update_trace_status("t-1", status="filtered")
+    store.flush()
+
+    batch = store._write_batch.call_args[0][0]
+    assert [kind for _, kind, _ in batch] == ["event", "status"]
+
+
+def test_failed_batch_is_kept_for_next_flush(tmp_path):
+    store = _store(tmp_path / "spill.jsonl")
+    store._write_batch = MagicMock(return_value=False)
+    store.add_event("t-1", "alert_received", datetime(2026, 1, 5, 14, 30))
+
+    assert store.flush() == 0
+    assert store.pending_count() == 1
+
+
+def _db_store(monkeypatch) -> TraceStore:
+    # TraceStore imports SessionLocal directly; point it at the per-test transaction
+    monkeypatch.setattr(trace_store, "SessionLocal", database.SessionLocal)
+    return TraceStore(async_writes=False, spill_path=None)
+
+
+def test_trace_summaries_include_first_strategy_name(monkeypatch):
+    store = _db_store(monkeypatch)
+    ts = datetime(2026, 1, 5, 14, 30)
+    store.create_trace("t-sum-1", "TEST", ts)
+    store.add_event("t-sum-1", "alert_received", ts)
+    store.add_event("t-sum-1", "filter_rejected", datetime(2026, 1, 5, 14, 31), "s-2", "Second", "late")
+    store.add_event("t-sum-1", "filter_accepted", datetime(2026, 1, 5, 14, 30, 30), "s-1", "First")
+    store.create_trace("t-sum-2", "TEST", ts)
+
+    traces = {t.trace_id: t for t in store.get_trace_summaries(ticker="test")}
+    assert traces["t-sum-1"].strategy_name == "First"
+    assert traces["t-sum-2"].strategy_name == "-"
+
+    by_strategy = store.get_trace_summaries(strategy_id="s-2")
+    assert [t.trace_id for t in by_strategy] == ["t-sum-1"]
+
+
+def test_funnel_and_rejection_counters_follow_status_changes(monkeypatch):
+    store = _db_store(monkeypatch)
+    ts = datetime(2026, 1, 5, 14, 30)
+    store.create_trace("t-fun-1", "TEST", ts)
+    store.create_trace("t-fun-2", "TEST", ts)
+    store.create_trace("t-fun-3", "TEST", ts)
+    store.update_trace_status("t-fun-1", status="filtered")
+    store.update_trace_status("t-fun-2", status="completed", pnl=25.0)
+    store.update_trace_status("t-fun-3", status="completed", pnl=-10.0)
+    store.add_event("t-fun-1", "filter_rejected", ts, "s-1", "S1", "price too low")
+    store.add_event("t-fun-1", "filter_rejected", ts, "s-1", "S1", "price too low")
+    store.add_event("t-fun-1", "filter_rejected", ts, "s-2", "S2", None)
+
+    stats = store.get_funnel_stats(datetime(2026, 1, 5))
+    assert stats["total_received"] == 3
+    assert stats["filtered"] == 1
+    assert stats["completed"] == 2
+    assert (stats["winners"], stats["losers"]) == (1, 1)
+    assert stats["total_pnl"] == 15.0
+    assert store.get_funnel_stats(datetime(2026, 1, 6))["total_received"] == 0
+
+    assert store.get_filter_rejection_summary(start=datetime(2026, 1, 5)) == [
+        ("price too low", 2), ("Unknown", 1),
+    ]
+    assert store.get_filter_rejection_summary(strategy_id="s-2") == [("Unknown", 1)]
+
+
+def test_replayed_batch_does_not_duplicate_events(monkeypatch, tmp_path):
+    monkeypatch.setattr(trace_store, "SessionLocal", database.SessionLocal)
+    ts = datetime(2026, 1, 5, 14, 30)
+    store = _store(tmp_path / "spill.jsonl")
+    store.create_trace("t-rep-1", "TEST", ts)
+    store.add_event("t-rep-1", "filter_rejected", ts, "s-rep", "S", "replayed")
+    batch = list(store._queue)
+
+    # Committed, then the process dies before the watermark is written
+    assert store._write_batch(batch) is True
+    assert store._write_batch(batch) is True
+
+    assert len(store.get_events_for_trace("t-rep-1")) == 1
+    assert store.get_filter_rejection_summary(strategy_id="s-rep") == [("replayed", 1)]
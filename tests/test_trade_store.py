@@ -0,0 +1,88 @@
+"""Tests for TradeStore SQL stats and keyset pagination."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.trade_store import TradeStore
+
+
+def _save(store: TradeStore, ticker: str, entry_time: datetime, pnl: float, return_pct: float,
+          strategy_name: str = "Alpha", paper: bool = True) -> int:
+    return store.save_trade(
+        trade={
+            "ticker": ticker,
+            "entry_price": 1.0,
+            "entry_time": entry_time,
+            "exit_price": 1.0 + return_pct / 100,
+            "exit_time": entry_time + timedelta(minutes=5),
+            "exit_reason": "take_profit" if pnl > 0 else "stop_loss",
+            "shares": 100,
+            "return_pct": return_pct,
+            "pnl": pnl,
+        },
+        paper=paper,
+        strategy_name=strategy_name,
+    )
+
+
+@pytest.fixture
+def store():
+    store = TradeStore()
+    base = datetime(2026, 1, 5, 15, 0)
+    _save(store, "AAA", base, 10.0, 10.0, "Alpha")
+    _save(store, "BBB", base + timedelta(minutes=1), -5.0, -5.0, "Alpha")
+    _save(store, "CCC", base + timedelta(minutes=2), 20.0, 20.0, "Beta")
+    # Next ET day, same entry time twice to exercise the id tiebreak
+    _save(store, "DDD", base + timedelta(days=1), -1.0, -1.0, "Beta")
+    _save(store, "EEE", base + timedelta(days=1), 2.0, 2.0, "Beta")
+    return store
+
+
+def test_trade_stats_in_sql(store):
+    stats = store.get_trade_stats(paper=True)
+    assert stats["total_trades"] == 5
+    assert stats["wins"] == 3
+    assert stats["losses"] == 2
+    assert stats["win_rate"] == pytest.approx(60.0)
+    assert stats["total_pnl"] == pytest.approx(26.0)
+    assert stats["best_trade_pct"] == pytest.approx(20.0)
+    assert stats["worst_trade_pct"] == pytest.approx(-5.0)
+
+
+def test_trade_stats_empty():
+    stats = TradeStore().get_trade_stats(strategy_name="does-not-exist")
+    assert stats["total_trades"] == 0
+    assert stats["win_rate"] == 0
+
+
+def test_trade_stats_grouped(store):
+    by_strategy = {row["strategy_name"]: row for row in store.get_trade_stats(group_by="strategy")}
+    assert by_strategy["Alpha"]["total_trades"] == 2
+    assert by_strategy["Beta"]["total_pnl"] == pytest.approx(21.0)
+
+    by_day = store.get_trade_stats(group_by="day")
+    assert [row["total_trades"] for row in by_day] == [3, 2]
+
+    with pytest.raises(ValueError):
+        store.get_trade_stats(group_by="ticker")
+
+
+def test_strategy_name_filter(store):
+    trades = store.get_trades(strategy_name="Alpha")
+    assert {t.ticker for t in trades} == {"AAA", "BBB"}
+
+
+def test_keyset_pagination_visits_every_trade_once(store):
+    seen = []
+    cursor = None
+    while True:
+        page = store.get_trades(limit=2, before=cursor)
+        seen.extend(t.ticker for t in page)
+        cursor = store.next_page_cursor(page, 2)
+        if cursor is None:
+            break
+
+    assert sorted(seen) == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    assert len(seen) == len(set(seen))
+    assert seen[-3:] == ["CCC", "BBB", "AAA"]